@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Benchmarks of the DISDRODB L0 processing.
+
+The benchmarks use synthetic raw data (see ``disdrodb.l0.synthetic``).
+Run them with ``asv run`` (or ``asv run --quick -b <pattern>`` for a single pass).
+The 1M rows parameter requires some GB of memory for the sensors with raw spectra.
+"""
+import concurrent.futures
+import functools
+import os
+import tempfile
+
+from disdrodb.l0.l0a_processing import process_raw_file
+from disdrodb.l0.l0b_processing import create_l0b_from_l0a, retrieve_l0b_arrays, write_l0b
+from disdrodb.l0.synthetic import (
+    SYNTHETIC_READER_KWARGS,
+    SYNTHETIC_SENSOR_NAMES,
+    generate_l0a_dataframe,
+    generate_raw_file,
+    get_synthetic_column_names,
+    get_synthetic_metadata,
+    synthetic_df_sanitizer,
+)
+from disdrodb.utils.netcdf import L0B_ENGINES, get_list_ds, xr_concat_datasets
+from disdrodb.utils.xarray import add_gap_table, iterate_regularized_dataset, regularize_dataset
+
+N_ROWS = [1_000, 100_000, 1_000_000]
+TIMEOUT = 1800
+EXECUTORS = {
+    "serial": None,
+    "threads": concurrent.futures.ThreadPoolExecutor,
+    "processes": concurrent.futures.ProcessPoolExecutor,
+}
+
+
+def _map(mode, func, *iterables):
+    """Map a function serially or with a pool of 4 workers."""
+    if EXECUTORS[mode] is None:
+        return list(map(func, *iterables))
+    with EXECUTORS[mode](max_workers=4) as pool:
+        return list(pool.map(func, *iterables))
+
+
+class TimeProcessRawFile:
+    """Benchmark the L0A processing of a raw text file."""
+
+    params = (SYNTHETIC_SENSOR_NAMES, N_ROWS, [0.0, 0.01])
+    param_names = ["sensor_name", "n_rows", "corruption_rate"]
+    timeout = TIMEOUT
+
+    def setup(self, sensor_name, n_rows, corruption_rate):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filepath = generate_raw_file(
+            os.path.join(self.tmp_dir.name, "raw.txt"),
+            sensor_name=sensor_name,
+            n_rows=n_rows,
+            corruption_rate=corruption_rate,
+            duplicate_rate=corruption_rate,
+        )
+
+    def teardown(self, sensor_name, n_rows, corruption_rate):
+        self.tmp_dir.cleanup()
+
+    def time_process_raw_file(self, sensor_name, n_rows, corruption_rate):
+        process_raw_file(
+            filepath=self.filepath,
+            column_names=get_synthetic_column_names(sensor_name),
+            reader_kwargs=SYNTHETIC_READER_KWARGS.copy(),
+            df_sanitizer_fun=synthetic_df_sanitizer,
+            sensor_name=sensor_name,
+            verbose=False,
+        )
+
+    def peakmem_process_raw_file(self, sensor_name, n_rows, corruption_rate):
+        self.time_process_raw_file(sensor_name, n_rows, corruption_rate)
+
+
+class TimeL0B:
+    """Benchmark the L0B processing of a L0A dataframe."""
+
+    params = (SYNTHETIC_SENSOR_NAMES, N_ROWS)
+    param_names = ["sensor_name", "n_rows"]
+    timeout = TIMEOUT
+
+    def setup(self, sensor_name, n_rows):
+        self.df = generate_l0a_dataframe(sensor_name, n_rows=n_rows)
+        self.attrs = get_synthetic_metadata(sensor_name)
+        self.ds = create_l0b_from_l0a(self.df, attrs=self.attrs)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def teardown(self, sensor_name, n_rows):
+        self.tmp_dir.cleanup()
+
+    def time_retrieve_l0b_arrays(self, sensor_name, n_rows):
+        retrieve_l0b_arrays(self.df, sensor_name=sensor_name)
+
+    def peakmem_retrieve_l0b_arrays(self, sensor_name, n_rows):
+        retrieve_l0b_arrays(self.df, sensor_name=sensor_name)
+
+    def time_create_l0b_from_l0a(self, sensor_name, n_rows):
+        create_l0b_from_l0a(self.df, attrs=self.attrs)
+
+    def peakmem_create_l0b_from_l0a(self, sensor_name, n_rows):
+        create_l0b_from_l0a(self.df, attrs=self.attrs)
+
+    def time_write_l0b(self, sensor_name, n_rows):
+        write_l0b(self.ds, filepath=os.path.join(self.tmp_dir.name, "l0b.nc"), force=True)
+
+    def time_write_l0b_rechunk(self, sensor_name, n_rows):
+        # Previous write path: the in-memory arrays are rechunked with dask before writing
+        ds = self.ds.copy()
+        write_l0b(ds, filepath=os.path.join(self.tmp_dir.name, "l0b.nc"), force=True, rechunk=True)
+
+
+class TimeConcatL0B:
+    """Benchmark the concatenation of L0B netCDF files."""
+
+    params = (SYNTHETIC_SENSOR_NAMES, N_ROWS, [10])
+    param_names = ["sensor_name", "n_rows", "n_files"]
+    timeout = TIMEOUT
+
+    def setup(self, sensor_name, n_rows, n_files):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filepaths = []
+        n_rows_file = n_rows // n_files
+        for i in range(n_files):
+            # Each file covers a distinct time period
+            start_time = f"{2000 + i}-01-01 00:00:00"
+            df = generate_l0a_dataframe(sensor_name, n_rows=n_rows_file, start_time=start_time, seed=i)
+            ds = create_l0b_from_l0a(df, attrs=get_synthetic_metadata(sensor_name))
+            filepath = os.path.join(self.tmp_dir.name, f"l0b_{i}.nc")
+            write_l0b(ds, filepath=filepath, force=True)
+            self.filepaths.append(filepath)
+
+    def teardown(self, sensor_name, n_rows, n_files):
+        self.tmp_dir.cleanup()
+
+    def time_xr_concat_datasets(self, sensor_name, n_rows, n_files):
+        ds = xr_concat_datasets(self.filepaths)
+        ds.load()
+        ds.close()
+
+
+class TimeL0BEngines:
+    """Benchmark the serial and parallel writing and reading of L0B netCDF files with each engine."""
+
+    params = (L0B_ENGINES, list(EXECUTORS), [16])
+    param_names = ["engine", "mode", "n_files"]
+    timeout = TIMEOUT
+
+    def setup(self, engine, mode, n_files):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.ds = create_l0b_from_l0a(
+            generate_l0a_dataframe("OTT_Parsivel2", n_rows=1440),
+            attrs=get_synthetic_metadata("OTT_Parsivel2"),
+        )
+        self.filepaths = [os.path.join(self.tmp_dir.name, f"l0b_{i}.nc") for i in range(n_files)]
+        for filepath in self.filepaths:
+            write_l0b(self.ds.copy(), filepath=filepath, force=True, engine=engine)
+
+    def teardown(self, engine, mode, n_files):
+        self.tmp_dir.cleanup()
+
+    def time_write_l0b(self, engine, mode, n_files):
+        func = functools.partial(write_l0b, force=True, engine=engine)
+        _map(mode, func, [self.ds.copy() for _ in self.filepaths], self.filepaths)
+
+    def time_read_l0b(self, engine, mode, n_files):
+        func = functools.partial(get_list_ds, engine=engine)
+        _map(mode, func, [[filepath] for filepath in self.filepaths])
+
+
+class TimeRegularizeL0B:
+    """Benchmark the time regularization of a L0B dataset with data gaps."""
+
+    params = (["in_memory", "lazy", "blocks", "gap_table"], [100_000])
+    param_names = ["mode", "n_rows"]
+    timeout = TIMEOUT
+
+    def setup(self, mode, n_rows):
+        ds = create_l0b_from_l0a(
+            generate_l0a_dataframe("OTT_Parsivel2", n_rows=n_rows, sample_interval=10),
+            attrs=get_synthetic_metadata("OTT_Parsivel2"),
+        )
+        # Remove 10 % of the timesteps in runs of 100 timesteps
+        self.ds = ds.drop_isel(time=[i for start in range(0, n_rows, 1000) for i in range(start, start + 100)])
+
+    def _regularize(self, mode):
+        if mode == "in_memory":
+            regularize_dataset(self.ds, freq="10s")["raw_drop_number"].values.sum()
+        elif mode == "lazy":
+            regularize_dataset(self.ds, freq="10s", chunks=8640)["raw_drop_number"].sum().compute()
+        elif mode == "blocks":
+            for ds_block in iterate_regularized_dataset(self.ds, freq="10s", block_size=8640):
+                ds_block["raw_drop_number"].values.sum()
+        else:
+            add_gap_table(self.ds, freq="10s")
+
+    def time_regularize(self, mode, n_rows):
+        self._regularize(mode)
+
+    def peakmem_regularize(self, mode, n_rows):
+        self._regularize(mode)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""End-to-end throughput benchmark of the DISDRODB L0 processing.
+
+The benchmark creates a synthetic DISDRODB archive (see ``disdrodb.l0.synthetic``)
+and runs the L0A, L0B and L0B concatenation of all stations under different execution settings
+(serial and parallel with a varying number of dask workers).
+
+For each setting, the report gives, per processing stage, the number of processed files per second,
+the input data volume processed per second (MB/s), the speedup and the scaling efficiency
+with respect to the serial processing. The peak RSS is the maximum resident memory of a single process
+(i.e. a station process or a dask worker) during the processing. It is only available on Unix.
+
+Example
+-------
+python benchmarks/throughput.py --n_stations 4 --n_files 20 --workers 1,2,4 --output throughput.json
+"""
+import datetime
+import glob
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import click
+
+STAGES = ["L0A", "L0B", "L0B_concat"]
+
+# Glob patterns (relative to the DISDRODB base directory) of the input files of each stage
+STAGES_INPUT_GLOB = {
+    "L0A": os.path.join("Raw", "*", "*", "data", "*", "*"),
+    "L0B": os.path.join("Processed", "*", "*", "L0A", "*", "*.parquet"),
+    "L0B_concat": os.path.join("Processed", "*", "*", "L0B", "*", "*.nc"),
+}
+
+
+def _get_peak_rss_mb():
+    """Return the peak RSS (in MB) of the largest terminated child process."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    if sys.platform == "darwin":
+        return peak_rss / 1024**2
+    return peak_rss / 1024
+
+
+def _run_pipeline(base_dir, parallel, output_filepath):
+    """Run the L0 processing of the archive and write the stages durations and peak RSS into a JSON file.
+
+    This function is executed in a dedicated process, so that the peak RSS is specific to the setting.
+    """
+    from disdrodb.l0.routines import run_disdrodb_l0a, run_disdrodb_l0b, run_disdrodb_l0b_concat
+
+    stages_fun = {
+        "L0A": lambda: run_disdrodb_l0a(base_dir=base_dir, parallel=parallel, force=True),
+        "L0B": lambda: run_disdrodb_l0b(base_dir=base_dir, parallel=parallel, force=True),
+        "L0B_concat": lambda: run_disdrodb_l0b_concat(base_dir=base_dir),
+    }
+    results = {"durations": {}, "n_files": {}, "size": {}}
+    for stage in STAGES:
+        # Retrieve the stage input files
+        filepaths = glob.glob(os.path.join(base_dir, STAGES_INPUT_GLOB[stage]))
+        results["n_files"][stage] = len(filepaths)
+        results["size"][stage] = sum(os.path.getsize(filepath) for filepath in filepaths)
+        # Run the stage
+        t_i = time.perf_counter()
+        stages_fun[stage]()
+        results["durations"][stage] = time.perf_counter() - t_i
+    results["peak_rss_mb"] = _get_peak_rss_mb()
+    with open(output_filepath, "w") as f:
+        json.dump(results, f)
+
+
+def run_setting(base_dir, parallel, num_workers):
+    """Run the L0 processing of the archive with the given execution setting.
+
+    The processed products of previous runs are removed.
+    """
+    shutil.rmtree(os.path.join(base_dir, "Processed"), ignore_errors=True)
+    env = os.environ.copy()
+    env["DASK_NUM_WORKERS"] = str(num_workers)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_filepath = os.path.join(tmp_dir, "results.json")
+        cmd = [sys.executable, os.path.abspath(__file__), "--run_pipeline", output_filepath, "--base_dir", base_dir]
+        if parallel:
+            cmd.append("--parallel")
+        subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+        with open(output_filepath) as f:
+            results = json.load(f)
+
+    stages = {}
+    for stage in STAGES:
+        duration = results["durations"][stage]
+        n_files = results["n_files"][stage]
+        size_mb = results["size"][stage] / 1024**2
+        stages[stage] = {
+            "duration": duration,
+            "n_files": n_files,
+            "size_mb": size_mb,
+            "files_per_second": n_files / duration if duration > 0 else None,
+            "mb_per_second": size_mb / duration if duration > 0 else None,
+        }
+    return {
+        "parallel": parallel,
+        "num_workers": num_workers,
+        "duration": sum(results["durations"].values()),
+        "peak_rss_mb": results["peak_rss_mb"],
+        "stages": stages,
+    }
+
+
+def add_scaling_efficiency(list_settings):
+    """Add the speedup and scaling efficiency of each setting with respect to the serial setting.
+
+    The scaling efficiency is the speedup divided by the number of workers.
+    """
+    serial = next(setting for setting in list_settings if not setting["parallel"])
+    for setting in list_settings:
+        for stage, stage_dict in [(None, setting), *setting["stages"].items()]:
+            serial_duration = serial["duration"] if stage is None else serial["stages"][stage]["duration"]
+            speedup = serial_duration / stage_dict["duration"] if stage_dict["duration"] > 0 else None
+            stage_dict["speedup"] = speedup
+            stage_dict["scaling_efficiency"] = speedup / setting["num_workers"] if speedup is not None else None
+    return list_settings
+
+
+def run_throughput_benchmark(
+    base_dir,
+    workers=(1, 2, 4),
+    n_data_sources=1,
+    n_campaigns=1,
+    n_stations=2,
+    n_files=10,
+    n_rows=1440,
+    sensor_name="OTT_Parsivel",
+    compress=False,
+):
+    """Create a synthetic DISDRODB archive and benchmark its L0 processing.
+
+    The L0 processing is first run serially (``parallel=False``), and then in parallel
+    with each number of dask workers specified in ``workers``.
+
+    Returns
+    -------
+    dict
+        Throughput report.
+    """
+    import disdrodb
+    from disdrodb.l0.synthetic import create_synthetic_archive
+
+    list_info = create_synthetic_archive(
+        base_dir,
+        n_data_sources=n_data_sources,
+        n_campaigns=n_campaigns,
+        n_stations=n_stations,
+        sensor_name=sensor_name,
+        n_files=n_files,
+        n_rows=n_rows,
+        compress=compress,
+    )
+    list_settings = [run_setting(base_dir, parallel=False, num_workers=1)]
+    list_settings += [run_setting(base_dir, parallel=True, num_workers=num_workers) for num_workers in workers]
+    return {
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "disdrodb_version": disdrodb.__version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "archive": {
+            "n_data_sources": n_data_sources,
+            "n_campaigns": n_campaigns,
+            "n_stations": len(list_info),
+            "n_files_per_station": n_files,
+            "n_rows_per_file": n_rows,
+            "sensor_name": sensor_name,
+            "compress": compress,
+        },
+        "settings": add_scaling_efficiency(list_settings),
+    }
+
+
+@click.command()
+@click.option("--n_data_sources", type=int, default=1, show_default=True, help="Number of data sources")
+@click.option("--n_campaigns", type=int, default=1, show_default=True, help="Number of campaigns per data source")
+@click.option("--n_stations", type=int, default=2, show_default=True, help="Number of stations per campaign")
+@click.option("--n_files", type=int, default=10, show_default=True, help="Number of raw files per station")
+@click.option("--n_rows", type=int, default=1440, show_default=True, help="Number of rows per raw file")
+@click.option("--sensor_name", type=str, default="OTT_Parsivel", show_default=True, help="Sensor name")
+@click.option("--compress", is_flag=True, help="Whether to gzip the raw files")
+@click.option("--workers", type=str, default="1,2,4", show_default=True, help="Comma-separated numbers of workers")
+@click.option("--output", type=str, default="throughput.json", show_default=True, help="Report JSON filepath")
+@click.option("--base_dir", type=str, default=None, help="Synthetic archive directory (temporary if not specified)")
+@click.option("--parallel", is_flag=True, hidden=True)
+@click.option("--run_pipeline", type=str, default=None, hidden=True)
+def main(
+    n_data_sources,
+    n_campaigns,
+    n_stations,
+    n_files,
+    n_rows,
+    sensor_name,
+    compress,
+    workers,
+    output,
+    base_dir,
+    parallel,
+    run_pipeline,
+):
+    """Benchmark the throughput of the DISDRODB L0 processing on a synthetic archive."""
+    # Run the pipeline of a single setting (in the dedicated process)
+    if run_pipeline is not None:
+        _run_pipeline(base_dir, parallel=parallel, output_filepath=run_pipeline)
+        return
+
+    workers = [int(num_workers) for num_workers in workers.split(",") if num_workers.strip()]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report = run_throughput_benchmark(
+            base_dir=base_dir or os.path.join(tmp_dir, "DISDRODB"),
+            workers=workers,
+            n_data_sources=n_data_sources,
+            n_campaigns=n_campaigns,
+            n_stations=n_stations,
+            n_files=n_files,
+            n_rows=n_rows,
+            sensor_name=sensor_name,
+            compress=compress,
+        )
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    for setting in report["settings"]:
+        print(
+            f"parallel={setting['parallel']} num_workers={setting['num_workers']}: "
+            f"{setting['duration']:.2f} s (scaling efficiency: {setting['scaling_efficiency']:.2f}, "
+            f"peak RSS: {setting['peak_rss_mb']} MB)",
+        )
+    print(f"Throughput report written at {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -29,10 +29,21 @@ __all__ = [
     "open_sensor_documentation",
     "open_documentation",
     "read_station_metadata",
+    "open_l0b_dataset",
     "download_archive",
     "download_station",
 ]
 
+
+def __getattr__(name):
+    # Import the L0 reading utilities (and dask) only when requested
+    if name == "open_l0b_dataset":
+        from disdrodb.l0.io import open_l0b_dataset
+
+        return open_l0b_dataset
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __root_path__ = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))  # noqa
 
 # Get version
@@ -39,6 +39,22 @@ _CONFIG_DEFAULTS = {
     "base_dir": None,
     "zenodo_sandbox_token": None,
     "zenodo_token": None,
+    "zenodo_sandbox_url": "https://sandbox.zenodo.org",
+    "zenodo_url": "https://zenodo.org",
+    "log_format": "text",
+    "metrics": False,
+    "metrics_prometheus": False,
+    "profile": False,
+    "profile_n_files": 3,
+    "l0b_nc_lazy": False,
+    "l0b_nc_chunksize": 1000,
+    "l0b_sparse": False,
+    "l0b_encodings_optimize": False,
+    "l0b_encodings_access_pattern": "timeseries",
+    "l0b_encodings_benchmark": False,
+    "l0b_engine": "netcdf4",
+    "l0b_batch_size": 1,
+    "l0b_time_window": None,
 }
 _CONFIG_DEFAULTS.update(_get_disdrodb_default_configs())
 
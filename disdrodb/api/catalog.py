@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Persistent catalog of the DISDRODB Raw and Processed archive.
+
+The catalog is a SQLite database stored by default at ``<base_dir>/.disdrodb_catalog.sqlite``.
+It records every station (with its metadata) and every product file (with size,
+modification time and start/end time parsed from the filename).
+
+The catalog is updated incrementally: a station is rescanned only if the modification
+time of its data directory (or of one of its subdirectories) or of its metadata file changed.
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+
+from disdrodb.api.checks import check_product
+from disdrodb.api.info import _parse_filename
+from disdrodb.api.path import get_disdrodb_path
+from disdrodb.configs import get_base_dir
+from disdrodb.utils.yaml import read_yaml
+
+CATALOG_FILENAME = ".disdrodb_catalog.sqlite"
+CATALOG_PRODUCTS = ["RAW", "L0A", "L0B"]
+CATALOG_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stations (
+    product TEXT NOT NULL,
+    data_source TEXT NOT NULL,
+    campaign_name TEXT NOT NULL,
+    station_name TEXT NOT NULL,
+    sensor_name TEXT,
+    latitude REAL,
+    longitude REAL,
+    altitude REAL,
+    metadata TEXT,
+    metadata_mtime REAL,
+    station_dir TEXT,
+    directories TEXT,
+    n_files INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (product, data_source, campaign_name, station_name)
+);
+CREATE TABLE IF NOT EXISTS files (
+    filepath TEXT PRIMARY KEY,
+    product TEXT NOT NULL,
+    data_source TEXT NOT NULL,
+    campaign_name TEXT NOT NULL,
+    station_name TEXT NOT NULL,
+    size INTEGER,
+    mtime REAL,
+    start_time TEXT,
+    end_time TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_files_station ON files (product, data_source, campaign_name, station_name);
+CREATE INDEX IF NOT EXISTS idx_files_time ON files (start_time, end_time);
+CREATE INDEX IF NOT EXISTS idx_stations_sensor ON stations (sensor_name);
+"""
+
+
+####---------------------------------------------------------------------------.
+#### Catalog database
+
+
+def define_catalog_filepath(base_dir=None):
+    """Return the default filepath of the DISDRODB catalog."""
+    base_dir = get_base_dir(base_dir)
+    return os.path.join(base_dir, CATALOG_FILENAME)
+
+
+def _connect_catalog(catalog_filepath):
+    """Open a connection to the catalog and ensure the tables exist."""
+    conn = sqlite3.connect(catalog_filepath)
+    conn.executescript(_CATALOG_SCHEMA)
+    return conn
+
+
+def _get_catalog_filepath(base_dir, catalog_filepath):
+    if catalog_filepath is None:
+        catalog_filepath = define_catalog_filepath(base_dir)
+    return str(catalog_filepath)
+
+
+####---------------------------------------------------------------------------.
+#### Archive scanning
+
+
+def _list_subdirectories(dir_path):
+    """Return the names of the subdirectories of ``dir_path`` (empty list if it does not exist)."""
+    if not os.path.isdir(dir_path):
+        return []
+    with os.scandir(dir_path) as it:
+        return sorted(entry.name for entry in it if entry.is_dir())
+
+
+def _get_mtime(path):
+    """Return the modification time of ``path`` or ``None`` if it does not exist."""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _get_directories_signature(directories):
+    """Return a dictionary with the modification time of each directory."""
+    return {dir_path: _get_mtime(dir_path) for dir_path in directories}
+
+
+def _scan_station_files(station_dir):
+    """Recursively scan a station directory.
+
+    Returns the list of ``(filepath, size, mtime)`` and the list of scanned directories.
+    """
+    list_files_info = []
+    directories = []
+    stack = [station_dir]
+    while stack:
+        dir_path = stack.pop()
+        directories.append(dir_path)
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    list_files_info.append((entry.path, stat.st_size, stat.st_mtime))
+    return list_files_info, sorted(directories)
+
+
+def _parse_file_time_coverage(filepath):
+    """Return the start and end time (as string) parsed from a DISDRODB product filename."""
+    try:
+        info_dict = _parse_filename(os.path.basename(filepath))
+    except ValueError:
+        return None, None
+    return info_dict["start_time"].strftime(CATALOG_TIME_FORMAT), info_dict["end_time"].strftime(CATALOG_TIME_FORMAT)
+
+
+def _read_metadata_fields(metadata_filepath):
+    """Read the station metadata and return the fields stored in the catalog."""
+    if metadata_filepath is None or not os.path.isfile(metadata_filepath):
+        return {"sensor_name": None, "latitude": None, "longitude": None, "altitude": None, "metadata": None}
+    metadata_dict = read_yaml(metadata_filepath) or {}
+
+    def _to_float(value):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        return value
+
+    return {
+        "sensor_name": metadata_dict.get("sensor_name", None),
+        "latitude": _to_float(metadata_dict.get("latitude", None)),
+        "longitude": _to_float(metadata_dict.get("longitude", None)),
+        "altitude": _to_float(metadata_dict.get("altitude", None)),
+        "metadata": json.dumps(metadata_dict, default=str),
+    }
+
+
+def _get_product_stations(base_dir, product):
+    """Return a dictionary ``{(data_source, campaign_name, station_name): (station_dir, metadata_filepath)}``.
+
+    A station is listed if it has either a data directory or a metadata file.
+    """
+    product_dir = get_disdrodb_path(base_dir=base_dir, product=product, check_exists=False)
+    dict_stations = {}
+    for data_source in _list_subdirectories(product_dir):
+        data_source_dir = os.path.join(product_dir, data_source)
+        for campaign_name in _list_subdirectories(data_source_dir):
+            campaign_dir = os.path.join(data_source_dir, campaign_name)
+            stations_dir = os.path.join(campaign_dir, "data" if product == "RAW" else product)
+            metadata_dir = os.path.join(campaign_dir, "metadata")
+            stations_names = set(_list_subdirectories(stations_dir))
+            if os.path.isdir(metadata_dir):
+                with os.scandir(metadata_dir) as it:
+                    stations_names.update(
+                        os.path.splitext(entry.name)[0]
+                        for entry in it
+                        if entry.is_file() and entry.name.endswith(".yml")
+                    )
+            for station_name in stations_names:
+                station_dir = os.path.join(stations_dir, station_name)
+                metadata_filepath = os.path.join(metadata_dir, f"{station_name}.yml")
+                dict_stations[(data_source, campaign_name, station_name)] = (station_dir, metadata_filepath)
+    return dict_stations
+
+
+def _update_catalog_station(conn, product, key, station_dir, metadata_filepath, force):
+    """Update the catalog entries of a station. Return ``True`` if the station has been rescanned."""
+    data_source, campaign_name, station_name = key
+    row = conn.execute(
+        "SELECT metadata_mtime, directories FROM stations "
+        "WHERE product=? AND data_source=? AND campaign_name=? AND station_name=?",
+        (product, *key),
+    ).fetchone()
+
+    # Check if the metadata and the station directories changed since last scan
+    metadata_mtime = _get_mtime(metadata_filepath)
+    if row is not None and not force:
+        previous_metadata_mtime, previous_directories = row
+        previous_directories = json.loads(previous_directories)
+        current_directories = _get_directories_signature(previous_directories.keys())
+        if previous_metadata_mtime == metadata_mtime and current_directories == previous_directories:
+            return False
+
+    # Rescan station files
+    if os.path.isdir(station_dir):
+        list_files_info, directories = _scan_station_files(station_dir)
+    else:
+        list_files_info, directories = [], [station_dir]
+    directories_signature = _get_directories_signature(directories)
+    metadata_fields = _read_metadata_fields(metadata_filepath)
+
+    # Replace station entries
+    conn.execute(
+        "DELETE FROM files WHERE product=? AND data_source=? AND campaign_name=? AND station_name=?",
+        (product, *key),
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (filepath, product, data_source, campaign_name, station_name, size, mtime)
+            + _parse_file_time_coverage(filepath)
+            for filepath, size, mtime in list_files_info
+        ],
+    )
+    conn.execute(
+        "INSERT OR REPLACE INTO stations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            product,
+            data_source,
+            campaign_name,
+            station_name,
+            metadata_fields["sensor_name"],
+            metadata_fields["latitude"],
+            metadata_fields["longitude"],
+            metadata_fields["altitude"],
+            metadata_fields["metadata"],
+            metadata_mtime,
+            station_dir,
+            json.dumps(directories_signature),
+            len(list_files_info),
+        ),
+    )
+    return True
+
+
+def update_catalog(base_dir=None, products=None, catalog_filepath=None, force=False, verbose=False):
+    """Create or incrementally update the DISDRODB catalog.
+
+    Parameters
+    ----------
+    base_dir : str, optional
+        The base directory of DISDRODB, expected in the format ``<...>/DISDRODB``.
+        If not specified, the path specified in the DISDRODB active configuration will be used.
+    products : list, optional
+        The DISDRODB products to catalog. The default is ``["RAW", "L0A", "L0B"]``.
+    catalog_filepath : str, optional
+        Path of the catalog file. The default is ``<base_dir>/.disdrodb_catalog.sqlite``.
+    force : bool, optional
+        If ``True``, rescan all stations regardless of their modification time.
+        The default is ``False``.
+    verbose : bool, optional
+        Whether to print the number of rescanned stations. The default is ``False``.
+
+    Returns
+    -------
+    catalog_filepath : str
+        Path of the catalog file.
+    """
+    base_dir = get_base_dir(base_dir)
+    catalog_filepath = _get_catalog_filepath(base_dir, catalog_filepath)
+    if products is None:
+        products = CATALOG_PRODUCTS
+    if isinstance(products, str):
+        products = [products]
+    products = [check_product(product).upper() for product in products]
+
+    with closing(_connect_catalog(catalog_filepath)) as conn:
+        for product in products:
+            dict_stations = _get_product_stations(base_dir=base_dir, product=product)
+            # Remove stations which are not anymore in the archive
+            cataloged_stations = conn.execute(
+                "SELECT data_source, campaign_name, station_name FROM stations WHERE product=?",
+                (product,),
+            ).fetchall()
+            with conn:
+                for key in set(cataloged_stations).difference(dict_stations):
+                    for table in ["stations", "files"]:
+                        conn.execute(
+                            f"DELETE FROM {table} "
+                            "WHERE product=? AND data_source=? AND campaign_name=? AND station_name=?",
+                            (product, *key),
+                        )
+            # Update stations
+            n_updated = 0
+            for key, (station_dir, metadata_filepath) in dict_stations.items():
+                with conn:
+                    n_updated += _update_catalog_station(
+                        conn,
+                        product=product,
+                        key=key,
+                        station_dir=station_dir,
+                        metadata_filepath=metadata_filepath,
+                        force=force,
+                    )
+            if verbose:
+                print(f"{product} catalog: {n_updated}/{len(dict_stations)} stations updated.")
+    return catalog_filepath
+
+
+####---------------------------------------------------------------------------.
+#### Catalog queries
+
+
+def _format_list(values):
+    if values is None:
+        return None
+    if isinstance(values, str):
+        values = [values]
+    return list(values)
+
+
+def _format_time(time):
+    if time is None:
+        return None
+    return pd.Timestamp(time).strftime(CATALOG_TIME_FORMAT)
+
+
+def _define_where_clause(
+    product=None,
+    data_sources=None,
+    campaign_names=None,
+    station_names=None,
+    sensor_names=None,
+    start_time=None,
+    end_time=None,
+    bbox=None,
+    table="s",
+):
+    """Define the SQL WHERE clause (and its parameters) of a catalog query."""
+    conditions = []
+    params = []
+    if product is not None:
+        conditions.append(f"{table}.product = ?")
+        params.append(check_product(product).upper())
+    for column, values in [
+        ("data_source", _format_list(data_sources)),
+        ("campaign_name", _format_list(campaign_names)),
+        ("station_name", _format_list(station_names)),
+    ]:
+        if values is not None:
+            conditions.append(f"{table}.{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+    sensor_names = _format_list(sensor_names)
+    if sensor_names is not None:
+        conditions.append(f"s.sensor_name IN ({', '.join('?' * len(sensor_names))})")
+        params.extend(sensor_names)
+    if bbox is not None:
+        lon_min, lon_max, lat_min, lat_max = bbox
+        conditions.append("s.longitude BETWEEN ? AND ? AND s.latitude BETWEEN ? AND ?")
+        params.extend([lon_min, lon_max, lat_min, lat_max])
+    # Time filtering (based on the time coverage of the product files)
+    start_time = _format_time(start_time)
+    end_time = _format_time(end_time)
+    if start_time is not None or end_time is not None:
+        time_conditions = ["f.start_time IS NOT NULL"]
+        if start_time is not None:
+            time_conditions.append("f.end_time >= ?")
+            params.append(start_time)
+        if end_time is not None:
+            time_conditions.append("f.start_time <= ?")
+            params.append(end_time)
+        if table == "f":
+            conditions.extend(time_conditions)
+        else:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM files f WHERE f.product = s.product AND f.data_source = s.data_source "
+                "AND f.campaign_name = s.campaign_name AND f.station_name = s.station_name AND "
+                + " AND ".join(time_conditions)
+                + ")",
+            )
+    where = "WHERE " + " AND ".join(conditions) if conditions else ""
+    return where, params
+
+
+def query_catalog_stations(
+    product=None,
+    data_sources=None,
+    campaign_names=None,
+    station_names=None,
+    sensor_names=None,
+    start_time=None,
+    end_time=None,
+    bbox=None,
+    available=True,
+    with_metadata=False,
+    base_dir=None,
+    catalog_filepath=None,
+):
+    """Query the stations recorded in the DISDRODB catalog.
+
+    Parameters
+    ----------
+    product : str, optional
+        The DISDRODB product. It can be ``"RAW"``, ``"L0A"``, or ``"L0B"``.
+        If ``None`` (the default), all products are returned.
+    data_sources, campaign_names, station_names, sensor_names : str or list, optional
+        Values used to subset the stations.
+    start_time, end_time : str or datetime, optional
+        If specified, return only the stations with product files overlapping the time period.
+        Raw files are not considered, because their time coverage is not encoded in the filename.
+    bbox : tuple, optional
+        Bounding box ``(lon_min, lon_max, lat_min, lat_max)`` of the stations to return.
+    available : bool, optional
+        If ``True`` (the default), return only the stations with both data and metadata.
+    with_metadata : bool, optional
+        If ``True``, return only the stations with metadata (regardless of their data).
+        The default is ``False``.
+    base_dir : str, optional
+        The base directory of DISDRODB, expected in the format ``<...>/DISDRODB``.
+        If not specified, the path specified in the DISDRODB active configuration will be used.
+    catalog_filepath : str, optional
+        Path of the catalog file. The default is ``<base_dir>/.disdrodb_catalog.sqlite``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dataframe with one row per station.
+    """
+    catalog_filepath = _get_catalog_filepath(base_dir, catalog_filepath)
+    where, params = _define_where_clause(
+        product=product,
+        data_sources=data_sources,
+        campaign_names=campaign_names,
+        station_names=station_names,
+        sensor_names=sensor_names,
+        start_time=start_time,
+        end_time=end_time,
+        bbox=bbox,
+        table="s",
+    )
+    if available:
+        where = (where + " AND " if where else "WHERE ") + "s.n_files > 0 AND s.metadata IS NOT NULL"
+    elif with_metadata:
+        where = (where + " AND " if where else "WHERE ") + "s.metadata IS NOT NULL"
+    query = (
+        "SELECT s.product, s.data_source, s.campaign_name, s.station_name, s.sensor_name, "
+        "s.latitude, s.longitude, s.altitude, s.n_files, s.station_dir "
+        f"FROM stations s {where} ORDER BY s.product, s.data_source, s.campaign_name, s.station_name"
+    )
+    with closing(_connect_catalog(catalog_filepath)) as conn:
+        df = pd.read_sql_query(query, conn, params=params)
+    return df
+
+
+def query_catalog_files(
+    product=None,
+    data_sources=None,
+    campaign_names=None,
+    station_names=None,
+    sensor_names=None,
+    start_time=None,
+    end_time=None,
+    bbox=None,
+    base_dir=None,
+    catalog_filepath=None,
+):
+    """Query the product files recorded in the DISDRODB catalog.
+
+    The arguments are the same as for :py:func:`query_catalog_stations`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dataframe with one row per file, sorted by station and file start time.
+    """
+    catalog_filepath = _get_catalog_filepath(base_dir, catalog_filepath)
+    where, params = _define_where_clause(
+        product=product,
+        data_sources=data_sources,
+        campaign_names=campaign_names,
+        station_names=station_names,
+        sensor_names=sensor_names,
+        start_time=start_time,
+        end_time=end_time,
+        bbox=bbox,
+        table="f",
+    )
+    query = (
+        "SELECT f.product, f.data_source, f.campaign_name, f.station_name, f.filepath, f.size, f.mtime, "
+        "f.start_time, f.end_time FROM files f LEFT JOIN stations s ON f.product = s.product "
+        "AND f.data_source = s.data_source AND f.campaign_name = s.campaign_name "
+        f"AND f.station_name = s.station_name {where} "
+        "ORDER BY f.product, f.data_source, f.campaign_name, f.station_name, f.start_time, f.filepath"
+    )
+    with closing(_connect_catalog(catalog_filepath)) as conn:
+        df = pd.read_sql_query(query, conn, params=params)
+    df["start_time"] = pd.to_datetime(df["start_time"], format=CATALOG_TIME_FORMAT)
+    df["end_time"] = pd.to_datetime(df["end_time"], format=CATALOG_TIME_FORMAT)
+    return df
@@ -19,13 +19,17 @@
 """Routines tot extract information from the DISDRODB infrastructure."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
 from disdrodb.api.checks import check_product
 from disdrodb.api.path import get_disdrodb_path
 from disdrodb.configs import get_base_dir
-from disdrodb.utils.directories import count_files, list_directories, list_files
+from disdrodb.utils.directories import has_files, list_directories, list_files
+
+# Maximum number of threads used to scan the campaign directories
+MAX_SCAN_WORKERS = 16
 
 
 def _get_list_stations_dirs(product, campaign_dir):
@@ -50,10 +54,9 @@ def _get_list_stations_with_data(product, campaign_dir):
     """Get the list of stations with data inside."""
     # Get stations directory
     list_stations_dir = _get_list_stations_dirs(product=product, campaign_dir=campaign_dir)
-    # Count number of files within directory
-    list_nfiles_per_station = [count_files(station_dir, "*", recursive=True) for station_dir in list_stations_dir]
     # Keep only stations with at least one file
-    stations_names = [os.path.basename(path) for n, path in zip(list_nfiles_per_station, list_stations_dir) if n >= 1]
+    # - The directory scan stops at the first file found
+    stations_names = [os.path.basename(station_dir) for station_dir in list_stations_dir if has_files(station_dir)]
     return stations_names
 
 
@@ -89,15 +92,22 @@ def _get_campaign_stations(base_dir, product, data_source, campaign_name):
 def _get_campaigns_stations(base_dir, product, data_source, campaign_names):
     if isinstance(campaign_names, str):
         campaign_names = [campaign_names]
-    list_available_stations = []
-    for campaign_name in campaign_names:
-        # Get list of available stations
-        stations_names = _get_campaign_stations(
+
+    # Scan the campaign directories concurrently (I/O bound)
+    def _scan_campaign(campaign_name):
+        return _get_campaign_stations(
             base_dir=base_dir,
             product=product,
             data_source=data_source,
             campaign_name=campaign_name,
         )
+
+    n_workers = max(1, min(MAX_SCAN_WORKERS, len(campaign_names)))
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        list_campaigns_stations = list(executor.map(_scan_campaign, campaign_names))
+
+    list_available_stations = []
+    for campaign_name, stations_names in zip(campaign_names, list_campaigns_stations):
         for station_name in stations_names:
             list_available_stations.append((data_source, campaign_name, station_name))
 
@@ -129,3 +129,18 @@ def get_zenodo_token(sandbox: bool):
         raise ValueError(f"Missing {token_name} in the DISDRODB config file !")
 
     return token
+
+
+def get_zenodo_url(sandbox: bool):
+    """Return the Zenodo URL.
+
+    The ``zenodo_url`` and ``zenodo_sandbox_url`` configuration keys allow to upload
+    data to another Zenodo (i.e. InvenioRDM) instance or to a local test server.
+    """
+    import disdrodb
+
+    if sandbox:
+        zenodo_url = disdrodb.config.get("zenodo_sandbox_url", "https://sandbox.zenodo.org")
+    else:
+        zenodo_url = disdrodb.config.get("zenodo_url", "https://zenodo.org")
+    return zenodo_url.rstrip("/")
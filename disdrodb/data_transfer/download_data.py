@@ -18,19 +18,26 @@
 # -----------------------------------------------------------------------------.
 """Routines to download data from the DISDRODB Decentralized Data Archive."""
 
+import base64
+import hashlib
+import json
 import os
+import re
 import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Union
 
 import click
-import pooch
+import requests
 import tqdm
 
 from disdrodb.api.path import define_metadata_filepath
 from disdrodb.configs import get_base_dir
 from disdrodb.metadata import get_list_metadata
-from disdrodb.utils.compression import unzip_file
-from disdrodb.utils.directories import is_empty_directory
+from disdrodb.utils.compression import ZipStreamExtractor, unzip_file
+from disdrodb.utils.directories import _remove_file_or_directories
+from disdrodb.utils.manifest import define_manifest_filepath, read_manifest
 from disdrodb.utils.yaml import read_yaml
 
 
@@ -72,6 +79,13 @@ def click_download_archive_options(function: object):
 
     """,
     )(function)
+    function = click.option(
+        "--max_workers",
+        type=int,
+        show_default=True,
+        default=4,
+        help="Maximum number of stations downloaded concurrently.",
+    )(function)
     return function
 
 
@@ -102,10 +116,14 @@ def download_archive(
     station_names: Optional[Union[str, list[str]]] = None,
     force: bool = False,
     base_dir: Optional[str] = None,
+    max_workers: int = 4,
 ):
     """Get all YAML files that contain the ``disdrodb_data_url`` key
     and download the data locally.
 
+    Stations are downloaded concurrently by a pool of ``max_workers`` threads.
+    Interrupted downloads are resumed at the next call.
+
     Parameters
     ----------
     data_sources : str or list of str, optional
@@ -126,7 +144,11 @@ def download_archive(
     base_dir : str (optional)
         Base directory of DISDRODB. Format: ``<...>/DISDRODB``.
         If ``None`` (the default), the disdrodb config variable ``base_dir`` is used.
+    max_workers : int, optional
+        Maximum number of stations downloaded concurrently. The default is 4.
     """
+    if max_workers < 1:
+        raise ValueError("'max_workers' must be a positive integer.")
     # Retrieve the requested metadata
     base_dir = get_base_dir(base_dir)
     metadata_filepaths = get_list_metadata(
@@ -145,34 +167,57 @@ def download_archive(
 
     # Try to download the data
     # - It will download data only if the disdrodb_data_url is specified !
-    for metadata_filepath in metadata_filepaths:
-        metadata = read_yaml(metadata_filepath)
-        data_source = metadata["data_source"]
-        campaign_name = metadata["campaign_name"]
-        station_name = metadata["station_name"]
-        try:
-            download_station(
-                data_source=data_source,
-                campaign_name=campaign_name,
-                station_name=station_name,
-                base_dir=base_dir,
-                force=force,
+    # - Progress bars are displayed only if stations are downloaded one after another
+    if max_workers == 1 or len(metadata_filepaths) == 1:
+        list_errors = [
+            _download_archive_station(fpath, base_dir=base_dir, force=force, progressbar=True)
+            for fpath in metadata_filepaths
+        ]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list_errors = list(
+                executor.map(
+                    lambda fpath: _download_archive_station(fpath, base_dir=base_dir, force=force, progressbar=False),
+                    metadata_filepaths,
+                ),
             )
-        except Exception as e:
-            print(f" - Download error: {e}")
+    # Report download errors
+    for error in list_errors:
+        if error is not None:
+            print(f" - Download error: {error}")
             print(" ")
 
 
+def _download_archive_station(metadata_filepath, base_dir, force, progressbar):
+    """Download the data of a station. Return the error message if the download fails."""
+    metadata = read_yaml(metadata_filepath)
+    try:
+        download_station(
+            data_source=metadata["data_source"],
+            campaign_name=metadata["campaign_name"],
+            station_name=metadata["station_name"],
+            base_dir=base_dir,
+            force=force,
+            progressbar=progressbar,
+        )
+    except Exception as e:
+        return str(e)
+    return None
+
+
 def download_station(
     data_source: str,
     campaign_name: str,
     station_name: str,
     force: bool = False,
     base_dir: Optional[str] = None,
+    progressbar: bool = True,
 ) -> None:
     """
     Download data of a single DISDRODB station from the DISDRODB remote repository.
 
+    An interrupted download is resumed at the next call.
+
     Parameters
     ----------
     data_source : str
@@ -192,6 +237,8 @@ def download_station(
     base_dir : str (optional)
         Base directory of DISDRODB. Format: ``<...>/DISDRODB``.
         If ``None`` (the default), the disdrodb config variable ``base_dir`` is used.
+    progressbar : bool, optional
+        Whether to display the download progress bar. The default is ``True``.
     """
     print(f"Start download of {data_source} {campaign_name} {station_name} station data")
     # Define metadata_filepath
@@ -204,7 +251,7 @@ def download_station(
         check_exists=True,
     )
     # Download data
-    _download_station_data(metadata_filepath, force=force)
+    _download_station_data(metadata_filepath, force=force, progressbar=progressbar)
 
 
 def _is_valid_disdrodb_data_url(disdrodb_data_url):
@@ -234,7 +281,7 @@ def _extract_station_files(zip_filepath, station_dir):
         os.remove(zip_filepath)
 
 
-def _download_station_data(metadata_filepath: str, force: bool = False) -> None:
+def _download_station_data(metadata_filepath: str, force: bool = False, progressbar: bool = True) -> None:
     """Download and unzip the station data .
 
     Parameters
@@ -243,13 +290,65 @@ def _download_station_data(metadata_filepath: str, force: bool = False) -> None:
         Metadata file path.
     force : bool, optional
         If ``True``, delete existing files and redownload it. The default is ``False``.
+    progressbar : bool, optional
+        Whether to display the download progress bar. The default is ``True``.
 
     """
     disdrodb_data_url, station_dir = _get_station_url_and_dir_path(metadata_filepath)
-    # Download file
-    zip_filepath = _download_file_from_url(disdrodb_data_url, dst_dir=station_dir, force=force)
-    # Extract the stations files from the downloaded station.zip file
-    _extract_station_files(zip_filepath, station_dir=station_dir)
+    # Download the station zip file and extract the station files while downloading
+    try:
+        _download_and_extract_station_files(
+            disdrodb_data_url,
+            station_dir=station_dir,
+            force=force,
+            progressbar=progressbar,
+        )
+    # If the zip file can not be extracted while downloading, download the zip file and then extract it
+    except NotImplementedError:
+        zip_filepath = _download_file_from_url(
+            disdrodb_data_url,
+            dst_dir=station_dir,
+            force=force,
+            progressbar=progressbar,
+        )
+        _extract_station_files(zip_filepath, station_dir=station_dir)
+    # Apply the incremental station archives
+    _download_station_updates(metadata_filepath, disdrodb_data_url, station_dir=station_dir, progressbar=progressbar)
+
+
+def _download_station_updates(metadata_filepath, disdrodb_data_url, station_dir, progressbar=True):
+    """Download the incremental station archives listed in the station manifest.
+
+    The incremental archives are applied only if the first archive of the manifest is the ``disdrodb_data_url``.
+    """
+    manifest = read_manifest(define_manifest_filepath(metadata_filepath))
+    archives = manifest["archives"]
+    if len(archives) < 2 or archives[0]["url"] != disdrodb_data_url:
+        return
+    tmp_dir = os.path.join(station_dir, f".{os.path.basename(station_dir)}.download")
+    for archive_info in archives[1:]:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        try:
+            download_and_extract_zip(
+                archive_info["url"],
+                dest_path=tmp_dir,
+                known_hash=f"{manifest['hash_algorithm']}:{archive_info['hash']}",
+                progressbar=progressbar,
+            )
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        # Add the new and changed files
+        for filename in archive_info["files"]:
+            dst_filepath = os.path.join(station_dir, *filename.split("/"))
+            os.makedirs(os.path.dirname(dst_filepath), exist_ok=True)
+            os.replace(os.path.join(tmp_dir, *filename.split("/")), dst_filepath)
+        shutil.rmtree(tmp_dir)
+        # Remove the files removed since the previous archive
+        for filename in archive_info["removed"]:
+            filepath = os.path.join(station_dir, *filename.split("/"))
+            if os.path.isfile(filepath):
+                os.remove(filepath)
 
 
 def _get_valid_station_name(metadata_filepath, metadata_dict):
@@ -286,9 +385,364 @@ def _get_station_url_and_dir_path(metadata_filepath: str) -> tuple:
     return disdrodb_data_url, station_dir
 
 
-def _download_file_from_url(url: str, dst_dir: str, force: bool = False) -> str:
+####--------------------------------------------------------------------------.
+#### Download manager
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_MAX_RETRIES = 5
+DOWNLOAD_BACKOFF_FACTOR = 1.0
+DOWNLOAD_TIMEOUT = 60
+RETRY_STATUS_CODES = (416, 429, 500, 502, 503, 504)
+
+
+def _parse_known_hash(known_hash):
+    """Parse a ``<algorithm>:<hexdigest>`` checksum string into a ``(algorithm, hexdigest)`` tuple."""
+    if known_hash is None:
+        return None
+    algorithm, _, hexdigest = known_hash.rpartition(":")
+    algorithm = algorithm or "sha256"
+    if algorithm not in hashlib.algorithms_available:
+        raise ValueError(f"Invalid checksum algorithm '{algorithm}'.")
+    return algorithm, hexdigest.lower()
+
+
+def _get_server_hash(response):
+    """Return the ``(algorithm, hexdigest)`` checksum of the file advertised by the server.
+
+    The checksum is retrieved from the ``Content-MD5`` header (of a complete response)
+    or from an ``ETag`` header with the ``<algorithm>:<hexdigest>`` format.
+    Return ``None`` if the server does not advertise any checksum.
+    """
+    content_md5 = response.headers.get("Content-MD5")
+    if content_md5 and response.status_code == 200:
+        return "md5", base64.b64decode(content_md5).hex()
+    etag = response.headers.get("ETag", "")
+    match = re.fullmatch(r'(?:W/)?"?(md5|sha1|sha256):([0-9a-fA-F]+)"?', etag.strip())
+    if match:
+        return match.group(1), match.group(2).lower()
+    return None
+
+
+def _compute_file_hash(filepath, algorithm):
+    """Compute the checksum of a file."""
+    hasher = hashlib.new(algorithm)
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _is_retryable_error(error):
+    """Check if a download error is transient (i.e. the download can be retried)."""
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRY_STATUS_CODES
+    return isinstance(error, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError))
+
+
+def _download_part_file(url, part_filepath, timeout, progressbar):
+    """Download (or resume the download of) a file into ``part_filepath``.
+
+    If ``part_filepath`` already exists, only the missing bytes are requested with an HTTP range request.
+    If the server does not support range requests, the download restarts from scratch.
+
+    Returns
+    -------
+    tuple
+        The checksum advertised by the server (or ``None``).
+    """
+    offset = os.path.getsize(part_filepath) if os.path.exists(part_filepath) else 0
+    headers = {"Range": f"bytes={offset}-"} if offset > 0 else {}
+    with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        # If the range is not satisfiable, the partial file is either complete or corrupted
+        if response.status_code == 416:
+            total_size = response.headers.get("Content-Range", "").rpartition("/")[2]
+            if total_size.isdigit() and int(total_size) == offset:
+                return _get_server_hash(response)
+            os.remove(part_filepath)
+        response.raise_for_status()
+        # If the server does not support range requests, restart from scratch
+        if response.status_code != 206:
+            offset = 0
+        content_length = response.headers.get("Content-Length")
+        expected_size = offset + int(content_length) if content_length is not None else None
+        pbar = tqdm.tqdm(
+            total=expected_size,
+            initial=offset,
+            unit="B",
+            unit_scale=True,
+            desc=os.path.basename(url.split("?")[0]),
+            disable=not progressbar,
+        )
+        with open(part_filepath, "ab" if offset > 0 else "wb") as f, pbar:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                pbar.update(len(chunk))
+        if expected_size is not None and os.path.getsize(part_filepath) < expected_size:
+            raise requests.exceptions.ChunkedEncodingError(f"Incomplete download of {url}.")
+        return _get_server_hash(response)
+
+
+def download_file(
+    url: str,
+    filepath: str,
+    known_hash: Optional[str] = None,
+    max_retries: int = DOWNLOAD_MAX_RETRIES,
+    backoff_factor: float = DOWNLOAD_BACKOFF_FACTOR,
+    timeout: float = DOWNLOAD_TIMEOUT,
+    progressbar: bool = False,
+) -> str:
+    """Download a file with resume, retries and checksum verification.
+
+    The file is downloaded into ``<filepath>.part`` and renamed to ``filepath`` once complete and verified.
+    If the download is interrupted, it is resumed (with an HTTP range request) at the next attempt or call.
+    Transient errors (connection errors, timeouts, HTTP 429 and 5xx status codes) are retried
+    with an exponential backoff of ``backoff_factor * 2**(attempt - 1)`` seconds.
+
+    Parameters
+    ----------
+    url : str
+        URL of the file to download.
+    filepath : str
+        Local path of the downloaded file.
+    known_hash : str, optional
+        Expected checksum of the file, in the ``<algorithm>:<hexdigest>`` format (i.e. ``md5:<hexdigest>``).
+        If ``None`` (the default), the checksum advertised by the server (if any) is verified.
+    max_retries : int, optional
+        Maximum number of retries. The default is 5.
+    backoff_factor : float, optional
+        Backoff factor (in seconds) between retries. The default is 1.
+    timeout : float, optional
+        Timeout (in seconds) of the HTTP requests. The default is 60.
+    progressbar : bool, optional
+        Whether to display the download progress bar. The default is ``False``.
+
+    Returns
+    -------
+    str
+        Path of the downloaded file.
+    """
+    known_hash = _parse_known_hash(known_hash)
+    os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+    part_filepath = filepath + ".part"
+    for attempt in range(max_retries + 1):
+        if attempt > 0:
+            time.sleep(backoff_factor * 2 ** (attempt - 1))
+        # Download the file
+        try:
+            server_hash = _download_part_file(url, part_filepath, timeout=timeout, progressbar=progressbar)
+        except requests.RequestException as e:
+            if not _is_retryable_error(e) or attempt == max_retries:
+                raise
+            continue
+        # Verify the checksum
+        expected_hash = known_hash or server_hash
+        if expected_hash is not None:
+            algorithm, hexdigest = expected_hash
+            if _compute_file_hash(part_filepath, algorithm) != hexdigest:
+                os.remove(part_filepath)
+                if attempt == max_retries:
+                    raise ValueError(f"The checksum of the file downloaded from {url} is invalid.")
+                continue
+        os.replace(part_filepath, filepath)
+        return filepath
+
+
+def _read_extraction_state(state_filepath, url):
+    """Read the ``(offset, entries)`` extraction progress of an interrupted ``download_and_extract_zip`` call."""
+    if state_filepath is None or not os.path.exists(state_filepath):
+        return 0, []
+    try:
+        with open(state_filepath) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return 0, []
+    if state.get("url") != url:
+        return 0, []
+    return state["offset"], state["entries"]
+
+
+def _write_extraction_state(state_filepath, url, offset, entries):
+    """Write the extraction progress of ``download_and_extract_zip`` (atomically)."""
+    tmp_filepath = state_filepath + ".tmp"
+    with open(tmp_filepath, "w") as f:
+        json.dump({"url": url, "offset": offset, "entries": entries}, f)
+    os.replace(tmp_filepath, state_filepath)
+
+
+def download_and_extract_zip(
+    url: str,
+    dest_path: str,
+    known_hash: Optional[str] = None,
+    max_retries: int = DOWNLOAD_MAX_RETRIES,
+    backoff_factor: float = DOWNLOAD_BACKOFF_FACTOR,
+    timeout: float = DOWNLOAD_TIMEOUT,
+    max_entry_size: Optional[int] = None,
+    progressbar: bool = False,
+    state_filepath: Optional[str] = None,
+) -> list:
+    """Download a zip archive and extract its entries while the bytes are received.
+
+    The zip archive is never written to disk. The entries paths, sizes and CRC-32 are verified.
+    If the download is interrupted, it is resumed (with an HTTP range request) from the first
+    entry not yet extracted. Transient errors are retried as in ``download_file``.
+
+    If ``state_filepath`` is specified, the extraction progress is saved into this JSON file
+    after each extracted entry, and an interrupted download is resumed at the next call.
+    The file is removed once the archive has been entirely extracted.
+    The archive checksum is not verified when the download is resumed from a previous call,
+    but the entries sizes and CRC-32 are.
+
+    A ``NotImplementedError`` is raised if the archive contains entries which can not be
+    extracted while downloading (see ``disdrodb.utils.compression.ZipStreamExtractor``).
+
+    Parameters
+    ----------
+    url : str
+        URL of the zip archive to download.
+    dest_path : str
+        Path of the destination directory.
+    known_hash : str, optional
+        Expected checksum of the archive, in the ``<algorithm>:<hexdigest>`` format (i.e. ``md5:<hexdigest>``).
+        If ``None`` (the default), the checksum advertised by the server (if any) is verified.
+    max_retries : int, optional
+        Maximum number of retries. The default is 5.
+    backoff_factor : float, optional
+        Backoff factor (in seconds) between retries. The default is 1.
+    timeout : float, optional
+        Timeout (in seconds) of the HTTP requests. The default is 60.
+    max_entry_size : int, optional
+        Maximum uncompressed size (in bytes) of an entry. The default is ``None``.
+    progressbar : bool, optional
+        Whether to display the download progress bar (with the name of the entry being extracted).
+        The default is ``False``.
+    state_filepath : str, optional
+        Path of the JSON file where to save the extraction progress. The default is ``None``.
+
+    Returns
+    -------
+    list
+        Names of the extracted entries.
+    """
+    expected_hash = _parse_known_hash(known_hash)
+    os.makedirs(dest_path, exist_ok=True)
+    # Resume the extraction of a previous call
+    extractor = None
+    offset, entries = _read_extraction_state(state_filepath, url)
+    if offset > 0:
+        expected_hash = None
+        extractor = ZipStreamExtractor(dest_path, max_entry_size=max_entry_size, offset=offset, entries=entries)
+    for attempt in range(max_retries + 1):
+        if attempt > 0:
+            time.sleep(backoff_factor * 2 ** (attempt - 1))
+        # Download and extract the archive
+        try:
+            offset = extractor.offset if extractor is not None else 0
+            headers = {"Range": f"bytes={offset}-"} if offset > 0 else {}
+            with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+                response.raise_for_status()
+                if extractor is None:
+                    expected_hash = expected_hash or _get_server_hash(response)
+                    hash_algorithm = expected_hash[0] if expected_hash is not None else None
+                    extractor = ZipStreamExtractor(
+                        dest_path,
+                        max_entry_size=max_entry_size,
+                        hash_algorithm=hash_algorithm,
+                    )
+                # If the server does not support range requests, skip the bytes already processed
+                n_skip = offset if response.status_code != 206 else 0
+                content_length = response.headers.get("Content-Length")
+                with tqdm.tqdm(
+                    total=offset + int(content_length) - n_skip if content_length is not None else None,
+                    initial=offset,
+                    unit="B",
+                    unit_scale=True,
+                    desc=os.path.basename(url.split("?")[0]),
+                    disable=not progressbar,
+                ) as pbar:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        if n_skip > 0:
+                            n_skip, chunk = max(n_skip - len(chunk), 0), chunk[n_skip:]
+                        extractor.feed(chunk)
+                        pbar.update(len(chunk))
+                        pbar.set_postfix_str(extractor.current_entry or "", refresh=False)
+                        # Save the extraction progress
+                        if state_filepath is not None and extractor.offset != offset:
+                            offset = extractor.offset
+                            _write_extraction_state(state_filepath, url, offset=offset, entries=extractor.entries)
+            extractor.close()
+        except (requests.RequestException, EOFError) as e:
+            if (isinstance(e, requests.RequestException) and not _is_retryable_error(e)) or attempt == max_retries:
+                raise
+            if extractor is not None:
+                extractor.restart()
+            continue
+        # Verify the checksum
+        if state_filepath is not None and os.path.exists(state_filepath):
+            os.remove(state_filepath)
+        if expected_hash is not None and extractor.hexdigest() != expected_hash[1]:
+            shutil.rmtree(dest_path)
+            os.makedirs(dest_path)
+            extractor = None
+            if attempt == max_retries:
+                raise ValueError(f"The checksum of the file downloaded from {url} is invalid.")
+            continue
+        return extractor.entries
+
+
+def _list_existing_station_paths(station_dir, force, ignored_names=()):
+    """List the existing station files. An error is raised if there are existing files and ``force=False``."""
+    os.makedirs(station_dir, exist_ok=True)
+    existing_paths = [os.path.join(station_dir, name) for name in os.listdir(station_dir) if name not in ignored_names]
+    if len(existing_paths) > 0 and not force:
+        raise ValueError(
+            f"There are already raw files within {station_dir}. Download is suspended. "
+            "Use force=True to force the download and overwrite existing raw files."
+        )
+    return existing_paths
+
+
+def _download_and_extract_station_files(url: str, station_dir: str, force: bool = False, progressbar: bool = True):
+    """Download the station zip file and extract the station files while downloading.
+
+    The files are extracted into a temporary directory inside the station directory.
+    If the download is interrupted, the extracted files and the extraction progress are kept,
+    and the download is resumed at the next call.
+    The existing station files are replaced (if ``force=True``) only once the extraction succeeded.
+    """
+    station_name = os.path.basename(station_dir)
+    tmp_dirname = f".{station_name}.download"
+    state_filename = f"{tmp_dirname}.json"
+    existing_paths = _list_existing_station_paths(
+        station_dir,
+        force=force,
+        ignored_names=[tmp_dirname, state_filename, f"{station_name}.zip.part"],
+    )
+    # Download and extract the station files into the temporary directory
+    tmp_dir = os.path.join(station_dir, tmp_dirname)
+    state_filepath = os.path.join(station_dir, state_filename)
+    if not os.path.exists(state_filepath):
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    try:
+        download_and_extract_zip(url, dest_path=tmp_dir, progressbar=progressbar, state_filepath=state_filepath)
+    # If the zip file can not be extracted while downloading, discard the extracted files
+    except NotImplementedError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if os.path.exists(state_filepath):
+            os.remove(state_filepath)
+        raise
+    # Replace the existing station files
+    for path in existing_paths:
+        _remove_file_or_directories(path)
+    for name in os.listdir(tmp_dir):
+        os.replace(os.path.join(tmp_dir, name), os.path.join(station_dir, name))
+    os.rmdir(tmp_dir)
+
+
+def _download_file_from_url(url: str, dst_dir: str, force: bool = False, progressbar: bool = True) -> str:
     """Download station zip file into the DISDRODB station data directory.
 
+    The existing station files are removed (if ``force=True``) only once the download succeeded.
+
     Parameters
     ----------
     url : str
@@ -297,29 +751,24 @@ def _download_file_from_url(url: str, dst_dir: str, force: bool = False) -> str:
         Local directory where to download the file (DISDRODB station data directory).
     force : bool, optional
         Overwrite the raw data file if already existing. The default is ``False``.
+    progressbar : bool, optional
+        Whether to display the download progress bar. The default is ``True``.
 
     Returns
     -------
     dst_filepath
         Path of the downloaded file.
-    to_unzip
-        Flag that specify if the download station zip file must be unzipped.
     """
     dst_filename = os.path.basename(dst_dir) + ".zip"
     dst_filepath = os.path.join(dst_dir, dst_filename)
-    os.makedirs(dst_dir, exist_ok=True)
-    if not is_empty_directory(dst_dir):
-        if force:
-            shutil.rmtree(dst_dir)
-            os.makedirs(dst_dir)  # station directory
-        else:
-            raise ValueError(
-                f"There are already raw files within {dst_dir}. Download is suspended. "
-                "Use force=True to force the download and overwrite existing raw files."
-            )
+    # Check for existing files (excluding a partial download to resume)
+    existing_paths = _list_existing_station_paths(dst_dir, force=force, ignored_names=[dst_filename + ".part"])
 
-    os.makedirs(dst_dir, exist_ok=True)
+    # Download the file
+    download_file(url=url, filepath=dst_filepath, progressbar=progressbar)
 
-    downloader = pooch.HTTPDownloader(progressbar=True)
-    pooch.retrieve(url=url, known_hash=None, path=dst_dir, fname=dst_filename, downloader=downloader, progressbar=tqdm)
+    # Remove the existing station files
+    for path in existing_paths:
+        if path != dst_filepath:
+            _remove_file_or_directories(path)
     return dst_filepath
@@ -34,6 +34,7 @@ def disdrodb_download_archive(
     data_sources: str = None,
     campaign_names: str = None,
     station_names: str = None,
+    max_workers: int = 4,
     base_dir: str = None,
     force: bool = False,
 ):
@@ -50,4 +51,5 @@ def disdrodb_download_archive(
         campaign_names=campaign_names,
         station_names=station_names,
         force=force,
+        max_workers=max_workers,
     )
@@ -39,6 +39,8 @@ def disdrodb_upload_archive(
     station_names: str = None,
     platform: str = None,
     force: bool = False,
+    incremental: bool = False,
+    max_workers: int = 4,
 ):
     from disdrodb.data_transfer.upload_data import upload_archive
 
@@ -54,4 +56,6 @@ def disdrodb_upload_archive(
         station_names=station_names,
         platform=platform,
         force=force,
+        incremental=incremental,
+        max_workers=max_workers,
     )
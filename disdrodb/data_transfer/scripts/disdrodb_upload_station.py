@@ -39,6 +39,7 @@ def disdrodb_upload_station(
     platform: str = None,
     base_dir: str = None,
     force: bool = False,
+    incremental: bool = False,
 ):
     from disdrodb.data_transfer.upload_data import upload_station
 
@@ -50,4 +51,5 @@ def disdrodb_upload_station(
         station_name=station_name,
         platform=platform,
         force=force,
+        incremental=incremental,
     )
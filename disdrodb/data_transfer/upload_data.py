@@ -18,6 +18,7 @@
 # -----------------------------------------------------------------------------.
 """Routines to upload data to the DISDRODB Decentralized Data Archive."""
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import click
@@ -25,6 +26,7 @@ import click
 from disdrodb.api.path import define_metadata_filepath
 from disdrodb.data_transfer.zenodo import upload_station_to_zenodo
 from disdrodb.metadata import get_list_metadata
+from disdrodb.utils.manifest import define_manifest_filepath, read_manifest
 from disdrodb.utils.yaml import read_yaml
 
 
@@ -44,6 +46,13 @@ def click_upload_options(function: object):
         default=False,
         help="Force uploading even if data already exists on another remote location.",
     )(function)
+    function = click.option(
+        "--incremental",
+        type=bool,
+        show_default=True,
+        default=False,
+        help="Upload only the files added or changed since the last upload.",
+    )(function)
     return function
 
 
@@ -84,23 +93,40 @@ def click_upload_archive_options(function: object):
     Multiple station names  can be specified by separating them with spaces.
     """,
     )(function)
+    function = click.option(
+        "--max_workers",
+        type=int,
+        show_default=True,
+        default=4,
+        help="Maximum number of stations uploaded concurrently.",
+    )(function)
     return function
 
 
-def _check_if_upload(metadata_filepath: str, force: bool):
-    """Check if data must be uploaded."""
+def _has_uploaded_archives(metadata_filepath: str) -> bool:
+    """Check if the station manifest records previously uploaded archives."""
+    return len(read_manifest(define_manifest_filepath(metadata_filepath))["archives"]) > 0
+
+
+def _check_if_upload(metadata_filepath: str, force: bool, incremental: bool = False):
+    """Check if data must be uploaded.
+
+    Incremental uploads of stations with a manifest are always allowed.
+    """
+    if incremental and _has_uploaded_archives(metadata_filepath):
+        return
     if not force:
         disdrodb_data_url = read_yaml(metadata_filepath).get("disdrodb_data_url", "")
         if isinstance(disdrodb_data_url, str) and len(disdrodb_data_url) > 1:
             raise ValueError(f"'force' is False and {metadata_filepath} has already a 'disdrodb_data_url' specified.")
 
 
-def _filter_already_uploaded(metadata_filepaths: list[str], force: bool) -> list[str]:
+def _filter_already_uploaded(metadata_filepaths: list[str], force: bool, incremental: bool = False) -> list[str]:
     """Filter metadata files that already have a remote url specified."""
     filtered = []
     for metadata_filepath in metadata_filepaths:
         try:
-            _check_if_upload(metadata_filepath, force=force)
+            _check_if_upload(metadata_filepath, force=force, incremental=incremental)
             filtered.append(metadata_filepath)
         except Exception:
             msg = (
@@ -125,6 +151,7 @@ def upload_station(
     platform: Optional[str] = "sandbox.zenodo",
     force: bool = False,
     base_dir: Optional[str] = None,
+    incremental: bool = False,
 ) -> None:
     """
     Upload data from a single DISDRODB station on a remote repository.
@@ -151,6 +178,10 @@ def upload_station(
     force: bool, optional
         If ``True``, upload the data and overwrite the ``disdrodb_data_url``.
         The default is ``force=False``.
+    incremental: bool, optional
+        If ``True`` and the station has already been uploaded, upload only the files added or changed
+        since the last upload. The upload is recorded in the station manifest next to the metadata file.
+        The default is ``incremental=False``.
 
     """
     _check_valid_platform(platform)
@@ -165,25 +196,47 @@ def upload_station(
         check_exists=True,
     )
     # Check if data must be uploaded
-    _check_if_upload(metadata_filepath, force=force)
+    _check_if_upload(metadata_filepath, force=force, incremental=incremental)
 
     print(f"Start uploading of {data_source} {campaign_name} {station_name}")
     # Upload the data
     if platform == "zenodo":
-        upload_station_to_zenodo(metadata_filepath, sandbox=False)
+        upload_station_to_zenodo(metadata_filepath, sandbox=False, incremental=incremental)
 
     else:  # platform == "sandbox.zenodo":  # Only for testing purposes, not available through CLI
-        upload_station_to_zenodo(metadata_filepath, sandbox=True)
+        upload_station_to_zenodo(metadata_filepath, sandbox=True, incremental=incremental)
+
+
+def _upload_archive_station(metadata_filepath, base_dir, platform, force, incremental=False):
+    """Upload the data of a station. Return the error message if the upload fails."""
+    metadata = read_yaml(metadata_filepath)
+    try:
+        upload_station(
+            base_dir=base_dir,
+            data_source=metadata["data_source"],
+            campaign_name=metadata["campaign_name"],
+            station_name=metadata["station_name"],
+            platform=platform,
+            force=force,
+            incremental=incremental,
+        )
+    except Exception as e:
+        return str(e)
+    return None
 
 
 def upload_archive(
     platform: Optional[str] = None,
     force: bool = False,
     base_dir: Optional[str] = None,
+    max_workers: int = 4,
+    incremental: bool = False,
     **kwargs,
 ) -> None:
     """Find all stations containing local data and upload them to a remote repository.
 
+    Stations are zipped on the fly and uploaded concurrently by a pool of ``max_workers`` threads.
+
     Parameters
     ----------
     platform: str, optional
@@ -196,6 +249,11 @@ def upload_archive(
     base_dir : str (optional)
         Base directory of DISDRODB. Format: ``<...>/DISDRODB``.
         If ``None`` (the default), the ``base_dir`` path specified in the DISDRODB active configuration will be used.
+    max_workers : int, optional
+        Maximum number of stations uploaded concurrently. The default is 4.
+    incremental: bool, optional
+        If ``True``, upload only the files added or changed since the last upload of each station.
+        The default is ``incremental=False``.
 
     Other Parameters
     ----------------
@@ -214,6 +272,8 @@ def upload_archive(
         The default is ``station_name=None``.
     """
     _check_valid_platform(platform)
+    if max_workers < 1:
+        raise ValueError("'max_workers' must be a positive integer.")
 
     # Get list metadata
     metadata_filepaths = get_list_metadata(
@@ -223,7 +283,7 @@ def upload_archive(
     )
     # If force=False, keep only metadata without disdrodb_data_url
     if not force:
-        metadata_filepaths = _filter_already_uploaded(metadata_filepaths, force=force)
+        metadata_filepaths = _filter_already_uploaded(metadata_filepaths, force=force, incremental=incremental)
 
     # Check there are some stations to upload
     if len(metadata_filepaths) == 0:
@@ -231,21 +291,34 @@ def upload_archive(
         return
 
     # Upload station data
-    for metadata_filepath in metadata_filepaths:
-        metadata = read_yaml(metadata_filepath)
-        data_source = metadata["data_source"]
-        campaign_name = metadata["campaign_name"]
-        station_name = metadata["station_name"]
-        try:
-            upload_station(
+    if max_workers == 1 or len(metadata_filepaths) == 1:
+        list_errors = [
+            _upload_archive_station(
+                fpath,
                 base_dir=base_dir,
-                data_source=data_source,
-                campaign_name=campaign_name,
-                station_name=station_name,
                 platform=platform,
                 force=force,
+                incremental=incremental,
+            )
+            for fpath in metadata_filepaths
+        ]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list_errors = list(
+                executor.map(
+                    lambda fpath: _upload_archive_station(
+                        fpath,
+                        base_dir=base_dir,
+                        platform=platform,
+                        force=force,
+                        incremental=incremental,
+                    ),
+                    metadata_filepaths,
+                ),
             )
-        except Exception as e:
-            print(f"{e}")
+    # Report upload errors
+    for error in list_errors:
+        if error is not None:
+            print(f"{error}")
 
     print("All data have been uploaded. Please review your data depositions and publish it when ready.")
@@ -18,15 +18,25 @@
 # -----------------------------------------------------------------------------.
 """DISDRODB Zenodo utility."""
 
+import functools
+import hashlib
 import json
 import os
+import time
 
 import requests
 
-from disdrodb.configs import get_zenodo_token
+from disdrodb.configs import get_zenodo_token, get_zenodo_url
+from disdrodb.data_transfer.download_data import RETRY_STATUS_CODES, _is_retryable_error
 from disdrodb.utils.compression import archive_station_data
+from disdrodb.utils.manifest import define_station_archive, iter_station_archive, update_station_manifest
 from disdrodb.utils.yaml import read_yaml, write_yaml
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_MAX_RETRIES = 5
+UPLOAD_BACKOFF_FACTOR = 1.0
+UPLOAD_TIMEOUT = 60
+
 
 def _check_http_response(
     response: requests.Response,
@@ -71,8 +81,8 @@ def _create_zenodo_deposition(sandbox) -> tuple[int, str]:
     access_token = get_zenodo_token(sandbox=sandbox)
 
     # Define Zenodo deposition url
-    host = "sandbox.zenodo.org" if sandbox else "zenodo.org"
-    deposit_url = f"https://{host}/api/deposit/depositions"
+    zenodo_url = get_zenodo_url(sandbox=sandbox)
+    deposit_url = f"{zenodo_url}/api/deposit/depositions"
 
     # Create a new deposition
     # url = f"{deposit_url}?access_token={access_token}"
@@ -90,11 +100,57 @@ def _create_zenodo_deposition(sandbox) -> tuple[int, str]:
 
 
 def _define_disdrodb_data_url(zenodo_host, deposit_id, filename):
-    return f"https://{zenodo_host}/records/{deposit_id}/files/{filename}?download=1"
+    if not zenodo_host.startswith(("http://", "https://")):
+        zenodo_host = f"https://{zenodo_host}"
+    return f"{zenodo_host}/records/{deposit_id}/files/{filename}?download=1"
 
 
-def _upload_file_to_zenodo(filepath: str, metadata_filepath: str, sandbox: bool) -> None:
-    """Upload a file to a Zenodo bucket."""
+def _iter_file(filepath: str, chunk_size: int = UPLOAD_CHUNK_SIZE):
+    """Yield the bytes of a file by chunks."""
+    with open(filepath, "rb") as f:
+        yield from iter(functools.partial(f.read, chunk_size), b"")
+
+
+class _SizedStream:
+    """Iterable of bytes with a known total size.
+
+    ``requests`` sends the ``Content-Length`` header (instead of ``Transfer-Encoding: chunked``)
+    for iterables defining ``__len__``. Zenodo requires the ``Content-Length`` header.
+    """
+
+    def __init__(self, chunks, size):
+        self._chunks = chunks
+        self._size = size
+
+    def __iter__(self):
+        return iter(self._chunks)
+
+    def __len__(self):
+        return self._size
+
+
+def _upload_stream(remote_url: str, stream_factory, size: int, params: dict, task_description: str) -> None:
+    """Upload the ``size`` bytes yielded by ``stream_factory()`` with a streamed PUT request.
+
+    If the upload fails with a transient error (i.e. connection error or 5XX status code),
+    a new stream is created and the upload is retried with an exponential backoff.
+    """
+    for attempt in range(UPLOAD_MAX_RETRIES + 1):
+        try:
+            data = _SizedStream(stream_factory(), size=size)
+            response = requests.put(remote_url, data=data, params=params, timeout=UPLOAD_TIMEOUT)
+            if response.status_code in RETRY_STATUS_CODES:
+                response.raise_for_status()
+            break
+        except requests.RequestException as e:
+            if attempt == UPLOAD_MAX_RETRIES or not _is_retryable_error(e):
+                raise
+            time.sleep(UPLOAD_BACKOFF_FACTOR * 2**attempt)
+    _check_http_response(response, 201, task_description)
+
+
+def _upload_to_zenodo(stream_factory, size: int, filename: str, metadata_filepath: str, sandbox: bool) -> str:
+    """Upload the ``size`` bytes yielded by ``stream_factory()`` as a file of a new Zenodo deposition."""
 
     # Read metadata
     metadata = read_yaml(metadata_filepath)
@@ -106,7 +162,6 @@ def _upload_file_to_zenodo(filepath: str, metadata_filepath: str, sandbox: bool)
 
     # Define remote filename and remote url
     # --> <data_source>-<campaign_name>-<station_name>.zip !
-    filename = os.path.basename(filepath)
     filename = f"{data_source}-{campaign_name}-{filename}"
     remote_url = f"{bucket_url}/{filename}"
 
@@ -116,10 +171,14 @@ def _upload_file_to_zenodo(filepath: str, metadata_filepath: str, sandbox: bool)
 
     ###----------------------------------------------------------.
     # Upload data
-    with open(filepath, "rb") as f:
-        response = requests.put(remote_url, data=f, params=params)
     host_name = "Zenodo Sandbox" if sandbox else "Zenodo"
-    _check_http_response(response, 201, f"Upload of {filepath} to {host_name}.")
+    _upload_stream(
+        remote_url,
+        stream_factory,
+        size=size,
+        params=params,
+        task_description=f"Upload of {filename} to {host_name}.",
+    )
 
     ###----------------------------------------------------------.
     # Add zenodo metadata
@@ -130,11 +189,11 @@ def _upload_file_to_zenodo(filepath: str, metadata_filepath: str, sandbox: bool)
 
     ###----------------------------------------------------------.
     # Define disdrodb data url
-    zenodo_host = "sandbox.zenodo.org" if sandbox else "zenodo.org"
-    disdrodb_data_url = _define_disdrodb_data_url(zenodo_host, deposit_id, filename)
+    zenodo_url = get_zenodo_url(sandbox=sandbox)
+    disdrodb_data_url = _define_disdrodb_data_url(zenodo_url, deposit_id, filename)
 
     # Define Zenodo url to review and publish the uploaded data
-    review_url = f"https://{zenodo_host}/uploads/{deposit_id}"
+    review_url = f"{zenodo_url}/uploads/{deposit_id}"
 
     ###----------------------------------------------------------.
     print(f" - Please review your data deposition at {review_url} and publish it when ready !")
@@ -142,6 +201,46 @@ def _upload_file_to_zenodo(filepath: str, metadata_filepath: str, sandbox: bool)
     return disdrodb_data_url
 
 
+def _upload_file_to_zenodo(filepath: str, metadata_filepath: str, sandbox: bool) -> str:
+    """Upload a file to a Zenodo bucket."""
+    return _upload_to_zenodo(
+        stream_factory=functools.partial(_iter_file, filepath),
+        size=os.path.getsize(filepath),
+        filename=os.path.basename(filepath),
+        metadata_filepath=metadata_filepath,
+        sandbox=sandbox,
+    )
+
+
+def _upload_station_archive_to_zenodo(archive: dict, metadata_filepath: str, sandbox: bool) -> tuple[str, str]:
+    """Zip the station archive files on the fly and upload the zip archive to a Zenodo bucket.
+
+    Since Zenodo requires the size of the uploaded file in advance, the reproducible zip archive
+    is first generated (without being stored) to compute its size and hash, and then generated again while uploading.
+
+    Returns the remote url and the hash of the uploaded zip archive.
+    """
+    station_name = os.path.basename(archive["station_data_path"])
+    if archive["incremental"]:
+        filename = f"{station_name}_update_{len(archive['manifest']['archives'])}.zip"
+    else:
+        filename = f"{station_name}.zip"
+
+    # Compute the size and hash of the zip archive
+    hasher = hashlib.new(archive["manifest"]["hash_algorithm"])
+    size = sum(len(data) for data in iter_station_archive(archive, hasher=hasher, chunk_size=UPLOAD_CHUNK_SIZE))
+
+    # Upload the zip archive
+    disdrodb_data_url = _upload_to_zenodo(
+        stream_factory=functools.partial(iter_station_archive, archive, chunk_size=UPLOAD_CHUNK_SIZE),
+        size=size,
+        filename=filename,
+        metadata_filepath=metadata_filepath,
+        sandbox=sandbox,
+    )
+    return disdrodb_data_url, hasher.hexdigest()
+
+
 def _define_creators_list(metadata):
     """Try to define Zenodo creator list from DISDRODB metadata."""
     try:
@@ -215,7 +314,12 @@ def _update_metadata_with_zenodo_url(metadata_filepath: str, disdrodb_data_url:
     write_yaml(metadata_dict, metadata_filepath)
 
 
-def upload_station_to_zenodo(metadata_filepath: str, sandbox: bool = True) -> str:
+def upload_station_to_zenodo(
+    metadata_filepath: str,
+    sandbox: bool = True,
+    streaming: bool = True,
+    incremental: bool = False,
+) -> str:
     """Zip station data, upload data to Zenodo and update the metadata disdrodb_data_url.
 
     Parameters
@@ -225,22 +329,54 @@ def upload_station_to_zenodo(metadata_filepath: str, sandbox: bool = True) -> st
     sandbox: bool
         If ``True``, upload to Zenodo Sandbox (for testing purposes).
         If ``False``, upload to Zenodo.
+    streaming: bool
+        If ``True`` (the default), the station data are zipped on the fly while uploading
+        and the upload is recorded in the station manifest (see ``disdrodb.utils.manifest``).
+        If ``False``, the station data are first zipped into a temporary file.
+    incremental: bool
+        If ``True`` and the station has already been uploaded, only the files added or changed since the
+        last upload are uploaded. The incremental archive url is recorded in the station manifest,
+        while the metadata ``disdrodb_data_url`` is left unchanged. The default is ``False``.
     """
-    # Zip station data
-    print(" - Zipping station data")
-    station_zip_filepath = archive_station_data(metadata_filepath)
-
-    # Upload the station data zip file on Zenodo
-    # - After upload, it removes the zip file !
-    print(" - Uploading station data")
-    try:
-        disdrodb_data_url = _upload_file_to_zenodo(
-            filepath=station_zip_filepath, metadata_filepath=metadata_filepath, sandbox=sandbox
-        )
-        os.remove(station_zip_filepath)
-    except Exception as e:
-        os.remove(station_zip_filepath)
-        raise ValueError(f"{station_zip_filepath} The upload on Zenodo has failed: {e}.")
+    if streaming:
+        archive = define_station_archive(metadata_filepath, incremental=incremental)
+        if archive["incremental"] and len(archive["files"]) == 0 and len(archive["removed"]) == 0:
+            print(" - The station data did not change since the last upload. Skipping data upload.")
+            return
+        if archive["incremental"]:
+            print(f" - Zipping and uploading the {len(archive['files'])} files added or changed since the last upload")
+        else:
+            print(" - Zipping and uploading station data")
+        try:
+            disdrodb_data_url, archive_hash = _upload_station_archive_to_zenodo(
+                archive=archive,
+                metadata_filepath=metadata_filepath,
+                sandbox=sandbox,
+            )
+        except Exception as e:
+            raise ValueError(f"{archive['station_data_path']} The upload on Zenodo has failed: {e}.")
+
+        # Record the uploaded archive in the station manifest
+        update_station_manifest(metadata_filepath, archive=archive, archive_hash=archive_hash, url=disdrodb_data_url)
+        if archive["incremental"]:
+            print(" - The station manifest has been updated with the remote url of the incremental archive")
+            return
+    else:
+        # Zip station data
+        print(" - Zipping station data")
+        station_zip_filepath = archive_station_data(metadata_filepath)
+
+        # Upload the station data zip file on Zenodo
+        # - After upload, it removes the zip file !
+        print(" - Uploading station data")
+        try:
+            disdrodb_data_url = _upload_file_to_zenodo(
+                filepath=station_zip_filepath, metadata_filepath=metadata_filepath, sandbox=sandbox
+            )
+            os.remove(station_zip_filepath)
+        except Exception as e:
+            os.remove(station_zip_filepath)
+            raise ValueError(f"{station_zip_filepath} The upload on Zenodo has failed: {e}.")
 
     # Add the disdrodb_data_url information to the metadata
     print(" - The station metadata 'disdrodb_data_url' key has been updated with the remote url")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Issue intervals.
+
+The ``timesteps`` and ``time_periods`` of an issue dictionary are compiled once into
+sorted and merged closed intervals (``timesteps`` being intervals with equal start and end time).
+The rows falling within the issue intervals are then identified with a single ``searchsorted`` pass.
+"""
+
+import numpy as np
+
+
+def _to_time_array(values):
+    """Convert time values into a numpy array (datetime values are converted to ``datetime64[ns]``)."""
+    values = np.asarray(values)
+    if values.dtype.kind in ["M", "U", "O"]:
+        values = values.astype("M8[ns]")
+    return values
+
+
+def merge_intervals(starts, ends):
+    """Sort and merge overlapping closed intervals.
+
+    Parameters
+    ----------
+    starts : numpy.ndarray
+        Start time of the intervals.
+    ends : numpy.ndarray
+        End time of the intervals.
+
+    Returns
+    -------
+    tuple
+        Sorted start and end times of the non-overlapping intervals.
+    """
+    if len(starts) == 0:
+        return starts, ends
+    order = np.argsort(starts, kind="stable")
+    starts = starts[order]
+    ends = ends[order]
+    # An interval starts a new group if it starts after the end of all previous intervals
+    max_ends = np.maximum.accumulate(ends)
+    is_new_interval = np.ones(len(starts), dtype=bool)
+    is_new_interval[1:] = starts[1:] > max_ends[:-1]
+    indices = np.flatnonzero(is_new_interval)
+    return starts[indices], np.maximum.reduceat(ends, indices)
+
+
+def compile_issue_intervals(issue_dict):
+    """Compile the ``timesteps`` and ``time_periods`` of an issue dictionary into merged intervals.
+
+    Parameters
+    ----------
+    issue_dict : dict
+        Issue dictionary.
+
+    Returns
+    -------
+    dict
+        Dictionary with the sorted ``starts`` and ``ends`` arrays of the non-overlapping issue intervals.
+        The ``nat`` key indicates whether the issue ``timesteps`` contain ``NaT``.
+    """
+    issue_dict = issue_dict or {}
+    timesteps = issue_dict.get("timesteps", None)
+    time_periods = issue_dict.get("time_periods", None)
+    list_starts = []
+    list_ends = []
+    has_nat = False
+    if timesteps is not None and len(timesteps) > 0:
+        timesteps = _to_time_array(timesteps)
+        if timesteps.dtype.kind == "M":
+            has_nat = bool(np.any(np.isnat(timesteps)))
+            timesteps = timesteps[~np.isnat(timesteps)]
+        list_starts.append(timesteps)
+        list_ends.append(timesteps)
+    if time_periods is not None and len(time_periods) > 0:
+        if any(len(time_period) != 2 for time_period in time_periods):
+            raise ValueError("Every time period of time_periods must be a list of length 2.")
+        list_starts.append(_to_time_array([time_period[0] for time_period in time_periods]))
+        list_ends.append(_to_time_array([time_period[1] for time_period in time_periods]))
+    if len(list_starts) == 0:
+        return {"starts": np.array([], dtype="M8[ns]"), "ends": np.array([], dtype="M8[ns]"), "nat": has_nat}
+    starts, ends = merge_intervals(np.concatenate(list_starts), np.concatenate(list_ends))
+    return {"starts": starts, "ends": ends, "nat": has_nat}
+
+
+def select_issue_intervals(issue_intervals, start_time, end_time):
+    """Select the issue intervals overlapping the ``[start_time, end_time]`` time span."""
+    starts = issue_intervals["starts"]
+    ends = issue_intervals["ends"]
+    # Merged intervals are sorted by both start and end time
+    idx_start = np.searchsorted(ends, start_time, side="left")
+    idx_end = np.searchsorted(starts, end_time, side="right")
+    return {**issue_intervals, "starts": starts[idx_start:idx_end], "ends": ends[idx_start:idx_end]}
+
+
+def get_issue_mask(time, issue_intervals):
+    """Return a boolean mask indicating which time values fall within the issue intervals.
+
+    The issue intervals are first restricted to the time span of ``time``.
+    ``NaT`` values are flagged only if the issue ``timesteps`` contain ``NaT``.
+
+    Parameters
+    ----------
+    time : numpy.ndarray
+        Time values.
+    issue_intervals : dict
+        Issue intervals returned by ``compile_issue_intervals``.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean mask.
+    """
+    time = np.asarray(time)
+    starts = issue_intervals["starts"]
+    ends = issue_intervals["ends"]
+    if time.dtype.kind == "M":
+        starts = starts.astype(time.dtype, copy=False)
+        ends = ends.astype(time.dtype, copy=False)
+    is_valid = ~np.isnat(time) if time.dtype.kind == "M" else np.ones(len(time), dtype=bool)
+    mask = ~is_valid if issue_intervals.get("nat", False) else np.zeros(len(time), dtype=bool)
+    if len(starts) == 0 or not np.any(is_valid):
+        return mask
+    # Restrict the issue intervals to the time span
+    valid_time = time[is_valid]
+    intervals = select_issue_intervals(
+        {"starts": starts, "ends": ends},
+        valid_time.min(),
+        valid_time.max(),
+    )
+    starts = intervals["starts"]
+    ends = intervals["ends"]
+    if len(starts) == 0:
+        return mask
+    # Identify the last interval starting before each time value
+    indices = np.searchsorted(starts, valid_time, side="right") - 1
+    is_within = (indices >= 0) & (valid_time <= ends[np.clip(indices, 0, None)])
+    mask[is_valid] = is_within
+    return mask
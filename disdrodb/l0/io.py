@@ -22,10 +22,14 @@ import os
 from typing import Union
 
 import pandas as pd
+import xarray as xr
 
 from disdrodb.api.path import define_l0a_station_dir
 from disdrodb.utils.directories import list_files
 from disdrodb.utils.logger import log_info
+from disdrodb.utils.metrics import time_stage
+from disdrodb.utils.netcdf import get_l0b_engine, xr_open_dataset
+from disdrodb.utils.sparse import SPARSE_CHUNKSIZE, densify_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -205,6 +209,7 @@ def _read_l0a(filepath: str, verbose: bool = False, debugging_mode: bool = False
     return df
 
 
+@time_stage("read_l0a_dataframe")
 def read_l0a_dataframe(
     filepaths: Union[str, list],
     verbose: bool = False,
@@ -255,3 +260,34 @@ def read_l0a_dataframe(
     # ---------------------------------------------------
     # Return dataframe
     return df
+
+
+####---------------------------------------------------------------------------.
+#### Read L0B netCDF files
+
+
+def open_l0b_dataset(filepath: str, chunksize: int = SPARSE_CHUNKSIZE, engine: str = None) -> xr.Dataset:
+    """Open a DISDRODB L0B netCDF file.
+
+    The spectra variables stored in the sparse layout (see ``disdrodb.utils.sparse``)
+    are reconstructed as lazy dense dask arrays, chunked along time with ``chunksize`` timesteps.
+    Only the non-zero values of the timesteps being computed are read from disk.
+
+    Parameters
+    ----------
+    filepath : str
+        L0B netCDF file path.
+    chunksize : int
+        Number of timesteps of the dense spectra chunks.
+        The default is ``5000``.
+    engine : str, optional
+        Engine used to read the netCDF. Either ``"netcdf4"`` or ``"h5netcdf"``.
+        If ``None``, the ``l0b_engine`` key of the DISDRODB configuration is used.
+
+    Returns
+    -------
+    xr.Dataset
+        L0B dataset with dense spectra variables.
+    """
+    ds = xr_open_dataset(filepath, engine=get_l0b_engine(engine), cache=False)
+    return densify_dataset(ds, chunksize=chunksize)
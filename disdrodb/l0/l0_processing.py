@@ -27,7 +27,6 @@ import time
 
 import dask
 import dask.bag as db
-import xarray as xr
 
 from disdrodb.api.checks import check_sensor_name
 
@@ -47,12 +46,15 @@ from disdrodb.api.path import (
 )
 from disdrodb.configs import get_base_dir
 from disdrodb.issue import read_station_issue
+from disdrodb.issue.intervals import compile_issue_intervals
 from disdrodb.l0.io import (
     get_l0a_filepaths,
     get_raw_filepaths,
     read_l0a_dataframe,
 )
 from disdrodb.l0.l0_reader import get_station_reader_function
+from disdrodb.l0.l0b_encodings import get_l0b_encoding_options
+from disdrodb.l0.l0b_processing import get_l0b_batch_options
 from disdrodb.metadata import read_station_metadata
 from disdrodb.utils.directories import list_files
 
@@ -61,10 +63,31 @@ from disdrodb.utils.logger import (
     close_logger,
     create_file_logger,
     define_summary_log,
+    get_log_format,
+    initialize_station_logs,
     log_error,
     log_info,
     log_warning,
 )
+from disdrodb.utils.metrics import (
+    define_file_metrics_filepath,
+    define_station_metrics,
+    get_metrics_options,
+    increment_counter,
+    start_metrics,
+    stop_metrics,
+    write_file_metrics,
+)
+from disdrodb.utils.netcdf import get_l0b_engine, xr_open_dataset
+from disdrodb.utils.profiling import (
+    define_file_profile_filepath,
+    define_station_profile,
+    get_profile_options,
+    select_profiled_filepaths,
+    start_profiler,
+    stop_profiler,
+)
+from disdrodb.utils.sparse import get_l0b_sparse_option
 
 logger = logging.getLogger(__name__)
 
@@ -105,6 +128,10 @@ def _generate_l0a(
     verbose,
     parallel,
     issue_dict={},
+    issue_intervals=None,
+    log_format="text",
+    metrics=False,
+    profiled_filepaths=(),
 ):
     """Generate L0A file from raw file."""
     from disdrodb.l0.l0a_processing import (
@@ -121,10 +148,11 @@ def _generate_l0a(
         station_name=station_name,
         filename=filename,
         parallel=parallel,
+        log_format=log_format,
     )
 
-    if not os.environ.get("PYTEST_CURRENT_TEST"):
-        logger_filepath = logger.handlers[0].baseFilename
+    if log_format == "jsonl" or not os.environ.get("PYTEST_CURRENT_TEST"):
+        logger_filepath = logger.handlers[-1].baseFilename
     else:
         # LogCaptureHandler of pytest does not have baseFilename attribute
         logger_filepath = None
@@ -143,8 +171,17 @@ def _generate_l0a(
     check_sensor_name(sensor_name)
 
     ##------------------------------------------------------------------------.
+    # Start collecting the processing metrics
+    metrics_token = start_metrics() if metrics else None
+
+    ##------------------------------------------------------------------------.
+    profiler = None
     try:
+        # Start profiling (if the file is in the profiled sample)
+        profiler = start_profiler() if filepath in profiled_filepaths else None
+
         #### - Read raw file into a dataframe and sanitize to L0A format
+        increment_counter("n_bytes_read", os.path.getsize(filepath))
         df = process_raw_file(
             filepath=filepath,
             column_names=column_names,
@@ -153,12 +190,14 @@ def _generate_l0a(
             sensor_name=sensor_name,
             verbose=verbose,
             issue_dict=issue_dict,
+            issue_intervals=issue_intervals,
         )
 
         ##--------------------------------------------------------------------.
         #### - Write to Parquet
         filepath = define_l0a_filepath(df=df, processed_dir=processed_dir, station_name=station_name)
         write_l0a(df=df, filepath=filepath, force=force, verbose=verbose)
+        increment_counter("n_bytes_written", os.path.getsize(filepath))
 
         ##--------------------------------------------------------------------.
         # Clean environment
@@ -173,6 +212,19 @@ def _generate_l0a(
         error_type = str(type(e).__name__)
         msg = f"{error_type}: {e}"
         log_error(logger=logger, msg=msg, verbose=False)
+        increment_counter("n_failed_files")
+
+    # Write the processing metrics
+    if metrics:
+        write_file_metrics(
+            stop_metrics(metrics_token),
+            filepath=define_file_metrics_filepath(processed_dir, "L0A", station_name, filename),
+            labels={"filename": filename, "sensor_name": sensor_name, "reader": attrs.get("reader")},
+        )
+
+    # Write the profile
+    if profiler is not None:
+        stop_profiler(profiler, filepath=define_file_profile_filepath(processed_dir, "L0A", station_name, filename))
 
     # Close the file logger
     close_logger(logger)
@@ -181,6 +233,25 @@ def _generate_l0a(
     return logger_filepath
 
 
+def _get_task_filename(filepath):
+    """Return the file name of a L0 processing task (the first file name of a batch of files)."""
+    filepath = filepath if isinstance(filepath, str) else filepath[0]
+    return os.path.basename(filepath)
+
+
+def _define_batches(filepaths, batch_size=1):
+    """Group the files into batches of ``batch_size`` files.
+
+    If ``batch_size=1``, the file paths are returned unchanged.
+    Otherwise, the file paths are sorted by name (i.e. by starting time for DISDRODB products)
+    so that each batch covers a contiguous time period.
+    """
+    if batch_size == 1:
+        return filepaths
+    filepaths = sorted(filepaths)
+    return [filepaths[i : i + batch_size] for i in range(0, len(filepaths), batch_size)]
+
+
 def _generate_l0b(
     filepath,
     processed_dir,  # retrievable from filepath
@@ -189,24 +260,38 @@ def _generate_l0b(
     verbose,
     debugging_mode,
     parallel,
+    log_format="text",
+    metrics=False,
+    profiled_filepaths=(),
+    sparse=False,
+    encoding_options=None,
+    engine="netcdf4",
+    time_window=None,
 ):
     from disdrodb.l0.l0b_processing import (
         create_l0b_from_l0a,
+        split_dataset_by_time_window,
         write_l0b,
     )
 
+    # -----------------------------------------------------------------.
+    # Define the L0A files to process
+    # - If filepath is a list, the L0A files are processed as a single batch
+    filepaths = [filepath] if isinstance(filepath, str) else list(filepath)
+
     # -----------------------------------------------------------------.
     # Create file logger
-    filename = os.path.basename(filepath)
+    filename = _get_task_filename(filepath)
     logger = create_file_logger(
         processed_dir=processed_dir,
         product="L0B",
         station_name=station_name,
         filename=filename,
         parallel=parallel,
+        log_format=log_format,
     )
-    if not os.environ.get("PYTEST_CURRENT_TEST"):
-        logger_filepath = logger.handlers[0].baseFilename
+    if log_format == "jsonl" or not os.environ.get("PYTEST_CURRENT_TEST"):
+        logger_filepath = logger.handlers[-1].baseFilename
     else:
         # LogCaptureHandler of pytest does not have baseFilename attribute
         logger_filepath = None
@@ -225,17 +310,38 @@ def _generate_l0b(
     check_sensor_name(sensor_name)
 
     ##------------------------------------------------------------------------.
+    # Start collecting the processing metrics
+    metrics_token = start_metrics() if metrics else None
+
+    ##------------------------------------------------------------------------.
+    profiler = None
     try:
-        # Read L0A Apache Parquet file
-        df = read_l0a_dataframe(filepath, verbose=verbose, debugging_mode=debugging_mode)
+        # Start profiling (if the file is in the profiled sample)
+        profiler = start_profiler() if filepath in profiled_filepaths else None
+
+        # Read L0A Apache Parquet file(s)
+        # - The dataframes of a batch are concatenated (and sorted by time)
+        increment_counter("n_bytes_read", sum(os.path.getsize(l0a_filepath) for l0a_filepath in filepaths))
+        df = read_l0a_dataframe(filepaths, verbose=verbose, debugging_mode=debugging_mode)
         # -----------------------------------------------------------------.
         # Create xarray Dataset
+        # - The coordinates and attributes are defined once for the whole batch
         ds = create_l0b_from_l0a(df=df, attrs=attrs, verbose=verbose)
 
         # -----------------------------------------------------------------.
-        # Write L0B netCDF4 dataset
-        filepath = define_l0b_filepath(ds, processed_dir, station_name)
-        write_l0b(ds, filepath=filepath, force=force)
+        # Write L0B netCDF4 dataset(s)
+        # - If time_window is specified, a L0B file is written for each time window
+        for ds_window in split_dataset_by_time_window(ds, time_window=time_window):
+            filepath = define_l0b_filepath(ds_window, processed_dir, station_name)
+            write_l0b(
+                ds_window,
+                filepath=filepath,
+                force=force,
+                sparse=sparse,
+                encoding_options=encoding_options,
+                engine=engine,
+            )
+            increment_counter("n_bytes_written", os.path.getsize(filepath))
 
         ##--------------------------------------------------------------------.
         # Clean environment
@@ -250,6 +356,19 @@ def _generate_l0b(
         error_type = str(type(e).__name__)
         msg = f"{error_type}: {e}"
         log_error(logger, msg, verbose=verbose)
+        increment_counter("n_failed_files")
+
+    # Write the processing metrics
+    if metrics:
+        write_file_metrics(
+            stop_metrics(metrics_token),
+            filepath=define_file_metrics_filepath(processed_dir, "L0B", station_name, filename),
+            labels={"filename": filename, "sensor_name": sensor_name, "reader": attrs.get("reader")},
+        )
+
+    # Write the profile
+    if profiler is not None:
+        stop_profiler(profiler, filepath=define_file_profile_filepath(processed_dir, "L0B", station_name, filename))
 
     # Close the file logger
     close_logger(logger)
@@ -267,6 +386,14 @@ def _generate_l0b_from_nc(
     force,
     verbose,
     parallel,
+    log_format="text",
+    metrics=False,
+    profiled_filepaths=(),
+    lazy=False,
+    chunksize=None,
+    sparse=False,
+    encoding_options=None,
+    engine="netcdf4",
 ):
     from disdrodb.l0.l0b_nc_processing import create_l0b_from_raw_nc
     from disdrodb.l0.l0b_processing import write_l0b
@@ -280,10 +407,11 @@ def _generate_l0b_from_nc(
         station_name=station_name,
         filename=filename,
         parallel=parallel,
+        log_format=log_format,
     )
 
-    if not os.environ.get("PYTEST_CURRENT_TEST"):
-        logger_filepath = logger.handlers[0].baseFilename
+    if log_format == "jsonl" or not os.environ.get("PYTEST_CURRENT_TEST"):
+        logger_filepath = logger.handlers[-1].baseFilename
     else:
         # LogCaptureHandler of pytest does not have baseFilename attribute
         logger_filepath = None
@@ -302,24 +430,44 @@ def _generate_l0b_from_nc(
     check_sensor_name(sensor_name)
 
     ##------------------------------------------------------------------------.
+    # Start collecting the processing metrics
+    metrics_token = start_metrics() if metrics else None
+
+    ##------------------------------------------------------------------------.
+    profiler = None
     try:
-        # Open the raw netCDF
-        with xr.open_dataset(filepath, cache=False) as data:
-            ds = data.load()
+        # Start profiling (if the file is in the profiled sample)
+        profiler = start_profiler() if filepath in profiled_filepaths else None
 
-        # Convert to DISDRODB L0 format
-        ds = create_l0b_from_raw_nc(
-            ds=ds,
-            dict_names=dict_names,
-            ds_sanitizer_fun=ds_sanitizer_fun,
-            sensor_name=sensor_name,
-            verbose=verbose,
-            attrs=attrs,
-        )
-        # -----------------------------------------------------------------.
-        # Write L0B netCDF4 dataset
-        filepath = define_l0b_filepath(ds, processed_dir, station_name)
-        write_l0b(ds, filepath=filepath, force=force)
+        # Open the raw netCDF
+        # - If lazy=True, the raw netCDF is kept open until the L0B netCDF has been written
+        #   and only the variables required by the L0B product are read, chunk by chunk.
+        increment_counter("n_bytes_read", os.path.getsize(filepath))
+        with xr_open_dataset(filepath, engine=None, load=not lazy, cache=False) as data:
+            ds = data
+
+            # Convert to DISDRODB L0 format
+            ds = create_l0b_from_raw_nc(
+                ds=ds,
+                dict_names=dict_names,
+                ds_sanitizer_fun=ds_sanitizer_fun,
+                sensor_name=sensor_name,
+                verbose=verbose,
+                attrs=attrs,
+                chunksize=chunksize if lazy else None,
+            )
+            # -----------------------------------------------------------------.
+            # Write L0B netCDF4 dataset
+            filepath = define_l0b_filepath(ds, processed_dir, station_name)
+            write_l0b(
+                ds,
+                filepath=filepath,
+                force=force,
+                sparse=sparse,
+                encoding_options=encoding_options,
+                engine=engine,
+            )
+            increment_counter("n_bytes_written", os.path.getsize(filepath))
 
         ##--------------------------------------------------------------------.
         # Clean environment
@@ -334,6 +482,19 @@ def _generate_l0b_from_nc(
         error_type = str(type(e).__name__)
         msg = f"{error_type}: {e}"
         log_error(logger, msg, verbose=verbose)
+        increment_counter("n_failed_files")
+
+    # Write the processing metrics
+    if metrics:
+        write_file_metrics(
+            stop_metrics(metrics_token),
+            filepath=define_file_metrics_filepath(processed_dir, "L0B", station_name, filename),
+            labels={"filename": filename, "sensor_name": sensor_name, "reader": attrs.get("reader")},
+        )
+
+    # Write the profile
+    if profiler is not None:
+        stop_profiler(profiler, filepath=define_file_profile_filepath(processed_dir, "L0B", station_name, filename))
 
     # Close the file logger
     close_logger(logger)
@@ -460,6 +621,20 @@ def run_l0a(
     # Read issue YAML file
     issue_dict = read_station_issue(station_name=station_name, **infer_path_info_dict(raw_dir))
 
+    # Compile the issue timesteps and time_periods once into sorted and merged intervals
+    # - If parallel=True, the intervals are a single node of the dask graph shared by all file tasks
+    issue_intervals = compile_issue_intervals(issue_dict)
+    if parallel:
+        issue_intervals = dask.delayed(issue_intervals, pure=True, traverse=False)
+
+    # -----------------------------------------------------------------.
+    # Initialize station logs
+    log_format = get_log_format()
+    initialize_station_logs(processed_dir, product="L0A", station_name=station_name, log_format=log_format)
+    metrics, metrics_prometheus = get_metrics_options()
+    profile, profile_n_files = get_profile_options()
+    profiled_filepaths = select_profiled_filepaths(filepaths, n_files=profile_n_files) if profile else []
+
     # -----------------------------------------------------------------.
     # Generate L0A files
     # - Loop over the files and save the L0A Apache Parquet files.
@@ -475,11 +650,14 @@ def run_l0a(
                 column_names=column_names,
                 reader_kwargs=reader_kwargs,
                 df_sanitizer_fun=df_sanitizer_fun,
-                issue_dict=issue_dict,
+                issue_intervals=issue_intervals,
                 # Processing options
                 force=force,
                 verbose=verbose,
                 parallel=parallel,
+                log_format=log_format,
+                metrics=metrics,
+                profiled_filepaths=profiled_filepaths,
             )
         )
     if parallel:
@@ -490,6 +668,22 @@ def run_l0a(
     # Define L0A summary logs
     define_summary_log(list_logs)
 
+    # Define L0A station metrics
+    if metrics:
+        filenames = [os.path.basename(filepath) for filepath in filepaths]
+        define_station_metrics(
+            processed_dir,
+            product="L0A",
+            station_name=station_name,
+            filenames=filenames,
+            prometheus=metrics_prometheus,
+        )
+
+    # Define L0A station profile
+    if profile:
+        filenames = [os.path.basename(filepath) for filepath in profiled_filepaths]
+        define_station_profile(processed_dir, product="L0A", station_name=station_name, filenames=filenames)
+
     # ---------------------------------------------------------------------.
     # End L0A processing
     if verbose:
@@ -593,15 +787,31 @@ def run_l0b(
         debugging_mode=debugging_mode,
     )
 
+    # -----------------------------------------------------------------.
+    # Initialize station logs
+    log_format = get_log_format()
+    initialize_station_logs(processed_dir, product="L0B", station_name=station_name, log_format=log_format)
+    metrics, metrics_prometheus = get_metrics_options()
+    profile, profile_n_files = get_profile_options()
+    sparse = get_l0b_sparse_option()
+    encoding_options = get_l0b_encoding_options()
+    engine = get_l0b_engine()
+    batch_size, time_window = get_l0b_batch_options()
+
+    # Group the L0A files into batches
+    # - If batch_size > 1, each task processes a list of L0A files
+    tasks = _define_batches(filepaths, batch_size=batch_size)
+    profiled_filepaths = select_profiled_filepaths(tasks, n_files=profile_n_files) if profile else []
+
     # -----------------------------------------------------------------.
     # Generate L0B files
-    # Loop over the L0A files and save the L0B netCDF files.
+    # Loop over the L0A files (or batches of L0A files) and save the L0B netCDF files.
     # - If parallel=True, it does that in parallel using dask.bag
-    #   Settings npartitions=len(filepaths) enable to wait prior task on a core
+    #   Settings npartitions=len(tasks) enable to wait prior task on a core
     #   finish before starting a new one.
     if not parallel:
         list_logs = []
-        for filepath in filepaths:
+        for filepath in tasks:
             list_logs.append(
                 _generate_l0b(
                     filepath=filepath,
@@ -611,10 +821,17 @@ def run_l0b(
                     verbose=verbose,
                     debugging_mode=debugging_mode,
                     parallel=parallel,
+                    log_format=log_format,
+                    metrics=metrics,
+                    profiled_filepaths=profiled_filepaths,
+                    sparse=sparse,
+                    encoding_options=encoding_options,
+                    engine=engine,
+                    time_window=time_window,
                 )
             )
     else:
-        bag = db.from_sequence(filepaths, npartitions=len(filepaths))
+        bag = db.from_sequence(tasks, npartitions=len(tasks))
         list_logs = bag.map(
             _generate_l0b,
             processed_dir=processed_dir,
@@ -623,12 +840,40 @@ def run_l0b(
             verbose=verbose,
             debugging_mode=debugging_mode,
             parallel=parallel,
+            log_format=log_format,
+            metrics=metrics,
+            profiled_filepaths=profiled_filepaths,
+            sparse=sparse,
+            encoding_options=encoding_options,
+            engine=engine,
+            time_window=time_window,
         ).compute()
 
     # -----------------------------------------------------------------.
     # Define L0B summary logs
     define_summary_log(list_logs)
 
+    # Define L0B station metrics
+    if metrics:
+        filenames = [_get_task_filename(filepath) for filepath in tasks]
+        define_station_metrics(
+            processed_dir,
+            product="L0B",
+            station_name=station_name,
+            filenames=filenames,
+            prometheus=metrics_prometheus,
+        )
+
+    # Define L0B station profile
+    if profile:
+        filenames = [_get_task_filename(filepath) for filepath in profiled_filepaths]
+        define_station_profile(processed_dir, product="L0B", station_name=station_name, filenames=filenames)
+
+    # Repartition the L0B files into time windows
+    # - The files of the time windows shared by consecutive batches are merged
+    if time_window is not None:
+        run_l0b_repartition(processed_dir, station_name=station_name, time_window=time_window, verbose=verbose)
+
     # -----------------------------------------------------------------.
     # End L0B processing
     if verbose:
@@ -651,6 +896,8 @@ def run_l0b_from_nc(
     verbose,
     force,
     debugging_mode,
+    lazy=None,
+    chunksize=None,
 ):
     """Run the L0B processing for a specific DISDRODB station with raw netCDFs.
 
@@ -717,7 +964,20 @@ def run_l0b_from_nc(
         Only the first 3 raw netCDF files will be processed.
         Default is ``False``.
 
+    lazy : bool, optional
+        If ``True``, the raw netCDFs are not loaded into memory.
+        Only the variables required by the L0B product are read and processed chunk by chunk
+        while writing the L0B netCDF. This bounds the memory usage with large raw netCDFs.
+        If ``None``, the ``l0b_nc_lazy`` key of the DISDRODB configuration is used (``False`` by default).
+
+    chunksize : int, optional
+        Number of timesteps processed at once if ``lazy=True``.
+        If ``None``, the ``l0b_nc_chunksize`` key of the DISDRODB configuration is used (``1000`` by default).
+
     """
+    from disdrodb.l0.l0b_nc_processing import get_l0b_nc_options
+
+    lazy, chunksize = get_l0b_nc_options(lazy=lazy, chunksize=chunksize)
 
     # ------------------------------------------------------------------------.
     # Start L0A processing
@@ -749,6 +1009,17 @@ def run_l0b_from_nc(
         debugging_mode=debugging_mode,
     )
 
+    # -----------------------------------------------------------------.
+    # Initialize station logs
+    log_format = get_log_format()
+    initialize_station_logs(processed_dir, product="L0B", station_name=station_name, log_format=log_format)
+    metrics, metrics_prometheus = get_metrics_options()
+    profile, profile_n_files = get_profile_options()
+    profiled_filepaths = select_profiled_filepaths(filepaths, n_files=profile_n_files) if profile else []
+    sparse = get_l0b_sparse_option()
+    encoding_options = get_l0b_encoding_options()
+    engine = get_l0b_engine()
+
     # -----------------------------------------------------------------.
     # Generate L0B files
     # - Loop over the raw netCDF files and convert it to DISDRODB netCDF format.
@@ -770,6 +1041,14 @@ def run_l0b_from_nc(
                     force=force,
                     verbose=verbose,
                     parallel=parallel,
+                    log_format=log_format,
+                    metrics=metrics,
+                    profiled_filepaths=profiled_filepaths,
+                    sparse=sparse,
+                    encoding_options=encoding_options,
+                    engine=engine,
+                    lazy=lazy,
+                    chunksize=chunksize,
                 )
             )
     else:
@@ -785,12 +1064,36 @@ def run_l0b_from_nc(
             force=force,
             verbose=verbose,
             parallel=parallel,
+            log_format=log_format,
+            metrics=metrics,
+            profiled_filepaths=profiled_filepaths,
+            sparse=sparse,
+            encoding_options=encoding_options,
+            engine=engine,
+            lazy=lazy,
+            chunksize=chunksize,
         ).compute()
 
     # -----------------------------------------------------------------.
     # Define L0B summary logs
     define_summary_log(list_logs)
 
+    # Define L0B station metrics
+    if metrics:
+        filenames = [os.path.basename(filepath) for filepath in filepaths]
+        define_station_metrics(
+            processed_dir,
+            product="L0B",
+            station_name=station_name,
+            filenames=filenames,
+            prometheus=metrics_prometheus,
+        )
+
+    # Define L0B station profile
+    if profile:
+        filenames = [os.path.basename(filepath) for filepath in profiled_filepaths]
+        define_station_profile(processed_dir, product="L0B", station_name=station_name, filenames=filenames)
+
     # ---------------------------------------------------------------------.
     # End L0B processing
     if verbose:
@@ -838,13 +1141,21 @@ def run_l0b_concat(processed_dir, station_name, verbose=False):
 
     # -------------------------------------------------------------------------.
     # Concatenate the files
-    ds = xr_concat_datasets(filepaths)
+    engine = get_l0b_engine()
+    ds = xr_concat_datasets(filepaths, engine=engine)
 
     # -------------------------------------------------------------------------.
     # Define the filepath of the concatenated L0B netCDF
     single_nc_filepath = define_l0b_filepath(ds, processed_dir, station_name, l0b_concat=True)
     force = True  # TODO add as argument
-    write_l0b(ds, filepath=single_nc_filepath, force=force)
+    write_l0b(
+        ds,
+        filepath=single_nc_filepath,
+        force=force,
+        sparse=get_l0b_sparse_option(),
+        encoding_options=get_l0b_encoding_options(),
+        engine=engine,
+    )
 
     # -------------------------------------------------------------------------.
     # Close file and delete
@@ -859,6 +1170,100 @@ def run_l0b_concat(processed_dir, station_name, verbose=False):
     return None
 
 
+def run_l0b_repartition(processed_dir, station_name, time_window=None, verbose=False):
+    """Repartition the L0B netCDF files of a station into files covering fixed time windows.
+
+    A L0B file is written for each ``"day"``, ``"month"`` or ``"year"`` time window,
+    whatever the time periods covered by the existing L0B files.
+    The timesteps of the files overlapping a time window are sorted by time and only the
+    timesteps duplicated across files are dropped. Only the files overlapping a time window are
+    loaded in memory at once, and the existing L0B files are removed once all time windows have been written.
+
+    If ``time_window`` is ``None``, the ``l0b_time_window`` key of the DISDRODB configuration is used.
+    """
+    from disdrodb.l0.l0b_processing import (
+        group_filepaths_by_time_window,
+        select_time_window,
+        write_l0b,
+    )
+    from disdrodb.utils.netcdf import xr_concat_sorted_datasets
+
+    # Create logger
+    filename = f"repartition_{station_name}"
+    logger = create_file_logger(
+        processed_dir=processed_dir,
+        product="L0B",
+        station_name="",  # locate outside the station directory
+        filename=filename,
+        parallel=False,
+    )
+
+    # -------------------------------------------------------------------------.
+    # Check the time window
+    _, time_window = get_l0b_batch_options(time_window=time_window)
+    if time_window is None:
+        msg = "A 'time_window' must be specified to repartition the L0B files."
+        log_error(logger=logger, msg=msg, verbose=False)
+        raise ValueError(msg)
+
+    # -------------------------------------------------------------------------.
+    # Retrieve L0B files
+    station_dir = define_l0b_station_dir(processed_dir, station_name)
+    filepaths = list_files(station_dir, glob_pattern="*.nc", recursive=True)
+    filepaths = sorted(filepaths)
+    if len(filepaths) == 0:
+        msg = f"No L0B file is available for repartitioning in {station_dir}."
+        log_error(logger=logger, msg=msg, verbose=False)
+        raise ValueError(msg)
+
+    # -------------------------------------------------------------------------.
+    # Group the L0B files by time window
+    dict_windows = group_filepaths_by_time_window(filepaths, time_window=time_window)
+
+    # -------------------------------------------------------------------------.
+    # Write a L0B file for each time window
+    msg = f"Repartitioning of {len(filepaths)} L0B files into {len(dict_windows)} {time_window} files has started."
+    log_info(logger=logger, msg=msg, verbose=verbose)
+    engine = get_l0b_engine()
+    sparse = get_l0b_sparse_option()
+    encoding_options = get_l0b_encoding_options()
+    new_filepaths = []
+    for window, window_filepaths in dict_windows.items():
+        # Concatenate the files overlapping the time window (sorting and dropping duplicated timesteps)
+        ds = xr_concat_sorted_datasets(window_filepaths, engine=engine)
+        ds = select_time_window(ds, window)
+
+        # Write the L0B netCDF of the time window
+        if ds.sizes["time"] > 0:
+            filepath = define_l0b_filepath(ds, processed_dir, station_name)
+            write_l0b(
+                ds,
+                filepath=filepath,
+                force=True,
+                sparse=sparse,
+                encoding_options=encoding_options,
+                engine=engine,
+            )
+            new_filepaths.append(filepath)
+        del ds
+
+    # -------------------------------------------------------------------------.
+    # Remove the original files once all time windows have been written
+    # - A file with the same name as a repartitioned file has already been overwritten.
+    #   Such file only covers the time window of the repartitioned file.
+    for filepath in filepaths:
+        if filepath not in new_filepaths:
+            os.remove(filepath)
+
+    msg = f"Repartitioning of the L0B files into {len(new_filepaths)} {time_window} files has ended."
+    log_info(logger=logger, msg=msg, verbose=verbose)
+
+    # -------------------------------------------------------------------------.
+    # Close the file logger
+    close_logger(logger)
+    return None
+
+
 ####--------------------------------------------------------------------------.
 #### DISDRODB Station Functions
 
@@ -874,6 +1279,7 @@ def run_l0a_station(
     debugging_mode: bool = False,
     parallel: bool = True,
     base_dir: str = None,
+    profile: bool = False,
 ):
     """
     Run the L0A processing of a specific DISDRODB station when invoked from the terminal.
@@ -908,7 +1314,12 @@ def run_l0a_station(
     base_dir : str, optional
         The base directory of DISDRODB, expected in the format ``<...>/DISDRODB``.
         If not specified, the path specified in the DISDRODB active configuration will be used.
+    profile : bool, optional
+        If ``True``, a sample of files (``profile_n_files`` DISDRODB configuration key) is processed
+        under ``cProfile``. The merged profiles are saved next to the station logs. By default, ``False``.
     """
+    import disdrodb
+
     base_dir = get_base_dir(base_dir)
     reader = get_station_reader_function(
         base_dir=base_dir,
@@ -932,16 +1343,18 @@ def run_l0a_station(
     # Run L0A processing
     # --> The reader call the run_l0a within the custom defined reader function
     # --> For the special case of raw netCDF data, it calls the run_l0b_from_nc function
-    reader(
-        raw_dir=raw_dir,
-        processed_dir=processed_dir,
-        station_name=station_name,
-        # Processing options
-        force=force,
-        verbose=verbose,
-        debugging_mode=debugging_mode,
-        parallel=parallel,
-    )
+    # --> The profiling is enabled through the DISDRODB configuration
+    with disdrodb.config.set({"profile": True} if profile else {}):
+        reader(
+            raw_dir=raw_dir,
+            processed_dir=processed_dir,
+            station_name=station_name,
+            # Processing options
+            force=force,
+            verbose=verbose,
+            debugging_mode=debugging_mode,
+            parallel=parallel,
+        )
 
 
 def run_l0b_station(
@@ -956,6 +1369,7 @@ def run_l0b_station(
     debugging_mode: bool = False,
     remove_l0a: bool = False,
     base_dir: str = None,
+    profile: bool = False,
 ):
     """
     Run the L0B processing of a specific DISDRODB station when invoked from the terminal.
@@ -990,8 +1404,13 @@ def run_l0b_station(
     base_dir : str, optional
         The base directory of DISDRODB, expected in the format ``<...>/DISDRODB``.
         If not specified, the path specified in the DISDRODB active configuration will be used.
+    profile : bool, optional
+        If ``True``, a sample of files (``profile_n_files`` DISDRODB configuration key) is processed
+        under ``cProfile``. The merged profiles are saved next to the station logs. By default, ``False``.
 
     """
+    import disdrodb
+
     # Define campaign processed dir
     base_dir = get_base_dir(base_dir)
     processed_dir = get_disdrodb_path(
@@ -1002,15 +1421,16 @@ def run_l0b_station(
         check_exists=False,
     )
     # Run L0B
-    run_l0b(
-        processed_dir=processed_dir,
-        station_name=station_name,
-        # Processing options
-        force=force,
-        verbose=verbose,
-        debugging_mode=debugging_mode,
-        parallel=parallel,
-    )
+    with disdrodb.config.set({"profile": True} if profile else {}):
+        run_l0b(
+            processed_dir=processed_dir,
+            station_name=station_name,
+            # Processing options
+            force=force,
+            verbose=verbose,
+            debugging_mode=debugging_mode,
+            parallel=parallel,
+        )
 
     if remove_l0a:
         station_dir = define_station_dir(
@@ -1088,4 +1508,56 @@ def run_l0b_concat_station(
         log_info(logger=logger, msg="Removal of single L0B files ended.", verbose=verbose)
 
 
+def run_l0b_repartition_station(
+    # Station arguments
+    data_source,
+    campaign_name,
+    station_name,
+    # L0B repartition options
+    time_window=None,
+    verbose=True,
+    base_dir: str = None,
+):
+    """Repartition the L0B files of a station into daily, monthly or yearly files.
+
+    Parameters
+    ----------
+    data_source : str
+        The name of the institution (for campaigns spanning multiple countries) or
+        the name of the country (for campaigns or sensor networks within a single country).
+        Must be provided in UPPER CASE.
+    campaign_name : str
+        The name of the campaign. Must be provided in UPPER CASE.
+    station_name : str
+        The name of the station.
+    time_window : str, optional
+        Either ``"day"``, ``"month"`` or ``"year"``.
+        If ``None``, the ``l0b_time_window`` key of the DISDRODB configuration is used.
+    verbose : bool, optional
+        If ``True`` (default), detailed processing information will be printed to the terminal.
+        If ``False``, less information will be displayed.
+    base_dir : str, optional
+        The base directory of DISDRODB, expected in the format ``<...>/DISDRODB``.
+        If not specified, the path specified in the DISDRODB active configuration will be used.
+
+    """
+    # Retrieve processed_dir
+    base_dir = get_base_dir(base_dir)
+    processed_dir = get_disdrodb_path(
+        base_dir=base_dir,
+        product="L0B",
+        data_source=data_source,
+        campaign_name=campaign_name,
+        check_exists=True,
+    )
+
+    # Run repartitioning
+    run_l0b_repartition(
+        processed_dir=processed_dir,
+        station_name=station_name,
+        time_window=time_window,
+        verbose=verbose,
+    )
+
+
 ####---------------------------------------------------------------------------.
@@ -23,6 +23,13 @@ import os
 
 logger = logging.getLogger(__name__)
 
+# Readers defined outside of disdrodb.l0.readers (i.e. the reader of the synthetic data used for
+# testing and benchmarking). They are not listed by available_readers, but can be referenced in the
+# station metadata. Format: {"<DATA_SOURCE>/<READER_NAME>": "<module_name>.<function_name>"}
+_EXTERNAL_READERS = {
+    "SYNTHETIC/SYNTHETIC": "disdrodb.l0.synthetic.synthetic_reader",
+}
+
 
 ####--------------------------------------------------------------------------.
 
@@ -144,6 +151,9 @@ def _check_reader_exists(reader_data_source: str, reader_name: str) -> str:
     ValueError
         Error if the reader name provided for the campaign has not been found.
     """
+    # Check if reader defined outside of disdrodb.l0.readers
+    if f"{reader_data_source}/{reader_name}" in _EXTERNAL_READERS:
+        return reader_name
     # Check valid data_source
     reader_data_source = _check_reader_data_source(reader_data_source)
     # Get available reader names
@@ -223,6 +233,11 @@ def get_reader_function(reader_data_source: str, reader_name: str) -> object:
         The ``reader()`` function
 
     """
+    # Retrieve reader defined outside of disdrodb.l0.readers
+    if f"{reader_data_source}/{reader_name}" in _EXTERNAL_READERS:
+        full_name = _EXTERNAL_READERS[f"{reader_data_source}/{reader_name}"]
+        module_name, unit_name = full_name.rsplit(".", 1)
+        return getattr(__import__(module_name, fromlist=[""]), unit_name)
     # Check data source and reader_name validity
     reader_data_source = _check_reader_data_source(reader_data_source)
     reader_name = _check_reader_exists(reader_data_source=reader_data_source, reader_name=reader_name)
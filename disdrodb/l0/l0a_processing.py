@@ -27,6 +27,7 @@ from typing import Union
 import numpy as np
 import pandas as pd
 
+from disdrodb.issue.intervals import compile_issue_intervals, get_issue_mask
 from disdrodb.l0.check_standards import check_l0a_column_names, check_l0a_standards
 from disdrodb.l0.l0b_processing import infer_split_str
 from disdrodb.l0.standards import (
@@ -44,6 +45,7 @@ from disdrodb.utils.logger import (
     log_info,
     log_warning,
 )
+from disdrodb.utils.metrics import increment_counter, time_stage
 
 logger = logging.getLogger(__name__)
 
@@ -86,6 +88,7 @@ def _preprocess_reader_kwargs(reader_kwargs: dict) -> dict:
     return reader_kwargs
 
 
+@time_stage("read_raw_file")
 def read_raw_file(
     filepath: str,
     column_names: list,
@@ -154,6 +157,7 @@ def _check_matching_column_number(df, column_names, verbose=False):
         raise ValueError(msg)
 
 
+@time_stage("remove_rows_with_missing_time")
 def remove_rows_with_missing_time(df: pd.DataFrame, verbose: bool = False):
     """Remove dataframe rows where the ``"time"`` is ``NaT``.
 
@@ -186,6 +190,7 @@ def remove_rows_with_missing_time(df: pd.DataFrame, verbose: bool = False):
     return df
 
 
+@time_stage("remove_duplicated_timesteps")
 def remove_duplicated_timesteps(df: pd.DataFrame, verbose: bool = False):
     """Remove duplicated timesteps.
 
@@ -219,34 +224,32 @@ def remove_duplicated_timesteps(df: pd.DataFrame, verbose: bool = False):
     return df
 
 
-def drop_timesteps(df, timesteps):
-    """Drop problematic time steps."""
-    df = df[~df["time"].isin(timesteps)]
+def _drop_issue_intervals(df, issue_intervals, description):
+    """Drop the rows within the issue intervals. Raise an error if there are no rows left."""
+    mask = get_issue_mask(df["time"].to_numpy(), issue_intervals)
+    df = df[~mask]
     # Check there are row left
     if len(df) == 0:
-        msg = "No rows left after removing problematic timesteps. Maybe you need to adjust the issue YAML file."
+        msg = f"No rows left after removing problematic {description}. Maybe you need to adjust the issue YAML file."
         log_warning(logger=logger, msg=msg, verbose=False)
         raise ValueError(msg)
     return df
 
 
+def drop_timesteps(df, timesteps):
+    """Drop problematic time steps."""
+    issue_intervals = compile_issue_intervals({"timesteps": timesteps})
+    return _drop_issue_intervals(df, issue_intervals, description="timesteps")
+
+
 def drop_time_periods(df, time_periods):
     """Drop problematic time periods."""
-    for time_period in time_periods:
-        if len(df) > 0:
-            start_time = time_period[0]
-            end_time = time_period[1]
-            df = df[(df["time"] < start_time) | (df["time"] > end_time)]
-    # Check there are row left
-    if len(df) == 0:
-        msg = "No rows left after removing problematic time_periods. Maybe you need to adjust the issue YAML file."
-        log_warning(logger=logger, msg=msg, verbose=False)
-        raise ValueError(msg)
+    issue_intervals = compile_issue_intervals({"time_periods": time_periods})
+    return _drop_issue_intervals(df, issue_intervals, description="time_periods")
 
-    return df
 
-
-def remove_issue_timesteps(df, issue_dict, verbose=False):
+@time_stage("remove_issue_timesteps")
+def remove_issue_timesteps(df, issue_dict, verbose=False, issue_intervals=None):
     """Drop dataframe rows with timesteps listed in the issue dictionary.
 
     Parameters
@@ -257,6 +260,9 @@ def remove_issue_timesteps(df, issue_dict, verbose=False):
         Issue dictionary.
     verbose : bool
         Whether to verbose the processing. The default is ``False``.
+    issue_intervals : dict, optional
+        Issue intervals compiled with ``disdrodb.issue.intervals.compile_issue_intervals``.
+        If specified, ``issue_dict`` is not used. The default is ``None``.
 
     Returns
     -------
@@ -267,17 +273,13 @@ def remove_issue_timesteps(df, issue_dict, verbose=False):
     # Retrieve number of initial rows
     n_initial_rows = len(df)
 
-    # Retrieve timesteps and time_periods
-    timesteps = issue_dict.get("timesteps", None)
-    time_periods = issue_dict.get("time_periods", None)
-
-    # Drop rows of specified timesteps
-    if timesteps:
-        df = drop_timesteps(df=df, timesteps=timesteps)
+    # Compile the issue timesteps and time_periods into sorted and merged intervals
+    if issue_intervals is None:
+        issue_intervals = compile_issue_intervals(issue_dict)
 
-    # Drop rows within specified time_period
-    if time_periods:
-        df = drop_time_periods(df, time_periods=time_periods)
+    # Drop rows within the issue intervals
+    if len(issue_intervals["starts"]) > 0:
+        df = _drop_issue_intervals(df, issue_intervals, description="timesteps and time_periods")
 
     # Report number of dropped rows
     n_rows_dropped = n_initial_rows - len(df)
@@ -288,6 +290,7 @@ def remove_issue_timesteps(df, issue_dict, verbose=False):
     return df
 
 
+@time_stage("cast_column_dtypes")
 def cast_column_dtypes(df: pd.DataFrame, sensor_name: str, verbose: bool = False) -> pd.DataFrame:
     """Convert ``'object'`` dataframe columns into DISDRODB L0A dtype standards.
 
@@ -328,6 +331,7 @@ def cast_column_dtypes(df: pd.DataFrame, sensor_name: str, verbose: bool = False
     return df
 
 
+@time_stage("coerce_corrupted_values_to_nan")
 def coerce_corrupted_values_to_nan(df: pd.DataFrame, sensor_name: str, verbose: bool = False) -> pd.DataFrame:
     """Coerce corrupted values in dataframe numeric columns to ``np.nan``.
 
@@ -361,6 +365,7 @@ def coerce_corrupted_values_to_nan(df: pd.DataFrame, sensor_name: str, verbose:
     return df
 
 
+@time_stage("strip_string_spaces")
 def strip_string_spaces(df: pd.DataFrame, sensor_name: str, verbose: bool = False) -> pd.DataFrame:
     """Strip leading/trailing spaces from dataframe string columns.
 
@@ -406,6 +411,7 @@ def _strip_delimiter(string):
     return string
 
 
+@time_stage("strip_delimiter_from_raw_arrays")
 def strip_delimiter_from_raw_arrays(df):
     """Remove the first and last delimiter occurrence from the raw array fields."""
     # Possible fields
@@ -432,6 +438,7 @@ def _is_not_corrupted(string):
     return ~np.any(np.isnan(values))
 
 
+@time_stage("remove_corrupted_rows")
 def remove_corrupted_rows(df):
     """Remove corrupted rows by checking conversion of raw fields to numeric.
 
@@ -458,6 +465,7 @@ def remove_corrupted_rows(df):
     return df
 
 
+@time_stage("replace_nan_flags")
 def replace_nan_flags(df, sensor_name, verbose=False):
     """Set values corresponding to ``nan_flags`` to ``np.nan``.
 
@@ -493,6 +501,7 @@ def replace_nan_flags(df, sensor_name, verbose=False):
     return df
 
 
+@time_stage("set_nan_outside_data_range")
 def set_nan_outside_data_range(df, sensor_name, verbose=False):
     """Set values outside the data range as ``np.nan``.
 
@@ -532,6 +541,7 @@ def set_nan_outside_data_range(df, sensor_name, verbose=False):
     return df
 
 
+@time_stage("set_nan_invalid_values")
 def set_nan_invalid_values(df, sensor_name, verbose=False):
     """Set invalid (class) values to ``np.nan``.
 
@@ -576,6 +586,7 @@ def process_raw_file(
     sensor_name,
     verbose=True,
     issue_dict={},
+    issue_intervals=None,
 ):
     """Read and parse a raw text files into a L0A dataframe.
 
@@ -600,6 +611,9 @@ def process_raw_file(
         Valid issue_dict values are list of datetime64 values (with second accuracy).
         To correctly format and check the validity of the ``issue_dict``, use
         the ``disdrodb.l0.issue.check_issue_dict`` function.
+    issue_intervals : dict, optional
+        Issue intervals compiled with ``disdrodb.issue.intervals.compile_issue_intervals``.
+        If specified, ``issue_dict`` is not used. The default is ``None``.
 
     Returns
     -------
@@ -615,6 +629,8 @@ def process_raw_file(
         reader_kwargs=reader_kwargs,
     )
 
+    increment_counter("n_raw_rows", len(df))
+
     # - Check if file empty
     _check_not_empty_dataframe(df=df, verbose=verbose)
 
@@ -623,7 +639,8 @@ def process_raw_file(
 
     # - Sanitize the dataframe with a custom function
     if df_sanitizer_fun is not None:
-        df = df_sanitizer_fun(df)
+        with time_stage("df_sanitizer_fun"):
+            df = df_sanitizer_fun(df)
 
     # - Remove rows with time NaT
     df = remove_rows_with_missing_time(df, verbose=verbose)
@@ -632,7 +649,7 @@ def process_raw_file(
     df = remove_duplicated_timesteps(df, verbose=verbose)
 
     # - Filter out problematic tiemsteps reported in the issue YAML file
-    df = remove_issue_timesteps(df, issue_dict=issue_dict, verbose=verbose)
+    df = remove_issue_timesteps(df, issue_dict=issue_dict, verbose=verbose, issue_intervals=issue_intervals)
 
     # - Coerce numeric columns corrupted values to np.nan
     df = coerce_corrupted_values_to_nan(df, sensor_name=sensor_name, verbose=verbose)
@@ -663,7 +680,9 @@ def process_raw_file(
     check_l0a_column_names(df, sensor_name=sensor_name)
 
     # - Check the dataframe respects the DISDRODB standards
-    check_l0a_standards(df=df, sensor_name=sensor_name, verbose=verbose)
+    with time_stage("check_l0a_standards"):
+        check_l0a_standards(df=df, sensor_name=sensor_name, verbose=verbose)
+    increment_counter("n_l0a_rows", len(df))
 
     # ------------------------------------------------------.
     # Return the L0A dataframe
@@ -674,6 +693,7 @@ def process_raw_file(
 #### L0A Apache Parquet Writer
 
 
+@time_stage("write_l0a")
 def write_l0a(
     df: pd.DataFrame,
     filepath: str,
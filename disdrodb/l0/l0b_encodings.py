@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""DISDRODB L0B encodings optimizer.
+
+The ``l0b_encodings.yml`` chunk sizes and compression levels are adapted to the dataset to write:
+
+- The time chunk size targets ``TARGET_CHUNK_BYTES`` of uncompressed data, scaled up for sparse spectra
+  (which compress well). With the ``spectrum`` access pattern, the spectra chunks span at most
+  ``SPECTRUM_CHUNK_DURATION`` seconds to speed up the reading of a few spectra.
+- Sparse spectra are compressed with the fastest compression level, while large variables
+  (i.e. decade-long concatenations) are compressed with a higher compression level.
+
+In benchmark mode, candidate chunk sizes and compression levels of the spectra variables are written and read back
+on a sample of the dataset, and the candidate with the smallest size among the fastest ones is selected.
+The chosen settings are recorded in the ``disdrodb_encodings`` global attribute.
+"""
+
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import xarray as xr
+
+from disdrodb.utils.netcdf import get_engine_lock
+
+ACCESS_PATTERNS = ["timeseries", "spectrum"]
+TARGET_CHUNK_BYTES = 1024 * 1024
+MAX_SPARSITY_FACTOR = 8
+SPECTRUM_CHUNK_DURATION = 3600
+SPARSE_THRESHOLD = 0.9
+SPARSE_COMPLEVEL = 1
+LARGE_VARIABLE_BYTES = 1024**3
+LARGE_VARIABLE_COMPLEVEL = 5
+BENCHMARK_N_TIMESTEPS = 10_000
+BENCHMARK_COMPLEVELS = [1, 3, 5, 9]
+BENCHMARK_TIME_TOLERANCE = 1.5
+DEFAULT_SAMPLING_INTERVAL = 60
+
+
+def check_access_pattern(access_pattern):
+    """Check the validity of the target access pattern."""
+    if access_pattern not in ACCESS_PATTERNS:
+        raise ValueError(f"Invalid access_pattern '{access_pattern}'. Valid access patterns are {ACCESS_PATTERNS}.")
+    return access_pattern
+
+
+def get_l0b_encoding_options(optimize=None, access_pattern=None, benchmark=None):
+    """Return the L0B encodings optimizer options.
+
+    If an option is ``None``, the ``l0b_encodings_optimize``, ``l0b_encodings_access_pattern``
+    and ``l0b_encodings_benchmark`` keys of the DISDRODB configuration are used.
+    By default, the ``l0b_encodings.yml`` encodings are used as they are.
+    """
+    import disdrodb
+
+    if optimize is None:
+        optimize = disdrodb.config.get("l0b_encodings_optimize", False)
+    if access_pattern is None:
+        access_pattern = disdrodb.config.get("l0b_encodings_access_pattern", "timeseries")
+    if benchmark is None:
+        benchmark = disdrodb.config.get("l0b_encodings_benchmark", False)
+    return {
+        "optimize": bool(optimize),
+        "access_pattern": check_access_pattern(access_pattern),
+        "benchmark": bool(benchmark),
+    }
+
+
+def get_sampling_interval(ds):
+    """Return the (median) sampling interval of the dataset in seconds."""
+    if ds.sizes.get("time", 0) < 2:
+        return DEFAULT_SAMPLING_INTERVAL
+    time_diff = np.diff(ds["time"].values).astype("m8[s]").astype(float)
+    time_diff = time_diff[time_diff > 0]
+    if len(time_diff) == 0:
+        return DEFAULT_SAMPLING_INTERVAL
+    return float(np.median(time_diff))
+
+
+def get_variable_sparsity(da, n_timesteps=BENCHMARK_N_TIMESTEPS):
+    """Return the fraction of zero values of the first ``n_timesteps`` of a variable."""
+    values = np.asarray(da.isel(time=slice(0, n_timesteps)).values)
+    if values.size == 0:
+        return 0.0
+    return float(np.count_nonzero(values == 0) / values.size)
+
+
+def _get_variable_itemsize(da, encoding):
+    return np.dtype(encoding.get("dtype", da.dtype)).itemsize
+
+
+def define_time_chunksize(ds, var, encoding, access_pattern="timeseries", sparsity=0.0):
+    """Define the time chunk size of a variable."""
+    da = ds[var]
+    n_timesteps = max(ds.sizes["time"], 1)
+    n_values = int(np.prod([ds.sizes[dim] for dim in da.dims if dim != "time"]))
+    # Target chunk size (larger for sparse spectra)
+    target_chunk_bytes = TARGET_CHUNK_BYTES * min(MAX_SPARSITY_FACTOR, 1 / max(1 - sparsity, 1e-6))
+    chunksize = int(target_chunk_bytes // (n_values * _get_variable_itemsize(da, encoding)))
+    # Limit the duration of the spectra chunks for spectrum reads
+    if access_pattern == "spectrum" and da.ndim > 1:
+        chunksize = min(chunksize, int(SPECTRUM_CHUNK_DURATION // get_sampling_interval(ds)))
+    return int(np.clip(chunksize, 1, n_timesteps))
+
+
+def define_complevel(ds, var, encoding, sparsity=0.0):
+    """Define the compression level of a variable."""
+    complevel = encoding.get("complevel", None)
+    if not encoding.get("zlib", False) or complevel is None:
+        return complevel
+    if sparsity >= SPARSE_THRESHOLD:
+        return SPARSE_COMPLEVEL
+    n_bytes = ds[var].size * _get_variable_itemsize(ds[var], encoding)
+    if n_bytes >= LARGE_VARIABLE_BYTES:
+        return max(complevel, LARGE_VARIABLE_COMPLEVEL)
+    return complevel
+
+
+def _is_optimizable(ds, var, encoding):
+    """Return ``True`` if the variable is chunked along its first ``time`` dimension."""
+    return len(encoding.get("chunksizes") or []) > 0 and ds[var].dims[0] == "time"
+
+
+def _benchmark_candidate(ds_sample, var, encoding, access_pattern, dir_path):
+    """Write and read back a variable sample with the given encoding. Return the file size and elapsed time."""
+    filepath = os.path.join(dir_path, f"{var}_{encoding['complevel']}_{encoding['chunksizes'][0]}.nc")
+    with get_engine_lock("netcdf4"):
+        t_start = time.perf_counter()
+        ds_sample[[var]].to_netcdf(filepath, engine="netcdf4", encoding={var: encoding})
+        with xr.open_dataset(filepath, engine="netcdf4", cache=False) as ds:
+            if access_pattern == "spectrum":
+                indices = np.linspace(0, ds.sizes["time"] - 1, 20).astype(int)
+                for idx in indices:
+                    _ = ds[var].isel(time=idx).values
+            else:
+                _ = ds[var].values
+        elapsed_time = time.perf_counter() - t_start
+    n_bytes = os.path.getsize(filepath)
+    os.remove(filepath)
+    return n_bytes, elapsed_time
+
+
+def benchmark_variable_encoding(ds, var, encoding, access_pattern="timeseries", n_timesteps=BENCHMARK_N_TIMESTEPS):
+    """Select the time chunk size and compression level of a variable by benchmarking candidates on a sample.
+
+    The candidate with the smallest file size among the candidates whose write and read time is
+    within ``BENCHMARK_TIME_TOLERANCE`` times the fastest one is selected.
+    """
+    ds_sample = ds[[var]].isel(time=slice(0, n_timesteps)).load()
+    sparsity = get_variable_sparsity(ds_sample[var])
+    time_chunksizes = {
+        define_time_chunksize(ds_sample, var, encoding, access_pattern=pattern, sparsity=sparsity)
+        for pattern in ACCESS_PATTERNS
+    }
+    time_chunksizes.add(min(encoding["chunksizes"][0], ds_sample.sizes["time"]))
+    complevels = BENCHMARK_COMPLEVELS if encoding.get("zlib", False) else [encoding.get("complevel")]
+    results = []
+    with tempfile.TemporaryDirectory() as dir_path:
+        for complevel in complevels:
+            for time_chunksize in sorted(time_chunksizes):
+                candidate = {
+                    **encoding,
+                    "complevel": complevel,
+                    "chunksizes": [time_chunksize, *encoding["chunksizes"][1:]],
+                }
+                n_bytes, elapsed_time = _benchmark_candidate(ds_sample, var, candidate, access_pattern, dir_path)
+                results.append((n_bytes, elapsed_time, complevel, time_chunksize))
+    fastest_time = min(result[1] for result in results)
+    results = [result for result in results if result[1] <= fastest_time * BENCHMARK_TIME_TOLERANCE]
+    _, _, complevel, time_chunksize = min(results)
+    # Scale the time chunk size to the full dataset
+    if time_chunksize == ds_sample.sizes["time"]:
+        time_chunksize = define_time_chunksize(ds, var, encoding, access_pattern=access_pattern, sparsity=sparsity)
+    return complevel, time_chunksize
+
+
+def optimize_encodings_dict(encoding_dict, ds, access_pattern="timeseries", benchmark=False):
+    """Adapt the chunk sizes and compression levels of the encoding dictionary to the dataset.
+
+    Parameters
+    ----------
+    encoding_dict : dict
+        Dictionary containing the encoding to write DISDRODB L0B netCDFs.
+    ds : xr.Dataset
+        Dataset to write.
+    access_pattern : str
+        Target access pattern. Either ``"timeseries"`` or ``"spectrum"``.
+        The default is ``"timeseries"``.
+    benchmark : bool
+        Whether to select the spectra variables encodings by benchmarking candidates on a sample of the dataset.
+        The default is ``False``.
+
+    Returns
+    -------
+    tuple
+        The optimized encoding dictionary and the dictionary of the chosen settings.
+    """
+    access_pattern = check_access_pattern(access_pattern)
+    settings = {"access_pattern": access_pattern, "benchmark": benchmark, "variables": {}}
+    for var, encoding in encoding_dict.items():
+        if not _is_optimizable(ds, var, encoding):
+            continue
+        if benchmark and ds[var].ndim > 1:
+            complevel, time_chunksize = benchmark_variable_encoding(ds, var, encoding, access_pattern=access_pattern)
+        else:
+            sparsity = get_variable_sparsity(ds[var]) if ds[var].ndim > 1 else 0.0
+            complevel = define_complevel(ds, var, encoding, sparsity=sparsity)
+            time_chunksize = define_time_chunksize(ds, var, encoding, access_pattern=access_pattern, sparsity=sparsity)
+        encoding["chunksizes"] = [time_chunksize, *encoding["chunksizes"][1:]]
+        if complevel is not None:
+            encoding["complevel"] = complevel
+        settings["variables"][var] = {"chunksizes": encoding["chunksizes"], "complevel": complevel}
+    return encoding_dict, settings
+
+
+def format_encodings_settings(settings):
+    """Format the chosen encodings settings into a string to be saved as netCDF attribute."""
+    return json.dumps(settings, sort_keys=True)
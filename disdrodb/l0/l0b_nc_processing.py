@@ -19,6 +19,7 @@
 """Functions to process DISDRODB raw netCDF files into DISDRODB L0B netCDF files."""
 
 import copy
+import functools
 import logging
 
 import numpy as np
@@ -28,6 +29,7 @@ from disdrodb.l0.l0b_processing import finalize_dataset
 from disdrodb.l0.standards import (
     get_bin_coords_dict,
     get_data_range_dict,
+    get_masking_rules_dict,
     get_nan_flags_dict,
     get_valid_names,
     get_valid_values_dict,
@@ -41,6 +43,30 @@ from disdrodb.utils.logger import (
 )
 
 logger = logging.getLogger(__name__)
+
+
+def get_l0b_nc_options(lazy=None, chunksize=None):
+    """Return the raw netCDFs L0B processing options.
+
+    If an option is ``None``, the ``l0b_nc_lazy`` and ``l0b_nc_chunksize`` keys of the DISDRODB configuration are used.
+    If ``lazy=True``, the raw netCDFs are not loaded into memory but processed by chunks of ``chunksize`` timesteps.
+    """
+    import disdrodb
+
+    if lazy is None:
+        lazy = disdrodb.config.get("l0b_nc_lazy", False)
+    if chunksize is None:
+        chunksize = disdrodb.config.get("l0b_nc_chunksize", 1000)
+    if int(chunksize) < 1:
+        raise ValueError("'chunksize' must be a positive integer.")
+    return bool(lazy), int(chunksize)
+
+
+def _is_lazy(da):
+    """Return ``True`` if the DataArray values are a dask array."""
+    return da.chunks is not None
+
+
 ####--------------------------------------------------------------------------.
 #### L0B Raw netCDFs Preprocessing
 
@@ -186,6 +212,7 @@ def replace_custom_nan_flags(ds, dict_nan_flags, verbose=False):
     """Set values corresponding to ``nan_flags`` to ``np.nan``.
 
     This function must be used in a reader, if necessary.
+    Lazy (dask) variables are masked lazily and the number of replaced values is not logged.
 
     Parameters
     ----------
@@ -207,6 +234,9 @@ def replace_custom_nan_flags(ds, dict_nan_flags, verbose=False):
         if var in ds:
             # Get occurrence of nan_flags
             is_a_nan_flag = ds[var].isin(nan_flags)
+            if _is_lazy(ds[var]):
+                ds[var] = ds[var].where(~is_a_nan_flag)
+                continue
             n_nan_flags_values = np.sum(is_a_nan_flag.data)
             if n_nan_flags_values > 0:
                 msg = f"In variable {var}, {n_nan_flags_values} values were nan_flags and were replaced to np.nan."
@@ -269,6 +299,9 @@ def set_nan_outside_data_range(ds, sensor_name, verbose):
             max_val = data_range[1]
             # Check within data range or already np.nan
             is_valid = (ds[var] >= min_val) & (ds[var] <= max_val) | np.isnan(ds[var])
+            if _is_lazy(ds[var]):
+                ds[var] = ds[var].where(is_valid)
+                continue
             # If there are values outside the data range, set to np.nan
             n_invalid = np.sum(~is_valid.data)
             if n_invalid > 0:
@@ -304,6 +337,9 @@ def set_nan_invalid_values(ds, sensor_name, verbose):
         if var in ds:
             # Get array with occurrence of correct values (or already np.nan)
             is_valid_values = ds[var].isin(valid_values) | np.isnan(ds[var])
+            if _is_lazy(ds[var]):
+                ds[var] = ds[var].where(is_valid_values)
+                continue
             # If invalid values are present, replace with np.nan
             n_invalid_values = np.sum(~is_valid_values.data)
             if n_invalid_values > 0:
@@ -315,6 +351,87 @@ def set_nan_invalid_values(ds, sensor_name, verbose):
     return ds
 
 
+def _get_variable_masks(values, nan_flags=None, data_range=None, valid_values=None):
+    """Return the masks of the ``nan_flags``, outside ``data_range`` and invalid values of an array.
+
+    The masks are mutually exclusive: values already masked by a rule are not masked again by the following ones.
+    Works with both numpy and dask arrays.
+    """
+    is_nan = np.isnan(values)
+    is_masked = is_nan
+    masks = {}
+    if nan_flags is not None:
+        masks["nan_flags"] = np.isin(values, nan_flags)
+        is_masked = is_masked | masks["nan_flags"]
+    if data_range is not None:
+        with np.errstate(invalid="ignore"):
+            masks["outside_data_range"] = ~((values >= data_range[0]) & (values <= data_range[1])) & ~is_masked
+        is_masked = is_masked | masks["outside_data_range"]
+    if valid_values is not None:
+        masks["invalid_values"] = ~np.isin(values, valid_values) & ~is_masked
+    return masks
+
+
+def set_nan_invalid_data(ds, sensor_name, verbose=False, inplace=False):
+    """Set ``nan_flags``, values outside the data range and invalid values to ``np.nan`` in a single pass.
+
+    The sensor rules are read once. For each variable, a single combined mask is built and applied.
+    Floating point numpy arrays are masked in place if ``inplace=True``.
+    Integer arrays are converted to float only if some values must be masked.
+    Lazy (dask) variables are masked lazily and their counts are not computed.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        Input xarray dataset.
+    sensor_name : str
+        Name of the sensor.
+    verbose : bool
+        Whether to verbose the processing. The default is ``False``.
+    inplace : bool
+        Whether to mask the floating point arrays in place. The default is ``False``.
+
+    Returns
+    -------
+    tuple
+        The masked ``xr.Dataset`` and the summary dictionary with the number of
+        ``nan_flags``, ``outside_data_range`` and ``invalid_values`` values set to ``np.nan`` of each variable.
+    """
+    dict_rules = get_masking_rules_dict(sensor_name)
+    summary = {}
+    for var, rules in dict_rules.items():
+        if var not in ds:
+            continue
+        if _is_lazy(ds[var]):
+            masks = _get_variable_masks(ds[var].data, **rules)
+            if len(masks) > 0:
+                is_invalid = functools.reduce(np.logical_or, masks.values())
+                ds[var] = ds[var].where(~is_invalid)
+            continue
+        values = ds[var].values
+        masks = _get_variable_masks(values, **rules)
+        counts = {rule: int(np.count_nonzero(mask)) for rule, mask in masks.items()}
+        summary[var] = counts
+        if sum(counts.values()) == 0:
+            continue
+        is_invalid = functools.reduce(np.logical_or, masks.values())
+        if inplace and np.issubdtype(values.dtype, np.floating) and values.flags.writeable:
+            values[is_invalid] = np.nan
+        else:
+            ds[var] = ds[var].where(~is_invalid)
+
+    # Log the summary
+    list_msg = [
+        f"{var} ({', '.join(f'{count} {rule}' for rule, count in counts.items() if count > 0)})"
+        for var, counts in summary.items()
+        if sum(counts.values()) > 0
+    ]
+    if len(list_msg) > 0:
+        msg = f"Values set to np.nan: {'; '.join(list_msg)}."
+        log_info(logger=logger, msg=msg, verbose=verbose)
+    return ds, summary
+
+
 def create_l0b_from_raw_nc(
     ds,
     dict_names,
@@ -322,6 +439,7 @@ def create_l0b_from_raw_nc(
     sensor_name,
     verbose,
     attrs,
+    chunksize=None,
 ):
     """Convert a raw ``xr.Dataset`` into a DISDRODB L0B netCDF.
 
@@ -340,7 +458,11 @@ def create_l0b_from_raw_nc(
         Name of the sensor.
     verbose : bool
         Whether to verbose the processing.
-
+    chunksize : int, optional
+        If specified, the variables are chunked along the time dimension with ``chunksize`` timesteps
+        and the L0B dataset is computed lazily (i.e. when writing it to disk).
+        The raw dataset should then be opened without loading it into memory.
+        The default is ``None``.
 
     Returns
     -------
@@ -350,6 +472,10 @@ def create_l0b_from_raw_nc(
     # Preprocess netcdf
     ds = preprocess_raw_netcdf(ds=ds, dict_names=dict_names, sensor_name=sensor_name)
 
+    # Chunk the (subsetted) variables along time
+    if chunksize is not None:
+        ds = ds.chunk({"time": chunksize})
+
     # Add CRS and geolocation information
     attrs = copy.deepcopy(attrs)
     coords = {}
@@ -366,14 +492,9 @@ def create_l0b_from_raw_nc(
     # Apply dataset sanitizer function
     ds = ds_sanitizer_fun(ds)
 
-    # Replace nan flags values with np.nans
-    ds = replace_nan_flags(ds, sensor_name=sensor_name, verbose=verbose)
-
-    # Set values outside the data range to np.nan
-    ds = set_nan_outside_data_range(ds, sensor_name=sensor_name, verbose=verbose)
-
-    # Replace invalid values with np.nan
-    ds = set_nan_invalid_values(ds, sensor_name=sensor_name, verbose=verbose)
+    # Replace nan flags, values outside the data range and invalid values with np.nan
+    # - The raw dataset is owned by the L0B processing: arrays can be masked in place
+    ds, _ = set_nan_invalid_data(ds, sensor_name=sensor_name, verbose=verbose, inplace=True)
 
     # Finalize dataset
     ds = finalize_dataset(ds, sensor_name=sensor_name)
@@ -29,6 +29,7 @@ from disdrodb.l0.check_standards import (
     _check_raw_fields_available,
     check_l0b_standards,
 )
+from disdrodb.l0.l0b_encodings import format_encodings_settings, optimize_encodings_dict
 from disdrodb.l0.standards import (
     # get_valid_coordinates_names,
     get_bin_coords_dict,
@@ -49,9 +50,37 @@ from disdrodb.utils.logger import (
     log_error,
     log_info,
 )
+from disdrodb.utils.metrics import time_stage
+from disdrodb.utils.netcdf import get_engine_lock, set_engine_encodings
+from disdrodb.utils.sparse import sparsify_dataset
 
 logger = logging.getLogger(__name__)
 
+L0B_TIME_WINDOWS = {"day": "M8[D]", "month": "M8[M]", "year": "M8[Y]"}
+
+
+def get_l0b_batch_options(batch_size=None, time_window=None):
+    """Return the L0B batch processing options.
+
+    If an option is ``None``, the ``l0b_batch_size`` and ``l0b_time_window`` keys
+    of the DISDRODB configuration are used.
+    The L0A files are processed by batches of ``batch_size`` files. If ``time_window`` is ``"day"``, ``"month"``
+    or ``"year"``, a L0B file is written for each time window of a batch, and the L0B files of the time windows
+    shared by consecutive batches are merged. By default (``batch_size=1`` and ``time_window=None``),
+    each L0A file is processed into a single L0B file.
+    """
+    import disdrodb
+
+    if batch_size is None:
+        batch_size = disdrodb.config.get("l0b_batch_size", 1)
+    if time_window is None:
+        time_window = disdrodb.config.get("l0b_time_window", None)
+    if int(batch_size) < 1:
+        raise ValueError("'batch_size' must be a positive integer.")
+    if time_window is not None and time_window not in L0B_TIME_WINDOWS:
+        raise ValueError(f"Invalid time_window '{time_window}'. Valid time windows are {list(L0B_TIME_WINDOWS)}.")
+    return int(batch_size), time_window
+
 
 ####--------------------------------------------------------------------------.
 #### L0B Raw Precipitation Spectrum Processing
@@ -143,6 +172,63 @@ def _format_string_array(string: str, n_values: int) -> np.array:
     return values
 
 
+def _strings_to_float(values: list) -> np.array:
+    """Convert a list of strings to a float array (empty strings are converted to 0).
+
+    Each unique string is converted only once.
+    """
+    codes, uniques = pd.factorize(np.array(values, dtype=object))
+    uniques_values = np.array([float(value) if value else 0.0 for value in uniques], dtype=float)
+    return uniques_values[codes]
+
+
+def _format_string_arrays(series: pd.Series, n_values: int) -> np.array:
+    """Split the strings of a series into a 2D array of shape ``(len(series), n_values)``.
+
+    It is a vectorized version of ``_format_string_array``: the strings with the same delimiter
+    are joined and split once. The strings without delimiter are formatted by ``_format_string_array``.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Input series of strings.
+    n_values : int
+        Expected length of each array.
+
+    Returns
+    -------
+    np.array
+        2D array of float
+    """
+    strings = series.astype(str).tolist()
+    n_semicolons = np.array([string.count(";") for string in strings], dtype=int)
+    n_commas = np.array([string.count(",") for string in strings], dtype=int)
+    arr = np.full((len(strings), n_values), np.nan)
+    # Infer the delimiter of each string (as in infer_split_str)
+    dict_indices = {
+        ";": np.flatnonzero((n_semicolons >= n_commas) & (n_semicolons > 0)),
+        ",": np.flatnonzero(n_commas > n_semicolons),
+        None: np.flatnonzero((n_semicolons == 0) & (n_commas == 0)),
+    }
+    for split_str, indices in dict_indices.items():
+        if len(indices) == 0:
+            continue
+        if split_str is None:
+            arr[indices] = np.stack([_format_string_array(strings[i], n_values) for i in indices])
+            continue
+        stripped = [strings[i].strip(split_str) for i in indices]
+        # If the length is not as expected --> Assume data corruption (leave NaN)
+        is_valid = np.array([string.count(split_str) + 1 for string in stripped]) == n_values
+        if not np.any(is_valid):
+            continue
+        # Replace "-9.999" with 0
+        joined = split_str.join([string for string, valid in zip(stripped, is_valid) if valid])
+        values = joined.replace("-9.999", "0").split(split_str)
+        # Cast values to float type (and replace '' with 0)
+        arr[indices[is_valid]] = _strings_to_float(values).reshape(-1, n_values)
+    return arr
+
+
 def _reshape_raw_spectrum(
     arr: np.array,
     dims_order: list,
@@ -197,6 +283,7 @@ def _reshape_raw_spectrum(
     return arr, dims
 
 
+@time_stage("retrieve_l0b_arrays")
 def retrieve_l0b_arrays(
     df: pd.DataFrame,
     sensor_name: str,
@@ -246,12 +333,8 @@ def retrieve_l0b_arrays(
             unavailable_keys.append(key)
             continue
 
-        # Ensure is a string
-        df_series = df[key].astype(str)
-
-        # Get a numpy array for each row and then stack
-        list_arr = df_series.apply(_format_string_array, n_values=n_values)
-        arr = np.stack(list_arr, axis=0)
+        # Split the strings of all rows into a 2D array
+        arr = _format_string_arrays(df[key], n_values=n_values)
 
         # Retrieve dimensions
         dims_order = dims_order_dict[key]
@@ -477,10 +560,76 @@ def create_l0b_from_l0a(
     return ds
 
 
+def split_dataset_by_time_window(ds: xr.Dataset, time_window=None) -> list:
+    """Split a L0B dataset into the datasets of each time window.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        L0B dataset.
+    time_window : str, optional
+        Either ``"day"``, ``"month"`` or ``"year"``.
+        If ``None`` (the default), the dataset is not split.
+
+    Returns
+    -------
+    list
+        List of L0B datasets sorted by time.
+    """
+    if time_window is None or ds.sizes["time"] == 0:
+        return [ds]
+    if not ds.indexes["time"].is_monotonic_increasing:
+        ds = ds.sortby("time")
+    # Identify the first timestep of each time window
+    windows = ds["time"].values.astype(L0B_TIME_WINDOWS[time_window])
+    indices = [0, *(np.flatnonzero(windows[1:] != windows[:-1]) + 1).tolist(), len(windows)]
+    return [ds.isel(time=slice(start, end)) for start, end in zip(indices[:-1], indices[1:]) if end > start]
+
+
+def select_time_window(ds: xr.Dataset, window: np.datetime64) -> xr.Dataset:
+    """Select the timesteps of a dataset within a time window.
+
+    The time window is a ``numpy.datetime64`` with the time window unit (i.e. ``numpy.datetime64("2023-01", "M")``).
+    """
+    windows = ds["time"].values.astype(window.dtype)
+    return ds.isel(time=windows == window)
+
+
+def group_filepaths_by_time_window(filepaths: list, time_window: str) -> dict:
+    """Group the DISDRODB files by the time windows they overlap.
+
+    The time period covered by each file is retrieved from the file name.
+
+    Parameters
+    ----------
+    filepaths : list
+        List of DISDRODB file paths.
+    time_window : str
+        Either ``"day"``, ``"month"`` or ``"year"``.
+
+    Returns
+    -------
+    dict
+        Dictionary with the ``numpy.datetime64`` time windows (sorted by time) as keys
+        and the list of the file paths overlapping each time window as values.
+    """
+    from disdrodb.api.info import get_start_end_time_from_filepaths
+
+    dtype = L0B_TIME_WINDOWS[time_window]
+    start_times, end_times = get_start_end_time_from_filepaths(filepaths)
+    dict_windows = {}
+    for filepath, start_time, end_time in zip(filepaths, start_times, end_times):
+        windows = np.arange(np.datetime64(start_time).astype(dtype), np.datetime64(end_time).astype(dtype) + 1)
+        for window in windows:
+            dict_windows.setdefault(window, []).append(filepath)
+    return dict(sorted(dict_windows.items()))
+
+
 ####--------------------------------------------------------------------------.
 #### L0B netCDF4 Writer
 
 
+@time_stage("finalize_dataset")
 def finalize_dataset(ds, sensor_name):
     """Finalize DISDRODB L0B Dataset."""
     # Add dataset CRS coordinate
@@ -549,7 +698,43 @@ def rechunk_dataset(ds: xr.Dataset, encoding_dict: dict) -> xr.Dataset:
     return ds
 
 
-def set_encodings(ds: xr.Dataset, sensor_name: str) -> xr.Dataset:
+def set_netcdf_chunksizes(ds: xr.Dataset, encoding_dict: dict) -> dict:
+    """Specify the chunk size of the encoding dictionary only as netCDF encoding.
+
+    Contrary to ``rechunk_dataset``, the dataset arrays are not converted to dask arrays.
+    The ``chunksizes`` argument is removed for contiguous (unchunked) variables.
+    As in ``rechunk_dataset``, the dimensions without a specified chunk size are not chunked.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        Input xarray dataset
+    encoding_dict : dict
+        Dictionary containing the encoding to write the xarray dataset as a netCDF.
+
+    Returns
+    -------
+    dict
+        Encoding dictionary.
+    """
+    for var in ds.data_vars:
+        chunks = encoding_dict[var].get("chunksizes", None)
+        if chunks is None or len(chunks) == 0:
+            encoding_dict[var].pop("chunksizes", None)
+        else:
+            shape = ds[var].shape
+            chunks = list(chunks[: len(shape)]) + list(shape[len(chunks) :])
+            encoding_dict[var]["chunksizes"] = [max(chunk, 1) for chunk in chunks]
+    return encoding_dict
+
+
+def is_dask_dataset(ds: xr.Dataset) -> bool:
+    """Return ``True`` if a dataset variable is backed by a dask array."""
+    return any(ds[var].chunks is not None for var in ds.data_vars)
+
+
+@time_stage("set_encodings")
+def set_encodings(ds: xr.Dataset, sensor_name: str, encoding_options=None, rechunk=None) -> xr.Dataset:
     """Apply the encodings to the xarray Dataset.
 
     Parameters
@@ -558,6 +743,14 @@ def set_encodings(ds: xr.Dataset, sensor_name: str) -> xr.Dataset:
         Input xarray dataset.
     sensor_name : str
         Name of the sensor.
+    encoding_options : dict, optional
+        Encodings optimizer options returned by ``disdrodb.l0.l0b_encodings.get_l0b_encoding_options``.
+        If ``None`` (the default) or if the ``optimize`` option is ``False``,
+        the ``l0b_encodings.yml`` encodings are used.
+    rechunk : bool, optional
+        Whether to rechunk the dataset arrays to the encoding chunk sizes with dask before writing.
+        If ``False``, the arrays are left unchanged and the chunk sizes are specified only as netCDF encoding.
+        If ``None`` (the default), only datasets with dask arrays are rechunked.
 
     Returns
     -------
@@ -571,9 +764,31 @@ def set_encodings(ds: xr.Dataset, sensor_name: str) -> xr.Dataset:
     # Ensure chunksize smaller than the array shape
     encoding_dict = sanitize_encodings_dict(encoding_dict, ds)
 
-    # Rechunk variables for fast writing !
-    # - This pop the chunksize argument from the encoding dict !
-    ds = rechunk_dataset(ds, encoding_dict)
+    # Adapt the chunk sizes and compression levels to the dataset
+    settings = None
+    if encoding_options is not None and encoding_options["optimize"]:
+        encoding_dict, settings = optimize_encodings_dict(
+            encoding_dict,
+            ds,
+            access_pattern=encoding_options["access_pattern"],
+            benchmark=encoding_options["benchmark"],
+        )
+        ds.attrs["disdrodb_encodings"] = format_encodings_settings(settings)
+
+    # Define the chunking
+    # - In-memory datasets are written directly without dask (chunk sizes specified as netCDF encoding)
+    if rechunk is None:
+        rechunk = is_dask_dataset(ds)
+    if rechunk:
+        # Rechunk variables for fast writing !
+        # - This pop the chunksize argument from the encoding dict !
+        ds = rechunk_dataset(ds, encoding_dict)
+        # Write the optimized netCDF chunks
+        if settings is not None:
+            for var, var_settings in settings["variables"].items():
+                encoding_dict[var]["chunksizes"] = var_settings["chunksizes"]
+    else:
+        encoding_dict = set_netcdf_chunksizes(ds, encoding_dict)
 
     # Set time encoding
     ds["time"].encoding.update(get_time_encoding())
@@ -585,7 +800,15 @@ def set_encodings(ds: xr.Dataset, sensor_name: str) -> xr.Dataset:
     return ds
 
 
-def write_l0b(ds: xr.Dataset, filepath: str, force=False) -> None:
+def write_l0b(
+    ds: xr.Dataset,
+    filepath: str,
+    force=False,
+    sparse=False,
+    encoding_options=None,
+    rechunk=None,
+    engine="netcdf4",
+) -> None:
     """Save the xarray dataset into a NetCDF file.
 
     Parameters
@@ -600,6 +823,17 @@ def write_l0b(ds: xr.Dataset, filepath: str, force=False) -> None:
         Whether to overwrite existing data.
         If ``True``, overwrite existing data into destination directories.
         If ``False``, raise an error if there are already data into destination directories. This is the default.
+    sparse : bool, optional
+        Whether to store the spectra variables (i.e. ``raw_drop_number``) in the sparse layout.
+        See ``disdrodb.utils.sparse``. The default is ``False``.
+    encoding_options : dict, optional
+        Encodings optimizer options. See ``set_encodings``.
+    rechunk : bool, optional
+        Whether to rechunk the dataset arrays with dask before writing. See ``set_encodings``.
+        By default, only datasets with dask arrays are rechunked.
+    engine : str, optional
+        Engine used to write the netCDF. Either ``"netcdf4"`` or ``"h5netcdf"``.
+        The default is ``"netcdf4"``.
     """
     # Create station directory if does not exist
     create_directory(os.path.dirname(filepath))
@@ -613,10 +847,26 @@ def write_l0b(ds: xr.Dataset, filepath: str, force=False) -> None:
     sensor_name = ds.attrs.get("sensor_name")
 
     # Set encodings
-    ds = set_encodings(ds=ds, sensor_name=sensor_name)
+    ds = set_encodings(ds=ds, sensor_name=sensor_name, encoding_options=encoding_options, rechunk=rechunk)
+
+    # Convert spectra variables to the sparse layout
+    if sparse:
+        ds = sparsify_dataset(ds)
+
+    # Adapt the encodings to the writer engine
+    ds = set_engine_encodings(ds, engine=engine)
 
     # Write netcdf
-    ds.to_netcdf(filepath, engine="netcdf4")
+    # - The lazy variables are computed and written after releasing the engine lock
+    #   (see get_engine_lock), so that threads write lazy datasets concurrently
+    with time_stage("to_netcdf"):
+        if is_dask_dataset(ds):
+            with get_engine_lock(engine):
+                delayed = ds.to_netcdf(filepath, engine=engine, compute=False)
+            delayed.compute()
+        else:
+            with get_engine_lock(engine):
+                ds.to_netcdf(filepath, engine=engine)
 
 
 ####--------------------------------------------------------------------------.
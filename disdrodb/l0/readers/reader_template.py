@@ -49,7 +49,7 @@ def reader(
     reader_kwargs["engine"] = "python"
 
     # - Define on-the-fly decompression of on-disk data
-    #   - Available: gzip, bz2, zip
+    #   - Available: gzip, bz2, zip, zstd (requires the zstandard package)
     reader_kwargs["compression"] = "infer"
 
     # - Strings to recognize as NA/NaN and replace with standard NA flags
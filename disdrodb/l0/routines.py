@@ -77,6 +77,13 @@ def click_l0_processing_options(function: object):
     function : object
         Function.
     """
+    function = click.option(
+        "--profile",
+        type=bool,
+        show_default=True,
+        default=False,
+        help="Profile the processing of a sample of files",
+    )(function)
     function = click.option(
         "-p",
         "--parallel",
@@ -198,6 +205,7 @@ def run_disdrodb_l0a_station(
     debugging_mode: bool = False,
     parallel: bool = True,
     base_dir: str = None,
+    profile: bool = False,
 ):
     """Run the L0A processing of a station calling the disdrodb_l0a_station in the terminal."""
     # Define command
@@ -214,6 +222,8 @@ def run_disdrodb_l0a_station(
         str(verbose),
         "--debugging_mode",
         str(debugging_mode),
+        "--profile",
+        str(profile),
         "--parallel",
         str(parallel),
         "--base_dir",
@@ -236,6 +246,7 @@ def run_disdrodb_l0b_station(
     parallel: bool = True,
     base_dir: str = None,
     remove_l0a: bool = False,
+    profile: bool = False,
 ):
     """Run the L0B processing of a station calling disdrodb_run_l0b_station in the terminal."""
     # Define command
@@ -252,6 +263,8 @@ def run_disdrodb_l0b_station(
         str(verbose),
         "--debugging_mode",
         str(debugging_mode),
+        "--profile",
+        str(profile),
         "--parallel",
         str(parallel),
         "--remove_l0a",
@@ -311,6 +324,7 @@ def run_disdrodb_l0_station(
     debugging_mode: bool = False,
     parallel: bool = True,
     base_dir: str = None,
+    profile: bool = False,
 ):
     """Run the L0 processing of a specific DISDRODB station from the terminal.
 
@@ -363,6 +377,10 @@ def run_disdrodb_l0_station(
     base_dir : str (optional)
         Base directory of DISDRODB. Format: ``<...>/DISDRODB``.
         If ``None`` (the default), the ``base_dir`` path specified in the DISDRODB active configuration will be used.
+    profile : bool
+        If ``True``, a sample of files of each station is processed under ``cProfile``.
+        The merged profiles are saved next to the station logs.
+        The default is ``False``.
     """
 
     # ---------------------------------------------------------------------.
@@ -383,6 +401,7 @@ def run_disdrodb_l0_station(
             force=force,
             verbose=verbose,
             debugging_mode=debugging_mode,
+            profile=profile,
             parallel=parallel,
         )
     # ------------------------------------------------------------------.
@@ -398,6 +417,7 @@ def run_disdrodb_l0_station(
             force=force,
             verbose=verbose,
             debugging_mode=debugging_mode,
+            profile=profile,
             parallel=parallel,
             remove_l0a=remove_l0a,
         )
@@ -469,6 +489,7 @@ def run_disdrodb_l0(
     debugging_mode: bool = False,
     parallel: bool = True,
     base_dir: str = None,
+    profile: bool = False,
 ):
     """Run the L0 processing of DISDRODB stations.
 
@@ -529,6 +550,10 @@ def run_disdrodb_l0(
     base_dir : str (optional)
         Base directory of DISDRODB. Format: ``<...>/DISDRODB``.
         If ``None`` (the default), the ``base_dir`` path specified in the DISDRODB active configuration will be used.
+    profile : bool
+        If ``True``, a sample of files of each station is processed under ``cProfile``.
+        The merged profiles are saved next to the station logs.
+        The default is ``False``.
     """
     from disdrodb.api.io import available_stations
 
@@ -566,6 +591,7 @@ def run_disdrodb_l0(
             force=force,
             verbose=verbose,
             debugging_mode=debugging_mode,
+            profile=profile,
             parallel=parallel,
         )
         print(f"L0 processing of {data_source} {campaign_name} {station_name} station ended.")
@@ -581,6 +607,7 @@ def run_disdrodb_l0a(
     debugging_mode: bool = False,
     parallel: bool = True,
     base_dir: str = None,
+    profile: bool = False,
 ):
     """Run the L0A processing of DISDRODB stations.
 
@@ -620,6 +647,10 @@ def run_disdrodb_l0a(
     base_dir : str (optional)
         Base directory of DISDRODB. Format: ``<...>/DISDRODB``.
         If ``None`` (the default), the ``base_dir`` path specified in the DISDRODB active configuration will be used.
+    profile : bool
+        If ``True``, a sample of files of each station is processed under ``cProfile``.
+        The merged profiles are saved next to the station logs.
+        The default is ``False``.
     """
     run_disdrodb_l0(
         base_dir=base_dir,
@@ -636,6 +667,7 @@ def run_disdrodb_l0a(
         force=force,
         verbose=verbose,
         debugging_mode=debugging_mode,
+        profile=profile,
         parallel=parallel,
     )
 
@@ -651,6 +683,7 @@ def run_disdrodb_l0b(
     parallel: bool = True,
     base_dir: str = None,
     remove_l0a: bool = False,
+    profile: bool = False,
 ):
     """Run the L0B processing of DISDRODB stations.
 
@@ -690,6 +723,10 @@ def run_disdrodb_l0b(
     base_dir : str (optional)
         Base directory of DISDRODB. Format: ``<...>/DISDRODB``.
         If ``None`` (the default), the ``base_dir`` path specified in the DISDRODB active configuration will be used.
+    profile : bool
+        If ``True``, a sample of files of each station is processed under ``cProfile``.
+        The merged profiles are saved next to the station logs.
+        The default is ``False``.
     """
     run_disdrodb_l0(
         base_dir=base_dir,
@@ -706,6 +743,7 @@ def run_disdrodb_l0b(
         force=force,
         verbose=verbose,
         debugging_mode=debugging_mode,
+        profile=profile,
         parallel=parallel,
     )
 
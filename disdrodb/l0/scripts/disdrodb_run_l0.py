@@ -49,6 +49,7 @@ def disdrodb_run_l0(
     verbose: bool = True,
     parallel: bool = True,
     debugging_mode: bool = False,
+    profile: bool = False,
     base_dir: str = None,
 ):
     """
@@ -61,6 +62,11 @@ def disdrodb_run_l0(
     Parameters
     ----------
 
+    profile : bool
+        If True, a sample of files of each station is processed under cProfile.
+        The merged profiles and a flamegraph-ready collapsed stacks file are saved next to the logs.
+        The number of profiled files is defined by the DISDRODB 'profile_n_files' configuration key.
+        The default is False.
     base_dir : str
         Base directory of DISDRODB
         Format: <...>/DISDRODB
@@ -142,6 +148,7 @@ def disdrodb_run_l0(
         force=force,
         verbose=verbose,
         debugging_mode=debugging_mode,
+        profile=profile,
         parallel=parallel,
     )
     return None
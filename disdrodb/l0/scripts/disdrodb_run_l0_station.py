@@ -55,6 +55,7 @@ def disdrodb_run_l0_station(
     verbose: bool = True,
     parallel: bool = True,
     debugging_mode: bool = False,
+    profile: bool = False,
     base_dir: str = None,
 ):
     """Run the L0 processing of a specific DISDRODB station from the terminal.
@@ -106,6 +107,11 @@ def disdrodb_run_l0_station(
         For L0A, it processes just the first 3 raw data files for each station.\n
         For L0B, it processes just the first 100 rows of 3 L0A files for each station.\n
         The default is False.\n
+    profile : bool \n
+        If True, a sample of files of each station is processed under cProfile.\n
+        The merged profiles and a flamegraph-ready collapsed stacks file are saved next to the logs.\n
+        The number of profiled files is defined by the DISDRODB 'profile_n_files' configuration key.\n
+        The default is False.\n
     base_dir : str \n
         Base directory of DISDRODB \n
         Format: <...>/DISDRODB \n
@@ -130,6 +136,7 @@ def disdrodb_run_l0_station(
         force=force,
         verbose=verbose,
         debugging_mode=debugging_mode,
+        profile=profile,
         parallel=parallel,
     )
 
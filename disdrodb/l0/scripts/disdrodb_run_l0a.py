@@ -42,6 +42,7 @@ def disdrodb_run_l0a(
     verbose: bool = True,
     parallel: bool = True,
     debugging_mode: bool = False,
+    profile: bool = False,
     base_dir: str = None,
 ):
     """
@@ -84,6 +85,11 @@ def disdrodb_run_l0a(
         If True, it reduces the amount of data to process.
         It processes just the first 3 raw data files for each station.
         The default is False.
+    profile : bool
+        If True, a sample of files of each station is processed under cProfile.
+        The merged profiles and a flamegraph-ready collapsed stacks file are saved next to the logs.
+        The number of profiled files is defined by the DISDRODB 'profile_n_files' configuration key.
+        The default is False.
     base_dir : str
         Base directory of DISDRODB
         Format: <...>/DISDRODB
@@ -107,6 +113,7 @@ def disdrodb_run_l0a(
         force=force,
         verbose=verbose,
         debugging_mode=debugging_mode,
+        profile=profile,
         parallel=parallel,
     )
 
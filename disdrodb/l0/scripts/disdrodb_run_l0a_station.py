@@ -45,6 +45,7 @@ def disdrodb_run_l0a_station(
     verbose: bool = False,
     parallel: bool = True,
     debugging_mode: bool = False,
+    profile: bool = False,
     base_dir: str = None,
 ):
     """
@@ -78,6 +79,11 @@ def disdrodb_run_l0a_station(
         If True, it reduces the amount of data to process.
         It processes just the first 3 raw data files.
         The default is False.
+    profile : bool
+        If True, a sample of files of each station is processed under cProfile.
+        The merged profiles and a flamegraph-ready collapsed stacks file are saved next to the logs.
+        The number of profiled files is defined by the DISDRODB 'profile_n_files' configuration key.
+        The default is False.
     base_dir : str
         Base directory of DISDRODB.
         Format: <...>/DISDRODB
@@ -120,6 +126,7 @@ def disdrodb_run_l0a_station(
         force=force,
         verbose=verbose,
         debugging_mode=debugging_mode,
+        profile=profile,
         parallel=parallel,
         base_dir=base_dir,
     )
@@ -46,6 +46,7 @@ def disdrodb_run_l0b_station(
     verbose: bool = True,
     parallel: bool = True,
     debugging_mode: bool = False,
+    profile: bool = False,
     remove_l0a: bool = False,
     base_dir: str = None,
 ):
@@ -80,6 +81,11 @@ def disdrodb_run_l0b_station(
         If True, it reduces the amount of data to process.
         It processes just the first 100 rows of 3 L0A files.
         The default is False.
+    profile : bool
+        If True, a sample of files of each station is processed under cProfile.
+        The merged profiles and a flamegraph-ready collapsed stacks file are saved next to the logs.
+        The number of profiled files is defined by the DISDRODB 'profile_n_files' configuration key.
+        The default is False.
     base_dir : str
         Base directory of DISDRODB
         Format: <...>/DISDRODB
@@ -122,6 +128,7 @@ def disdrodb_run_l0b_station(
         force=force,
         verbose=verbose,
         debugging_mode=debugging_mode,
+        profile=profile,
         parallel=parallel,
         remove_l0a=remove_l0a,
         base_dir=base_dir,
@@ -151,6 +151,38 @@ def get_valid_values_dict(sensor_name: str) -> dict:
     return dict_valid_values
 
 
+def get_masking_rules_dict(sensor_name: str) -> dict:
+    """Get the ``nan_flags``, ``data_range`` and ``valid_values`` of each variable.
+
+    The data format configuration file is read only once.
+
+    Parameters
+    ----------
+    sensor_name : str
+        Name of the sensor.
+
+    Returns
+    -------
+    dict
+        Dictionary with the ``nan_flags``, ``data_range`` and ``valid_values`` rules of each data field.
+        It excludes variables without any rule. Unspecified rules are ``None``.
+    """
+    data_format_dict = get_data_format_dict(sensor_name)
+    dict_rules = {}
+    for k, format_dict in data_format_dict.items():
+        nan_flags = format_dict.get("nan_flags", None)
+        data_range = format_dict.get("data_range", None)
+        valid_values = format_dict.get("valid_values", None)
+        if nan_flags is None and data_range is None and valid_values is None:
+            continue
+        dict_rules[k] = {
+            "nan_flags": _ensure_list_value(nan_flags) if nan_flags is not None else None,
+            "data_range": data_range,
+            "valid_values": _ensure_list_value(valid_values) if valid_values is not None else None,
+        }
+    return dict_rules
+
+
 ####--------------------------------------------------------------------------.
 #### Get variable string format
 def get_field_ndigits_natural_dict(sensor_name: str) -> dict:
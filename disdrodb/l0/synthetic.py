@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Synthetic raw disdrometer data generators.
+
+The generators create raw text data following the DISDRODB standards of each sensor
+(see ``disdrodb/l0/configs/<sensor_name>``). They are used for benchmarking and testing
+the L0 processing with configurable data volume and data quality.
+
+The synthetic raw files are semicolon-delimited text files without header.
+The raw arrays are comma-delimited (with a trailing delimiter).
+Use ``get_synthetic_column_names``, ``SYNTHETIC_READER_KWARGS`` and ``synthetic_df_sanitizer``
+to read them with ``disdrodb.l0.l0a_processing.process_raw_file``.
+"""
+
+import contextlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from disdrodb.l0.l0_reader import is_documented_by, reader_generic_docstring
+from disdrodb.l0.standards import (
+    get_data_format_dict,
+    get_l0a_dtype,
+    get_raw_array_nvalues,
+)
+
+SYNTHETIC_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+SYNTHETIC_READER_KWARGS = {
+    "delimiter": ";",
+    "header": None,
+    "index_col": False,
+    "on_bad_lines": "skip",
+    "engine": "c",
+    "na_values": ["na", "", "error"],
+}
+
+SYNTHETIC_READER = "SYNTHETIC/SYNTHETIC"
+
+SYNTHETIC_SENSOR_NAMES = ["OTT_Parsivel", "OTT_Parsivel2", "Thies_LPM", "RD_80"]
+
+RAW_ARRAYS = ["raw_drop_concentration", "raw_drop_average_velocity", "raw_drop_number"]
+
+
+@is_documented_by(reader_generic_docstring)
+def synthetic_reader(
+    raw_dir,
+    processed_dir,
+    station_name,
+    # Processing options
+    force=False,
+    verbose=False,
+    parallel=False,
+    debugging_mode=False,
+):
+    # Reader of the synthetic raw files (for testing and benchmarking)
+    # - It is not part of disdrodb.l0.readers: the SYNTHETIC/SYNTHETIC metadata reader reference
+    #   is resolved by disdrodb.l0.l0_reader.get_reader_function
+    from disdrodb.api.info import infer_path_info_dict
+    from disdrodb.l0 import run_l0a
+    from disdrodb.metadata import read_station_metadata
+
+    ##------------------------------------------------------------------------.
+    #### - Define column names
+    # - The columns of the synthetic raw files depend on the sensor
+    metadata = read_station_metadata(station_name=station_name, product="RAW", **infer_path_info_dict(raw_dir))
+    column_names = get_synthetic_column_names(metadata["sensor_name"])
+
+    ##------------------------------------------------------------------------.
+    #### - Define reader options
+    reader_kwargs = SYNTHETIC_READER_KWARGS.copy()
+    # - Define on-the-fly decompression of on-disk data
+    reader_kwargs["compression"] = "infer"
+
+    ##------------------------------------------------------------------------.
+    #### - Define glob pattern to search data files in <raw_dir>/data/<station_name>
+    glob_patterns = "*.txt*"
+
+    ####----------------------------------------------------------------------.
+    #### - Create L0A products
+    run_l0a(
+        raw_dir=raw_dir,
+        processed_dir=processed_dir,
+        station_name=station_name,
+        # Custom arguments of the reader for L0A processing
+        glob_patterns=glob_patterns,
+        column_names=column_names,
+        reader_kwargs=reader_kwargs,
+        df_sanitizer_fun=synthetic_df_sanitizer,
+        # Processing options
+        force=force,
+        verbose=verbose,
+        parallel=parallel,
+        debugging_mode=debugging_mode,
+    )
+
+
+def _get_numeric_variables(sensor_name):
+    """Return the dictionary of the sensor numeric variables with a data range or valid values."""
+    data_format = get_data_format_dict(sensor_name)
+    dtype_dict = get_l0a_dtype(sensor_name)
+    variables = {}
+    for var, var_dict in data_format.items():
+        if var in RAW_ARRAYS or var not in dtype_dict or dtype_dict[var] == "str":
+            continue
+        if var_dict.get("valid_values") is not None or var_dict.get("data_range") is not None:
+            variables[var] = var_dict
+    return variables
+
+
+def get_synthetic_column_names(sensor_name):
+    """Return the column names of the synthetic raw files of a sensor."""
+    raw_arrays = [var for var in RAW_ARRAYS if var in get_raw_array_nvalues(sensor_name)]
+    return ["time", *_get_numeric_variables(sensor_name), *raw_arrays]
+
+
+def synthetic_df_sanitizer(df):
+    """Sanitize the synthetic raw dataframe (i.e. convert the time column to datetime)."""
+    df["time"] = pd.to_datetime(df["time"], format=SYNTHETIC_TIME_FORMAT, errors="coerce")
+    return df
+
+
+def get_synthetic_metadata(sensor_name):
+    """Return the minimal station metadata required to create L0B products from synthetic data."""
+    return {
+        "sensor_name": sensor_name,
+        "latitude": 46.52,
+        "longitude": 6.57,
+        "altitude": 400.0,
+        "platform_type": "fixed",
+        "raw_data_format": "txt",
+    }
+
+
+def _generate_variable_values(rng, var_dict, n_rows):
+    """Generate the string values of a numeric variable."""
+    valid_values = var_dict.get("valid_values")
+    if valid_values is not None:
+        values = rng.choice(np.atleast_1d(valid_values), size=n_rows)
+        return values.astype(str)
+    vmin, vmax = var_dict["data_range"]
+    n_decimals = var_dict.get("n_decimals") or 0
+    values = np.round(rng.uniform(vmin, vmax, size=n_rows), n_decimals)
+    if n_decimals == 0:
+        values = values.astype(int)
+    return values.astype(str)
+
+
+def _format_raw_arrays(arr):
+    """Format the rows of an array into comma-delimited strings (with trailing delimiter)."""
+    return [",".join(map(str, row)) + "," for row in arr.tolist()]
+
+
+def _generate_raw_array_values(rng, var, n_values, is_raining):
+    """Generate the string values of a raw array variable.
+
+    Dry timesteps have zero values (and share the same string object).
+    """
+    n_rows = len(is_raining)
+    n_rainy = int(is_raining.sum())
+    if var == "raw_drop_number":
+        dry_string = ",".join(["0"] * n_values) + ","
+        arr = rng.poisson(0.3, size=(n_rainy, n_values))
+    else:
+        dry_string = ",".join(["0.000"] * n_values) + ","
+        vmax = 10.0 if var == "raw_drop_average_velocity" else 5.0
+        arr = np.round(rng.uniform(0, vmax, size=(n_rainy, n_values)), 3)
+    values = np.full(n_rows, dry_string, dtype=object)
+    values[is_raining] = _format_raw_arrays(arr)
+    return values
+
+
+def generate_raw_dataframe(
+    sensor_name,
+    n_rows,
+    start_time="2020-01-01 00:00:00",
+    sample_interval=60,
+    rain_fraction=0.1,
+    corruption_rate=0.0,
+    duplicate_rate=0.0,
+    seed=0,
+):
+    """Generate a synthetic raw dataframe of a sensor.
+
+    All columns are strings, as when read from a raw text file.
+
+    Parameters
+    ----------
+    sensor_name : str
+        Name of the sensor.
+    n_rows : int
+        Number of rows.
+    start_time : str, optional
+        Time of the first row. The default is ``"2020-01-01 00:00:00"``.
+    sample_interval : int, optional
+        Sampling interval in seconds. The default is 60.
+    rain_fraction : float, optional
+        Fraction of timesteps with precipitation (non-zero raw arrays). The default is 0.1.
+    corruption_rate : float, optional
+        Fraction of corrupted rows. A corrupted row has an invalid timestep,
+        an invalid numeric value or an invalid raw array. The default is 0.
+    duplicate_rate : float, optional
+        Fraction of rows duplicating the previous timestep. The default is 0.
+    seed : int, optional
+        Seed of the random number generator. The default is 0.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Synthetic raw dataframe.
+    """
+    for name, rate in [("rain_fraction", rain_fraction), ("corruption_rate", corruption_rate)]:
+        if not 0 <= rate <= 1:
+            raise ValueError(f"'{name}' must be between 0 and 1.")
+    if not 0 <= duplicate_rate < 1:
+        raise ValueError("'duplicate_rate' must be between 0 and 1 (excluded).")
+    rng = np.random.default_rng(seed)
+
+    # Define the timesteps (with duplicated timesteps)
+    n_duplicates = int(round(n_rows * duplicate_rate))
+    n_timesteps = n_rows - n_duplicates
+    times = pd.date_range(start=start_time, periods=n_timesteps, freq=f"{sample_interval}s")
+    idx_rows = np.sort(np.concatenate([np.arange(n_timesteps), rng.integers(0, n_timesteps, size=n_duplicates)]))
+    times = times[idx_rows]
+
+    # Generate the variables
+    data = {"time": np.asarray(times.strftime(SYNTHETIC_TIME_FORMAT), dtype=object)}
+    for var, var_dict in _get_numeric_variables(sensor_name).items():
+        data[var] = _generate_variable_values(rng, var_dict, n_rows)
+    is_raining = rng.random(n_rows) < rain_fraction
+    for var, n_values in get_raw_array_nvalues(sensor_name).items():
+        data[var] = _generate_raw_array_values(rng, var, n_values, is_raining)
+    df = pd.DataFrame(data)[get_synthetic_column_names(sensor_name)]
+
+    # Corrupt rows
+    n_corrupted = int(round(n_rows * corruption_rate))
+    if n_corrupted > 0:
+        idx_corrupted = rng.choice(n_rows, size=n_corrupted, replace=False)
+        corruption_type = rng.integers(0, 3, size=n_corrupted)
+        numeric_columns = list(_get_numeric_variables(sensor_name))
+        df.loc[idx_corrupted[corruption_type == 0], "time"] = "corrupted"
+        for idx in idx_corrupted[corruption_type == 1]:
+            df.at[idx, numeric_columns[rng.integers(0, len(numeric_columns))]] = "Err"
+        df.loc[idx_corrupted[corruption_type == 2], "raw_drop_number"] = "Error in data reading! 0000"
+    return df
+
+
+def generate_raw_file(filepath, sensor_name, n_rows, **kwargs):
+    """Write a synthetic raw text file.
+
+    The file is compressed if ``filepath`` ends with a compression extension (i.e. ``.gz``).
+    Additional arguments are passed to ``generate_raw_dataframe``.
+    """
+    df = generate_raw_dataframe(sensor_name=sensor_name, n_rows=n_rows, **kwargs)
+    os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+    df.to_csv(filepath, sep=";", header=False, index=False, compression="infer")
+    return filepath
+
+
+def generate_l0a_dataframe(sensor_name, n_rows, **kwargs):
+    """Generate a synthetic DISDRODB L0A dataframe.
+
+    Additional arguments are passed to ``generate_raw_dataframe``.
+    Corrupted and duplicated rows are not allowed since the L0A dataframe is already cleaned.
+    """
+    from disdrodb.l0.l0a_processing import cast_column_dtypes, strip_delimiter_from_raw_arrays
+
+    if kwargs.get("corruption_rate", 0) != 0 or kwargs.get("duplicate_rate", 0) != 0:
+        raise ValueError("A L0A dataframe can not have corrupted or duplicated rows.")
+    df = generate_raw_dataframe(sensor_name=sensor_name, n_rows=n_rows, **kwargs)
+    df = synthetic_df_sanitizer(df)
+    df = strip_delimiter_from_raw_arrays(df)
+    df = cast_column_dtypes(df, sensor_name=sensor_name)
+    return df
+
+
+def create_synthetic_station(
+    base_dir,
+    data_source,
+    campaign_name,
+    station_name,
+    sensor_name="OTT_Parsivel",
+    n_files=1,
+    n_rows=1440,
+    compress=False,
+    **kwargs,
+):
+    """Create a DISDRODB station with synthetic raw files.
+
+    The station metadata points to the ``SYNTHETIC/SYNTHETIC`` reader (see ``synthetic_reader``).
+    Each raw file covers a distinct time period of ``n_rows`` timesteps.
+    Additional arguments are passed to ``generate_raw_dataframe``.
+
+    Returns
+    -------
+    list
+        List of the synthetic raw files paths.
+    """
+    from disdrodb.api.create_directories import create_initial_station_structure
+    from disdrodb.api.path import define_metadata_filepath, define_station_dir
+    from disdrodb.utils.yaml import read_yaml, write_yaml
+
+    station_kwargs = {
+        "base_dir": base_dir,
+        "data_source": data_source,
+        "campaign_name": campaign_name,
+        "station_name": station_name,
+    }
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_initial_station_structure(**station_kwargs)
+
+    # Update the station metadata
+    metadata_filepath = define_metadata_filepath(product="RAW", **station_kwargs)
+    metadata = read_yaml(metadata_filepath)
+    metadata.update(get_synthetic_metadata(sensor_name))
+    metadata["reader"] = SYNTHETIC_READER
+    write_yaml(metadata, filepath=metadata_filepath, sort_keys=False)
+
+    # Write the raw files
+    station_dir = define_station_dir(product="RAW", **station_kwargs)
+    start_time = pd.Timestamp(kwargs.pop("start_time", "2020-01-01 00:00:00"))
+    file_duration = pd.Timedelta(seconds=n_rows * kwargs.get("sample_interval", 60))
+    seed = kwargs.pop("seed", 0)
+    extension = ".txt.gz" if compress else ".txt"
+    filepaths = []
+    for i in range(n_files):
+        file_start_time = start_time + i * file_duration
+        filename = f"{station_name}_{file_start_time.strftime('%Y%m%d%H%M%S')}{extension}"
+        filepath = generate_raw_file(
+            os.path.join(station_dir, filename),
+            sensor_name=sensor_name,
+            n_rows=n_rows,
+            start_time=file_start_time,
+            seed=seed + i,
+            **kwargs,
+        )
+        filepaths.append(filepath)
+    return filepaths
+
+
+def create_synthetic_archive(base_dir, n_data_sources=1, n_campaigns=1, n_stations=1, **kwargs):
+    """Create a DISDRODB archive of synthetic stations.
+
+    The archive has ``n_data_sources`` data sources, each with ``n_campaigns`` campaigns
+    of ``n_stations`` stations. Additional arguments are passed to ``create_synthetic_station``.
+
+    Returns
+    -------
+    list
+        List of ``(data_source, campaign_name, station_name)`` tuples.
+    """
+    list_info = []
+    for i in range(n_data_sources):
+        for j in range(n_campaigns):
+            for k in range(n_stations):
+                station_info = (f"SYNTHETIC_{i}", f"CAMPAIGN_{j}", f"STATION_{k}")
+                create_synthetic_station(
+                    base_dir,
+                    *station_info,
+                    **kwargs,
+                )
+                list_info.append(station_info)
+    return list_info
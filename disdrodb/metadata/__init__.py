@@ -1,5 +1,11 @@
 from disdrodb.metadata.info import get_archive_metadata_key_value
 from disdrodb.metadata.reader import read_station_metadata
 from disdrodb.metadata.search import get_list_metadata
+from disdrodb.metadata.table import get_archive_metadata_table
 
-__all__ = ["read_station_metadata", "get_list_metadata", "get_archive_metadata_key_value"]
+__all__ = [
+    "read_station_metadata",
+    "get_list_metadata",
+    "get_archive_metadata_key_value",
+    "get_archive_metadata_table",
+]
@@ -18,10 +18,14 @@
 # -----------------------------------------------------------------------------.
 """Check metadata."""
 
+import hashlib
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 
 import numpy as np
+import yaml
 
 from disdrodb.api.info import (
     infer_campaign_name_from_path,
@@ -248,47 +252,282 @@ def identify_empty_metadata_keys(metadata_filepaths: list, keys: Union[str, list
 #### Check Metadata Archive
 
 
-def check_archive_metadata_keys(base_dir: str = None) -> bool:
-    """Check that all metadata files have valid keys.
+def _check_station_metadata_keys(metadata, data_source, campaign_name, station_name):
+    _check_metadata_keys(metadata)
+
+
+def _check_station_metadata_values(metadata, data_source, campaign_name, station_name):
+    _check_metadata_values(metadata)
+
+
+def _check_station_metadata_campaign_name(metadata, data_source, campaign_name, station_name):
+    _check_metadata_campaign_name(metadata, expected_name=campaign_name)
+
+
+def _check_station_metadata_data_source(metadata, data_source, campaign_name, station_name):
+    _check_metadata_data_source(metadata, expected_name=data_source)
+
+
+def _check_station_metadata_station_name(metadata, data_source, campaign_name, station_name):
+    _check_metadata_station_name(metadata, expected_name=station_name)
+
+
+def _check_station_metadata_sensor_name(metadata, data_source, campaign_name, station_name):
+    _check_metadata_sensor_name(metadata)
+
+
+def _check_station_metadata_reader(metadata, data_source, campaign_name, station_name):
+    from disdrodb.l0.l0_reader import _check_metadata_reader
+
+    _check_metadata_reader(metadata)
+
+
+def _check_station_metadata_geolocation(metadata, data_source, campaign_name, station_name):
+    check_metadata_geolocation(metadata)
+
+
+ARCHIVE_METADATA_CHECKS = {
+    "keys": _check_station_metadata_keys,
+    "values": _check_station_metadata_values,
+    "campaign_name": _check_station_metadata_campaign_name,
+    "data_source": _check_station_metadata_data_source,
+    "station_name": _check_station_metadata_station_name,
+    "sensor_name": _check_station_metadata_sensor_name,
+    "reader": _check_station_metadata_reader,
+    "geolocation": _check_station_metadata_geolocation,
+}
+COMPLIANCE_CHECKS = ["keys", "values", "campaign_name", "data_source", "station_name", "sensor_name", "reader"]
+METADATA_CHECKS_CACHE_FILENAME = ".disdrodb_metadata_checks.json"
+
+
+def _check_metadata_checks(checks):
+    """Check the validity of the metadata checks names."""
+    if checks is None:
+        return list(ARCHIVE_METADATA_CHECKS)
+    if isinstance(checks, str):
+        checks = [checks]
+    invalid_checks = [check for check in checks if check not in ARCHIVE_METADATA_CHECKS]
+    if len(invalid_checks) > 0:
+        raise ValueError(f"Invalid metadata checks {invalid_checks}. Valid checks are {list(ARCHIVE_METADATA_CHECKS)}.")
+    return list(checks)
+
+
+def _get_disdrodb_version():
+    import disdrodb
+
+    return getattr(disdrodb, "__version__", "")
+
+
+def _read_metadata_checks_cache(cache_filepath):
+    """Read the cached metadata checks results.
+
+    The cache is discarded if it has been created by another disdrodb version.
+    """
+    if not os.path.isfile(cache_filepath):
+        return {}
+    try:
+        with open(cache_filepath) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != _get_disdrodb_version():
+        return {}
+    return cache.get("stations", {})
+
+
+def _write_metadata_checks_cache(cache_dict, cache_filepath):
+    """Write the metadata checks results cache."""
+    cache = {"version": _get_disdrodb_version(), "stations": cache_dict}
+    tmp_filepath = cache_filepath + ".tmp"
+    with open(tmp_filepath, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_filepath, cache_filepath)
+
+
+def _run_station_metadata_checks(filepath, checks, cached_station):
+    """Read a station metadata file once and run the specified checks.
+
+    Results of checks already run on a metadata file with identical content are taken from ``cached_station``.
+    Each check result is ``None`` if the check succeeds, otherwise the error message.
+    """
+    data_source = infer_data_source_from_path(filepath)
+    campaign_name = infer_campaign_name_from_path(filepath)
+    station_name = os.path.basename(filepath).replace(".yml", "")
+    with open(filepath, "rb") as f:
+        content = f.read()
+    file_hash = hashlib.sha256(content).hexdigest()
+
+    # Retrieve results of unchanged metadata from the cache
+    results = {}
+    if cached_station is not None and cached_station.get("hash") == file_hash:
+        results = {check: msg for check, msg in cached_station["results"].items() if check in checks}
+    is_cached = len(results) == len(checks)
+
+    # Run the remaining checks
+    missing_checks = [check for check in checks if check not in results]
+    if len(missing_checks) > 0:
+        try:
+            metadata = yaml.safe_load(content)
+            if not isinstance(metadata, dict):
+                raise ValueError("The metadata file does not contain a dictionary.")
+        except Exception as e:
+            metadata = None
+            read_error = f"Unable to read the metadata file. The error is: {e}"
+        for check in missing_checks:
+            if metadata is None:
+                results[check] = read_error
+                continue
+            try:
+                ARCHIVE_METADATA_CHECKS[check](
+                    metadata,
+                    data_source=data_source,
+                    campaign_name=campaign_name,
+                    station_name=station_name,
+                )
+                results[check] = None
+            except Exception as e:
+                results[check] = str(e)
+
+    # Update the cached results
+    cached_results = {}
+    if cached_station is not None and cached_station.get("hash") == file_hash:
+        cached_results = cached_station["results"].copy()
+    cached_results.update(results)
+    station_report = {
+        "data_source": data_source,
+        "campaign_name": campaign_name,
+        "station_name": station_name,
+        "filepath": filepath,
+        "cached": is_cached,
+        "errors": {check: msg for check, msg in results.items() if msg is not None},
+    }
+    return station_report, {"hash": file_hash, "results": cached_results}
+
+
+def check_archive_metadata(
+    base_dir: str = None,
+    checks=None,
+    parallel: bool = True,
+    max_workers: int = None,
+    cache: bool = False,
+    cache_filepath: str = None,
+    report_filepath: str = None,
+) -> dict:
+    """Run the metadata checks over all the DISDRODB Metadata Archive.
+
+    Every station metadata YAML file is read only once and all the requested checks are run on it.
 
     Parameters
     ----------
     base_dir : str (optional)
-        Base directory of DISDRODB. Format: ``<...>/DISDRODB``
-        If ``None`` (the default), the disdrodb config key ``base_dir`` is used.
+        Base directory of DISDRODB. Format: ``<...>/DISDRODB``.
+        If ``None`` (the default), the ``base_dir`` path specified in the DISDRODB active configuration will be used.
+    checks : str or list (optional)
+        Name of the checks to run. See ``ARCHIVE_METADATA_CHECKS`` for the available checks.
+        If ``None`` (the default), all checks are run.
+    parallel : bool (optional)
+        Whether to check the metadata files with a pool of threads. The default is ``True``.
+    max_workers : int (optional)
+        Maximum number of threads. If ``None``, the ``concurrent.futures`` default is used.
+    cache : bool (optional)
+        Whether to reuse (and update) the results of previous runs.
+        Checks are rerun only on metadata files whose content (SHA256 hash) changed.
+        The default is ``False``.
+    cache_filepath : str (optional)
+        Path of the JSON cache file. The default is ``<base_dir>/.disdrodb_metadata_checks.json``.
+    report_filepath : str (optional)
+        If specified, the check report is written into this JSON file.
 
     Returns
     -------
-    bool
-        If the check succeeds, the result is ``True``, otherwise ``False``.
+    dict
+        The check report, with the ``n_stations`` and ``n_invalid`` counts and the ``stations`` list.
+        Each station entry contains the ``errors`` dictionary ``{<check>: <error message>}``.
     """
-    is_valid = True
     base_dir = get_base_dir(base_dir)
+    checks = _check_metadata_checks(checks)
     list_metadata_paths = get_list_metadata(
         base_dir=base_dir, data_sources=None, campaign_names=None, station_names=None, with_stations_data=False
     )
-    for filepath in list_metadata_paths:
-        data_source = infer_data_source_from_path(filepath)
-        campaign_name = infer_campaign_name_from_path(filepath)
-        station_name = os.path.basename(filepath).replace(".yml", "")
-
-        metadata = read_station_metadata(
-            base_dir=base_dir,
-            product="RAW",
-            data_source=data_source,
-            campaign_name=campaign_name,
-            station_name=station_name,
+    list_metadata_paths = sorted(list_metadata_paths)
+
+    # Read cached results
+    if cache_filepath is None:
+        cache_filepath = os.path.join(base_dir, METADATA_CHECKS_CACHE_FILENAME)
+    cache_filepath = str(cache_filepath)
+    cache_dict = _read_metadata_checks_cache(cache_filepath) if cache else {}
+
+    # Run the checks
+    def _run_checks(filepath):
+        key = os.path.relpath(filepath, base_dir)
+        return _run_station_metadata_checks(
+            filepath=filepath,
+            checks=checks,
+            cached_station=cache_dict.get(key, None),
         )
-        try:
-            _check_metadata_keys(metadata)
-        except Exception as e:
-            print(f"Error for {data_source} {campaign_name} {station_name}.")
-            print(f"The error is: {e}.")
-            is_valid = False
 
+    if parallel:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list_results = list(executor.map(_run_checks, list_metadata_paths))
+    else:
+        list_results = [_run_checks(filepath) for filepath in list_metadata_paths]
+
+    # Update the cache
+    if cache:
+        new_cache_dict = {
+            os.path.relpath(filepath, base_dir): cached_station
+            for filepath, (_, cached_station) in zip(list_metadata_paths, list_results)
+        }
+        _write_metadata_checks_cache(new_cache_dict, cache_filepath)
+
+    # Define the report
+    list_stations_report = [station_report for station_report, _ in list_results]
+    report = {
+        "base_dir": base_dir,
+        "checks": checks,
+        "n_stations": len(list_stations_report),
+        "n_invalid": sum(len(station_report["errors"]) > 0 for station_report in list_stations_report),
+        "n_cached": sum(station_report["cached"] for station_report in list_stations_report),
+        "stations": list_stations_report,
+    }
+    if report_filepath is not None:
+        with open(report_filepath, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def _print_metadata_checks_errors(report, msg_prefix="Error for"):
+    """Print the errors of a metadata checks report. Return ``True`` if there are no errors."""
+    is_valid = True
+    for station_report in report["stations"]:
+        for msg in station_report["errors"].values():
+            is_valid = False
+            data_source = station_report["data_source"]
+            campaign_name = station_report["campaign_name"]
+            station_name = station_report["station_name"]
+            print(f"{msg_prefix} {data_source} {campaign_name} {station_name}.")
+            print(f"The error is: {msg}.")
     return is_valid
 
 
+def check_archive_metadata_keys(base_dir: str = None) -> bool:
+    """Check that all metadata files have valid keys.
+
+    Parameters
+    ----------
+    base_dir : str (optional)
+        Base directory of DISDRODB. Format: ``<...>/DISDRODB``
+        If ``None`` (the default), the disdrodb config key ``base_dir`` is used.
+
+    Returns
+    -------
+    bool
+        If the check succeeds, the result is ``True``, otherwise ``False``.
+    """
+    report = check_archive_metadata(base_dir=base_dir, checks="keys")
+    return _print_metadata_checks_errors(report)
+
+
 def check_archive_metadata_campaign_name(base_dir: str = None) -> bool:
     """Check metadata ``campaign_name``.
 
@@ -303,30 +542,8 @@ def check_archive_metadata_campaign_name(base_dir: str = None) -> bool:
     bool
         If the check succeeds, the result is ``True``, otherwise ``False``.
     """
-    is_valid = True
-    base_dir = get_base_dir(base_dir)
-    list_metadata_paths = get_list_metadata(
-        base_dir=base_dir, data_sources=None, campaign_names=None, station_names=None, with_stations_data=False
-    )
-    for filepath in list_metadata_paths:
-        data_source = infer_data_source_from_path(filepath)
-        campaign_name = infer_campaign_name_from_path(filepath)
-        station_name = os.path.basename(filepath).replace(".yml", "")
-
-        metadata = read_station_metadata(
-            base_dir=base_dir,
-            product="RAW",
-            data_source=data_source,
-            campaign_name=campaign_name,
-            station_name=station_name,
-        )
-        try:
-            _check_metadata_campaign_name(metadata, expected_name=campaign_name)
-        except Exception as e:
-            is_valid = False
-            print(f"Error for {data_source} {campaign_name} {station_name}.")
-            print(f"The error is: {e}.")
-    return is_valid
+    report = check_archive_metadata(base_dir=base_dir, checks="campaign_name")
+    return _print_metadata_checks_errors(report)
 
 
 def check_archive_metadata_data_source(base_dir: str = None) -> bool:
@@ -343,30 +560,8 @@ def check_archive_metadata_data_source(base_dir: str = None) -> bool:
     bool
         If the check succeeds, the result is ``True``, otherwise ``False``.
     """
-    is_valid = True
-    base_dir = get_base_dir(base_dir)
-    list_metadata_paths = get_list_metadata(
-        base_dir=base_dir, data_sources=None, campaign_names=None, station_names=None, with_stations_data=False
-    )
-    for filepath in list_metadata_paths:
-        data_source = infer_data_source_from_path(filepath)
-        campaign_name = infer_campaign_name_from_path(filepath)
-        station_name = os.path.basename(filepath).replace(".yml", "")
-
-        metadata = read_station_metadata(
-            base_dir=base_dir,
-            product="RAW",
-            data_source=data_source,
-            campaign_name=campaign_name,
-            station_name=station_name,
-        )
-        try:
-            _check_metadata_data_source(metadata, expected_name=data_source)
-        except Exception as e:
-            is_valid = False
-            print(f"Error for {data_source} {campaign_name} {station_name}.")
-            print(f"The error is: {e}.")
-    return is_valid
+    report = check_archive_metadata(base_dir=base_dir, checks="data_source")
+    return _print_metadata_checks_errors(report)
 
 
 def check_archive_metadata_sensor_name(base_dir: str = None) -> bool:
@@ -383,30 +578,8 @@ def check_archive_metadata_sensor_name(base_dir: str = None) -> bool:
     bool
         If the check succeeds, the result is ``True``, otherwise ``False``.
     """
-    is_valid = True
-    base_dir = get_base_dir(base_dir)
-    list_metadata_paths = get_list_metadata(
-        base_dir=base_dir, data_sources=None, campaign_names=None, station_names=None, with_stations_data=False
-    )
-    for filepath in list_metadata_paths:
-        data_source = infer_data_source_from_path(filepath)
-        campaign_name = infer_campaign_name_from_path(filepath)
-        station_name = os.path.basename(filepath).replace(".yml", "")
-
-        metadata = read_station_metadata(
-            base_dir=base_dir,
-            product="RAW",
-            data_source=data_source,
-            campaign_name=campaign_name,
-            station_name=station_name,
-        )
-        try:
-            _check_metadata_sensor_name(metadata)
-        except Exception as e:
-            is_valid = False
-            print(f"Error for {data_source} {campaign_name} {station_name}.")
-            print(f"The error is: {e}.")
-    return is_valid
+    report = check_archive_metadata(base_dir=base_dir, checks="sensor_name")
+    return _print_metadata_checks_errors(report)
 
 
 def check_archive_metadata_station_name(base_dir: str = None) -> bool:
@@ -423,30 +596,8 @@ def check_archive_metadata_station_name(base_dir: str = None) -> bool:
     bool
         If the check succeeds, the result is ``True``, otherwise ``False``.
     """
-    is_valid = True
-    base_dir = get_base_dir(base_dir)
-    list_metadata_paths = get_list_metadata(
-        base_dir=base_dir, data_sources=None, campaign_names=None, station_names=None, with_stations_data=False
-    )
-    for filepath in list_metadata_paths:
-        data_source = infer_data_source_from_path(filepath)
-        campaign_name = infer_campaign_name_from_path(filepath)
-        station_name = os.path.basename(filepath).replace(".yml", "")
-
-        metadata = read_station_metadata(
-            base_dir=base_dir,
-            product="RAW",
-            data_source=data_source,
-            campaign_name=campaign_name,
-            station_name=station_name,
-        )
-        try:
-            _check_metadata_station_name(metadata, expected_name=station_name)
-        except Exception as e:
-            is_valid = False
-            print(f"Error for {data_source} {campaign_name} {station_name}.")
-            print(f"The error is: {e}.")
-    return is_valid
+    report = check_archive_metadata(base_dir=base_dir, checks="station_name")
+    return _print_metadata_checks_errors(report)
 
 
 def check_archive_metadata_reader(base_dir: str = None) -> bool:
@@ -463,35 +614,18 @@ def check_archive_metadata_reader(base_dir: str = None) -> bool:
     bool
         If the check succeeds, the result is ``True``, otherwise ``False``.
     """
-    from disdrodb.l0.l0_reader import _check_metadata_reader
-
-    is_valid = True
-    base_dir = get_base_dir(base_dir)
-    list_metadata_paths = get_list_metadata(
-        base_dir=base_dir, data_sources=None, campaign_names=None, station_names=None, with_stations_data=False
-    )
-    for filepath in list_metadata_paths:
-        data_source = infer_data_source_from_path(filepath)
-        campaign_name = infer_campaign_name_from_path(filepath)
-        station_name = os.path.basename(filepath).replace(".yml", "")
-
-        metadata = read_station_metadata(
-            base_dir=base_dir,
-            product="RAW",
-            data_source=data_source,
-            campaign_name=campaign_name,
-            station_name=station_name,
-        )
-        try:
-            _check_metadata_reader(metadata)
-        except Exception as e:
-            is_valid = False
-            print(f"Error for {data_source} {campaign_name} {station_name}.")
-            print(f"The error is: {e}.")
-    return is_valid
-
-
-def check_archive_metadata_compliance(base_dir: str = None, raise_error=False):
+    report = check_archive_metadata(base_dir=base_dir, checks="reader")
+    return _print_metadata_checks_errors(report)
+
+
+def check_archive_metadata_compliance(
+    base_dir: str = None,
+    raise_error=False,
+    parallel=True,
+    cache=False,
+    cache_filepath=None,
+    report_filepath=None,
+):
     """Check the archive metadata compliance.
 
     Parameters
@@ -500,40 +634,46 @@ def check_archive_metadata_compliance(base_dir: str = None, raise_error=False):
         Base directory of DISDRODB. Format: ``<...>/DISDRODB``.
         If ``None`` (the default), the ``base_dir`` path specified in the DISDRODB active configuration will be used.
     raise_error: bool (optional)
-        Whether to raise an error and interrupt the archive check if a
-        metadata is not compliant. The default is ``False``.
+        Whether to raise an error if a metadata is not compliant. The default is ``False``.
+    parallel : bool (optional)
+        Whether to check the metadata files with a pool of threads. The default is ``True``.
+    cache : bool (optional)
+        Whether to skip the stations whose metadata did not change since the last cached run.
+        The default is ``False``.
+    cache_filepath : str (optional)
+        Path of the JSON cache file. The default is ``<base_dir>/.disdrodb_metadata_checks.json``.
+    report_filepath : str (optional)
+        If specified, the check report is written into this JSON file.
 
     Returns
     -------
     bool
         If the check succeeds, the result is ``True``, otherwise ``False``.
     """
-    is_valid = True
-    base_dir = get_base_dir(base_dir)
-    list_metadata_paths = get_list_metadata(
-        base_dir=base_dir, data_sources=None, campaign_names=None, station_names=None, with_stations_data=False
+    report = check_archive_metadata(
+        base_dir=base_dir,
+        checks=COMPLIANCE_CHECKS,
+        parallel=parallel,
+        cache=cache,
+        cache_filepath=cache_filepath,
+        report_filepath=report_filepath,
     )
-    for filepath in list_metadata_paths:
-        data_source = infer_data_source_from_path(filepath)
-        campaign_name = infer_campaign_name_from_path(filepath)
-        station_name = os.path.basename(filepath).replace(".yml", "")
-        # Check compliance
-        try:
-            check_metadata_compliance(
-                base_dir=base_dir,
-                data_source=data_source,
-                campaign_name=campaign_name,
-                station_name=station_name,
-            )
-        except Exception as e:
-            is_valid = False
-            msg = f"Error for {data_source} {campaign_name} {station_name}."
-            msg = msg + f"The error is: {e}."
-            if raise_error:
-                raise ValueError(msg)
-            else:
-                print(msg)
-
+    is_valid = True
+    for station_report in report["stations"]:
+        if len(station_report["errors"]) == 0:
+            continue
+        is_valid = False
+        data_source = station_report["data_source"]
+        campaign_name = station_report["campaign_name"]
+        station_name = station_report["station_name"]
+        # Report the first failing check (as check_metadata_compliance)
+        error = [station_report["errors"][check] for check in COMPLIANCE_CHECKS if check in station_report["errors"]][0]
+        msg = f"Error for {data_source} {campaign_name} {station_name}."
+        msg = msg + f"The error is: {error}."
+        if raise_error:
+            raise ValueError(msg)
+        else:
+            print(msg)
     return is_valid
 
 
@@ -551,27 +691,5 @@ def check_archive_metadata_geolocation(base_dir: str = None):
     bool
         If the check succeeds, the result is ``True``, otherwise ``False``.
     """
-    is_valid = True
-    base_dir = get_base_dir(base_dir)
-    list_metadata_paths = get_list_metadata(
-        base_dir=base_dir, data_sources=None, campaign_names=None, station_names=None, with_stations_data=False
-    )
-    for filepath in list_metadata_paths:
-        data_source = infer_data_source_from_path(filepath)
-        campaign_name = infer_campaign_name_from_path(filepath)
-        station_name = os.path.basename(filepath).replace(".yml", "")
-
-        metadata = read_station_metadata(
-            base_dir=base_dir,
-            product="RAW",
-            data_source=data_source,
-            campaign_name=campaign_name,
-            station_name=station_name,
-        )
-        try:
-            check_metadata_geolocation(metadata)
-        except Exception as e:
-            is_valid = False
-            print(f"Missing information for {data_source} {campaign_name} {station_name}.")
-            print(f"The error is: {e}.")
-    return is_valid
+    report = check_archive_metadata(base_dir=base_dir, checks="geolocation")
+    return _print_metadata_checks_errors(report, msg_prefix="Missing information for")
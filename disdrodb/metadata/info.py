@@ -17,18 +17,11 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 # -----------------------------------------------------------------------------.
 """Test Metadata Info Extraction."""
-import os
 
-from disdrodb.api.info import (
-    infer_campaign_name_from_path,
-    infer_data_source_from_path,
-)
-from disdrodb.configs import get_base_dir
-from disdrodb.metadata.reader import read_station_metadata
-from disdrodb.metadata.search import get_list_metadata
+from disdrodb.metadata.table import _get_archive_metadata_records
 
 
-def get_archive_metadata_key_value(key: str, return_tuple: bool = True, base_dir: str = None):
+def get_archive_metadata_key_value(key: str, return_tuple: bool = True, base_dir: str = None, use_cache: bool = False):
     """Return the values of a metadata key for all the archive.
 
     Parameters
@@ -44,31 +37,22 @@ def get_archive_metadata_key_value(key: str, return_tuple: bool = True, base_dir
     base_dir : str (optional)
        Base directory of DISDRODB. Format: ``<...>/DISDRODB``.
        If ``None`` (the default), the ``base_dir`` path specified in the DISDRODB active configuration will be used.
+    use_cache : bool, optional
+       Whether to use (and update) the on-disk cache of the archive metadata table.
+       See ``disdrodb.metadata.table.get_archive_metadata_table``. The default is ``False``.
 
     Returns
     -------
     list or tuple
         List or tuple of values of the metadata key.
+
+    Raises
+    ------
+    KeyError
+        If the metadata of a station does not contain the key.
     """
-    base_dir = get_base_dir(base_dir)
-    list_metadata_paths = get_list_metadata(
-        base_dir=base_dir, data_sources=None, campaign_names=None, station_names=None, with_stations_data=False
-    )
-    list_info = []
-    for filepath in list_metadata_paths:
-        data_source = infer_data_source_from_path(filepath)
-        campaign_name = infer_campaign_name_from_path(filepath)
-        station_name = os.path.basename(filepath).replace(".yml", "")
-        metadata = read_station_metadata(
-            base_dir=base_dir,
-            product="RAW",
-            data_source=data_source,
-            campaign_name=campaign_name,
-            station_name=station_name,
-        )
-        value = metadata[key]
-        info = (data_source, campaign_name, station_name, value)
-        list_info.append(info)
+    records = _get_archive_metadata_records(base_dir=base_dir, use_cache=use_cache)
+    list_info = [(*station_id, metadata[key]) for station_id, metadata in records]
     if not return_tuple:
         list_info = [info[3] for info in list_info]
     return list_info
@@ -29,8 +29,32 @@ sys.tracebacklimit = 0  # avoid full traceback error if occur
 @click.option(
     "--raise_error", type=bool, show_default=True, default=True, help="Whether to raise error of finish the check"
 )
-def disdrodb_check_metadata_archive(base_dir=None, raise_error=True):
+@click.option("--parallel", type=bool, show_default=True, default=True, help="Check the metadata files in parallel")
+@click.option(
+    "--cache",
+    type=bool,
+    show_default=True,
+    default=False,
+    help="Skip the stations whose metadata did not change since the last run",
+)
+@click.option("--cache_filepath", type=str, show_default=True, default=None, help="Path of the JSON cache file")
+@click.option("--report_filepath", type=str, show_default=True, default=None, help="Path of the JSON report file")
+def disdrodb_check_metadata_archive(
+    base_dir=None,
+    raise_error=True,
+    parallel=True,
+    cache=False,
+    cache_filepath=None,
+    report_filepath=None,
+):
     from disdrodb.metadata.checks import check_archive_metadata_compliance
 
     base_dir = parse_base_dir(base_dir)
-    check_archive_metadata_compliance(base_dir=base_dir, raise_error=raise_error)
+    check_archive_metadata_compliance(
+        base_dir=base_dir,
+        raise_error=raise_error,
+        parallel=parallel,
+        cache=cache,
+        cache_filepath=cache_filepath,
+        report_filepath=report_filepath,
+    )
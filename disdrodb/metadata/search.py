@@ -21,6 +21,8 @@
 import glob
 import os
 
+import numpy as np
+
 from disdrodb.api.path import define_metadata_filepath
 from disdrodb.configs import get_base_dir
 
@@ -205,3 +207,134 @@ def _get_list_metadata_with_data(base_dir, data_sources=None, campaign_names=Non
     ]
 
     return metadata_filepaths
+
+
+####---------------------------------------------------------------------------.
+#### Station search
+
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def _haversine_distance(lon, lat, lons, lats):
+    """Return the great-circle distance (in km) between a point and an array of points."""
+    lon, lat = np.deg2rad(lon), np.deg2rad(lat)
+    lons, lats = np.deg2rad(np.asarray(lons, dtype=float)), np.deg2rad(np.asarray(lats, dtype=float))
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def search_stations(
+    sensor_names=None,
+    data_sources=None,
+    campaign_names=None,
+    point=None,
+    radius_km=None,
+    bbox=None,
+    start_time=None,
+    end_time=None,
+    product="L0B",
+    base_dir=None,
+    refresh=False,
+    catalog_filepath=None,
+):
+    """Search the stations of the DISDRODB Metadata Archive.
+
+    The search queries the station index of the DISDRODB catalog (see ``disdrodb.api.catalog.update_catalog``):
+    the archive is not listed and no metadata or data file is opened.
+    The catalog reflects the archive at its last update: use ``refresh=True`` (or ``update_catalog``)
+    to take into account the stations added or modified since then.
+
+    Parameters
+    ----------
+    sensor_names : str or list of str, optional
+        Sensor name(s) of interest.
+    data_sources : str or list of str, optional
+        Name of data source(s) of interest.
+    campaign_names : str or list of str, optional
+        Name of the campaign(s) of interest.
+    point : tuple, optional
+        ``(longitude, latitude)`` of the search center. Must be specified with ``radius_km``.
+    radius_km : float, optional
+        Search radius in km around ``point``.
+    bbox : tuple, optional
+        Bounding box ``(lon_min, lon_max, lat_min, lat_max)``.
+    start_time : str or datetime, optional
+        Start of the time period of interest.
+    end_time : str or datetime, optional
+        End of the time period of interest.
+    product : str, optional
+        DISDRODB product used to define the station time coverage. The default is ``"L0B"``.
+    base_dir : str (optional)
+        Base directory of DISDRODB. Format: ``<...>/DISDRODB``.
+        If ``None`` (the default), the ``base_dir`` path specified in the DISDRODB active configuration will be used.
+    refresh : bool, optional
+        Whether to (incrementally) update the DISDRODB catalog before the search.
+        The default is ``False``.
+    catalog_filepath : str, optional
+        Path of the DISDRODB catalog. The default is ``<base_dir>/.disdrodb_catalog.sqlite``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Table of the stations matching the search, indexed by ``data_source``, ``campaign_name`` and
+        ``station_name``, with the ``sensor_name``, ``longitude`` and ``latitude`` columns.
+        If ``point`` is specified, the ``distance_km`` column is added and stations are sorted by distance.
+    """
+    from disdrodb.api.catalog import define_catalog_filepath, query_catalog_stations, update_catalog
+
+    base_dir = get_base_dir(base_dir)
+    if (point is None) != (radius_km is None):
+        raise ValueError("'point' and 'radius_km' must be specified together.")
+    is_time_search = start_time is not None or end_time is not None
+
+    # Retrieve the catalog
+    if catalog_filepath is None:
+        catalog_filepath = define_catalog_filepath(base_dir)
+    if refresh:
+        products = ["RAW", product] if is_time_search else ["RAW"]
+        update_catalog(base_dir=base_dir, products=list(dict.fromkeys(products)), catalog_filepath=catalog_filepath)
+    if not os.path.isfile(catalog_filepath):
+        raise ValueError(
+            f"The DISDRODB catalog {catalog_filepath} does not exist. "
+            "Create it with disdrodb.api.catalog.update_catalog or specify refresh=True.",
+        )
+
+    # Filter by station attributes (and bounding box)
+    df = query_catalog_stations(
+        product="RAW",
+        data_sources=data_sources,
+        campaign_names=campaign_names,
+        sensor_names=sensor_names,
+        bbox=bbox,
+        available=False,
+        with_metadata=True,
+        catalog_filepath=catalog_filepath,
+    )
+    df = df.set_index(["data_source", "campaign_name", "station_name"])
+    df = df[["sensor_name", "longitude", "latitude"]]
+
+    # Filter by location
+    if point is not None:
+        lons = df["longitude"].to_numpy(dtype=float)
+        lats = df["latitude"].to_numpy(dtype=float)
+        # - Discard stations with missing coordinates (i.e. -9999 or mobile platforms)
+        is_missing = np.isnan(lons) | np.isnan(lats) | (lons == -9999) | (lats == -9999)
+        distances = _haversine_distance(point[0], point[1], lons, lats)
+        with np.errstate(invalid="ignore"):
+            mask = ~is_missing & (distances <= radius_km)
+        df = df[mask].assign(distance_km=distances[mask]).sort_values("distance_km")
+
+    # Filter by time coverage of the product files
+    if is_time_search:
+        df_stations = query_catalog_stations(
+            product=product,
+            start_time=start_time,
+            end_time=end_time,
+            available=False,
+            catalog_filepath=catalog_filepath,
+        )
+        df_stations = df_stations[["data_source", "campaign_name", "station_name"]]
+        station_ids = set(df_stations.itertuples(index=False, name=None))
+        df = df[[station_id in station_ids for station_id in df.index]]
+    return df
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Tabular view of the DISDRODB Metadata Archive."""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import yaml
+
+from disdrodb.api.info import infer_campaign_name_from_path, infer_data_source_from_path
+from disdrodb.configs import get_base_dir
+from disdrodb.metadata.search import get_list_metadata
+from disdrodb.metadata.standards import get_valid_metadata_keys
+
+METADATA_TABLE_CACHE_FILENAME = ".disdrodb_metadata_table.json"
+METADATA_TABLE_INDEX = ["data_source", "campaign_name", "station_name"]
+
+# Use the LibYAML based loader if available (much faster)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _get_file_signature(filepath):
+    """Return the ``[mtime, size]`` signature of a file."""
+    stat = os.stat(filepath)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_metadata_record(filepath):
+    """Read a station metadata YAML file.
+
+    Return the ``[data_source, campaign_name, station_name]`` list inferred from the path and the metadata.
+    """
+    with open(filepath) as f:
+        metadata = yaml.load(f, Loader=_YAML_LOADER) or {}
+    station_id = [
+        infer_data_source_from_path(filepath),
+        infer_campaign_name_from_path(filepath),
+        os.path.basename(filepath).replace(".yml", ""),
+    ]
+    return station_id, metadata
+
+
+def _read_metadata_table_cache(cache_filepath):
+    """Read the cached metadata table. Return ``None`` if not available or not readable."""
+    if not os.path.isfile(cache_filepath):
+        return None
+    try:
+        with open(cache_filepath) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or not isinstance(cache.get("signatures"), dict):
+        return None
+    if not isinstance(cache.get("records"), dict):
+        return None
+    return cache
+
+
+def _write_metadata_table_cache(cache, cache_filepath):
+    """Write the metadata table cache (atomically).
+
+    The cache is not written if the directory is read-only or if the metadata values can not be
+    serialized to JSON (i.e. dates).
+    """
+    tmp_filepath = cache_filepath + ".tmp"
+    try:
+        content = json.dumps(cache)
+        with open(tmp_filepath, "w") as f:
+            f.write(content)
+        os.replace(tmp_filepath, cache_filepath)
+    except (OSError, TypeError, ValueError):
+        if os.path.exists(tmp_filepath):
+            os.remove(tmp_filepath)
+
+
+def _create_metadata_table(records):
+    """Create the metadata table from the list of ``(station_id, metadata)`` records."""
+    list_station_ids = [station_id for station_id, _ in records]
+    index = pd.MultiIndex.from_arrays(
+        [[station_id[i] for station_id in list_station_ids] for i in range(len(METADATA_TABLE_INDEX))],
+        names=METADATA_TABLE_INDEX,
+    )
+    list_metadata = [metadata for _, metadata in records]
+    # Define columns: standard keys first, then the other keys
+    valid_keys = get_valid_metadata_keys()
+    all_keys = list(dict.fromkeys(key for metadata in list_metadata for key in metadata))
+    columns = [key for key in valid_keys if key in all_keys]
+    columns += [key for key in all_keys if key not in valid_keys]
+    # Create the table (keeping the original values types)
+    data = {key: [metadata.get(key, None) for metadata in list_metadata] for key in columns}
+    df = pd.DataFrame(data, index=index, columns=columns, dtype=object)
+    return df.sort_index()
+
+
+def _get_archive_metadata_records(
+    base_dir: str = None,
+    use_cache: bool = False,
+    cache_filepath: str = None,
+    parallel: bool = True,
+    max_workers: int = None,
+):
+    """Return the list of ``(station_id, metadata)`` records of the DISDRODB Metadata Archive.
+
+    The records are returned in the order of ``disdrodb.metadata.search.get_list_metadata``.
+    See ``get_archive_metadata_table`` for the description of the arguments.
+    """
+    base_dir = get_base_dir(base_dir)
+    if cache_filepath is None:
+        cache_filepath = os.path.join(base_dir, METADATA_TABLE_CACHE_FILENAME)
+    cache_filepath = str(cache_filepath)
+
+    # List metadata files and retrieve their signature
+    list_metadata_paths = get_list_metadata(
+        base_dir=base_dir, data_sources=None, campaign_names=None, station_names=None, with_stations_data=False
+    )
+    signatures = {
+        os.path.relpath(filepath, base_dir): _get_file_signature(filepath) for filepath in list_metadata_paths
+    }
+
+    # Retrieve records of unchanged metadata files from the cache
+    cache = _read_metadata_table_cache(cache_filepath) if use_cache else None
+    records = {}
+    if cache is not None:
+        records = {
+            key: record
+            for key, record in cache["records"].items()
+            if key in signatures and cache["signatures"].get(key) == signatures[key]
+        }
+    # Read new or modified metadata files
+    filepaths_to_read = [os.path.join(base_dir, key) for key in signatures if key not in records]
+    if parallel and len(filepaths_to_read) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list_records = list(executor.map(_read_metadata_record, filepaths_to_read))
+    else:
+        list_records = [_read_metadata_record(filepath) for filepath in filepaths_to_read]
+    for filepath, record in zip(filepaths_to_read, list_records):
+        records[os.path.relpath(filepath, base_dir)] = record
+
+    # Update the cache
+    if use_cache and (cache is None or len(filepaths_to_read) > 0 or len(records) != len(cache["records"])):
+        _write_metadata_table_cache({"signatures": signatures, "records": records}, cache_filepath)
+    return [records[key] for key in signatures]
+
+
+def get_archive_metadata_table(
+    base_dir: str = None,
+    use_cache: bool = False,
+    cache_filepath: str = None,
+    parallel: bool = True,
+    max_workers: int = None,
+):
+    """Return a table with the metadata of all stations of the DISDRODB Metadata Archive.
+
+    The table has one row per station (indexed by ``data_source``, ``campaign_name`` and ``station_name``,
+    as inferred from the metadata file path) and one column per metadata key.
+
+    If ``use_cache=True``, the table is cached on disk in a JSON file. At each call, only the metadata files
+    which have been added or modified (based on the file modification time and size) since the last call are read.
+    If the cache can not be written (i.e. read-only archive), the table is returned without updating it.
+
+    Parameters
+    ----------
+    base_dir : str (optional)
+        Base directory of DISDRODB. Format: ``<...>/DISDRODB``.
+        If ``None`` (the default), the ``base_dir`` path specified in the DISDRODB active configuration will be used.
+    use_cache : bool (optional)
+        Whether to use and update the on-disk cache. The default is ``False``.
+    cache_filepath : str (optional)
+        Path of the cache file. The default is ``<base_dir>/.disdrodb_metadata_table.json``.
+    parallel : bool (optional)
+        Whether to read the metadata files with a pool of threads. The default is ``True``.
+    max_workers : int (optional)
+        Maximum number of threads. If ``None``, the ``concurrent.futures`` default is used.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The metadata table, sorted by station. Missing keys are set to ``None``.
+    """
+    records = _get_archive_metadata_records(
+        base_dir=base_dir,
+        use_cache=use_cache,
+        cache_filepath=cache_filepath,
+        parallel=parallel,
+        max_workers=max_workers,
+    )
+    df = _create_metadata_table(records)
+    return df
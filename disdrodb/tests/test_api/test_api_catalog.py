@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Test DISDRODB archive catalog."""
+import os
+import shutil
+
+import pandas as pd
+
+from disdrodb.api.catalog import (
+    define_catalog_filepath,
+    query_catalog_files,
+    query_catalog_stations,
+    update_catalog,
+)
+from disdrodb.tests.conftest import create_fake_metadata_file, create_fake_raw_data_file
+
+L0A_FILENAME = "L0A.CAMPAIGN_NAME.station_1.s20180101000000.e20180101235959.V0.parquet"
+
+
+def _create_fake_archive(base_dir):
+    metadata_dict = {"sensor_name": "OTT_Parsivel", "latitude": 46.5, "longitude": 6.5}
+    create_fake_metadata_file(base_dir, product="RAW", metadata_dict=metadata_dict.copy(), station_name="station_1")
+    create_fake_raw_data_file(base_dir, product="RAW", station_name="station_1", filename="file_1.txt")
+    create_fake_raw_data_file(base_dir, product="RAW", station_name="station_1", filename="file_2.txt")
+    metadata_dict = {"sensor_name": "Thies_LPM", "latitude": 10, "longitude": 10}
+    create_fake_metadata_file(base_dir, product="RAW", metadata_dict=metadata_dict.copy(), station_name="station_2")
+    create_fake_raw_data_file(base_dir, product="RAW", station_name="station_2")
+    # Station without data
+    create_fake_metadata_file(base_dir, product="RAW", station_name="station_3")
+    # L0A product
+    metadata_dict = {"sensor_name": "OTT_Parsivel", "latitude": 46.5, "longitude": 6.5}
+    create_fake_metadata_file(base_dir, product="L0A", metadata_dict=metadata_dict.copy(), station_name="station_1")
+    create_fake_raw_data_file(base_dir, product="L0A", station_name="station_1", filename=L0A_FILENAME)
+
+
+def test_define_catalog_filepath(tmp_path):
+    base_dir = tmp_path / "DISDRODB"
+    assert define_catalog_filepath(base_dir) == os.path.join(base_dir, ".disdrodb_catalog.sqlite")
+
+
+def test_update_catalog(tmp_path, capsys):
+    base_dir = tmp_path / "DISDRODB"
+    _create_fake_archive(base_dir)
+
+    catalog_filepath = update_catalog(base_dir=base_dir, verbose=True)
+    assert os.path.isfile(catalog_filepath)
+    assert "RAW catalog: 3/3 stations updated." in capsys.readouterr().out
+
+    # Test unchanged stations are not rescanned
+    update_catalog(base_dir=base_dir, verbose=True)
+    assert "RAW catalog: 0/3 stations updated." in capsys.readouterr().out
+
+    # Test a new file triggers the rescan of the station
+    create_fake_raw_data_file(base_dir, product="RAW", station_name="station_2", filename="new_file.txt")
+    update_catalog(base_dir=base_dir, products="RAW", verbose=True)
+    assert "RAW catalog: 1/3 stations updated." in capsys.readouterr().out
+    df = query_catalog_files(product="RAW", station_names="station_2", base_dir=base_dir)
+    assert len(df) == 2
+
+    # Test force rescan all stations
+    update_catalog(base_dir=base_dir, products="RAW", force=True, verbose=True)
+    assert "RAW catalog: 3/3 stations updated." in capsys.readouterr().out
+
+    # Test removed stations are removed from the catalog
+    shutil.rmtree(os.path.join(base_dir, "Raw", "DATA_SOURCE", "CAMPAIGN_NAME", "data", "station_2"))
+    os.remove(os.path.join(base_dir, "Raw", "DATA_SOURCE", "CAMPAIGN_NAME", "metadata", "station_2.yml"))
+    update_catalog(base_dir=base_dir, products="RAW")
+    df = query_catalog_stations(product="RAW", available=False, base_dir=base_dir)
+    assert "station_2" not in df["station_name"].tolist()
+    assert len(query_catalog_files(product="RAW", station_names="station_2", base_dir=base_dir)) == 0
+
+
+def test_query_catalog_stations(tmp_path):
+    base_dir = tmp_path / "DISDRODB"
+    _create_fake_archive(base_dir)
+    update_catalog(base_dir=base_dir)
+
+    # Test only stations with data and metadata are returned by default
+    df = query_catalog_stations(product="RAW", base_dir=base_dir)
+    assert df["station_name"].tolist() == ["station_1", "station_2"]
+    df = query_catalog_stations(product="RAW", available=False, base_dir=base_dir)
+    assert df["station_name"].tolist() == ["station_1", "station_2", "station_3"]
+    assert df.set_index("station_name").loc["station_1", "n_files"] == 2
+
+    # Test filtering by sensor name
+    df = query_catalog_stations(sensor_names="Thies_LPM", base_dir=base_dir)
+    assert df["station_name"].tolist() == ["station_2"]
+
+    # Test filtering by bounding box
+    df = query_catalog_stations(product="RAW", bbox=(5, 7, 45, 47), base_dir=base_dir)
+    assert df["station_name"].tolist() == ["station_1"]
+
+    # Test filtering by data source and campaign name
+    df = query_catalog_stations(data_sources="DATA_SOURCE", campaign_names=["CAMPAIGN_NAME"], base_dir=base_dir)
+    assert len(df) == 3
+    df = query_catalog_stations(data_sources="ANOTHER", base_dir=base_dir)
+    assert len(df) == 0
+
+    # Test filtering by time period
+    df = query_catalog_stations(start_time="2018-01-01 12:00:00", end_time="2018-01-02", base_dir=base_dir)
+    assert df[["product", "station_name"]].values.tolist() == [["L0A", "station_1"]]
+    df = query_catalog_stations(start_time="2019-01-01", base_dir=base_dir)
+    assert len(df) == 0
+
+
+def test_query_catalog_files(tmp_path):
+    base_dir = tmp_path / "DISDRODB"
+    _create_fake_archive(base_dir)
+    update_catalog(base_dir=base_dir)
+
+    df = query_catalog_files(product="L0A", base_dir=base_dir)
+    assert len(df) == 1
+    assert os.path.basename(df["filepath"].iloc[0]) == L0A_FILENAME
+    assert df["start_time"].iloc[0] == pd.Timestamp("2018-01-01 00:00:00")
+    assert df["end_time"].iloc[0] == pd.Timestamp("2018-01-01 23:59:59")
+    assert df["size"].iloc[0] > 0
+
+    # Test raw files have no time information
+    df = query_catalog_files(product="RAW", base_dir=base_dir)
+    assert len(df) == 3
+    assert df["start_time"].isna().all()
+
+    # Test time filtering
+    assert len(query_catalog_files(end_time="2017-12-31", base_dir=base_dir)) == 0
+    assert len(query_catalog_files(end_time="2018-01-01 10:00:00", base_dir=base_dir)) == 1
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Test DISDRODB I/O interface."""
+import os
+
+from disdrodb.api.io import available_campaigns, available_data_sources, available_stations
+from disdrodb.tests.conftest import (
+    create_fake_metadata_file,
+    create_fake_raw_data_file,
+    create_fake_station_dir,
+)
+
+
+def test_available_stations(tmp_path):
+    base_dir = tmp_path / "DISDRODB"
+    campaign_names = [f"CAMPAIGN_{i}" for i in range(5)]
+    for campaign_name in campaign_names:
+        # Station with data (in a nested directory) and metadata
+        create_fake_metadata_file(base_dir, campaign_name=campaign_name, station_name="station_1")
+        station_dir = create_fake_station_dir(
+            base_dir,
+            product="RAW",
+            campaign_name=campaign_name,
+            station_name="station_1",
+        )
+        os.makedirs(os.path.join(station_dir, "subdir"))
+        with open(os.path.join(station_dir, "subdir", "file.txt"), "w") as f:
+            f.write("This is some fake text.")
+        # Station with metadata but empty data directory
+        create_fake_metadata_file(base_dir, campaign_name=campaign_name, station_name="station_2")
+        create_fake_station_dir(base_dir, product="RAW", campaign_name=campaign_name, station_name="station_2")
+        # Station with data but without metadata
+        create_fake_raw_data_file(base_dir, campaign_name=campaign_name, station_name="station_3")
+
+    list_info = available_stations(product="RAW", base_dir=base_dir)
+    assert sorted(list_info) == [("DATA_SOURCE", campaign_name, "station_1") for campaign_name in campaign_names]
+
+    list_info = available_stations(product="RAW", campaign_names="CAMPAIGN_1", return_tuple=False, base_dir=base_dir)
+    assert list_info == ["station_1"]
+
+    assert available_data_sources(product="RAW", base_dir=base_dir) == ["DATA_SOURCE"]
+    assert sorted(available_campaigns(product="RAW", return_tuple=False, base_dir=base_dir)) == campaign_names
@@ -18,19 +18,185 @@
 # # -----------------------------------------------------------------------------.
 """Test DISDRODB download utility."""
 
+import base64
+import functools
+import hashlib
+import io
 import os
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
+import requests
 
+from disdrodb import __root_path__
 from disdrodb.data_transfer.download_data import (
+    _download_and_extract_station_files,
     _download_file_from_url,
     _download_station_data,
+    download_and_extract_zip,
     download_archive,
+    download_file,
     download_station,
 )
 from disdrodb.tests.conftest import create_fake_metadata_file, create_fake_raw_data_file
 
 TEST_ZIP_FPATH = "https://raw.githubusercontent.com/ltelab/disdrodb/main/disdrodb/tests/data/test_data_download/station_files.zip"  # noqa
+LOCAL_ZIP_FPATH = os.path.join(__root_path__, "disdrodb", "tests", "data", "test_data_download", "station_files.zip")
+
+
+class _RangeRequestHandler(BaseHTTPRequestHandler):
+    """HTTP request handler supporting range requests and simulating transfer failures."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        range_header = self.headers.get("Range")
+        server.requests.append(range_header)
+        # Simulate server errors
+        if server.n_errors > 0:
+            server.n_errors -= 1
+            self.send_error(503)
+            return
+        content = server.files.get(self.path)
+        if content is None:
+            self.send_error(404)
+            return
+        # Send the (partial) content
+        start = int(range_header.removeprefix("bytes=").split("-")[0]) if range_header else 0
+        if start >= len(content):
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{len(content)}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if range_header:
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}")
+        else:
+            self.send_response(200)
+            md5_digest = hashlib.md5(server.md5_content.get(self.path, content)).digest()
+            self.send_header("Content-MD5", base64.b64encode(md5_digest).decode())
+        body = content[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        # Simulate interrupted transfers
+        if server.n_truncations > 0:
+            server.n_truncations -= 1
+            body = body[: len(body) // 2]
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def http_server():
+    """Local HTTP server standing in for the remote data repository."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RangeRequestHandler)
+    server.files = {}
+    server.md5_content = {}
+    server.requests = []
+    server.n_errors = 0
+    server.n_truncations = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_file(tmp_path, http_server):
+    content = os.urandom(100_000)
+    http_server.files["/file.zip"] = content
+    filepath = str(tmp_path / "file.zip")
+
+    # Test download with server checksum verification
+    assert download_file(f"{http_server.url}/file.zip", filepath) == filepath
+    with open(filepath, "rb") as f:
+        assert f.read() == content
+    assert not os.path.exists(filepath + ".part")
+
+    # Test download with known checksum
+    known_hash = f"sha256:{hashlib.sha256(content).hexdigest()}"
+    download_file(f"{http_server.url}/file.zip", filepath, known_hash=known_hash)
+
+    # Test not found file is not retried
+    http_server.requests.clear()
+    with pytest.raises(Exception):
+        download_file(f"{http_server.url}/missing.zip", filepath, backoff_factor=0)
+    assert len(http_server.requests) == 1
+
+
+def test_download_file_resume_and_retries(tmp_path, http_server):
+    content = os.urandom(100_000)
+    http_server.files["/file.zip"] = content
+    filepath = str(tmp_path / "file.zip")
+
+    # Test an interrupted transfer is resumed with a range request
+    # - The transfer is interrupted after 1.5 MB (i.e. 1 chunk of 1 MB is written)
+    content = os.urandom(3 * 1024 * 1024)
+    http_server.files["/large_file.zip"] = content
+    http_server.n_truncations = 1
+    download_file(f"{http_server.url}/large_file.zip", filepath, backoff_factor=0)
+    with open(filepath, "rb") as f:
+        assert f.read() == content
+    assert http_server.requests == [None, f"bytes={1024 * 1024}-"]
+
+    # Test a partial file from a previous call is resumed
+    with open(filepath + ".part", "wb") as f:
+        f.write(content[:1000])
+    http_server.requests.clear()
+    known_hash = f"md5:{hashlib.md5(content).hexdigest()}"
+    download_file(f"{http_server.url}/large_file.zip", filepath, known_hash=known_hash)
+    assert http_server.requests == ["bytes=1000-"]
+
+    # Test server errors are retried
+    http_server.n_errors = 2
+    download_file(f"{http_server.url}/file.zip", filepath, backoff_factor=0)
+
+    # Test an error is raised when the maximum number of retries is reached
+    http_server.n_errors = 3
+    with pytest.raises(Exception):
+        download_file(f"{http_server.url}/file.zip", filepath, max_retries=2, backoff_factor=0)
+
+
+def test_download_file_invalid_checksum(tmp_path, http_server):
+    http_server.files["/file.zip"] = b"content"
+    http_server.md5_content["/file.zip"] = b"another content"
+    filepath = str(tmp_path / "file.zip")
+    with pytest.raises(ValueError, match="checksum"):
+        download_file(f"{http_server.url}/file.zip", filepath, max_retries=1, backoff_factor=0)
+    assert not os.path.exists(filepath)
+    assert not os.path.exists(filepath + ".part")
+
+    # Test invalid checksum algorithm
+    with pytest.raises(ValueError):
+        download_file(f"{http_server.url}/file.zip", filepath, known_hash="invalid:abc")
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_download_archive_concurrently(tmp_path, http_server, max_workers):
+    """Test concurrent download of archive stations from a local server."""
+    with open(LOCAL_ZIP_FPATH, "rb") as f:
+        http_server.files["/station_files.zip"] = f.read()
+    base_dir = tmp_path / "DISDRODB"
+    station_names = ["station_1", "station_2", "station_3"]
+    for station_name in station_names:
+        _ = create_fake_metadata_file(
+            base_dir=base_dir,
+            metadata_dict={"disdrodb_data_url": f"{http_server.url}/station_files.zip"},
+            station_name=station_name,
+        )
+    download_archive(base_dir=str(base_dir), max_workers=max_workers)
+    for station_name in station_names:
+        station_dir = os.path.join(base_dir, "Raw", "DATA_SOURCE", "CAMPAIGN_NAME", "data", station_name)
+        assert os.path.isfile(os.path.join(station_dir, "station_file1.txt"))
+        assert not os.path.exists(os.path.join(station_dir, f"{station_name}.zip"))
+
+    with pytest.raises(ValueError):
+        download_archive(base_dir=str(base_dir), max_workers=0)
 
 
 def test_download_file_from_url(tmp_path):
@@ -234,3 +400,77 @@ def test_download_archive(tmp_path, force, existing_data):
         else:
             # Check original raw file does not exist anymore if force=True
             assert not os.path.exists(raw_file_filepath)
+
+
+def test_download_and_extract_zip(tmp_path, http_server):
+    buffer = io.BytesIO()
+    files = {f"file_{i}.bin": os.urandom(500_000) for i in range(6)}
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as zipf:
+        for filename, content in files.items():
+            zipf.writestr(filename, content)
+    http_server.files["/station.zip"] = buffer.getvalue()
+
+    # Test an interrupted transfer is resumed from the first entry not yet extracted
+    http_server.n_truncations = 1
+    entries = download_and_extract_zip(f"{http_server.url}/station.zip", tmp_path, backoff_factor=0)
+    assert entries == list(files)
+    for filename, content in files.items():
+        with open(tmp_path / filename, "rb") as f:
+            assert f.read() == content
+    assert http_server.requests[0] is None
+    assert http_server.requests[1].startswith("bytes=")
+
+    # Test invalid checksum
+    with pytest.raises(ValueError, match="checksum"):
+        download_and_extract_zip(
+            f"{http_server.url}/station.zip",
+            tmp_path / "dir",
+            known_hash="md5:0123",
+            max_retries=0,
+        )
+
+
+def test_download_station_not_streamable_zip(tmp_path, http_server):
+    """Test station zip files which can not be extracted while downloading are downloaded first."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_BZIP2) as zipf:
+        zipf.writestr("station_file1.txt", b"content")
+    http_server.files["/station_files.zip"] = buffer.getvalue()
+    base_dir = tmp_path / "DISDRODB"
+    metadata_filepath = create_fake_metadata_file(
+        base_dir=base_dir,
+        metadata_dict={"disdrodb_data_url": f"{http_server.url}/station_files.zip"},
+    )
+    station_dir = metadata_filepath.replace("metadata", "data").replace(".yml", "")
+    _download_station_data(metadata_filepath=metadata_filepath, force=False)
+    assert sorted(os.listdir(station_dir)) == ["station_file1.txt"]
+
+
+def test_download_station_resumed_at_next_call(tmp_path, http_server, mocker):
+    """Test an interrupted station download is resumed at the next call."""
+    buffer = io.BytesIO()
+    files = {f"station_file_{i}.bin": os.urandom(500_000) for i in range(6)}
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as zipf:
+        for filename, content in files.items():
+            zipf.writestr(filename, content)
+    http_server.files["/station_files.zip"] = buffer.getvalue()
+    station_dir = str(tmp_path / "station_name")
+
+    # Interrupt the download
+    http_server.n_truncations = 1
+    mocker.patch(
+        "disdrodb.data_transfer.download_data.download_and_extract_zip",
+        functools.partial(download_and_extract_zip, max_retries=0),
+    )
+    with pytest.raises(requests.RequestException):
+        _download_and_extract_station_files(f"{http_server.url}/station_files.zip", station_dir)
+    assert os.path.exists(os.path.join(station_dir, ".station_name.download.json"))
+
+    # Resume the download
+    mocker.stopall()
+    _download_and_extract_station_files(f"{http_server.url}/station_files.zip", station_dir)
+    assert http_server.requests[1].startswith("bytes=")
+    assert sorted(os.listdir(station_dir)) == list(files)
+    for filename, content in files.items():
+        with open(os.path.join(station_dir, filename), "rb") as f:
+            assert f.read() == content
@@ -17,16 +17,28 @@
 # # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 # # -----------------------------------------------------------------------------.
 """Test DISDRODB zenodo utility."""
+
+import io
+import json
 import os
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
+import disdrodb
+from disdrodb.data_transfer.download_data import _download_station_data
+from disdrodb.data_transfer.upload_data import upload_archive
 from disdrodb.data_transfer.zenodo import (
     _check_http_response,
     _define_creators_list,
     _define_disdrodb_data_url,
     upload_station_to_zenodo,
 )
+from disdrodb.metadata import read_station_metadata
+from disdrodb.tests.conftest import create_fake_metadata_file, create_fake_raw_data_file
+from disdrodb.utils.manifest import define_manifest_filepath, read_manifest
 
 
 class MockResponse:
@@ -179,6 +191,188 @@ def test_if_upload_raise_error_remove_zip_file(tmp_path, mocker):
 
     # Test it remove the file if something fail
     with pytest.raises(ValueError):
-        upload_station_to_zenodo(metadata_filepath=f"{station_name}.yml")
+        upload_station_to_zenodo(metadata_filepath=f"{station_name}.yml", streaming=False)
 
     assert not os.path.exists(station_zip_fpath)
+
+
+class _ZenodoRequestHandler(BaseHTTPRequestHandler):
+    """HTTP request handler standing in for the Zenodo deposition API."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding") != "chunked":
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b""
+        while True:
+            chunk_size = int(self.rfile.readline().strip(), 16)
+            if chunk_size == 0:
+                self.rfile.readline()
+                return body
+            body += self.rfile.read(chunk_size)
+            self.rfile.readline()
+
+    def _send_json(self, status_code, data):
+        content = json.dumps(data).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        filename = self.path.split("?")[0].split("/")[-1]
+        content = self.server.files.get(filename)
+        if content is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_POST(self):
+        self._read_body()
+        with self.server.lock:
+            self.server.n_depositions += 1
+            deposit_id = self.server.n_depositions
+        self._send_json(201, {"id": deposit_id, "links": {"bucket": f"{self.server.url}/api/files/{deposit_id}"}})
+
+    def do_PUT(self):
+        body = self._read_body()
+        if self.path.startswith("/api/deposit/depositions/"):
+            self._send_json(200, {})
+            return
+        # Zenodo requires the Content-Length header
+        if "Content-Length" not in self.headers:
+            self._send_json(411, {"message": "Length required"})
+            return
+        # Simulate server errors
+        with self.server.lock:
+            self.server.n_uploads += 1
+            simulate_error = self.server.n_errors > 0
+            self.server.n_errors -= int(simulate_error)
+        if simulate_error:
+            self._send_json(503, {"message": "Service unavailable"})
+            return
+        filename = self.path.split("?")[0].split("/")[-1]
+        self.server.files[filename] = body
+        self._send_json(201, {})
+
+
+@pytest.fixture
+def zenodo_server():
+    """Local HTTP server standing in for Zenodo."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ZenodoRequestHandler)
+    server.lock = threading.Lock()
+    server.files = {}
+    server.n_depositions = 0
+    server.n_errors = 0
+    server.n_uploads = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    with disdrodb.config.set({"zenodo_sandbox_token": "test_access_token", "zenodo_sandbox_url": server.url}):
+        yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_upload_station_to_zenodo_streaming(tmp_path, zenodo_server, monkeypatch):
+    """Test station data are zipped on the fly and uploaded in chunks with retries."""
+    monkeypatch.setattr("disdrodb.data_transfer.zenodo.UPLOAD_BACKOFF_FACTOR", 0)
+    monkeypatch.setattr("disdrodb.data_transfer.zenodo.UPLOAD_CHUNK_SIZE", 1000)
+    zenodo_server.n_errors = 1
+    base_dir = tmp_path / "DISDRODB"
+    metadata_filepath = create_fake_metadata_file(base_dir=base_dir, metadata_dict={}, station_name="station_1")
+    for filename in ["file_1.txt", "file_2.txt"]:
+        filepath = create_fake_raw_data_file(base_dir=base_dir, station_name="station_1", filename=filename)
+        with open(filepath, "w") as f:
+            f.write("content\n" * 1000)
+
+    upload_station_to_zenodo(metadata_filepath=metadata_filepath, sandbox=True)
+
+    # Check the zip archive has been uploaded with its size
+    assert zenodo_server.n_uploads == 2  # the first upload failed
+    with zipfile.ZipFile(io.BytesIO(zenodo_server.files["DATA_SOURCE-CAMPAIGN_NAME-station_1.zip"])) as zipf:
+        assert sorted(zipf.namelist()) == ["file_1.txt", "file_2.txt"]
+        assert zipf.read("file_1.txt") == b"content\n" * 1000
+
+    # Check the metadata disdrodb_data_url points to the server
+    metadata = read_station_metadata(
+        base_dir=base_dir,
+        product="RAW",
+        station_name="station_1",
+        data_source="DATA_SOURCE",
+        campaign_name="CAMPAIGN_NAME",
+    )
+    assert metadata["disdrodb_data_url"].startswith(zenodo_server.url)
+
+
+def test_upload_archive_concurrently(tmp_path, zenodo_server):
+    """Test stations are uploaded concurrently."""
+    base_dir = tmp_path / "DISDRODB"
+    station_names = [f"station_{i}" for i in range(4)]
+    for station_name in station_names:
+        create_fake_metadata_file(base_dir=base_dir, metadata_dict={}, station_name=station_name)
+        create_fake_raw_data_file(base_dir=base_dir, station_name=station_name)
+
+    upload_archive(platform="sandbox.zenodo", base_dir=str(base_dir), max_workers=2)
+
+    assert zenodo_server.n_depositions == 4
+    assert sorted(zenodo_server.files) == [f"DATA_SOURCE-CAMPAIGN_NAME-{name}.zip" for name in station_names]
+
+
+def test_incremental_upload_and_download(tmp_path, zenodo_server):
+    """Test only the files added or changed since the last upload are uploaded and then downloaded."""
+    base_dir = tmp_path / "DISDRODB"
+    metadata_filepath = create_fake_metadata_file(base_dir=base_dir, metadata_dict={}, station_name="station_1")
+    filepaths = {}
+    for filename in ["file_1.txt", "file_2.txt"]:
+        filepaths[filename] = create_fake_raw_data_file(base_dir=base_dir, station_name="station_1", filename=filename)
+        with open(filepaths[filename], "w") as f:
+            f.write(f"{filename}\n" * 100)
+
+    # First upload: all files are uploaded
+    upload_station_to_zenodo(metadata_filepath=metadata_filepath, incremental=True)
+    manifest = read_manifest(define_manifest_filepath(metadata_filepath))
+    assert len(manifest["archives"]) == 1
+    assert sorted(manifest["files"]) == ["file_1.txt", "file_2.txt"]
+
+    # No changes: nothing is uploaded
+    upload_station_to_zenodo(metadata_filepath=metadata_filepath, incremental=True)
+    assert zenodo_server.n_depositions == 1
+
+    # Update the station files: only the new and changed files are uploaded
+    with open(filepaths["file_2.txt"], "w") as f:
+        f.write("updated content\n")
+    filepath_3 = create_fake_raw_data_file(base_dir=base_dir, station_name="station_1", filename="file_3.txt")
+    os.remove(filepaths["file_1.txt"])
+    upload_station_to_zenodo(metadata_filepath=metadata_filepath, incremental=True)
+    manifest = read_manifest(define_manifest_filepath(metadata_filepath))
+    assert len(manifest["archives"]) == 2
+    assert manifest["archives"][1]["files"] == ["file_2.txt", "file_3.txt"]
+    assert manifest["archives"][1]["removed"] == ["file_1.txt"]
+    archive_content = zenodo_server.files["DATA_SOURCE-CAMPAIGN_NAME-station_1_update_1.zip"]
+    with zipfile.ZipFile(io.BytesIO(archive_content)) as zipf:
+        assert zipf.namelist() == ["file_2.txt", "file_3.txt"]
+
+    # The metadata disdrodb_data_url still points to the first archive
+    metadata = read_station_metadata(
+        base_dir=base_dir,
+        product="RAW",
+        station_name="station_1",
+        data_source="DATA_SOURCE",
+        campaign_name="CAMPAIGN_NAME",
+    )
+    assert metadata["disdrodb_data_url"] == manifest["archives"][0]["url"]
+
+    # Test the download applies the incremental archives
+    station_dir = os.path.dirname(filepath_3)
+    os.rename(station_dir, station_dir + "_uploaded")
+    _download_station_data(metadata_filepath, progressbar=False)
+    assert sorted(os.listdir(station_dir)) == ["file_2.txt", "file_3.txt"]
+    with open(os.path.join(station_dir, "file_2.txt")) as f:
+        assert f.read() == "updated content\n"
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Test DISDRODB issue intervals."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from disdrodb.issue.intervals import (
+    compile_issue_intervals,
+    get_issue_mask,
+    merge_intervals,
+    select_issue_intervals,
+)
+
+
+def test_merge_intervals():
+    starts = np.array([5, 1, 2, 10, 12])
+    ends = np.array([6, 3, 4, 11, 12])
+    merged_starts, merged_ends = merge_intervals(starts, ends)
+    np.testing.assert_array_equal(merged_starts, [1, 5, 10, 12])
+    np.testing.assert_array_equal(merged_ends, [4, 6, 11, 12])
+
+
+def test_compile_issue_intervals():
+    issue_dict = {
+        "timesteps": np.array(["2020-01-01T00:05:00", "2020-01-02T00:00:00"], dtype="M8[s]"),
+        "time_periods": [
+            np.array(["2020-01-01T00:00:00", "2020-01-01T01:00:00"], dtype="M8[s]"),
+            np.array(["2020-01-01T00:30:00", "2020-01-01T02:00:00"], dtype="M8[s]"),
+        ],
+    }
+    issue_intervals = compile_issue_intervals(issue_dict)
+    np.testing.assert_array_equal(
+        issue_intervals["starts"],
+        np.array(["2020-01-01T00:00:00", "2020-01-02T00:00:00"], dtype="M8[ns]"),
+    )
+    np.testing.assert_array_equal(
+        issue_intervals["ends"],
+        np.array(["2020-01-01T02:00:00", "2020-01-02T00:00:00"], dtype="M8[ns]"),
+    )
+    assert len(compile_issue_intervals({})["starts"]) == 0
+    assert len(compile_issue_intervals({"timesteps": None, "time_periods": None})["starts"]) == 0
+
+    # Test invalid time periods
+    with pytest.raises(ValueError):
+        compile_issue_intervals({"time_periods": [[np.datetime64("2020-01-01T00:00:00")]]})
+
+    # Test intervals selection
+    selected = select_issue_intervals(
+        issue_intervals,
+        np.datetime64("2020-01-01T01:30:00"),
+        np.datetime64("2020-01-01T12:00:00"),
+    )
+    assert len(selected["starts"]) == 1
+
+
+def test_get_issue_mask():
+    """Test the issue mask is identical to the mask computed period by period."""
+    rng = np.random.default_rng(0)
+    time = pd.date_range("2020-01-01", periods=10_000, freq="30s").to_numpy().copy()
+    time[0] = np.datetime64("NaT")
+    starts = time[1:][rng.integers(0, len(time) - 1, 500)]
+    time_periods = [np.array([start, start + np.timedelta64(rng.integers(0, 3600), "s")]) for start in starts]
+    timesteps = time[1:][rng.integers(0, len(time) - 1, 500)]
+    issue_intervals = compile_issue_intervals({"timesteps": timesteps, "time_periods": time_periods})
+
+    expected_mask = np.isin(time, timesteps)
+    for start_time, end_time in time_periods:
+        expected_mask |= (time >= start_time) & (time <= end_time)
+    np.testing.assert_array_equal(get_issue_mask(time, issue_intervals), expected_mask)
+    assert not get_issue_mask(time, issue_intervals)[0]
+
+    # Test NaT time values are flagged only if the issue timesteps contain NaT
+    issue_intervals = compile_issue_intervals({"timesteps": time[:10]})
+    assert issue_intervals["nat"]
+    np.testing.assert_array_equal(get_issue_mask(time, issue_intervals), pd.Series(time).isin(time[:10]).to_numpy())
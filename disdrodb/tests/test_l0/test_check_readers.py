@@ -20,12 +20,15 @@
 import os
 import shutil
 
+import dask.array
 import pandas as pd
 import xarray as xr
 
+import disdrodb
 from disdrodb import __root_path__
 from disdrodb.api.io import available_stations
 from disdrodb.api.path import define_campaign_dir, define_station_dir
+from disdrodb.l0 import l0b_processing
 from disdrodb.l0.l0_processing import run_l0a_station
 from disdrodb.metadata import read_station_metadata
 from disdrodb.utils.directories import list_files
@@ -171,3 +174,58 @@ def test_check_all_readers(tmp_path) -> None:
             campaign_name=campaign_name,
             station_name=station_name,
         )
+
+
+def test_check_reader_lazy_netcdf_processing(tmp_path, monkeypatch) -> None:
+    """Test the lazy processing of raw netCDFs gives the same L0B files as the eager processing."""
+    data_source, campaign_name, station_name = "UK", "DIVEN", "CAIRNGORM"
+    campaign_dir = os.path.join(__root_path__, "disdrodb", "tests", "data", "check_readers", "DISDRODB", "Raw")
+    campaign_dir = os.path.join(campaign_dir, data_source, campaign_name)
+
+    # Record whether the datasets passed to write_l0b are backed by dask arrays
+    list_is_lazy = []
+    list_time_chunks = []
+    write_l0b = l0b_processing.write_l0b
+
+    def mock_write_l0b(ds, *args, **kwargs):
+        list_is_lazy.append(all(isinstance(ds[var].data, dask.array.Array) for var in ds.data_vars))
+        list_time_chunks.append(ds["raw_drop_number"].chunks)
+        return write_l0b(ds, *args, **kwargs)
+
+    monkeypatch.setattr(l0b_processing, "write_l0b", mock_write_l0b)
+
+    # Run the eager and lazy processing
+    dict_l0b_files = {}
+    for lazy in [False, True]:
+        base_dir = tmp_path / f"lazy_{lazy}" / "DISDRODB"
+        shutil.copytree(campaign_dir, base_dir / "Raw" / data_source / campaign_name)
+        with disdrodb.config.set({"l0b_nc_lazy": lazy, "l0b_nc_chunksize": 2}):
+            run_l0a_station(
+                base_dir=base_dir,
+                data_source=data_source,
+                campaign_name=campaign_name,
+                station_name=station_name,
+                force=True,
+                verbose=False,
+                debugging_mode=False,
+                parallel=False,
+            )
+        station_dir = define_station_dir(
+            base_dir=base_dir,
+            product="L0B",
+            data_source=data_source,
+            campaign_name=campaign_name,
+            station_name=station_name,
+        )
+        dict_l0b_files[lazy] = sorted(list_files(station_dir, glob_pattern="*.nc", recursive=True))
+
+    # Test the lazy datasets remain backed by dask arrays (chunked along time) until written
+    n_files = len(dict_l0b_files[False])
+    assert n_files > 0
+    assert list_is_lazy == [False] * n_files + [True] * n_files
+    assert all(max(chunks[0]) <= 2 for chunks in list_time_chunks[n_files:])
+
+    # Test the L0B files are identical (apart from the processing date)
+    assert len(dict_l0b_files[True]) == n_files
+    for eager_filepath, lazy_filepath in zip(dict_l0b_files[False], dict_l0b_files[True]):
+        _check_identical_netcdf_files(eager_filepath, lazy_filepath)
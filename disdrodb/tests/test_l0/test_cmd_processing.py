@@ -18,6 +18,7 @@
 # -----------------------------------------------------------------------------.
 """Test DISDRODB L0 processing commands."""
 
+import json
 import os
 import shutil
 
@@ -89,6 +90,74 @@ def test_disdrodb_run_l0b_station(tmp_path, parallel):
     assert count_files(station_dir, glob_pattern="*.nc", recursive=True) > 0
 
 
+@pytest.mark.parametrize("parallel", [True, False])
+def test_disdrodb_run_l0_station_jsonl_logs(tmp_path, monkeypatch, parallel):
+    """Test the L0 processing with JSON-lines logs."""
+    # The L0A and L0B processing are run in subprocesses reading the configuration from the environment
+    monkeypatch.setenv("DISDRODB_LOG_FORMAT", "jsonl")
+    test_base_dir = tmp_path / "DISDRODB"
+    shutil.copytree(BASE_DIR, test_base_dir)
+
+    runner = CliRunner()
+    runner.invoke(
+        disdrodb_run_l0_station,
+        [DATA_SOURCE, CAMPAIGN_NAME, STATION_NAME, "--base_dir", test_base_dir, "--parallel", parallel],
+    )
+
+    logs_dir = os.path.join(test_base_dir, "Processed", DATA_SOURCE, CAMPAIGN_NAME, "logs")
+    for product in ["L0A", "L0B"]:
+        assert os.path.isfile(os.path.join(logs_dir, product, STATION_NAME, f"logs_{STATION_NAME}.jsonl"))
+        assert os.path.isfile(os.path.join(logs_dir, product, f"logs_summary_{STATION_NAME}.log"))
+        assert count_files(os.path.join(logs_dir, product, STATION_NAME), glob_pattern="*.log") == 0
+
+
+def test_disdrodb_run_l0_station_metrics(tmp_path, monkeypatch):
+    """Test the L0 processing metrics collection."""
+    # The L0A and L0B processing are run in subprocesses reading the configuration from the environment
+    monkeypatch.setenv("DISDRODB_METRICS", "True")
+    monkeypatch.setenv("DISDRODB_METRICS_PROMETHEUS", "True")
+    test_base_dir = tmp_path / "DISDRODB"
+    shutil.copytree(BASE_DIR, test_base_dir)
+
+    runner = CliRunner()
+    runner.invoke(
+        disdrodb_run_l0_station,
+        [DATA_SOURCE, CAMPAIGN_NAME, STATION_NAME, "--base_dir", test_base_dir, "--parallel", False],
+    )
+
+    logs_dir = os.path.join(test_base_dir, "Processed", DATA_SOURCE, CAMPAIGN_NAME, "logs")
+    expected_stages = {
+        "L0A": ["read_raw_file", "remove_corrupted_rows", "cast_column_dtypes", "write_l0a"],
+        "L0B": ["read_l0a_dataframe", "retrieve_l0b_arrays", "finalize_dataset", "set_encodings", "to_netcdf"],
+    }
+    for product, stages in expected_stages.items():
+        with open(os.path.join(logs_dir, product, f"metrics_{STATION_NAME}.json")) as f:
+            metrics = json.load(f)
+        assert metrics["station"]["n_files"] == 1
+        assert metrics["labels"]["sensor_name"] == "OTT_Parsivel"
+        assert all(stage in metrics["station"]["stages"] for stage in stages)
+        assert metrics["station"]["counters"]["n_bytes_written"] > 0
+        assert os.path.isfile(os.path.join(logs_dir, product, f"metrics_{STATION_NAME}.prom"))
+
+
+def test_disdrodb_run_l0_station_profile(tmp_path):
+    """Test the L0 processing profiling."""
+    test_base_dir = tmp_path / "DISDRODB"
+    shutil.copytree(BASE_DIR, test_base_dir)
+
+    runner = CliRunner()
+    runner.invoke(
+        disdrodb_run_l0_station,
+        [DATA_SOURCE, CAMPAIGN_NAME, STATION_NAME, "--base_dir", test_base_dir, "--parallel", False, "--profile", True],
+    )
+
+    logs_dir = os.path.join(test_base_dir, "Processed", DATA_SOURCE, CAMPAIGN_NAME, "logs")
+    for product in ["L0A", "L0B"]:
+        for extension in ["prof", "txt", "collapsed"]:
+            assert os.path.isfile(os.path.join(logs_dir, product, f"profile_{STATION_NAME}.{extension}"))
+        assert count_files(os.path.join(logs_dir, product, STATION_NAME), glob_pattern="*.prof") == 0
+
+
 @pytest.mark.parametrize("verbose", [True, False])
 def test_disdrodb_run_l0_station(tmp_path, verbose):
     """Test the disdrodb_run_l0_station command."""
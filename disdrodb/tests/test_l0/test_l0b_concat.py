@@ -25,9 +25,11 @@ import pandas as pd
 import pytest
 import xarray as xr
 
-from disdrodb.api.path import define_campaign_dir
-from disdrodb.l0.l0_processing import run_l0b_concat, run_l0b_concat_station
+from disdrodb.api.path import define_campaign_dir, define_l0b_filepath
+from disdrodb.l0.l0_processing import run_l0b_concat, run_l0b_concat_station, run_l0b_repartition
+from disdrodb.l0.l0b_processing import create_l0b_from_l0a, write_l0b
 from disdrodb.l0.routines import run_disdrodb_l0b_concat
+from disdrodb.l0.synthetic import generate_l0a_dataframe, get_synthetic_metadata
 from disdrodb.tests.conftest import create_fake_metadata_file, create_fake_station_dir
 from disdrodb.utils.directories import count_files, list_files
 from disdrodb.utils.netcdf import xr_concat_datasets
@@ -161,7 +163,7 @@ def test_xr_concat_completely_partial_overlapped_datasets(tmp_path):
     np.testing.assert_allclose(time_values.astype(float), unique_time_data.astype(float))
 
 
-def test_run_l0b_concat(tmp_path):
+def test_run_l0b_concat(tmp_path, monkeypatch):
     # Define station info
     base_dir = tmp_path / "DISDRODB"
     data_source = "DATA_SOURCE"
@@ -191,12 +193,17 @@ def test_run_l0b_concat(tmp_path):
     _ = create_dummy_l0b_file(filepath=filepath2, time=time_data_2)
 
     # Monkey patch the write_l0b function
-    def mock_write_l0b(ds: xr.Dataset, filepath: str, force=False) -> None:
+    def mock_write_l0b(
+        ds: xr.Dataset,
+        filepath: str,
+        force=False,
+        sparse=False,
+        encoding_options=None,
+        engine="netcdf4",
+    ) -> None:
         ds.to_netcdf(filepath, engine="netcdf4")
 
-    from disdrodb.l0 import l0b_processing
-
-    l0b_processing.write_l0b = mock_write_l0b
+    monkeypatch.setattr("disdrodb.l0.l0b_processing.write_l0b", mock_write_l0b)
 
     # Run concatenation command
     run_l0b_concat(processed_dir=processed_dir, station_name=station_name, verbose=False)
@@ -351,3 +358,100 @@ def test_run_disdrodb_l0b_concat(tmp_path):
             remove_l0b=True,
             verbose=False,
         )
+
+
+@pytest.mark.parametrize(("time_window", "expected_sizes"), [("day", [240, 120, 240]), ("month", [360, 240])])
+def test_run_l0b_repartition(tmp_path, time_window, expected_sizes):
+    base_dir = tmp_path / "DISDRODB"
+    data_source = "DATA_SOURCE"
+    campaign_name = "CAMPAIGN_NAME"
+    station_name = "test_station_1"
+    station_dir = create_fake_station_dir(
+        base_dir=base_dir,
+        product="L0B",
+        data_source=data_source,
+        campaign_name=campaign_name,
+        station_name=station_name,
+    )
+    processed_dir = define_campaign_dir(
+        base_dir=base_dir, product="L0B", data_source=data_source, campaign_name=campaign_name
+    )
+
+    # Add L0B files crossing day and month boundaries, with 120 duplicated timesteps
+    filepaths = []
+    for start_time in ["2023-01-30 20:00:00", "2023-01-31 22:00:00", "2023-02-01 00:00:00"]:
+        df = generate_l0a_dataframe("OTT_Parsivel2", n_rows=240, start_time=start_time, seed=0)
+        ds = create_l0b_from_l0a(df, attrs=get_synthetic_metadata("OTT_Parsivel2"))
+        filepaths.append(define_l0b_filepath(ds, processed_dir, station_name))
+        write_l0b(ds, filepath=filepaths[-1])
+
+    # Run repartitioning
+    run_l0b_repartition(processed_dir, station_name=station_name, time_window=time_window)
+
+    # Assert the original files were replaced by a file for each time window
+    # - The files within a single time window are overwritten by the time window file
+    assert not os.path.exists(filepaths[1])
+    new_filepaths = sorted(list_files(station_dir, glob_pattern="*.nc", recursive=True))
+    assert len(new_filepaths) == len(expected_sizes)
+    list_time = []
+    for filepath in new_filepaths:
+        with xr.open_dataset(filepath) as ds:
+            time = ds["time"].values
+        assert len(np.unique(time.astype(f"M8[{time_window[0].upper()}]"))) == 1
+        list_time.append(time)
+    assert [len(time) for time in list_time] == expected_sizes
+
+    # Assert the timesteps are unique and sorted across the time windows
+    time = np.concatenate(list_time)
+    assert np.all(np.diff(time) > np.timedelta64(0, "s"))
+
+
+def test_run_l0b_repartition_without_time_window(tmp_path):
+    processed_dir = tmp_path / "DISDRODB" / "Processed" / "DATA_SOURCE" / "CAMPAIGN_NAME"
+    with pytest.raises(ValueError):
+        run_l0b_repartition(str(processed_dir), station_name="test_station_1", time_window=None)
+
+
+def test_run_l0b_repartition_interleaved_files(tmp_path):
+    base_dir = tmp_path / "DISDRODB"
+    data_source = "DATA_SOURCE"
+    campaign_name = "CAMPAIGN_NAME"
+    station_name = "test_station_1"
+    station_dir = create_fake_station_dir(
+        base_dir=base_dir,
+        product="L0B",
+        data_source=data_source,
+        campaign_name=campaign_name,
+        station_name=station_name,
+    )
+    processed_dir = define_campaign_dir(
+        base_dir=base_dir, product="L0B", data_source=data_source, campaign_name=campaign_name
+    )
+
+    # Add L0B files with interleaved timesteps (even and odd rows) and a file overlapping both
+    df = generate_l0a_dataframe("OTT_Parsivel2", n_rows=240, start_time="2023-01-31 22:00:00", seed=0)
+    ds = create_l0b_from_l0a(df, attrs=get_synthetic_metadata("OTT_Parsivel2"))
+    filepaths = []
+    for ds_file in [ds.isel(time=slice(0, None, 2)), ds.isel(time=slice(1, None, 2)), ds.isel(time=slice(100, 140))]:
+        filepaths.append(os.path.join(station_dir, f"file_{len(filepaths)}.nc"))
+        write_l0b(ds_file, filepath=filepaths[-1])
+    # - Rename the files with the time period they cover
+    for i, filepath in enumerate(filepaths):
+        with xr.open_dataset(filepath) as ds_file:
+            new_filepath = define_l0b_filepath(ds_file, processed_dir, station_name)
+        os.rename(filepath, new_filepath)
+        filepaths[i] = new_filepath
+
+    # Run repartitioning
+    run_l0b_repartition(processed_dir, station_name=station_name, time_window="day")
+
+    # Assert no timestep is lost
+    new_filepaths = sorted(list_files(station_dir, glob_pattern="*.nc", recursive=True))
+    assert len(new_filepaths) == 2
+    ds_new = xr.concat([xr.open_dataset(filepath) for filepath in new_filepaths], dim="time")
+    np.testing.assert_array_equal(ds_new["time"].values, ds["time"].values)
+    np.testing.assert_array_equal(ds_new["raw_drop_number"].values, ds["raw_drop_number"].values)
+
+    # Assert the original files have been removed
+    for filepath in filepaths:
+        assert filepath in new_filepaths or not os.path.exists(filepath)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Test DISDRODB L0B encodings optimizer."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+import disdrodb
+from disdrodb.l0.l0b_encodings import (
+    SPARSE_COMPLEVEL,
+    define_complevel,
+    define_time_chunksize,
+    get_l0b_encoding_options,
+    get_sampling_interval,
+    get_variable_sparsity,
+    optimize_encodings_dict,
+)
+from disdrodb.l0.l0b_processing import set_encodings
+
+
+def create_dataset(n_timesteps=7200, n_nonzero=10):
+    time = pd.date_range("2023-01-01", periods=n_timesteps, freq="60s")
+    spectrum = np.zeros((n_timesteps, 32, 32), dtype="uint32")
+    spectrum[:, :n_nonzero, 0] = 1
+    return xr.Dataset(
+        {
+            "raw_drop_number": (("time", "diameter_bin_center", "velocity_bin_center"), spectrum),
+            "rainfall_rate_32bit": ("time", np.ones(n_timesteps, dtype="float32")),
+        },
+        coords={"time": time},
+    )
+
+
+def create_encoding_dict():
+    return {
+        "raw_drop_number": {"dtype": "uint32", "zlib": True, "complevel": 3, "chunksizes": [5000, 32, 32]},
+        "rainfall_rate_32bit": {"dtype": "float32", "zlib": True, "complevel": 3, "chunksizes": [5000]},
+    }
+
+
+def test_get_l0b_encoding_options():
+    assert get_l0b_encoding_options() == {"optimize": False, "access_pattern": "timeseries", "benchmark": False}
+    options = get_l0b_encoding_options(optimize=True, access_pattern="spectrum", benchmark=True)
+    assert options == {"optimize": True, "access_pattern": "spectrum", "benchmark": True}
+    with disdrodb.config.set({"l0b_encodings_optimize": True}):
+        assert get_l0b_encoding_options()["optimize"]
+    with pytest.raises(ValueError):
+        get_l0b_encoding_options(access_pattern="invalid")
+
+
+def test_sampling_interval_and_sparsity():
+    ds = create_dataset(n_timesteps=10)
+    assert get_sampling_interval(ds) == 60
+    assert get_sampling_interval(ds.isel(time=[0])) == 60
+    assert get_variable_sparsity(ds["raw_drop_number"]) == pytest.approx(1 - 10 / 1024)
+
+
+def test_define_time_chunksize():
+    ds = create_dataset()
+    encoding = create_encoding_dict()["raw_drop_number"]
+    # Dense spectra: 1 MiB chunks
+    assert define_time_chunksize(ds, "raw_drop_number", encoding) == 256
+    # Sparse spectra: larger chunks
+    assert define_time_chunksize(ds, "raw_drop_number", encoding, sparsity=0.99) == 2048
+    # Spectrum access pattern: chunks of at most one hour
+    assert define_time_chunksize(ds, "raw_drop_number", encoding, access_pattern="spectrum", sparsity=0.99) == 60
+    # Chunks smaller than the number of timesteps
+    assert define_time_chunksize(ds, "rainfall_rate_32bit", {"dtype": "float32"}) == 7200
+
+
+def test_define_complevel():
+    ds = create_dataset(n_timesteps=10)
+    encoding = create_encoding_dict()["raw_drop_number"]
+    assert define_complevel(ds, "raw_drop_number", encoding) == 3
+    assert define_complevel(ds, "raw_drop_number", encoding, sparsity=0.99) == SPARSE_COMPLEVEL
+    assert define_complevel(ds, "raw_drop_number", {"zlib": False}) is None
+
+
+@pytest.mark.parametrize("benchmark", [False, True])
+def test_optimize_encodings_dict(benchmark):
+    ds = create_dataset(n_timesteps=200)
+    encoding_dict, settings = optimize_encodings_dict(
+        create_encoding_dict(),
+        ds,
+        access_pattern="spectrum",
+        benchmark=benchmark,
+    )
+    assert settings["access_pattern"] == "spectrum"
+    assert set(settings["variables"]) == {"raw_drop_number", "rainfall_rate_32bit"}
+    for var, var_settings in settings["variables"].items():
+        assert encoding_dict[var]["chunksizes"] == var_settings["chunksizes"]
+        assert var_settings["chunksizes"][0] <= 200
+    assert encoding_dict["raw_drop_number"]["chunksizes"][1:] == [32, 32]
+    if not benchmark:
+        assert settings["variables"]["raw_drop_number"] == {"chunksizes": [60, 32, 32], "complevel": 1}
+
+
+def test_set_encodings_optimize(tmp_path):
+    ds = create_dataset(n_timesteps=200)
+    encoding_options = get_l0b_encoding_options(optimize=True, access_pattern="spectrum")
+    ds = set_encodings(ds, sensor_name="OTT_Parsivel", encoding_options=encoding_options)
+    settings = json.loads(ds.attrs["disdrodb_encodings"])
+    assert settings["variables"]["raw_drop_number"]["chunksizes"] == [60, 32, 32]
+
+    # Test the optimized chunks are written to the netCDF
+    filepath = str(tmp_path / "test.nc")
+    ds.to_netcdf(filepath)
+    with xr.open_dataset(filepath) as ds_file:
+        assert ds_file["raw_drop_number"].encoding["chunksizes"] == (60, 32, 32)
+
+    # Test the default encodings are left unchanged
+    ds = set_encodings(create_dataset(n_timesteps=200), sensor_name="OTT_Parsivel")
+    assert "disdrodb_encodings" not in ds.attrs
@@ -22,13 +22,16 @@ import numpy as np
 import pytest
 import xarray as xr
 
+import disdrodb
 from disdrodb.l0.l0b_nc_processing import (
     _check_dict_names_validity,
     _get_missing_variables,
     add_dataset_missing_variables,
+    get_l0b_nc_options,
     rename_dataset,
     replace_custom_nan_flags,
     replace_nan_flags,
+    set_nan_invalid_data,
     set_nan_invalid_values,
     set_nan_outside_data_range,
     subset_dataset,
@@ -293,3 +296,63 @@ def test_get_missing_variables(create_test_config_files):
 
     # Assertions
     assert missing_vars == {"var3", "var_not_in_ds"}, "Missing variables should be identified correctly"
+
+
+def test_get_l0b_nc_options():
+    assert get_l0b_nc_options() == (False, 1000)
+    assert get_l0b_nc_options(lazy=True, chunksize=10) == (True, 10)
+    with disdrodb.config.set({"l0b_nc_lazy": True, "l0b_nc_chunksize": 100}):
+        assert get_l0b_nc_options() == (True, 100)
+    with pytest.raises(ValueError):
+        get_l0b_nc_options(chunksize=0)
+
+
+@pytest.mark.parametrize("create_test_config_files", [config_dict], indirect=True)
+def test_lazy_dataset_masking(create_test_config_files):
+    """Test the masking of lazy (dask) variables gives the same results as in memory."""
+    ds = xr.Dataset({
+        "key_1": xr.DataArray([0, 1, 2, 3, 4], dims="time"),
+        "key_2": xr.DataArray([1, -9999, 20, 30, 89], dims="time"),
+        "key_3": xr.DataArray([1.0, -9999.0, 0.0, 1.0, 89.0], dims="time"),
+        "key_4": xr.DataArray([1, -9999, -8888, 0, 3], dims="time"),
+    })
+    list_ds = []
+    for dataset in [ds, ds.chunk({"time": 2})]:
+        dataset = replace_nan_flags(dataset, sensor_name=TEST_SENSOR_NAME, verbose=False)
+        dataset = set_nan_outside_data_range(dataset, sensor_name=TEST_SENSOR_NAME, verbose=False)
+        dataset = set_nan_invalid_values(dataset, sensor_name=TEST_SENSOR_NAME, verbose=False)
+        list_ds.append(dataset)
+    assert list_ds[1]["key_2"].chunks is not None
+    xr.testing.assert_identical(list_ds[0], list_ds[1].compute())
+
+
+@pytest.mark.parametrize("create_test_config_files", [config_dict], indirect=True)
+def test_set_nan_invalid_data(create_test_config_files):
+    """Test the single-pass masking gives the same results as the sequential masking."""
+    ds = xr.Dataset({
+        "key_1": xr.DataArray([0, 1, 2, 3, 4]),
+        "key_2": xr.DataArray([1, -9999, 20, 30, 89]),
+        "key_3": xr.DataArray([1.0, -9999.0, 0.0, np.nan, 89.0]),
+        "key_4": xr.DataArray([1, -9999, -8888, 0, 3]),
+        "key_not_in_dict": xr.DataArray([0, 1, 2, 3, 4]),
+    })
+    expected_ds = replace_nan_flags(ds.copy(deep=True), sensor_name=TEST_SENSOR_NAME, verbose=False)
+    expected_ds = set_nan_outside_data_range(expected_ds, sensor_name=TEST_SENSOR_NAME, verbose=False)
+    expected_ds = set_nan_invalid_values(expected_ds, sensor_name=TEST_SENSOR_NAME, verbose=False)
+
+    result_ds, summary = set_nan_invalid_data(ds.copy(deep=True), sensor_name=TEST_SENSOR_NAME, verbose=True)
+    xr.testing.assert_identical(result_ds, expected_ds)
+    assert "key_1" not in summary
+    assert summary["key_2"] == {"nan_flags": 1, "outside_data_range": 2, "invalid_values": 2}
+    assert summary["key_3"] == {"nan_flags": 1, "outside_data_range": 1, "invalid_values": 0}
+    assert summary["key_4"] == {"nan_flags": 2, "invalid_values": 1}
+    assert "key_not_in_dict" not in summary
+
+    # Test floating point arrays are masked in place
+    values = ds["key_3"].values
+    result_ds, _ = set_nan_invalid_data(ds, sensor_name=TEST_SENSOR_NAME, inplace=True)
+    assert result_ds["key_3"].values is values
+    assert np.isnan(values[1])
+    # - Integer arrays are converted to float
+    assert result_ds["key_2"].dtype == float
+    xr.testing.assert_identical(result_ds, expected_ds)
@@ -24,6 +24,7 @@ import pandas as pd
 import pytest
 import xarray as xr
 
+import disdrodb
 from disdrodb.l0 import l0b_processing
 from disdrodb.l0.l0b_processing import (
     _set_attrs_dict,
@@ -310,6 +311,25 @@ def test__format_string_array():
     assert np.allclose(l0b_processing._format_string_array(",,2,", 4), arr_nan, equal_nan=True)
 
 
+def test__format_string_arrays():
+    strings = [
+        "",
+        "2;44;22;33",
+        "2,44,22,33",
+        "000;000;000;001",
+        ",,2,44,22,33,,",
+        "2,44,22",
+        "2,44,22,33,44",
+        ",,2,",
+        "-9.999;1;2;3",
+        "1,2;3,4",
+    ]
+    expected = np.stack([l0b_processing._format_string_array(string, 4) for string in strings])
+    result = l0b_processing._format_string_arrays(pd.Series(strings), n_values=4)
+    assert result.shape == (len(strings), 4)
+    np.testing.assert_allclose(result, expected, equal_nan=True)
+
+
 def test__reshape_raw_spectrum():
     from disdrodb.l0.standards import (
         get_dims_size_dict,
@@ -536,3 +556,70 @@ def test_rechunk_dataset():
     ds_rechunked = l0b_processing.rechunk_dataset(ds, encoding_dict)
     assert ds_rechunked["a"].chunks == ((1, 1), (2, 1))
     assert ds_rechunked["b"].chunks == ((2,), (1, 1, 1))
+
+
+def test_set_netcdf_chunksizes():
+    ds = xr.Dataset(
+        {
+            "a": (["x", "y"], [[1, 2, 3], [4, 5, 6]]),
+            "b": (["x", "y"], [[7, 8, 9], [10, 11, 12]]),
+            "c": (["z"], []),
+        },
+    )
+    encoding_dict = {"a": {"chunksizes": [1]}, "b": {"chunksizes": [], "contiguous": True}, "c": {"chunksizes": [0]}}
+    result = l0b_processing.set_netcdf_chunksizes(ds, encoding_dict)
+    assert result["a"]["chunksizes"] == [1, 3]
+    assert "chunksizes" not in result["b"]
+    assert result["c"]["chunksizes"] == [1]
+    assert ds["a"].chunks is None
+
+
+@pytest.mark.parametrize("rechunk", [None, True])
+def test_set_encodings_rechunk(rechunk):
+    # Create a sample in-memory L0B dataset
+    time = pd.date_range("2023-01-01", periods=10, freq="60s")
+    ds = xr.Dataset(
+        {
+            "rainfall_rate_32bit": ("time", np.ones(10, dtype="float32")),
+            "raw_drop_number": (("time", "diameter_bin_center", "velocity_bin_center"), np.zeros((10, 32, 32))),
+        },
+        coords={"time": time},
+    )
+    ds = l0b_processing.set_encodings(ds, sensor_name="OTT_Parsivel", rechunk=rechunk)
+    if rechunk:
+        # Test the arrays are rechunked with dask
+        assert ds["raw_drop_number"].chunks == ((10,), (32,), (32,))
+        assert "chunksizes" not in ds["raw_drop_number"].encoding
+    else:
+        # Test in-memory arrays are left unchanged and chunk sizes are set as netCDF encoding
+        assert ds["raw_drop_number"].chunks is None
+        assert ds["raw_drop_number"].encoding["chunksizes"] == [10, 32, 32]
+        assert ds["rainfall_rate_32bit"].encoding["chunksizes"] == [10]
+
+
+def test_get_l0b_batch_options():
+    assert l0b_processing.get_l0b_batch_options() == (1, None)
+    assert l0b_processing.get_l0b_batch_options(batch_size=10, time_window="day") == (10, "day")
+    assert l0b_processing.get_l0b_batch_options(time_window="year") == (1, "year")
+    with disdrodb.config.set({"l0b_batch_size": 5, "l0b_time_window": "month"}):
+        assert l0b_processing.get_l0b_batch_options() == (5, "month")
+    with pytest.raises(ValueError):
+        l0b_processing.get_l0b_batch_options(batch_size=0)
+    with pytest.raises(ValueError):
+        l0b_processing.get_l0b_batch_options(time_window="week")
+
+
+def test_split_dataset_by_time_window():
+    time = pd.to_datetime(["2023-02-01 00:00", "2023-01-31 23:59", "2023-01-31 12:00", "2023-02-02 00:00"])
+    ds = xr.Dataset({"var": ("time", np.arange(4))}, coords={"time": time})
+    # No time window
+    list_ds = l0b_processing.split_dataset_by_time_window(ds, time_window=None)
+    assert len(list_ds) == 1
+    # Daily windows
+    list_ds = l0b_processing.split_dataset_by_time_window(ds, time_window="day")
+    assert [ds_window.sizes["time"] for ds_window in list_ds] == [2, 1, 1]
+    assert all(ds_window.indexes["time"].is_monotonic_increasing for ds_window in list_ds)
+    # Monthly windows
+    list_ds = l0b_processing.split_dataset_by_time_window(ds, time_window="month")
+    assert [ds_window.sizes["time"] for ds_window in list_ds] == [2, 2]
+    np.testing.assert_equal(list_ds[0]["var"].values, [2, 1])
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Test DISDRODB synthetic raw data generators."""
+import os
+
+import pytest
+
+from disdrodb.api.path import define_station_dir
+from disdrodb.l0.l0_processing import run_l0a_station
+from disdrodb.l0.l0_reader import available_readers
+from disdrodb.l0.l0a_processing import process_raw_file
+from disdrodb.l0.l0b_processing import create_l0b_from_l0a
+from disdrodb.l0.standards import get_raw_array_nvalues
+from disdrodb.l0.synthetic import (
+    SYNTHETIC_READER_KWARGS,
+    SYNTHETIC_SENSOR_NAMES,
+    create_synthetic_archive,
+    generate_l0a_dataframe,
+    generate_raw_dataframe,
+    generate_raw_file,
+    get_synthetic_column_names,
+    get_synthetic_metadata,
+    synthetic_df_sanitizer,
+)
+from disdrodb.utils.directories import count_files
+
+
+def test_generate_raw_dataframe():
+    df = generate_raw_dataframe("OTT_Parsivel", n_rows=100, duplicate_rate=0.1)
+    assert len(df) == 100
+    assert list(df.columns) == get_synthetic_column_names("OTT_Parsivel")
+    assert df["time"].duplicated().sum() > 0
+    # Test reproducibility
+    assert df.equals(generate_raw_dataframe("OTT_Parsivel", n_rows=100, duplicate_rate=0.1))
+
+    # Test invalid rates
+    with pytest.raises(ValueError):
+        generate_raw_dataframe("OTT_Parsivel", n_rows=100, corruption_rate=2)
+    with pytest.raises(ValueError):
+        generate_raw_dataframe("OTT_Parsivel", n_rows=100, duplicate_rate=1)
+
+
+@pytest.mark.parametrize("sensor_name", SYNTHETIC_SENSOR_NAMES)
+def test_process_synthetic_raw_file(tmp_path, sensor_name):
+    filepath = generate_raw_file(
+        os.path.join(tmp_path, f"{sensor_name}.txt.gz"),
+        sensor_name=sensor_name,
+        n_rows=500,
+        corruption_rate=0.05,
+        duplicate_rate=0.05,
+    )
+    df = process_raw_file(
+        filepath=filepath,
+        column_names=get_synthetic_column_names(sensor_name),
+        reader_kwargs=SYNTHETIC_READER_KWARGS.copy(),
+        df_sanitizer_fun=synthetic_df_sanitizer,
+        sensor_name=sensor_name,
+        verbose=False,
+    )
+    # Corrupted and duplicated rows are removed
+    assert 0 < len(df) < 500
+    assert df["time"].is_unique
+
+
+@pytest.mark.parametrize("sensor_name", SYNTHETIC_SENSOR_NAMES)
+def test_generate_l0a_dataframe(sensor_name):
+    df = generate_l0a_dataframe(sensor_name, n_rows=100)
+    ds = create_l0b_from_l0a(df, attrs=get_synthetic_metadata(sensor_name))
+    assert ds.sizes["time"] == 100
+    if "raw_drop_number" in get_raw_array_nvalues(sensor_name):
+        assert int(ds["raw_drop_number"].sum()) > 0
+
+    with pytest.raises(ValueError):
+        generate_l0a_dataframe(sensor_name, n_rows=100, corruption_rate=0.1)
+
+
+def test_create_synthetic_archive(tmp_path):
+    base_dir = str(tmp_path / "DISDRODB")
+    list_info = create_synthetic_archive(base_dir, n_data_sources=2, n_stations=2, n_files=2, n_rows=50)
+    assert len(list_info) == 4
+
+    # Test the SYNTHETIC reader is not listed in the readers registry
+    assert "SYNTHETIC" not in available_readers()
+
+    # Test the synthetic stations can be processed with the SYNTHETIC reader
+    data_source, campaign_name, station_name = list_info[0]
+    run_l0a_station(
+        data_source=data_source,
+        campaign_name=campaign_name,
+        station_name=station_name,
+        base_dir=base_dir,
+        parallel=False,
+    )
+    station_dir = define_station_dir(
+        base_dir=base_dir,
+        product="L0A",
+        data_source=data_source,
+        campaign_name=campaign_name,
+        station_name=station_name,
+    )
+    assert count_files(station_dir, glob_pattern="*.parquet", recursive=True) == 2
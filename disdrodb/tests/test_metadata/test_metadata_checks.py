@@ -18,6 +18,8 @@
 # -----------------------------------------------------------------------------.
 """Check DISDRODB Metadata Archive files."""
 
+import json
+import os
 
 import pytest
 
@@ -25,6 +27,7 @@ from disdrodb.api.configs import available_sensor_names
 from disdrodb.l0.l0_reader import available_readers
 from disdrodb.metadata.checks import (
     _check_metadata_values,
+    check_archive_metadata,
     check_archive_metadata_campaign_name,
     check_archive_metadata_compliance,
     check_archive_metadata_data_source,
@@ -347,3 +350,66 @@ def test_identify_missing_metadata_coords(tmp_path):
     metadata_filepath = create_fake_metadata_file(base_dir=base_dir, metadata_dict=metadata_dict)
     with pytest.raises(TypeError):
         identify_missing_metadata_coords([metadata_filepath])
+
+
+def test_check_archive_metadata(tmp_path):
+    base_dir = tmp_path / "DISDRODB"
+    metadata_dict = {"longitude": 10, "latitude": 20, "platform_type": "fixed"}
+    _ = create_fake_metadata_file(base_dir=base_dir, metadata_dict=metadata_dict, station_name="station_1")
+    metadata_dict = {"longitude": -9999, "latitude": -9999, "platform_type": "fixed"}
+    _ = create_fake_metadata_file(base_dir=base_dir, metadata_dict=metadata_dict, station_name="station_2")
+
+    # Test invalid check name
+    with pytest.raises(ValueError):
+        check_archive_metadata(base_dir=base_dir, checks="invalid_check")
+
+    # Test report
+    report_filepath = str(tmp_path / "report.json")
+    for parallel in [True, False]:
+        report = check_archive_metadata(
+            base_dir=base_dir,
+            checks=["station_name", "geolocation"],
+            parallel=parallel,
+            report_filepath=report_filepath,
+        )
+        assert report["n_stations"] == 2
+        assert report["n_invalid"] == 1
+        assert report["stations"][0]["errors"] == {}
+        assert list(report["stations"][1]["errors"]) == ["geolocation"]
+        with open(report_filepath) as f:
+            assert json.load(f) == report
+
+
+def test_check_archive_metadata_cache(tmp_path):
+    base_dir = tmp_path / "DISDRODB"
+    metadata_filepath = create_fake_metadata_file(base_dir=base_dir, station_name="station_1")
+    _ = create_fake_metadata_file(base_dir=base_dir, station_name="station_2")
+    cache_filepath = str(tmp_path / "cache.json")
+
+    # Test first run creates the cache
+    report = check_archive_metadata(base_dir=base_dir, checks="geolocation", cache=True, cache_filepath=cache_filepath)
+    assert os.path.isfile(cache_filepath)
+    assert report["n_cached"] == 0
+    assert report["n_invalid"] == 2
+
+    # Test unchanged stations are taken from the cache
+    report = check_archive_metadata(base_dir=base_dir, checks="geolocation", cache=True, cache_filepath=cache_filepath)
+    assert report["n_cached"] == 2
+    assert report["n_invalid"] == 2
+
+    # Test additional checks are run on cached stations
+    report = check_archive_metadata(
+        base_dir=base_dir,
+        checks=["geolocation", "station_name"],
+        cache=True,
+        cache_filepath=cache_filepath,
+    )
+    assert report["n_cached"] == 0
+
+    # Test modified stations are checked again
+    metadata_dict = read_yaml(metadata_filepath)
+    metadata_dict.update({"longitude": 10, "latitude": 20, "platform_type": "fixed"})
+    write_yaml(metadata_dict, metadata_filepath)
+    report = check_archive_metadata(base_dir=base_dir, checks="geolocation", cache=True, cache_filepath=cache_filepath)
+    assert report["n_cached"] == 1
+    assert report["n_invalid"] == 1
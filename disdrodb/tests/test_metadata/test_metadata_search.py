@@ -24,6 +24,7 @@ from disdrodb.metadata.search import (
     _get_list_all_metadata,
     _get_list_metadata_with_data,
     get_list_metadata,
+    search_stations,
 )
 from disdrodb.tests.conftest import (
     create_fake_metadata_file,
@@ -190,3 +191,76 @@ def test_get_list_metadata_file(tmp_path):
     # Test 5: Check by station names
     result = get_list_metadata(base_dir=str(base_dir), station_names=station_name, with_stations_data=False)
     assert [metadata_filepath] == result
+
+
+def test_search_stations(tmp_path):
+    from disdrodb.api.catalog import update_catalog
+
+    base_dir = tmp_path / "DISDRODB"
+    # Lausanne
+    metadata_dict = {"sensor_name": "OTT_Parsivel2", "longitude": 6.63, "latitude": 46.52}
+    create_fake_metadata_file(base_dir=base_dir, metadata_dict=metadata_dict, station_name="station_1")
+    # Geneva
+    metadata_dict = {"sensor_name": "OTT_Parsivel2", "longitude": 6.14, "latitude": 46.20}
+    create_fake_metadata_file(base_dir=base_dir, metadata_dict=metadata_dict, station_name="station_2")
+    # Zurich
+    metadata_dict = {"sensor_name": "Thies_LPM", "longitude": 8.54, "latitude": 47.37}
+    create_fake_metadata_file(base_dir=base_dir, metadata_dict=metadata_dict, station_name="station_3")
+    # Missing coordinates
+    metadata_dict = {"sensor_name": "OTT_Parsivel2"}
+    create_fake_metadata_file(base_dir=base_dir, metadata_dict=metadata_dict, station_name="station_4")
+
+    def _get_station_names(df):
+        return df.index.get_level_values("station_name").tolist()
+
+    # Test the search requires the catalog
+    with pytest.raises(ValueError):
+        search_stations(base_dir=base_dir)
+
+    # Test the catalog is created with refresh=True
+    df = search_stations(base_dir=base_dir, refresh=True)
+    assert _get_station_names(df) == ["station_1", "station_2", "station_3", "station_4"]
+
+    # Test filter by sensor
+    df = search_stations(sensor_names="OTT_Parsivel2", base_dir=base_dir)
+    assert _get_station_names(df) == ["station_1", "station_2", "station_4"]
+
+    # Test filter by radius (sorted by distance)
+    df = search_stations(point=(6.6, 46.5), radius_km=50, base_dir=base_dir)
+    assert _get_station_names(df) == ["station_1", "station_2"]
+    assert df["distance_km"].iloc[0] < 5
+
+    # Test filter by bounding box
+    df = search_stations(bbox=(8, 9, 47, 48), base_dir=base_dir)
+    assert _get_station_names(df) == ["station_3"]
+
+    # Test filter by data source and campaign
+    assert len(search_stations(data_sources="ANOTHER", base_dir=base_dir)) == 0
+    assert len(search_stations(campaign_names="CAMPAIGN_NAME", base_dir=base_dir)) == 4
+
+    # Test invalid arguments
+    with pytest.raises(ValueError):
+        search_stations(point=(6.6, 46.5), base_dir=base_dir)
+
+    # Test the catalog is not updated without refresh
+    metadata_dict = {"sensor_name": "OTT_Parsivel2", "longitude": 6.60, "latitude": 46.50}
+    create_fake_metadata_file(base_dir=base_dir, metadata_dict=metadata_dict, station_name="station_5")
+    assert len(search_stations(point=(6.6, 46.5), radius_km=1, base_dir=base_dir)) == 0
+    df = search_stations(point=(6.6, 46.5), radius_km=1, base_dir=base_dir, refresh=True)
+    assert _get_station_names(df) == ["station_5"]
+
+    # Test time filtering
+    filename = "L0B.CAMPAIGN_NAME.station_2.s20180101000000.e20180131235959.V0.nc"
+    create_fake_raw_data_file(base_dir=base_dir, product="L0B", station_name="station_2", filename=filename)
+    assert len(search_stations(start_time="2018-01-15", base_dir=base_dir)) == 0
+    update_catalog(base_dir=base_dir)
+    df = search_stations(
+        sensor_names="OTT_Parsivel2",
+        point=(6.6, 46.5),
+        radius_km=50,
+        start_time="2018-01-15",
+        end_time="2018-02-15",
+        base_dir=base_dir,
+    )
+    assert _get_station_names(df) == ["station_2"]
+    assert len(search_stations(start_time="2018-02-01", base_dir=base_dir)) == 0
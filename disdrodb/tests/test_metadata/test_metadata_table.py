@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Test DISDRODB Metadata Archive table."""
+import os
+
+import pytest
+
+from disdrodb.metadata.info import get_archive_metadata_key_value
+from disdrodb.metadata.standards import get_valid_metadata_keys
+from disdrodb.metadata.table import get_archive_metadata_table
+from disdrodb.tests.conftest import create_fake_metadata_file
+from disdrodb.utils.yaml import read_yaml, write_yaml
+
+
+def test_get_archive_metadata_table(tmp_path):
+    base_dir = tmp_path / "DISDRODB"
+    cache_filepath = str(tmp_path / "cache.json")
+    metadata_dict = {"sensor_name": "OTT_Parsivel", "latitude": 46, "extra_key": "value"}
+    _ = create_fake_metadata_file(base_dir=base_dir, metadata_dict=metadata_dict, station_name="station_1")
+    metadata_filepath = create_fake_metadata_file(
+        base_dir=base_dir,
+        metadata_dict={"sensor_name": "Thies_LPM"},
+        campaign_name="CAMPAIGN_2",
+        station_name="station_2",
+    )
+
+    for parallel in [True, False]:
+        df = get_archive_metadata_table(
+            base_dir=base_dir,
+            use_cache=True,
+            cache_filepath=cache_filepath,
+            parallel=parallel,
+        )
+        assert list(df.index.names) == ["data_source", "campaign_name", "station_name"]
+        assert df.index.tolist() == [
+            ("DATA_SOURCE", "CAMPAIGN_2", "station_2"),
+            ("DATA_SOURCE", "CAMPAIGN_NAME", "station_1"),
+        ]
+        # Test standard keys come first, followed by non-standard keys
+        assert df.columns.tolist() == get_valid_metadata_keys() + ["extra_key"]
+        # Test original types are preserved and missing keys are set to None
+        assert df["latitude"].tolist() == [-9999, 46]
+        assert df["extra_key"].tolist() == [None, "value"]
+    assert os.path.isfile(cache_filepath)
+
+    # Test filtering
+    df_subset = df[df["sensor_name"] == "Thies_LPM"]
+    assert df_subset.index.get_level_values("station_name").tolist() == ["station_2"]
+
+    # Test modified and removed files are updated
+    metadata_dict = read_yaml(metadata_filepath)
+    metadata_dict["sensor_name"] = "RD_80"
+    metadata_dict["comment"] = "a longer comment to change the file size"
+    write_yaml(metadata_dict, metadata_filepath)
+    df = get_archive_metadata_table(base_dir=base_dir, use_cache=True, cache_filepath=cache_filepath)
+    assert df["sensor_name"].tolist() == ["RD_80", "OTT_Parsivel"]
+
+    os.remove(metadata_filepath)
+    df = get_archive_metadata_table(base_dir=base_dir, use_cache=True, cache_filepath=cache_filepath)
+    assert len(df) == 1
+
+    # Test without cache
+    df = get_archive_metadata_table(base_dir=base_dir)
+    assert len(df) == 1
+    # Test the cache is not written into the archive by default
+    assert os.listdir(base_dir) == ["Raw"]
+
+
+def test_get_archive_metadata_table_read_only_archive(tmp_path, mocker):
+    """Test the table is returned if the cache can not be written."""
+    base_dir = tmp_path / "DISDRODB"
+    _ = create_fake_metadata_file(base_dir=base_dir, metadata_dict={}, station_name="station_1")
+    mocker.patch("disdrodb.metadata.table.os.replace", side_effect=PermissionError("Read-only file system"))
+    df = get_archive_metadata_table(base_dir=base_dir, use_cache=True)
+    assert len(df) == 1
+    assert os.listdir(base_dir) == ["Raw"]
+
+
+def test_get_archive_metadata_key_value_empty_archive(tmp_path):
+    base_dir = tmp_path / "DISDRODB"
+    os.makedirs(base_dir)
+    assert get_archive_metadata_key_value(key="station_name", base_dir=base_dir) == []
+
+
+def test_get_archive_metadata_key_value_missing_key(tmp_path):
+    base_dir = tmp_path / "DISDRODB"
+    _ = create_fake_metadata_file(base_dir=base_dir, metadata_dict={})
+    with pytest.raises(KeyError):
+        get_archive_metadata_key_value(key="non_existing_key", base_dir=base_dir)
+    assert get_archive_metadata_key_value(key="station_name", return_tuple=False, base_dir=base_dir) == [
+        "station_name",
+    ]
+
+
+def test_get_archive_metadata_key_value_station_missing_key(tmp_path):
+    """Test a KeyError is raised if any station does not have the key."""
+    base_dir = tmp_path / "DISDRODB"
+    _ = create_fake_metadata_file(base_dir=base_dir, metadata_dict={"extra_key": "value"}, station_name="station_1")
+    _ = create_fake_metadata_file(base_dir=base_dir, metadata_dict={}, station_name="station_2")
+    for use_cache in [False, True]:
+        with pytest.raises(KeyError):
+            get_archive_metadata_key_value(key="extra_key", base_dir=base_dir, use_cache=use_cache)
@@ -19,12 +19,49 @@
 """Test DISDRODB raw data compression."""
 
 
+import gzip
+import hashlib
+import io
 import os
+import zipfile
 
+import pandas as pd
 import pytest
 
 from disdrodb.tests.conftest import create_fake_raw_data_file
-from disdrodb.utils.compression import _zip_dir, compress_station_files, unzip_file
+from disdrodb.utils.compression import (
+    ZipStreamExtractor,
+    _check_file_compression,
+    _compress_file,
+    _zip_dir,
+    compress_station_files,
+    iter_zip_dir,
+    unzip_file,
+    unzip_stream,
+)
+
+
+class _NonSeekableBuffer(io.RawIOBase):
+    """Non-seekable binary buffer (zip entries are written with data descriptors)."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.data += b
+        return len(b)
+
+
+def _create_zip_bytes(seekable=True):
+    buffer = io.BytesIO() if seekable else _NonSeekableBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zipf:
+        zipf.writestr("file1.txt", b"content" * 1000)
+        zipf.writestr("2020/", b"")
+        zipf.writestr("2020/file2.bin", os.urandom(10_000), compress_type=zipfile.ZIP_STORED)
+    return bytes(buffer.getvalue() if seekable else buffer.data)
 
 
 def create_fake_data_dir(base_dir, data_source, campaign_name, station_name):
@@ -135,6 +172,75 @@ def test_files_compression(tmp_path, method):
         )
 
 
+@pytest.mark.parametrize("n_threads", [1, 3])
+@pytest.mark.parametrize("method", ["zip", "gzip", "bzip2"])
+def test_compress_file(tmp_path, method, n_threads, monkeypatch):
+    """Test compressed files are verified and can be read back by pandas."""
+    monkeypatch.setattr("disdrodb.utils.compression.GZIP_BLOCK_SIZE", 1000)
+    filepath = str(tmp_path / "file.txt")
+    content = "".join(f"2020-01-01 00:{i % 60:02d}:00,{i},{i * 0.1:.1f}\n" for i in range(5000))
+    with open(filepath, "w") as f:
+        f.write(content)
+
+    compressed_filepath = _compress_file(filepath, method=method, skip=False, compression_level=1, n_threads=n_threads)
+    assert not os.path.exists(filepath)
+    assert _check_file_compression(compressed_filepath) == method
+    df = pd.read_csv(compressed_filepath, header=None, compression="infer")
+    assert len(df) == 5000
+
+    # Test invalid compression level
+    with pytest.raises(ValueError):
+        compress_station_files(
+            base_dir=tmp_path,
+            data_source="DATA_SOURCE",
+            campaign_name="CAMPAIGN_NAME",
+            station_name="STATION_NAME",
+            method=method,
+            compression_level=30,
+        )
+
+
+def test_compress_file_corrupted_output(tmp_path, monkeypatch):
+    """Test the original file is kept if the compressed file differs."""
+
+    def _compress_file_gzip(filepath, compressed_filepath, compression_level=None, n_threads=1):
+        with gzip.open(compressed_filepath, "wb") as f:
+            f.write(b"corrupted content")
+
+    monkeypatch.setattr("disdrodb.utils.compression._compress_file_gzip", _compress_file_gzip)
+    filepath = str(tmp_path / "file.txt")
+    with open(filepath, "w") as f:
+        f.write("content")
+    with pytest.raises(ValueError):
+        _compress_file(filepath, method="gzip", skip=False)
+    assert os.path.isfile(filepath)
+    assert not os.path.exists(filepath + ".gz")
+
+
+def test_compress_station_files_parallel(tmp_path):
+    """Test compression of station files with a pool of processes."""
+    base_dir = tmp_path / "DISDRODB"
+    create_fake_data_dir(
+        base_dir=base_dir,
+        data_source="DATA_SOURCE",
+        campaign_name="CAMPAIGN_NAME",
+        station_name="STATION_NAME",
+    )
+    list_report = compress_station_files(
+        base_dir=base_dir,
+        data_source="DATA_SOURCE",
+        campaign_name="CAMPAIGN_NAME",
+        station_name="STATION_NAME",
+        method="gzip",
+        parallel=True,
+        max_workers=2,
+    )
+    assert len(list_report) == 2
+    assert all(os.path.isfile(report["compressed_filepath"]) for report in list_report)
+    assert all(not os.path.exists(report["filepath"]) for report in list_report)
+    assert all(report["size"] == 0 for report in list_report)
+
+
 def test_zip_unzip_directory(tmp_path):
     dir_path = tmp_path / "test_dir"
     dir_path.mkdir()
@@ -147,3 +253,87 @@ def test_zip_unzip_directory(tmp_path):
     unzip_path = tmp_path / "test_dir_unzipped"
     unzip_file(zip_path, unzip_path)
     assert os.path.isdir(unzip_path)
+
+
+def test_iter_zip_dir(tmp_path):
+    """Test a directory zipped on the fly can be extracted by streaming."""
+    create_fake_data_dir(tmp_path, "DATA_SOURCE", "CAMPAIGN_NAME", "STATION_NAME")
+    dir_path = tmp_path / "Raw" / "DATA_SOURCE" / "CAMPAIGN_NAME" / "data" / "STATION_NAME"
+    with open(dir_path / "2020" / "file1.txt", "wb") as f:
+        f.write(os.urandom(200_000))
+
+    chunks = list(iter_zip_dir(str(dir_path), chunk_size=10_000))
+    assert len(chunks) > 1
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zipf:
+        assert zipf.testzip() is None
+    assert unzip_stream(chunks, tmp_path / "unzipped") == ["2020/Jan/file2.txt", "2020/file1.txt"]
+    with open(dir_path / "2020" / "file1.txt", "rb") as f:
+        assert (tmp_path / "unzipped" / "2020" / "file1.txt").read_bytes() == f.read()
+
+
+@pytest.mark.parametrize("seekable", [True, False])
+def test_unzip_stream(tmp_path, seekable):
+    content = _create_zip_bytes(seekable=seekable)
+    if not seekable:
+        # Stored entries with unknown size can not be extracted while streaming
+        with pytest.raises(NotImplementedError):
+            unzip_stream([content], tmp_path)
+        return
+    chunks = [content[i : i + 100] for i in range(0, len(content), 100)]
+    assert unzip_stream(chunks, tmp_path) == ["file1.txt", "2020/", "2020/file2.bin"]
+    with open(tmp_path / "file1.txt", "rb") as f:
+        assert f.read() == b"content" * 1000
+    assert os.path.getsize(tmp_path / "2020" / "file2.bin") == 10_000
+
+    # Test maximum entry size
+    with pytest.raises(ValueError):
+        unzip_stream([content], tmp_path / "dir", max_entry_size=1000)
+
+    # Test incomplete archive
+    with pytest.raises(EOFError):
+        unzip_stream([content[:500]], tmp_path / "dir")
+
+
+def test_unzip_stream_deflate_with_data_descriptor(tmp_path):
+    buffer = _NonSeekableBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zipf:
+        with zipf.open("file.txt", "w") as f:
+            f.write(b"content" * 1000)
+    assert unzip_stream([bytes(buffer.data)], tmp_path) == ["file.txt"]
+    with open(tmp_path / "file.txt", "rb") as f:
+        assert f.read() == b"content" * 1000
+
+
+def test_unzip_stream_invalid_entries(tmp_path):
+    # Test path traversal
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zipf:
+        zipf.writestr("../file.txt", b"content")
+    with pytest.raises(ValueError, match="Invalid zip archive entry path"):
+        unzip_stream([buffer.getvalue()], tmp_path)
+    assert not os.path.exists(tmp_path.parent / "file.txt")
+
+    # Test corrupted entry
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zipf:
+        zipf.writestr("file.txt", b"content")
+    content = buffer.getvalue().replace(b"content", b"CONTENT")
+    with pytest.raises(ValueError, match="Corrupted"):
+        unzip_stream([content], tmp_path)
+    assert not os.path.exists(tmp_path / "file.txt")
+
+
+def test_zip_stream_extractor_restart(tmp_path):
+    content = _create_zip_bytes()
+    extractor = ZipStreamExtractor(tmp_path, hash_algorithm="md5")
+    # Simulate an interruption within the second file
+    extractor.feed(content[:8000])
+    assert extractor.entries == ["file1.txt", "2020/"]
+    assert extractor.current_entry == "2020/file2.bin"
+    # Restart the stream after the last extracted entry
+    extractor.restart()
+    extractor.feed(content[extractor.offset :])
+    extractor.close()
+    assert extractor.entries == ["file1.txt", "2020/", "2020/file2.bin"]
+    assert os.path.getsize(tmp_path / "2020" / "file2.bin") == 10_000
+    assert extractor.hexdigest() == hashlib.md5(content).hexdigest()
@@ -32,6 +32,7 @@ from disdrodb.utils.directories import (
     create_directory,
     create_required_directory,
     ensure_string_path,
+    has_files,
     is_empty_directory,
     list_directories,
     list_files,
@@ -138,6 +139,25 @@ def test_list_and_count_directories(tmp_path):
     assert count_directories(tmp_path, glob_pattern, recursive=True) == len(expected_dirs)
 
 
+def test_has_files(tmp_path):
+    # Test non existing directory
+    assert not has_files(tmp_path / "non_existing")
+
+    # Test empty directory tree
+    dir1 = tmp_path / "dir1"
+    dir2 = dir1 / "dir2"
+    dir2.mkdir(parents=True)
+    assert not has_files(tmp_path)
+
+    # Test nested file is found only if recursive=True
+    file1 = dir2 / "file1.txt"
+    file1.touch()
+    assert has_files(tmp_path)
+    assert has_files(str(tmp_path))
+    assert not has_files(tmp_path, recursive=False)
+    assert has_files(dir2, recursive=False)
+
+
 def test_check_directory_exists(tmp_path):
     # Check when is a directory
     assert check_directory_exists(tmp_path) is None
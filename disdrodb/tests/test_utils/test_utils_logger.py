@@ -17,6 +17,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 # -----------------------------------------------------------------------------.
 """Test DISDRODB logger utility."""
+import json
 import logging
 import os
 
@@ -25,7 +26,10 @@ import pytest
 from disdrodb.utils.logger import (
     close_logger,
     create_file_logger,
+    define_station_jsonl_log_filepath,
     define_summary_log,
+    get_log_format,
+    initialize_station_logs,
     log_debug,
     log_error,
     log_info,
@@ -196,3 +200,65 @@ def test_close_logger(log_environment):
     logger = create_file_logger(str(processed_dir), product, station_name, filename, parallel=False)
     close_logger(logger)
     assert not logger.handlers
+
+
+def test_get_log_format():
+    import disdrodb
+
+    assert get_log_format() == "text"
+    assert get_log_format("jsonl") == "jsonl"
+    with disdrodb.config.set({"log_format": "jsonl"}):
+        assert get_log_format() == "jsonl"
+    with pytest.raises(ValueError):
+        get_log_format("invalid")
+
+
+def test_jsonl_file_logger(log_environment):
+    processed_dir, product, station_name, _ = log_environment
+    processed_dir = str(processed_dir)
+    jsonl_filepath = define_station_jsonl_log_filepath(processed_dir, product, station_name)
+
+    # Log the processing of two files in the same station log file
+    list_logs = []
+    for filename, has_error in [("file1", False), ("file2", True)]:
+        logger = create_file_logger(processed_dir, product, station_name, filename, parallel=True, log_format="jsonl")
+        log_info(logger, f"L0A processing of {filename} has started.")
+        log_debug(logger, "Detail not in summary.")
+        logger.info("Stage completed.", extra={"stage": "read_raw_file", "counts": {"n_rows": 10}})
+        if has_error:
+            log_error(logger, "ValueError: Critical failure occurred")
+        else:
+            log_warning(logger, "Potential issue detected")
+            log_info(logger, f"L0A processing of {filename} has ended.")
+        list_logs.append(logger.handlers[-1].baseFilename)
+        close_logger(logger)
+
+    assert list_logs == [jsonl_filepath, jsonl_filepath]
+    with open(jsonl_filepath) as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 9
+    assert records[0]["file"] == "file1"
+    assert records[0]["level"] == "INFO"
+    assert records[2]["stage"] == "read_raw_file"
+    assert records[2]["counts"] == {"n_rows": 10}
+    assert all(record["elapsed"] >= 0 for record in records)
+
+    # Test summary and problem logs
+    define_summary_log(list_logs)
+    logs_dir = os.path.dirname(os.path.dirname(jsonl_filepath))
+    with open(os.path.join(logs_dir, f"logs_summary_{station_name}.log")) as f:
+        summary_contents = f.read()
+    assert "file1 has started" in summary_contents
+    assert "file1 has ended" in summary_contents
+    assert "WARNING - Potential issue detected" in summary_contents
+    assert "ERROR - ValueError: Critical failure occurred" in summary_contents
+    assert "Detail not in summary" not in summary_contents
+    with open(os.path.join(logs_dir, f"logs_problem_{station_name}.log")) as f:
+        problem_contents = f.read()
+    assert "file2 has started" in problem_contents
+    assert "Detail not in summary" in problem_contents
+    assert "file1" not in problem_contents
+
+    # Test initialization removes the logs of previous runs
+    initialize_station_logs(processed_dir, product, station_name, log_format="jsonl")
+    assert not os.path.exists(jsonl_filepath)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Test DISDRODB station data manifest utility."""
+import hashlib
+import os
+
+from disdrodb.tests.conftest import create_fake_metadata_file, create_fake_raw_data_file
+from disdrodb.utils.manifest import (
+    compute_file_hash,
+    define_manifest_filepath,
+    define_station_archive,
+    get_manifest_changes,
+    iter_station_archive,
+    read_manifest,
+    scan_station_files,
+    update_station_manifest,
+)
+
+
+def test_scan_station_files(tmp_path, mocker):
+    base_dir = tmp_path / "DISDRODB"
+    filepath = create_fake_raw_data_file(base_dir=base_dir, filename="file.txt")
+    station_data_path = os.path.dirname(filepath)
+    files = scan_station_files(station_data_path)
+    assert files["file.txt"]["hash"] == compute_file_hash(filepath)
+
+    # Test the hash is not recomputed if the file size and modification time did not change
+    spy = mocker.spy(hashlib, "new")
+    manifest = {**read_manifest(str(tmp_path / "missing.json")), "files": files}
+    assert scan_station_files(station_data_path, manifest=manifest) == files
+    assert spy.call_count == 0
+
+    # Test changes detection
+    with open(filepath, "w") as f:
+        f.write("new content")
+    create_fake_raw_data_file(base_dir=base_dir, filename="new_file.txt")
+    new_files = scan_station_files(station_data_path, manifest=manifest)
+    assert get_manifest_changes(new_files, manifest) == (["file.txt", "new_file.txt"], [])
+    assert get_manifest_changes(files, {**manifest, "files": new_files}) == (["file.txt"], ["new_file.txt"])
+
+
+def test_station_archive_is_reproducible(tmp_path):
+    base_dir = tmp_path / "DISDRODB"
+    metadata_filepath = create_fake_metadata_file(base_dir=base_dir, metadata_dict={})
+    filepath = create_fake_raw_data_file(base_dir=base_dir, filename="file.txt")
+    archive = define_station_archive(metadata_filepath, incremental=True)
+    assert not archive["incremental"]
+    assert archive["files"] == ["file.txt"]
+
+    # Test the archive bytes do not depend on the files modification time
+    content = b"".join(iter_station_archive(archive))
+    os.utime(filepath, (0, 0))
+    assert b"".join(iter_station_archive(archive)) == content
+
+    # Test the archive is recorded in the manifest
+    archive_hash = hashlib.sha256(content).hexdigest()
+    update_station_manifest(metadata_filepath, archive=archive, archive_hash=archive_hash, url="url")
+    manifest = read_manifest(define_manifest_filepath(metadata_filepath))
+    assert manifest["archives"][0]["hash"] == archive_hash
+    assert define_station_archive(metadata_filepath, incremental=True)["incremental"]
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Test DISDRODB processing metrics utility."""
+import json
+import os
+
+import disdrodb
+from disdrodb.utils.metrics import (
+    aggregate_metrics,
+    define_file_metrics_filepath,
+    define_station_metrics,
+    define_station_metrics_filepath,
+    format_prometheus_metrics,
+    get_metrics_options,
+    increment_counter,
+    start_metrics,
+    stop_metrics,
+    time_stage,
+    write_file_metrics,
+)
+
+
+@time_stage("decorated_stage")
+def _decorated_function(x):
+    return x + 1
+
+
+def test_get_metrics_options():
+    assert get_metrics_options() == (False, False)
+    assert get_metrics_options(metrics=True) == (True, False)
+    with disdrodb.config.set({"metrics": True, "metrics_prometheus": True}):
+        assert get_metrics_options() == (True, True)
+
+
+def test_metrics_collection():
+    # Test timers and counters do nothing when metrics are not collected
+    with time_stage("stage"):
+        increment_counter("n_rows", 10)
+    assert _decorated_function(1) == 2
+
+    # Test metrics collection
+    token = start_metrics()
+    with time_stage("stage"):
+        increment_counter("n_rows", 10)
+    with time_stage("stage"):
+        increment_counter("n_rows", 5)
+    assert _decorated_function(1) == 2
+    metrics = stop_metrics(token)
+    assert metrics["counters"] == {"n_rows": 15}
+    assert metrics["stages"]["stage"]["n_calls"] == 2
+    assert metrics["stages"]["decorated_stage"]["n_calls"] == 1
+    assert metrics["duration"] >= metrics["stages"]["stage"]["duration"]
+
+    # Test metrics are no more collected after stop_metrics
+    increment_counter("n_rows", 10)
+    assert metrics["counters"] == {"n_rows": 15}
+
+
+def test_aggregate_metrics():
+    list_metrics = [
+        {"duration": 2.0, "stages": {"read": {"duration": 1.0, "n_calls": 1}}, "counters": {"n_rows": 10}},
+        {"duration": 2.0, "stages": {"read": {"duration": 1.0, "n_calls": 1}}, "counters": {"n_failed_files": 1}},
+    ]
+    station_metrics = aggregate_metrics(list_metrics)
+    assert station_metrics["n_files"] == 2
+    assert station_metrics["duration"] == 4.0
+    assert station_metrics["stages"]["read"] == {"duration": 2.0, "n_calls": 2, "fraction": 0.5}
+    assert station_metrics["counters"] == {"n_rows": 10, "n_failed_files": 1}
+
+    # Test prometheus text format
+    text = format_prometheus_metrics(station_metrics, labels={"product": "L0A", "station_name": "station_1"})
+    assert 'disdrodb_stage_duration_seconds{product="L0A",station_name="station_1",stage="read"} 2.0' in text
+    assert 'disdrodb_n_rows{product="L0A",station_name="station_1"} 10' in text
+
+
+def test_define_station_metrics(tmp_path):
+    processed_dir = os.path.join(tmp_path, "DISDRODB", "Processed", "DATA_SOURCE", "CAMPAIGN_NAME")
+    labels = {"sensor_name": "OTT_Parsivel", "reader": "DATA_SOURCE/READER"}
+    filenames = ["file_1.txt", "file_2.txt"]
+    for filename in filenames:
+        token = start_metrics()
+        with time_stage("read_raw_file"):
+            increment_counter("n_raw_rows", 10)
+        filepath = define_file_metrics_filepath(processed_dir, "L0A", "station_1", filename)
+        write_file_metrics(stop_metrics(token), filepath=filepath, labels={"filename": filename, **labels})
+
+    station_metrics = define_station_metrics(
+        processed_dir,
+        product="L0A",
+        station_name="station_1",
+        filenames=filenames,
+        prometheus=True,
+    )
+    assert station_metrics["station"]["counters"] == {"n_raw_rows": 20}
+    assert [metrics["filename"] for metrics in station_metrics["files"]] == filenames
+    assert station_metrics["labels"]["campaign_name"] == "CAMPAIGN_NAME"
+    assert station_metrics["labels"]["sensor_name"] == "OTT_Parsivel"
+
+    # Test station files are written and per-file files removed
+    metrics_filepath = define_station_metrics_filepath(processed_dir, "L0A", "station_1")
+    with open(metrics_filepath) as f:
+        assert json.load(f)["station"]["n_files"] == 2
+    assert os.path.isfile(define_station_metrics_filepath(processed_dir, "L0A", "station_1", extension="prom"))
+    assert not os.path.exists(define_file_metrics_filepath(processed_dir, "L0A", "station_1", filenames[0]))
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Test DISDRODB netCDF engines utility."""
+
+import concurrent.futures
+import functools
+import os
+import sys
+
+import numpy as np
+import pytest
+import xarray as xr
+
+import disdrodb
+from disdrodb.l0.io import open_l0b_dataset
+from disdrodb.l0.l0b_processing import create_l0b_from_l0a, write_l0b
+from disdrodb.l0.synthetic import generate_l0a_dataframe, get_synthetic_metadata
+from disdrodb.utils.netcdf import L0B_ENGINES, get_l0b_engine, get_list_ds, xr_concat_datasets
+
+ENCODING_KEYS = ["dtype", "zlib", "complevel", "shuffle", "fletcher32", "chunksizes"]
+
+
+def create_l0b_dataset(n_rows=100, start_time="2023-01-01 00:00:00", seed=0):
+    df = generate_l0a_dataframe("OTT_Parsivel2", n_rows=n_rows, start_time=start_time, seed=seed)
+    ds = create_l0b_from_l0a(df, attrs=get_synthetic_metadata("OTT_Parsivel2"))
+    # Add a string variable
+    ds["weather_code_metar_4678"] = ("time", np.array(["RA"] * (n_rows - 1) + [""]))
+    return ds
+
+
+def test_get_l0b_engine():
+    assert get_l0b_engine() == "netcdf4"
+    assert get_l0b_engine("h5netcdf") == "h5netcdf"
+    with disdrodb.config.set({"l0b_engine": "h5netcdf"}):
+        assert get_l0b_engine() == "h5netcdf"
+    with pytest.raises(ValueError):
+        get_l0b_engine("scipy")
+
+
+def test_get_l0b_engine_without_h5py(monkeypatch):
+    """Test the h5netcdf engine requires h5py (an optional dependency of h5netcdf>=1.8)."""
+    monkeypatch.setitem(sys.modules, "h5py", None)
+    with pytest.raises(ImportError, match="h5py"):
+        get_l0b_engine("h5netcdf")
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_l0b_engines_equivalence(tmp_path, sparse):
+    """Test the L0B netCDFs written by the available engines are equivalent."""
+    ds = create_l0b_dataset()
+    filepaths = {}
+    for engine in L0B_ENGINES:
+        filepaths[engine] = str(tmp_path / f"{engine}.nc")
+        write_l0b(ds.copy(), filepath=filepaths[engine], sparse=sparse, engine=engine)
+
+    # Test the files are identical when read by any engine
+    for read_engine in L0B_ENGINES:
+        list_ds = [open_l0b_dataset(filepaths[engine], engine=read_engine).load() for engine in L0B_ENGINES]
+        xr.testing.assert_identical(list_ds[0], list_ds[1])
+        # Test the compression, chunking and fill values are equivalent
+        for var in list_ds[0].data_vars:
+            encodings = [{k: ds_engine[var].encoding.get(k) for k in ENCODING_KEYS} for ds_engine in list_ds]
+            assert encodings[0] == encodings[1]
+            fill_values = [ds_engine[var].encoding.get("_FillValue") for ds_engine in list_ds]
+            np.testing.assert_equal(fill_values[0], fill_values[1])
+        for ds_engine in list_ds:
+            ds_engine.close()
+
+
+@pytest.mark.parametrize("executor", [concurrent.futures.ThreadPoolExecutor, concurrent.futures.ProcessPoolExecutor])
+@pytest.mark.parametrize("engine", L0B_ENGINES)
+def test_l0b_concurrent_write_and_read(tmp_path, engine, executor):
+    """Test the parallel writing and reading of L0B netCDFs gives the same results as the serial processing."""
+    n_files = 3
+    list_ds = [create_l0b_dataset(start_time=f"{2000 + i}-01-01 00:00:00", seed=i).compute() for i in range(n_files)]
+    filepaths = [str(tmp_path / f"serial_{i}.nc") for i in range(n_files)]
+    parallel_filepaths = [str(tmp_path / f"parallel_{i}.nc") for i in range(n_files)]
+
+    # Write the files serially and in parallel
+    for ds, filepath in zip(list_ds, filepaths):
+        write_l0b(ds.copy(), filepath=filepath, engine=engine)
+    with executor(max_workers=n_files) as pool:
+        func = functools.partial(write_l0b, engine=engine)
+        _ = list(pool.map(func, [ds.copy() for ds in list_ds], parallel_filepaths))
+    assert all(os.path.exists(filepath) for filepath in parallel_filepaths)
+
+    # Read the files serially and in parallel
+    list_ds_serial = get_list_ds(filepaths, engine=engine)
+    with executor(max_workers=n_files) as pool:
+        func = functools.partial(get_list_ds, engine=engine)
+        list_ds_parallel = [list_ds_file[0] for list_ds_file in pool.map(func, [[f] for f in parallel_filepaths])]
+    for ds_serial, ds_parallel in zip(list_ds_serial, list_ds_parallel):
+        xr.testing.assert_identical(ds_serial, ds_parallel)
+
+    # Test the concatenation
+    ds_concat = xr_concat_datasets(parallel_filepaths, engine=engine)
+    assert ds_concat.sizes["time"] == sum(ds.sizes["time"] for ds in list_ds)
+
+
+@pytest.mark.parametrize("engine", L0B_ENGINES)
+def test_l0b_concurrent_lazy_write(tmp_path, engine):
+    """Test lazy L0B datasets read from netCDFs can be written concurrently by threads."""
+    n_files = 3
+    filepaths = [str(tmp_path / f"source_{i}.nc") for i in range(n_files)]
+    new_filepaths = [str(tmp_path / f"new_{i}.nc") for i in range(n_files)]
+    for i, filepath in enumerate(filepaths):
+        write_l0b(create_l0b_dataset(start_time=f"{2000 + i}-01-01 00:00:00", seed=i), filepath=filepath)
+
+    # Write the lazy datasets in parallel
+    list_ds = [open_l0b_dataset(filepath, engine=engine).chunk({"time": 20}) for filepath in filepaths]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=n_files) as pool:
+        func = functools.partial(write_l0b, engine=engine)
+        _ = list(pool.map(func, list_ds, new_filepaths))
+
+    # Check the written files
+    for filepath, new_filepath in zip(filepaths, new_filepaths):
+        with xr.open_dataset(filepath) as ds, xr.open_dataset(new_filepath) as ds_new:
+            xr.testing.assert_identical(ds.load(), ds_new.load())
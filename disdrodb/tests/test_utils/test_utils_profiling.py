@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Test DISDRODB processing profiling utility."""
+import os
+
+import pytest
+
+import disdrodb
+from disdrodb.utils.profiling import (
+    define_file_profile_filepath,
+    define_station_profile,
+    define_station_profile_filepath,
+    get_profile_options,
+    select_profiled_filepaths,
+    start_profiler,
+    stop_profiler,
+)
+
+
+def _slow_function():
+    return sum(i**2 for i in range(100_000))
+
+
+def test_get_profile_options():
+    assert get_profile_options() == (False, 3)
+    assert get_profile_options(profile=True, profile_n_files=1) == (True, 1)
+    with disdrodb.config.set({"profile": True, "profile_n_files": None}):
+        assert get_profile_options() == (True, None)
+    with pytest.raises(ValueError):
+        get_profile_options(profile_n_files=0)
+
+
+def test_select_profiled_filepaths():
+    filepaths = [f"file_{i}" for i in range(10)]
+    assert select_profiled_filepaths(filepaths, n_files=None) == filepaths
+    assert select_profiled_filepaths(filepaths, n_files=20) == filepaths
+    assert select_profiled_filepaths(filepaths, n_files=3) == ["file_0", "file_4", "file_9"]
+    assert select_profiled_filepaths(filepaths, n_files=1) == ["file_0"]
+
+
+def test_define_station_profile(tmp_path):
+    processed_dir = os.path.join(tmp_path, "DISDRODB", "Processed", "DATA_SOURCE", "CAMPAIGN_NAME")
+    filenames = ["file_1.txt", "file_2.txt"]
+
+    # Test no profile available
+    assert define_station_profile(processed_dir, "L0A", "station_1", filenames=filenames) is None
+
+    # Profile the files
+    for filename in filenames:
+        profiler = start_profiler()
+        _slow_function()
+        stop_profiler(profiler, filepath=define_file_profile_filepath(processed_dir, "L0A", "station_1", filename))
+
+    stats = define_station_profile(processed_dir, "L0A", "station_1", filenames=filenames)
+    assert any(func[2] == "_slow_function" for func in stats.stats)
+
+    # Test the station profile files
+    with open(define_station_profile_filepath(processed_dir, "L0A", "station_1", extension="txt")) as f:
+        assert "_slow_function" in f.read()
+    with open(define_station_profile_filepath(processed_dir, "L0A", "station_1", extension="collapsed")) as f:
+        lines = f.read().splitlines()
+    assert any(line.startswith("_slow_function") and "<genexpr>" in line for line in lines)
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines)
+    assert os.path.isfile(define_station_profile_filepath(processed_dir, "L0A", "station_1"))
+
+    # Test per-file profiles are removed
+    assert not os.path.exists(define_file_profile_filepath(processed_dir, "L0A", "station_1", filenames[0]))
+
+
+def test_start_profiler_with_active_profiler(mocker):
+    """Test the profiling is skipped if another profiler is enabled (Python >= 3.12 with threads)."""
+    mocker.patch("cProfile.Profile.enable", side_effect=ValueError("Another profiling tool is already active"))
+    assert start_profiler() is None
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""Test DISDRODB sparse variables utility."""
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+import xarray as xr
+
+import disdrodb
+from disdrodb.l0.io import open_l0b_dataset
+from disdrodb.utils.sparse import (
+    densify_dataset,
+    get_l0b_sparse_option,
+    is_sparse_dataset,
+    sparsify_dataset,
+)
+
+
+def create_spectra_dataset(n_timesteps=1000):
+    rng = np.random.default_rng(0)
+    raw_drop_number = np.zeros((n_timesteps, 4, 3), dtype="float32")
+    is_raining = rng.random(n_timesteps) < 0.2
+    raw_drop_number[is_raining] = rng.poisson(0.5, (is_raining.sum(), 4, 3))
+    # Dry period spanning more than a chunk
+    raw_drop_number[100:400] = 0
+    raw_drop_number[n_timesteps // 2 :, 0, 0] = np.nan
+    ds = xr.Dataset(
+        {
+            "raw_drop_number": (("time", "diameter_bin_center", "velocity_bin_center"), raw_drop_number),
+            "number_particles": ("time", np.arange(n_timesteps)),
+        },
+        coords={
+            "time": np.arange(n_timesteps),
+            "diameter_bin_center": np.arange(4.0),
+            "velocity_bin_center": np.arange(3.0),
+        },
+    )
+    ds["raw_drop_number"].attrs = {"units": "number"}
+    return ds
+
+
+def test_get_l0b_sparse_option():
+    assert not get_l0b_sparse_option()
+    assert get_l0b_sparse_option(sparse=True)
+    with disdrodb.config.set({"l0b_sparse": True}):
+        assert get_l0b_sparse_option()
+
+
+def test_sparsify_dataset():
+    ds = create_spectra_dataset()
+    ds_sparse = sparsify_dataset(ds)
+    assert is_sparse_dataset(ds_sparse)
+    assert not is_sparse_dataset(ds)
+    assert "raw_drop_number" not in ds_sparse
+    n_nonzero = int(np.sum(ds["raw_drop_number"].values != 0))
+    assert ds_sparse.sizes["raw_drop_number_nnz"] == n_nonzero
+    assert ds_sparse["raw_drop_number_count"].sum() == n_nonzero
+    assert ds_sparse["raw_drop_number_value"].attrs["units"] == "number"
+
+    # Test dense values reconstruction
+    ds_dense = densify_dataset(ds_sparse, chunksize=128)
+    assert ds_dense["raw_drop_number"].chunks[0][0] == 128
+    xr.testing.assert_identical(ds_dense.compute()[list(ds.data_vars)], ds)
+
+    # Test variables without time as first dimension are not accepted
+    with pytest.raises(ValueError):
+        sparsify_dataset(ds.transpose("diameter_bin_center", ...))
+
+
+def test_sparsify_dask_dataset(tmp_path):
+    """Test dask arrays are sparsified block by block along time."""
+    ds = create_spectra_dataset()
+    ds_sparse = sparsify_dataset(ds)
+    ds_sparse_lazy = sparsify_dataset(ds.chunk({"time": 128}))
+    # Test the indices and values remain lazy, with one chunk per time block
+    for var in ["raw_drop_number_index", "raw_drop_number_value"]:
+        assert len(ds_sparse_lazy[var].chunks[0]) == 8
+    xr.testing.assert_identical(ds_sparse_lazy.compute(), ds_sparse)
+
+    # Test writing
+    filepath = str(tmp_path / "sparse.nc")
+    ds_sparse_lazy.to_netcdf(filepath)
+    with open_l0b_dataset(filepath) as ds_dense:
+        xr.testing.assert_identical(ds_dense.compute()[list(ds.data_vars)], ds)
+
+
+@pytest.mark.parametrize("n_timesteps", [0, 1, 1000])
+def test_open_l0b_dataset(tmp_path, n_timesteps):
+    ds = create_spectra_dataset(n_timesteps)
+    filepath = str(tmp_path / "sparse.nc")
+    sparsify_dataset(ds).to_netcdf(filepath)
+
+    ds_dense = open_l0b_dataset(filepath, chunksize=100)
+    assert ds_dense["raw_drop_number"].chunks is not None
+    # Test time subsetting before computing
+    ds_subset = ds_dense.isel(time=slice(50, 450)).compute()
+    xr.testing.assert_identical(ds_subset[list(ds.data_vars)], ds.isel(time=slice(50, 450)))
+    ds_dense.close()
+
+
+def test_open_l0b_dataset_lazy_import():
+    """Test ``import disdrodb`` does not import the L0 processing stack and dask."""
+    code = (
+        "import sys; import disdrodb; "
+        "assert 'disdrodb.l0.io' not in sys.modules and 'dask' not in sys.modules; "
+        "from disdrodb.l0.io import open_l0b_dataset; "
+        "assert disdrodb.open_l0b_dataset is open_l0b_dataset"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
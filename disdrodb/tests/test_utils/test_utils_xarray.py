@@ -23,7 +23,15 @@ import pandas as pd
 import pytest
 import xarray as xr
 
-from disdrodb.utils.xarray import get_dataset_start_end_time, regularize_dataset
+from disdrodb.utils.xarray import (
+    add_gap_table,
+    get_dataset_start_end_time,
+    get_gap_table,
+    infer_sampling_interval,
+    is_regular_dataset,
+    iterate_regularized_dataset,
+    regularize_dataset,
+)
 
 
 def create_test_dataset():
@@ -68,3 +76,79 @@ def test_regularize_dataset():
     # Get time index which were infilled
     new_indices = np.where(np.isin(expected_times, ds["time"].values, invert=True))[0]
     assert np.all(ds_regularized.isel(time=new_indices)["data"].data == fill_value)
+
+
+@pytest.mark.parametrize(
+    ("freq", "n_timesteps"),
+    [("min", 4), ("D", 1), ("s", 181), ("MS", 1)],
+)
+def test_regularize_dataset_freq_aliases(freq, n_timesteps):
+    """Test frequency aliases without a number and non-fixed frequencies are accepted."""
+    times = pd.date_range("2020-01-01", periods=4, freq="1min")
+    ds = xr.Dataset({"data": ("time", np.arange(4.0))}, coords={"time": times})
+    ds_regularized = regularize_dataset(ds, freq=freq)
+    assert ds_regularized.sizes["time"] == n_timesteps
+    expected_times = pd.date_range(times[0], times[-1], freq=freq)
+    assert np.array_equal(ds_regularized["time"].values, expected_times)
+
+
+def test_get_gap_table_non_fixed_freq():
+    ds = create_dataset_with_gaps()
+    with pytest.raises(ValueError):
+        get_gap_table(ds, freq="MS")
+
+
+def create_dataset_with_gaps():
+    """Create a 10 seconds dataset with gaps of 1 and 3 timesteps and an irregular timestep."""
+    times = pd.date_range("2020-01-01", periods=20, freq="10s").to_numpy()
+    times = np.delete(times, [3, 10, 11, 12])
+    times[-2] = times[-2] + np.timedelta64(2, "s")
+    data = np.arange(len(times), dtype=float)
+    return xr.Dataset({"data": ("time", data)}, coords={"time": times})
+
+
+def test_infer_sampling_interval():
+    ds = create_dataset_with_gaps()
+    assert infer_sampling_interval(ds) == pd.Timedelta("10s")
+    with pytest.raises(ValueError):
+        infer_sampling_interval(ds.isel(time=[0]))
+
+
+def test_get_gap_table():
+    ds = create_dataset_with_gaps()
+    df_gaps = get_gap_table(ds)
+    assert df_gaps["start_index"].tolist() == [3, 10, 18]
+    assert df_gaps["length"].tolist() == [1, 3, 1]
+    assert df_gaps["start_time"].iloc[0] == pd.Timestamp("2020-01-01 00:00:30")
+    # Test a regular dataset has no gaps
+    ds_regular = regularize_dataset(ds)
+    assert is_regular_dataset(ds_regular)
+    assert len(get_gap_table(ds_regular)) == 0
+
+
+@pytest.mark.parametrize("method", [None, "ffill"])
+def test_regularize_dataset_lazy_and_by_blocks(method):
+    ds = create_dataset_with_gaps()
+    ds_regularized = regularize_dataset(ds, freq="10s", method=method)
+    assert ds_regularized.sizes["time"] == 20
+    assert int(ds_regularized["data"].isnull().sum()) == (0 if method else 5)
+
+    # Test the lazy regularization
+    ds_lazy = regularize_dataset(ds, method=method, chunks=7)
+    assert ds_lazy["data"].chunks == ((7, 7, 6),)
+    xr.testing.assert_identical(ds_lazy.compute(), ds_regularized)
+
+    # Test the regularization by blocks
+    list_ds = list(iterate_regularized_dataset(ds, method=method, block_size=3))
+    assert [ds_block.sizes["time"] for ds_block in list_ds] == [3, 3, 3, 3, 3, 3, 2]
+    xr.testing.assert_identical(xr.concat(list_ds, dim="time"), ds_regularized)
+
+
+def test_add_gap_table():
+    ds = create_dataset_with_gaps()
+    ds_gaps = add_gap_table(ds)
+    assert ds_gaps.sizes["time"] == ds.sizes["time"]
+    assert ds_gaps["gap_length"].values.tolist() == [1, 3, 1]
+    assert ds_gaps["gap_length"].attrs["sampling_interval"] == 10
+    # Test the dataset is regularized with the gap table sampling interval
+    xr.testing.assert_identical(regularize_dataset(ds_gaps), regularize_dataset(ds, freq="10s"))
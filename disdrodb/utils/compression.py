@@ -19,11 +19,19 @@
 """DISDRODB raw data compression utility."""
 
 import bz2
+import functools
 import gzip
+import hashlib
+import io
 import os
+import re
 import shutil
+import struct
 import tempfile
 import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
 from typing import Optional
 
 from disdrodb.api.checks import check_base_dir
@@ -34,8 +42,21 @@ COMPRESSION_OPTIONS = {
     "zip": ".zip",
     "gzip": ".gz",
     "bzip2": ".bz2",
+    "zstd": ".zst",
 }
 
+COMPRESSION_LEVELS = {
+    "zip": (0, 9),
+    "gzip": (0, 9),
+    "bzip2": (1, 9),
+    "zstd": (1, 22),
+}
+
+COMPRESSION_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+GZIP_BLOCK_SIZE = 4 * 1024 * 1024  # 4 MiB
+ZIP_STREAM_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+ZIP_REPRODUCIBLE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
 
 def unzip_file(filepath: str, dest_path: str) -> None:
     """Unzip a file into a directory.
@@ -52,6 +73,300 @@ def unzip_file(filepath: str, dest_path: str) -> None:
         zip_ref.extractall(dest_path)
 
 
+####--------------------------------------------------------------------------.
+#### Streaming unzip
+
+ZIP_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+ZIP_DATA_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+ZIP_END_SIGNATURES = (b"PK\x01\x02", b"PK\x05\x06", b"PK\x06\x06")  # central directory records
+_ZIP_LOCAL_HEADER_STRUCT = struct.Struct("<4sHHHHHIIIHH")
+_ZIP64_MARKER = 0xFFFFFFFF
+
+
+def get_zip_entry_path(name: str, dest_path: str) -> str:
+    """Return the extraction path of a zip archive entry.
+
+    An error is raised if the entry path is absolute or escapes the destination directory.
+    """
+    parts = name.replace("\\", "/").split("/")
+    if name.startswith(("/", "\\")) or re.match(r"^[A-Za-z]:", name) or ".." in parts:
+        raise ValueError(f"Invalid zip archive entry path '{name}'.")
+    dest_path = os.path.realpath(dest_path)
+    path = os.path.realpath(os.path.join(dest_path, *[part for part in parts if part not in ("", ".")]))
+    if os.path.commonpath([dest_path, path]) != dest_path:
+        raise ValueError(f"Invalid zip archive entry path '{name}'.")
+    return path
+
+
+def _parse_zip64_extra_field(extra, usize, csize):
+    """Retrieve the uncompressed and compressed sizes from the zip64 extra field."""
+    while len(extra) >= 4:
+        header_id, data_size = struct.unpack("<HH", extra[:4])
+        data = extra[4 : 4 + data_size]
+        if header_id == 0x0001:
+            if usize == _ZIP64_MARKER:
+                usize, data = struct.unpack("<Q", data[:8])[0], data[8:]
+            if csize == _ZIP64_MARKER:
+                csize = struct.unpack("<Q", data[:8])[0]
+            return usize, csize, True
+        extra = extra[4 + data_size :]
+    return usize, csize, False
+
+
+class ZipStreamExtractor:
+    """Extract the entries of a zip archive while its bytes are received.
+
+    The archive bytes are passed sequentially with ``feed``. Each entry is written to disk as soon as
+    its bytes are received, and its path, size and CRC-32 are verified.
+    The central directory at the end of the archive is not required.
+
+    ``offset`` is the archive offset following the last extracted entry. If the stream is interrupted,
+    call ``restart`` and feed the archive bytes again from ``offset`` (i.e. with an HTTP range request).
+    To resume an extraction in a new extractor, pass the ``offset`` and ``entries`` of the interrupted one.
+
+    Entries with unknown sizes are supported only if compressed with DEFLATE.
+    A ``NotImplementedError`` is raised for encrypted entries and unsupported compression methods.
+
+    Parameters
+    ----------
+    dest_path : str
+        Path of the destination directory.
+    max_entry_size : int, optional
+        Maximum uncompressed size (in bytes) of an entry. The default is ``None``.
+    hash_algorithm : str, optional
+        If specified, the checksum of the archive is computed (see ``hexdigest``). The default is ``None``.
+        The checksum can not be computed if the extraction is resumed from ``offset > 0``.
+    offset : int, optional
+        Archive offset from which the extraction is resumed. The default is 0.
+    entries : list, optional
+        Names of the entries already extracted before ``offset``. The default is ``None``.
+    """
+
+    def __init__(self, dest_path, max_entry_size=None, hash_algorithm=None, offset=0, entries=None):
+        if hash_algorithm and offset > 0:
+            raise ValueError("The archive checksum can not be computed when resuming the extraction.")
+        self.dest_path = dest_path
+        self.max_entry_size = max_entry_size
+        self.hash_algorithm = hash_algorithm
+        self.entries = list(entries) if entries is not None else []
+        self.offset = offset
+        self._hasher = hashlib.new(hash_algorithm) if hash_algorithm else None
+        self._committed_hasher = self._hasher.copy() if self._hasher else None
+        self._reset_stream(offset=offset)
+
+    @property
+    def done(self):
+        """Whether all entries have been extracted."""
+        return self._state == "done"
+
+    @property
+    def current_entry(self):
+        """Name of the entry being extracted."""
+        return self._entry["name"] if self._entry is not None else None
+
+    def hexdigest(self):
+        """Return the checksum of the archive bytes received."""
+        return self._hasher.hexdigest() if self._hasher else None
+
+    def _reset_stream(self, offset):
+        self._buffer = bytearray()
+        self._position = offset
+        self._state = "header"
+        self._entry = None
+
+    def restart(self):
+        """Discard the entry being extracted and restart the stream at ``offset``."""
+        if self._entry is not None and self._entry["file"] is not None:
+            self._entry["file"].close()
+            os.remove(self._entry["path"])
+        if self._hasher is not None:
+            self._hasher = self._committed_hasher.copy()
+        self._reset_stream(offset=self.offset)
+
+    def _consume(self, n):
+        """Remove ``n`` bytes from the buffer and return them."""
+        data = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        self._position += n
+        if self._hasher is not None:
+            self._hasher.update(data)
+        return data
+
+    def feed(self, data):
+        """Feed the next bytes of the archive."""
+        self._buffer += data
+        while self._buffer:
+            if self._state == "done":
+                self._consume(len(self._buffer))
+            elif self._state == "header":
+                if not self._read_local_header():
+                    return
+            elif self._state == "data":
+                if not self._read_entry_data():
+                    return
+            elif not self._read_data_descriptor():  # self._state == "descriptor"
+                return
+
+    def close(self):
+        """Check the archive has been entirely received."""
+        if not self.done:
+            if self._entry is not None and self._entry["file"] is not None:
+                self._entry["file"].close()
+            raise EOFError("The zip archive stream ended before the last entry.")
+
+    def _read_local_header(self):
+        if len(self._buffer) < 4:
+            return False
+        signature = bytes(self._buffer[:4])
+        if signature in ZIP_END_SIGNATURES:
+            self._state = "done"
+            return True
+        if signature != ZIP_LOCAL_HEADER_SIGNATURE:
+            raise ValueError("Invalid zip archive: local file header expected.")
+        if len(self._buffer) < _ZIP_LOCAL_HEADER_STRUCT.size:
+            return False
+        _, _, flags, method, _, _, crc, csize, usize, name_length, extra_length = _ZIP_LOCAL_HEADER_STRUCT.unpack(
+            self._buffer[: _ZIP_LOCAL_HEADER_STRUCT.size],
+        )
+        header_size = _ZIP_LOCAL_HEADER_STRUCT.size + name_length + extra_length
+        if len(self._buffer) < header_size:
+            return False
+        header = self._consume(header_size)
+        name_bytes = header[_ZIP_LOCAL_HEADER_STRUCT.size : _ZIP_LOCAL_HEADER_STRUCT.size + name_length]
+        name = name_bytes.decode("utf-8" if flags & 0x800 else "cp437")
+        extra = header[_ZIP_LOCAL_HEADER_STRUCT.size + name_length :]
+        usize, csize, is_zip64 = _parse_zip64_extra_field(extra, usize, csize)
+
+        # Check the entry can be extracted
+        has_data_descriptor = bool(flags & 0x08)
+        if flags & 0x01:
+            raise NotImplementedError(f"The zip archive entry '{name}' is encrypted.")
+        if method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            raise NotImplementedError(f"Unsupported compression method of the zip archive entry '{name}'.")
+        if has_data_descriptor and method == zipfile.ZIP_STORED:
+            raise NotImplementedError(f"Unknown size of the uncompressed zip archive entry '{name}'.")
+        path = get_zip_entry_path(name, self.dest_path)
+        if not has_data_descriptor:
+            self._check_entry_size(name, usize)
+
+        # Create the entry
+        is_directory = name.endswith("/")
+        if is_directory:
+            os.makedirs(path, exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._entry = {
+            "name": name,
+            "path": path,
+            "file": None if is_directory else open(path, "wb"),  # noqa: SIM115
+            "decompressor": zlib.decompressobj(-zlib.MAX_WBITS) if method == zipfile.ZIP_DEFLATED else None,
+            "crc": crc,
+            "csize": None if has_data_descriptor else csize,
+            "usize": None if has_data_descriptor else usize,
+            "remaining": None if has_data_descriptor else csize,
+            "is_zip64": is_zip64,
+            "has_data_descriptor": has_data_descriptor,
+            "computed_crc": 0,
+            "size": 0,
+        }
+        self._state = "data"
+        return True
+
+    def _check_entry_size(self, name, size):
+        if self.max_entry_size is not None and size > self.max_entry_size:
+            raise ValueError(f"The zip archive entry '{name}' exceeds the maximum size of {self.max_entry_size} bytes.")
+
+    def _write_entry_data(self, data):
+        entry = self._entry
+        if entry["file"] is None:
+            if len(data) > 0:
+                raise ValueError(f"Invalid zip archive: the directory entry '{entry['name']}' has data.")
+            return
+        entry["size"] += len(data)
+        self._check_entry_size(entry["name"], entry["size"])
+        if entry["usize"] is not None and entry["size"] > entry["usize"]:
+            raise ValueError(f"The zip archive entry '{entry['name']}' is larger than declared.")
+        entry["computed_crc"] = zlib.crc32(data, entry["computed_crc"])
+        entry["file"].write(data)
+
+    def _read_entry_data(self):
+        entry = self._entry
+        decompressor = entry["decompressor"]
+        if entry["remaining"] is not None:
+            # Entry with known compressed size
+            data = self._consume(min(len(self._buffer), entry["remaining"]))
+            entry["remaining"] -= len(data)
+            self._write_entry_data(decompressor.decompress(data) if decompressor else data)
+            if entry["remaining"] > 0:
+                return False
+            if decompressor:
+                self._write_entry_data(decompressor.flush())
+        else:
+            # DEFLATE entry with unknown compressed size: decompress up to the end of the deflate stream
+            data = bytes(self._buffer)
+            self._write_entry_data(decompressor.decompress(data))
+            self._consume(len(data) - len(decompressor.unused_data))
+            if not decompressor.eof:
+                return False
+        if entry["has_data_descriptor"]:
+            self._state = "descriptor"
+        else:
+            self._finalize_entry()
+        return True
+
+    def _read_data_descriptor(self):
+        entry = self._entry
+        size_format = "<IQQ" if entry["is_zip64"] else "<III"
+        descriptor_size = struct.calcsize(size_format)
+        has_signature = self._buffer[:4] == ZIP_DATA_DESCRIPTOR_SIGNATURE
+        if len(self._buffer) < descriptor_size + 4 * has_signature:
+            return False
+        if has_signature:
+            self._consume(4)
+        entry["crc"], entry["csize"], entry["usize"] = struct.unpack(size_format, self._consume(descriptor_size))
+        self._finalize_entry()
+        return True
+
+    def _finalize_entry(self):
+        entry = self._entry
+        if entry["file"] is not None:
+            entry["file"].close()
+            if entry["size"] != entry["usize"] or entry["computed_crc"] != entry["crc"]:
+                os.remove(entry["path"])
+                raise ValueError(f"Corrupted zip archive entry '{entry['name']}' (invalid size or CRC-32).")
+        self.entries.append(entry["name"])
+        self._entry = None
+        self._state = "header"
+        # Commit the extraction
+        self.offset = self._position
+        if self._hasher is not None:
+            self._committed_hasher = self._hasher.copy()
+
+
+def unzip_stream(chunks, dest_path: str, max_entry_size: Optional[int] = None) -> list:
+    """Extract a zip archive from an iterable of bytes chunks (i.e. an HTTP response stream).
+
+    Parameters
+    ----------
+    chunks : iterable
+        Iterable of the zip archive bytes.
+    dest_path : str
+        Path of the destination directory.
+    max_entry_size : int, optional
+        Maximum uncompressed size (in bytes) of an entry. The default is ``None``.
+
+    Returns
+    -------
+    list
+        Names of the extracted entries.
+    """
+    extractor = ZipStreamExtractor(dest_path, max_entry_size=max_entry_size)
+    for chunk in chunks:
+        extractor.feed(chunk)
+    extractor.close()
+    return extractor.entries
+
+
 def _zip_dir(dir_path: str) -> str:
     """Zip a directory into a file located in the same directory.
 
@@ -72,6 +387,96 @@ def _zip_dir(dir_path: str) -> str:
     return output_path
 
 
+class _ZipStreamBuffer(io.RawIOBase):
+    """Non-seekable buffer receiving the bytes of a zip archive written on the fly."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._buffer += b
+        return len(b)
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def pop(self):
+        """Return and remove the buffered bytes."""
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def list_dir_files(dir_path: str) -> list:
+    """Return the sorted paths (relative to ``dir_path`` and ``/`` separated) of the files of a directory."""
+    relpaths = []
+    for root, _, filenames in os.walk(dir_path):
+        for filename in filenames:
+            relpath = os.path.relpath(os.path.join(root, filename), dir_path)
+            relpaths.append(relpath.replace(os.sep, "/"))
+    return sorted(relpaths)
+
+
+def iter_zip_dir(
+    dir_path: str,
+    chunk_size: int = ZIP_STREAM_CHUNK_SIZE,
+    filenames: Optional[list] = None,
+    reproducible: bool = False,
+):
+    """Zip a directory on the fly and yield the bytes of the zip archive.
+
+    The zip archive is never written to disk. Since the archive is written into a non-seekable stream,
+    the entry sizes and CRC-32 are stored in data descriptors following the compressed data.
+    The entries are sorted by path.
+
+    Parameters
+    ----------
+    dir_path : str
+        Path of the directory to zip.
+    chunk_size : int, optional
+        Approximate size (in bytes) of the yielded chunks. The default is 1 MiB.
+    filenames : list, optional
+        Paths (relative to ``dir_path``) of the files to zip. If ``None`` (the default), all files are zipped.
+    reproducible : bool, optional
+        If ``True``, the entries modification time and permissions are fixed,
+        so that the same files always produce the same zip archive bytes. The default is ``False``.
+
+    Yields
+    ------
+    bytes
+        Zip archive bytes.
+    """
+    filenames = list_dir_files(dir_path) if filenames is None else sorted(filenames)
+    buffer = _ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zipf:
+        for filename in filenames:
+            filepath = os.path.join(dir_path, *filename.split("/"))
+            if reproducible:
+                zinfo = zipfile.ZipInfo(filename, date_time=ZIP_REPRODUCIBLE_DATE_TIME)
+                zinfo.file_size = os.path.getsize(filepath)
+                zinfo.external_attr = 0o644 << 16
+                zinfo.create_system = 3  # Unix
+            else:
+                zinfo = zipfile.ZipInfo.from_file(filepath, arcname=filename)
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            with open(filepath, "rb") as f_in, zipf.open(zinfo, "w") as f_out:
+                for data in iter(functools.partial(f_in.read, chunk_size), b""):
+                    f_out.write(data)
+                    if len(buffer) >= chunk_size:
+                        yield buffer.pop()
+    # Yield the remaining bytes and the central directory
+    yield buffer.pop()
+
+
+def get_station_data_path(metadata_filepath: str) -> str:
+    """Return the station data directory path of a metadata file."""
+    station_data_path = metadata_filepath.replace("metadata", "data")
+    return os.path.splitext(station_data_path)[0]  # remove trailing ".yml"
+
+
 def archive_station_data(metadata_filepath: str) -> str:
     """Archive station data into a zip file for subsequent data upload.
 
@@ -83,17 +488,28 @@ def archive_station_data(metadata_filepath: str) -> str:
         Metadata file path.
 
     """
-    station_data_path = metadata_filepath.replace("metadata", "data")
-    station_data_path = os.path.splitext(station_data_path)[0]  # remove trailing ".yml"
+    station_data_path = get_station_data_path(metadata_filepath)
     station_zip_filepath = _zip_dir(station_data_path)
     return station_zip_filepath
 
 
 def compress_station_files(
-    base_dir: str, data_source: str, campaign_name: str, station_name: str, method: str = "gzip", skip: bool = True
-) -> None:
+    base_dir: str,
+    data_source: str,
+    campaign_name: str,
+    station_name: str,
+    method: str = "gzip",
+    skip: bool = True,
+    compression_level: Optional[int] = None,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    n_threads: int = 1,
+    verbose: bool = True,
+) -> list:
     """Compress each raw file of a station.
 
+    Each compressed file is decompressed and compared to the original file before the original is removed.
+
     Parameters
     ----------
     base_dir : str
@@ -105,15 +521,40 @@ def compress_station_files(
     station_name : str
         Station name of interest.
     method : str
-        Compression method. ``"zip"``, ``"gzip"`` or ``"bzip2"``.
+        Compression method. ``"zip"``, ``"gzip"``, ``"bzip2"`` or ``"zstd"``.
+        The ``"zstd"`` method requires the ``zstandard`` package.
     skip : bool
         Whether to raise an error if a file is already compressed.
         If ``True``, it does not raise an error and try to compress the other files.
         If ``False``, it raise an error and stop the compression routine.
         The default is ``True``.
+    compression_level : int, optional
+        Compression level. See ``COMPRESSION_LEVELS`` for the valid range of each method.
+        If ``None`` (the default), the default level of the method is used.
+    parallel : bool
+        If ``True``, the files are compressed in parallel with a pool of processes.
+        The default is ``False``.
+    max_workers : int, optional
+        Maximum number of processes used if ``parallel=True``.
+        If ``None`` (the default), the number of CPUs is used.
+    n_threads : int
+        Number of threads used to compress each file. Only used by the ``"gzip"`` and ``"zstd"`` methods.
+        With ``"gzip"``, the file is compressed into independently compressed gzip members.
+        The default is ``1``.
+    verbose : bool
+        Whether to print the compression ratio of each file. The default is ``True``.
+
+    Returns
+    -------
+    list
+        List of dictionaries reporting, for each compressed file, the ``filepath``, the ``compressed_filepath``,
+        the ``size`` and ``compressed_size`` (in bytes) and the ``compression_ratio``.
     """
     if method not in COMPRESSION_OPTIONS:
         raise ValueError(f"Invalid compression method {method}. Valid methods are {list(COMPRESSION_OPTIONS.keys())}")
+    check_compression_level(method, compression_level)
+    if method == "zstd":
+        _import_zstandard()
 
     base_dir = check_base_dir(base_dir)
     station_dir = define_station_dir(
@@ -129,28 +570,89 @@ def compress_station_files(
 
     # Get list of files inside the station directory (in all nested directories)
     filepaths = list_files(station_dir, glob_pattern="*", recursive=True)
-    for filepath in filepaths:
-        _ = _compress_file(filepath, method, skip=skip)
-
+    compress_kwargs = {"method": method, "skip": skip, "compression_level": compression_level, "n_threads": n_threads}
+    if parallel:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            compress_function = functools.partial(_compress_file_with_report, **compress_kwargs)
+            list_report = list(executor.map(compress_function, filepaths))
+    else:
+        list_report = [_compress_file_with_report(filepath, **compress_kwargs) for filepath in filepaths]
+    list_report = [report for report in list_report if report is not None]
+
+    if verbose:
+        for report in list_report:
+            print(
+                f"{report['filepath']}: {report['size']} -> {report['compressed_size']} bytes "
+                f"(compression ratio {report['compression_ratio']:.2f}).",
+            )
     print(f"All files of {data_source} {campaign_name} {station_name} have been compressed.")
-    print("Please now remember to update the glob_pattern of the reader ¨!")
+    print(f"Please now remember to update the glob_pattern of the reader to '*{COMPRESSION_OPTIONS[method]}' !")
+    return list_report
+
+
+def check_compression_level(method: str, compression_level: Optional[int]) -> None:
+    """Check the compression level is valid for the compression method."""
+    if compression_level is None:
+        return
+    min_level, max_level = COMPRESSION_LEVELS[method]
+    if not isinstance(compression_level, int) or not min_level <= compression_level <= max_level:
+        raise ValueError(
+            f"Invalid compression level {compression_level} for {method}. "
+            f"It must be an integer between {min_level} and {max_level}.",
+        )
+
+
+def _import_zstandard():
+    """Import the optional ``zstandard`` package."""
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("The 'zstandard' package is required for zstd compression. Please install it.")
+    return zstandard
+
+
+def _compress_file_with_report(filepath: str, **kwargs) -> Optional[dict]:
+    """Compress a file and return the compression report. Return ``None`` if the file is skipped."""
+    size = os.path.getsize(filepath)
+    compressed_filepath = _compress_file(filepath, **kwargs)
+    if compressed_filepath == filepath:
+        return None
+    compressed_size = os.path.getsize(compressed_filepath)
+    return {
+        "filepath": filepath,
+        "compressed_filepath": compressed_filepath,
+        "size": size,
+        "compressed_size": compressed_size,
+        "compression_ratio": size / compressed_size,
+    }
 
 
-def _compress_file(filepath: str, method: str, skip: bool) -> str:
+def _compress_file(
+    filepath: str,
+    method: str,
+    skip: bool,
+    compression_level: Optional[int] = None,
+    n_threads: int = 1,
+) -> str:
     """Compress a file and delete the original.
 
     If the file is already compressed, it is not compressed again.
+    The original file is removed only if the decompressed content of the compressed file is identical.
 
     Parameters
     ----------
     filepath : str
         Path of the file to compress.
     method : str
-        Compression method. ``None``, ``"zip"``, ``"gzip"`` or ``"bzip2"``.
+        Compression method. ``"zip"``, ``"gzip"``, ``"bzip2"`` or ``"zstd"``.
     skip : bool
         Whether to raise an error if a file is already compressed.
         If ``True``, it does not raise an error return the input filepath.
         If ``False``, it raise an error.
+    compression_level : int, optional
+        Compression level. If ``None``, the default level of the method is used.
+    n_threads : int
+        Number of threads used by the ``"gzip"`` and ``"zstd"`` methods. The default is ``1``.
 
     Returns
     -------
@@ -174,14 +676,53 @@ def _compress_file(filepath: str, method: str, skip: bool) -> str:
         "zip": _compress_file_zip,
         "gzip": _compress_file_gzip,
         "bzip2": _compress_file_bzip2,
+        "zstd": _compress_file_zstd,
     }[method]
+    kwargs = {"n_threads": n_threads} if method in ["gzip", "zstd"] else {}
 
-    compress_file_function(filepath, compressed_filepath)
+    compress_file_function(filepath, compressed_filepath, compression_level=compression_level, **kwargs)
+    if not _check_compressed_file(filepath, compressed_filepath, method):
+        os.remove(compressed_filepath)
+        raise ValueError(f"The compressed file {compressed_filepath} differs from the original file {filepath}.")
     os.remove(filepath)
 
     return compressed_filepath
 
 
+def _open_compressed_file(stack: ExitStack, compressed_filepath: str, method: str):
+    """Open a compressed file in binary read mode. The file is closed when ``stack`` exits."""
+    if method == "zip":
+        zipf = stack.enter_context(zipfile.ZipFile(compressed_filepath, "r"))
+        return stack.enter_context(zipf.open(zipf.namelist()[0]))
+    if method == "gzip":
+        return stack.enter_context(gzip.open(compressed_filepath, "rb"))
+    if method == "bzip2":
+        return stack.enter_context(bz2.open(compressed_filepath, "rb"))
+    zstandard = _import_zstandard()
+    f = stack.enter_context(open(compressed_filepath, "rb"))
+    return stack.enter_context(zstandard.ZstdDecompressor().stream_reader(f))
+
+
+def _check_compressed_file(filepath: str, compressed_filepath: str, method: str) -> bool:
+    """Check that the decompressed content of a compressed file is identical to the original file."""
+    with ExitStack() as stack:
+        f_original = stack.enter_context(open(filepath, "rb"))
+        f_compressed = _open_compressed_file(stack, compressed_filepath, method)
+        while True:
+            chunk = f_original.read(COMPRESSION_CHUNK_SIZE)
+            decompressed_chunk = f_compressed.read(len(chunk)) if chunk else f_compressed.read(1)
+            # Read the decompressed stream until the chunk is filled (i.e. zstd stream readers)
+            while chunk and len(decompressed_chunk) < len(chunk):
+                data = f_compressed.read(len(chunk) - len(decompressed_chunk))
+                if not data:
+                    break
+                decompressed_chunk += data
+            if chunk != decompressed_chunk:
+                return False
+            if not chunk:
+                return True
+
+
 def _check_file_compression(filepath: str) -> Optional[str]:
     """Check the method used to compress a raw text file.
 
@@ -195,13 +736,14 @@ def _check_file_compression(filepath: str) -> Optional[str]:
     Returns
     -------
     Optional[str]
-        Compression method. ``None``, ``"zip"``, ``"gzip"`` or ``"bzip2"``.
+        Compression method. ``None``, ``"zip"``, ``"gzip"``, ``"bzip2"`` or ``"zstd"``.
 
     """
     magic_dict = {
         b"\x1f\x8b\x08": "gzip",
         b"\x42\x5a\x68": "bzip2",
         b"\x50\x4b\x03\x04": "zip",
+        b"\x28\xb5\x2f\xfd": "zstd",
     }
     with open(filepath, "rb") as f:
         file_start = f.read(4)
@@ -212,7 +754,7 @@ def _check_file_compression(filepath: str) -> Optional[str]:
     return None
 
 
-def _compress_file_zip(filepath: str, compressed_filepath: str) -> None:
+def _compress_file_zip(filepath: str, compressed_filepath: str, compression_level: Optional[int] = None) -> None:
     """Compress a single file into a zip archive.
 
     Parameters
@@ -223,15 +765,31 @@ def _compress_file_zip(filepath: str, compressed_filepath: str) -> None:
     compressed_filepath : str
         Path of the compressed file.
 
+    compression_level : int, optional
+        Compression level (0-9). If ``None``, the zlib default level is used.
+
     """
 
-    with zipfile.ZipFile(compressed_filepath, "w", compression=zipfile.ZIP_DEFLATED) as zipf:
+    with zipfile.ZipFile(
+        compressed_filepath,
+        "w",
+        compression=zipfile.ZIP_DEFLATED,
+        compresslevel=compression_level,
+    ) as zipf:
         zipf.write(filepath, os.path.basename(filepath))
 
 
-def _compress_file_gzip(filepath: str, compressed_filepath: str) -> None:
+def _compress_file_gzip(
+    filepath: str,
+    compressed_filepath: str,
+    compression_level: Optional[int] = None,
+    n_threads: int = 1,
+) -> None:
     """Compress a single file into a gzip archive.
 
+    If ``n_threads > 1``, blocks of the file are compressed concurrently into independent
+    gzip members, which are concatenated into a valid multi-member gzip file.
+
     Parameters
     ----------
     filepath : str
@@ -240,15 +798,64 @@ def _compress_file_gzip(filepath: str, compressed_filepath: str) -> None:
     compressed_filepath : str
         Path of the compressed file.
 
+    compression_level : int, optional
+        Compression level (0-9). The default is ``None`` (level 9).
+
+    n_threads : int
+        Number of threads. The default is ``1``.
+
     """
+    compression_level = 9 if compression_level is None else compression_level
+    if n_threads <= 1:
+        with open(filepath, "rb") as f_in:
+            with gzip.open(compressed_filepath, "wb", compresslevel=compression_level) as f_out:
+                f_out.writelines(f_in)
+        return
+
+    # zlib releases the GIL while compressing: the blocks are compressed concurrently by threads
+    compress_block = functools.partial(gzip.compress, compresslevel=compression_level)
+    with open(filepath, "rb") as f_in, open(compressed_filepath, "wb") as f_out:
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            while True:
+                blocks = [f_in.read(GZIP_BLOCK_SIZE) for _ in range(n_threads)]
+                blocks = [block for block in blocks if block]
+                if len(blocks) == 0:
+                    break
+                for member in executor.map(compress_block, blocks):
+                    f_out.write(member)
+        # Ensure an empty file is still a valid gzip file
+        if f_out.tell() == 0:
+            f_out.write(compress_block(b""))
+
+
+def _compress_file_bzip2(filepath: str, compressed_filepath: str, compression_level: Optional[int] = None) -> None:
+    """Compress a single file into a bzip2 archive.
+
+    Parameters
+    ----------
+    filepath : str
+        Path of the file to compress.
+
+    compressed_filepath : str
+        Path of the compressed file.
+
+    compression_level : int, optional
+        Compression level (1-9). The default is ``None`` (level 9).
 
+    """
+    compression_level = 9 if compression_level is None else compression_level
     with open(filepath, "rb") as f_in:
-        with gzip.open(compressed_filepath, "wb") as f_out:
+        with bz2.open(compressed_filepath, "wb", compresslevel=compression_level) as f_out:
             f_out.writelines(f_in)
 
 
-def _compress_file_bzip2(filepath: str, compressed_filepath: str) -> None:
-    """Compress a single file into a bzip2 archive.
+def _compress_file_zstd(
+    filepath: str,
+    compressed_filepath: str,
+    compression_level: Optional[int] = None,
+    n_threads: int = 1,
+) -> None:
+    """Compress a single file into a zstd archive.
 
     Parameters
     ----------
@@ -258,8 +865,15 @@ def _compress_file_bzip2(filepath: str, compressed_filepath: str) -> None:
     compressed_filepath : str
         Path of the compressed file.
 
-    """
+    compression_level : int, optional
+        Compression level (1-22). The default is ``None`` (level 3).
 
-    with open(filepath, "rb") as f_in:
-        with bz2.open(compressed_filepath, "wb") as f_out:
-            f_out.writelines(f_in)
+    n_threads : int
+        Number of threads. The default is ``1``.
+
+    """
+    zstandard = _import_zstandard()
+    compression_level = 3 if compression_level is None else compression_level
+    compressor = zstandard.ZstdCompressor(level=compression_level, threads=n_threads if n_threads > 1 else 0)
+    with open(filepath, "rb") as f_in, open(compressed_filepath, "wb") as f_out:
+        compressor.copy_stream(f_in, f_out, size=os.path.getsize(filepath))
@@ -79,6 +79,28 @@ def count_directories(dir_path, glob_pattern, recursive=False):
     return len(list_directories(dir_path, glob_pattern, recursive=recursive))
 
 
+def has_files(dir_path, recursive=True):
+    """Return ``True`` if the directory contains at least one file.
+
+    The directory tree is scanned with ``os.scandir`` and the search stops at the first file found.
+    Return ``False`` if the directory does not exist.
+    """
+    dir_path = str(dir_path)
+    stack = [dir_path]
+    while stack:
+        current_dir = stack.pop()
+        try:
+            with os.scandir(current_dir) as it:
+                for entry in it:
+                    if entry.is_file():
+                        return True
+                    if recursive and entry.is_dir():
+                        stack.append(entry.path)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return False
+
+
 def check_directory_exists(dir_path):
     """Check if the directory exists."""
     if not os.path.exists(dir_path):
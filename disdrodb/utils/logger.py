@@ -18,31 +18,118 @@
 # -----------------------------------------------------------------------------.
 """DISDRODB logger utility."""
 
+import datetime
+import json
 import logging
 import os
 import re
+import time
 from asyncio.log import logger
 
+LOG_FORMATS = ["text", "jsonl"]
 
-def create_file_logger(processed_dir, product, station_name, filename, parallel):
-    """Create file logger."""
+
+def get_log_format(log_format=None):
+    """Return the DISDRODB processing log format.
+
+    If ``log_format`` is ``None``, the ``log_format`` key of the DISDRODB configuration is used.
+    ``"text"`` (the default) creates a log file for each processed file.
+    ``"jsonl"`` appends JSON-lines records of all processed files into a single station log file.
+    """
+    import disdrodb
+
+    if log_format is None:
+        log_format = disdrodb.config.get("log_format", "text")
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Invalid log_format '{log_format}'. Valid formats are {LOG_FORMATS}.")
+    return log_format
+
+
+def define_station_jsonl_log_filepath(processed_dir, product, station_name):
+    """Define the filepath of the station JSON-lines log file."""
+    return os.path.join(processed_dir, "logs", product, station_name, f"logs_{station_name}.jsonl")
+
+
+def initialize_station_logs(processed_dir, product, station_name, log_format="text"):
+    """Remove the station JSON-lines log file of a previous processing run.
+
+    Text logs files are overwritten when the file is processed again and do not need to be removed.
+    """
+    if log_format == "jsonl":
+        filepath = define_station_jsonl_log_filepath(processed_dir, product, station_name)
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+
+class JSONLinesHandler(logging.Handler):
+    """Logging handler appending JSON-lines records into a (shared) station log file.
+
+    Each record is written with a single ``write`` call on a file opened in append mode,
+    so that multiple processes can log into the same file.
+    Each record contains the ``time``, ``name``, ``level``, ``file``, ``message`` and ``elapsed``
+    (seconds since the creation of the handler) keys. The ``stage``, ``counts`` and ``duration``
+    attributes passed with the ``extra`` logging argument are also recorded.
+    """
+
+    extra_keys = ["stage", "counts", "duration"]
+
+    def __init__(self, filepath, filename):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filepath)
+        self.filename = filename
+        self._start_time = time.time()
+        self._fd = os.open(self.baseFilename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def emit(self, record):
+        try:
+            entry = {
+                "time": datetime.datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S,%f")[:-3],
+                "name": record.name,
+                "level": record.levelname,
+                "file": self.filename,
+                "message": record.getMessage(),
+                "elapsed": round(record.created - self._start_time, 6),
+            }
+            for key in self.extra_keys:
+                if hasattr(record, key):
+                    entry[key] = getattr(record, key)
+            os.write(self._fd, (json.dumps(entry, default=str) + "\n").encode())
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        super().close()
+
+
+def create_file_logger(processed_dir, product, station_name, filename, parallel, log_format="text"):
+    """Create file logger.
+
+    If ``log_format="text"``, the logs are written in the ``logs_<filename>.log`` file.
+    If ``log_format="jsonl"``, the logs are appended to the ``logs_<station_name>.jsonl`` station file.
+    """
     # Create logs directory
     logs_dir = os.path.join(processed_dir, "logs", product, station_name)
     os.makedirs(logs_dir, exist_ok=True)
 
-    # Define logger filepath
-    logger_filename = f"logs_{filename}.log"
-    logger_filepath = os.path.join(logs_dir, logger_filename)
-
     # Set logger
     if parallel:
         logger = logging.getLogger(filename)  # does not log submodules logs
     else:
         logger = logging.getLogger()  # root logger
 
-    handler = logging.FileHandler(logger_filepath, mode="w")
-    format_type = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    handler.setFormatter(logging.Formatter(format_type))
+    # Define logger handler
+    if log_format == "jsonl":
+        logger_filepath = define_station_jsonl_log_filepath(processed_dir, product, station_name)
+        handler = JSONLinesHandler(logger_filepath, filename=filename)
+    else:
+        logger_filename = f"logs_{filename}.log"
+        logger_filepath = os.path.join(logs_dir, logger_filename)
+        handler = logging.FileHandler(logger_filepath, mode="w")
+        format_type = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        handler.setFormatter(logging.Formatter(format_type))
     logger.addHandler(handler)
     logger.setLevel(logging.DEBUG)
     return logger
@@ -186,6 +273,39 @@ def _define_station_problem_log_file(list_logs, problem_filepath):
         os.remove(problem_filepath)
 
 
+def _format_jsonl_record(entry):
+    """Format a JSON-lines log record as a text log line."""
+    return f"{entry['time']} - {entry['name']} - {entry['level']} - {entry['message']}\n"
+
+
+def _define_station_logs_from_jsonl(jsonl_filepath, summary_filepath, problem_filepath):
+    """Create the station summary and problem log files with a single pass over the JSON-lines log."""
+    re_keyword = re.compile("has started|has ended")
+    dict_file_lines = {}
+    files_with_problem = []
+    with open(summary_filepath, "w") as summary_file:
+        with open(jsonl_filepath) as input_file:
+            for line in input_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:  # e.g. truncated line of an interrupted run
+                    continue
+                text_line = _format_jsonl_record(entry)
+                dict_file_lines.setdefault(entry["file"], []).append(text_line)
+                if entry["level"] in ["WARNING", "ERROR"] or re_keyword.search(entry["message"]):
+                    summary_file.write(text_line)
+                if entry["level"] == "ERROR" and entry["file"] not in files_with_problem:
+                    files_with_problem.append(entry["file"])
+
+    # Copy the logs of files with errors in the problem log file
+    if len(files_with_problem) > 0:
+        with open(problem_filepath, "w") as problem_file:
+            for filename in files_with_problem:
+                problem_file.writelines(dict_file_lines[filename])
+    elif os.path.exists(problem_filepath):
+        os.remove(problem_filepath)
+
+
 def define_summary_log(list_logs):
     """Define a station summary and a problems log file from the list of input logs.
 
@@ -197,9 +317,11 @@ def define_summary_log(list_logs):
 
         ``/DISDRODB/Processed/<DATA_SOURCE>/<CAMPAIGN_NAME>/logs/<product>/<station_name>/*.log``
 
+    If the logs are JSON-lines station log files (``*.jsonl``), the summary and problems log files
+    are created with a single pass over the station log file.
     """
     # LogCaptureHandler of pytest does not have baseFilename attribute, so it returns None
-    if list_logs[0] is None:
+    if len(list_logs) == 0 or list_logs[0] is None:
         return None
 
     station_name, logs_dir = _get_logs_dir(list_logs)
@@ -208,6 +330,12 @@ def define_summary_log(list_logs):
     summary_filepath = os.path.join(logs_dir, f"logs_summary_{station_name}.log")
     # Define station problem logs file name
     problem_filepath = os.path.join(logs_dir, f"logs_problem_{station_name}.log")
+
+    # If JSON-lines logs, process the station log file
+    if list_logs[0].endswith(".jsonl"):
+        _define_station_logs_from_jsonl(list_logs[0], summary_filepath, problem_filepath)
+        return None
+
     # Create station summary log file
     _define_station_summary_log_file(list_logs, summary_filepath)
     # Create station ptoblems log file (if no problems, no file)
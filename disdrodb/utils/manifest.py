@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""DISDRODB station data manifest utility.
+
+The manifest of a station is a JSON file located next to the station metadata
+(``metadata/<station_name>.manifest.json``). It records:
+
+- ``files``: the size, modification time and content hash of each uploaded station file.
+- ``archives``: the uploaded station archives. The first archive contains all station files,
+  while the following (incremental) archives contain only the files added or changed since the previous upload.
+
+Station archives are reproducible zip files: the same files always produce the same archive bytes and hash.
+"""
+
+import datetime
+import functools
+import hashlib
+import json
+import os
+
+from disdrodb.utils.compression import get_station_data_path, iter_zip_dir, list_dir_files
+
+MANIFEST_HASH_ALGORITHM = "sha256"
+MANIFEST_CHUNK_SIZE = 1024 * 1024
+
+
+def define_manifest_filepath(metadata_filepath: str) -> str:
+    """Return the station manifest filepath of a metadata file."""
+    return os.path.splitext(metadata_filepath)[0] + ".manifest.json"
+
+
+def read_manifest(manifest_filepath: str) -> dict:
+    """Read a station manifest. Return an empty manifest if the file does not exist."""
+    if not os.path.isfile(manifest_filepath):
+        return {"hash_algorithm": MANIFEST_HASH_ALGORITHM, "files": {}, "archives": []}
+    with open(manifest_filepath) as f:
+        return json.load(f)
+
+
+def write_manifest(manifest: dict, manifest_filepath: str) -> None:
+    """Write a station manifest."""
+    with open(manifest_filepath, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compute_file_hash(filepath: str, algorithm: str = MANIFEST_HASH_ALGORITHM) -> str:
+    """Compute the hash of a file content."""
+    hasher = hashlib.new(algorithm)
+    with open(filepath, "rb") as f:
+        for data in iter(functools.partial(f.read, MANIFEST_CHUNK_SIZE), b""):
+            hasher.update(data)
+    return hasher.hexdigest()
+
+
+def scan_station_files(station_data_path: str, manifest: dict = None) -> dict:
+    """Return the size, modification time and content hash of the station files.
+
+    The hash of a file is taken from the ``manifest`` if its size and modification time did not change.
+
+    Returns
+    -------
+    dict
+        Dictionary with the file paths (relative to ``station_data_path``) as keys.
+    """
+    manifest_files = manifest["files"] if manifest is not None else {}
+    algorithm = manifest["hash_algorithm"] if manifest is not None else MANIFEST_HASH_ALGORITHM
+    files = {}
+    for filename in list_dir_files(station_data_path):
+        stat = os.stat(os.path.join(station_data_path, filename))
+        file_info = {"size": stat.st_size, "mtime": stat.st_mtime}
+        previous_info = manifest_files.get(filename, {})
+        if previous_info.get("size") == file_info["size"] and previous_info.get("mtime") == file_info["mtime"]:
+            file_info["hash"] = previous_info["hash"]
+        else:
+            file_info["hash"] = compute_file_hash(os.path.join(station_data_path, filename), algorithm=algorithm)
+        files[filename] = file_info
+    return files
+
+
+def get_manifest_changes(files: dict, manifest: dict) -> tuple:
+    """Return the files added or changed and the files removed since the manifest was written."""
+    manifest_files = manifest["files"]
+    changed = [
+        filename
+        for filename, file_info in files.items()
+        if filename not in manifest_files or manifest_files[filename]["hash"] != file_info["hash"]
+    ]
+    removed = [filename for filename in manifest_files if filename not in files]
+    return sorted(changed), sorted(removed)
+
+
+def define_station_archive(metadata_filepath: str, incremental: bool = False) -> dict:
+    """Define the station archive to upload.
+
+    If ``incremental=True`` and the station has already been uploaded, the archive contains only
+    the files added or changed since the last upload.
+
+    Returns
+    -------
+    dict
+        Archive description with the ``station_data_path``, the ``files`` to archive,
+        the ``removed`` files, the ``incremental`` flag and the updated ``manifest``.
+        ``files`` is empty if there is nothing to upload.
+    """
+    station_data_path = get_station_data_path(metadata_filepath)
+    manifest = read_manifest(define_manifest_filepath(metadata_filepath))
+    files = scan_station_files(station_data_path, manifest=manifest)
+    incremental = incremental and len(manifest["archives"]) > 0
+    if incremental:
+        changed, removed = get_manifest_changes(files, manifest)
+    else:
+        changed, removed = sorted(files), []
+    return {
+        "station_data_path": station_data_path,
+        "files": changed,
+        "removed": removed,
+        "incremental": incremental,
+        "manifest": {**manifest, "files": files},
+    }
+
+
+def iter_station_archive(archive: dict, hasher=None, chunk_size: int = MANIFEST_CHUNK_SIZE):
+    """Yield the bytes of the reproducible zip archive of a station archive.
+
+    If ``hasher`` is specified (i.e. ``hashlib.sha256()``), it is updated with the archive bytes.
+    """
+    for data in iter_zip_dir(
+        archive["station_data_path"],
+        chunk_size=chunk_size,
+        filenames=archive["files"],
+        reproducible=True,
+    ):
+        if hasher is not None:
+            hasher.update(data)
+        yield data
+
+
+def update_station_manifest(metadata_filepath: str, archive: dict, archive_hash: str, url: str) -> dict:
+    """Record an uploaded station archive into the station manifest.
+
+    A full archive replaces the previously recorded archives, while an incremental archive is appended.
+    """
+    manifest = archive["manifest"]
+    archive_info = {
+        "url": url,
+        "hash": archive_hash,
+        "files": archive["files"],
+        "removed": archive["removed"],
+        "created": datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    archives = manifest["archives"] if archive["incremental"] else []
+    manifest = {**manifest, "archives": [*archives, archive_info]}
+    write_manifest(manifest, define_manifest_filepath(metadata_filepath))
+    return manifest
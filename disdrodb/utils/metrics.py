@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""DISDRODB processing metrics utility.
+
+The processing stages are timed with the ``time_stage`` context manager (or decorator)
+and the processed quantities are counted with ``increment_counter``.
+Metrics are collected only between ``start_metrics`` and ``stop_metrics`` calls.
+Otherwise, the timers and counters do nothing.
+"""
+
+import contextvars
+import json
+import os
+import time
+from contextlib import contextmanager
+
+_ACTIVE_METRICS = contextvars.ContextVar("disdrodb_metrics", default=None)
+
+
+def get_metrics_options(metrics=None, metrics_prometheus=None):
+    """Return the processing metrics options.
+
+    If an option is ``None``, the ``metrics`` and ``metrics_prometheus`` keys
+    of the DISDRODB configuration are used. Both options are ``False`` by default.
+    """
+    import disdrodb
+
+    if metrics is None:
+        metrics = disdrodb.config.get("metrics", False)
+    if metrics_prometheus is None:
+        metrics_prometheus = disdrodb.config.get("metrics_prometheus", False)
+    return bool(metrics), bool(metrics_prometheus)
+
+
+####--------------------------------------------------------------------------.
+#### Metrics collection
+
+
+def start_metrics():
+    """Start collecting metrics in the current context. Return the token to pass to ``stop_metrics``."""
+    metrics = {"duration": None, "stages": {}, "counters": {}}
+    metrics["_start_time"] = time.perf_counter()
+    return _ACTIVE_METRICS.set(metrics)
+
+
+def stop_metrics(token):
+    """Stop collecting metrics and return the collected metrics dictionary."""
+    metrics = _ACTIVE_METRICS.get()
+    _ACTIVE_METRICS.reset(token)
+    metrics["duration"] = time.perf_counter() - metrics.pop("_start_time")
+    return metrics
+
+
+@contextmanager
+def time_stage(stage):
+    """Time a processing stage.
+
+    It can be used as context manager (``with time_stage("stage"):``) or as function decorator.
+    The duration and number of calls of the stage are accumulated into the active metrics.
+    """
+    metrics = _ACTIVE_METRICS.get()
+    if metrics is None:
+        yield
+        return
+    t_i = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - t_i
+        stage_dict = metrics["stages"].setdefault(stage, {"duration": 0.0, "n_calls": 0})
+        stage_dict["duration"] += duration
+        stage_dict["n_calls"] += 1
+
+
+def increment_counter(name, value=1):
+    """Increment a counter of the active metrics."""
+    metrics = _ACTIVE_METRICS.get()
+    if metrics is None:
+        return
+    metrics["counters"][name] = metrics["counters"].get(name, 0) + value
+
+
+####--------------------------------------------------------------------------.
+#### Metrics files
+
+
+def define_file_metrics_filepath(processed_dir, product, station_name, filename):
+    """Define the filepath of the metrics file of a processed file."""
+    return os.path.join(processed_dir, "logs", product, station_name, f"metrics_{filename}.json")
+
+
+def define_station_metrics_filepath(processed_dir, product, station_name, extension="json"):
+    """Define the filepath of the station metrics file.
+
+    Use ``extension="prom"`` to define the filepath of the Prometheus text export.
+    """
+    return os.path.join(processed_dir, "logs", product, f"metrics_{station_name}.{extension}")
+
+
+def write_file_metrics(metrics, filepath, labels=None):
+    """Write the metrics of a processed file into a JSON file.
+
+    ``labels`` (i.e. the ``filename``, ``sensor_name`` and ``reader``) are added to the metrics dictionary.
+    """
+    metrics = {**(labels or {}), **metrics}
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, "w") as f:
+        json.dump(metrics, f)
+
+
+def aggregate_metrics(list_metrics):
+    """Aggregate the metrics of multiple files.
+
+    Stages durations, number of calls and counters are summed.
+    The ``fraction`` key of each stage gives the fraction of the total processing time spent in the stage.
+    """
+    stages = {}
+    counters = {}
+    for metrics in list_metrics:
+        for stage, stage_dict in metrics["stages"].items():
+            aggregated = stages.setdefault(stage, {"duration": 0.0, "n_calls": 0})
+            aggregated["duration"] += stage_dict["duration"]
+            aggregated["n_calls"] += stage_dict["n_calls"]
+        for name, value in metrics["counters"].items():
+            counters[name] = counters.get(name, 0) + value
+    duration = sum(metrics["duration"] for metrics in list_metrics)
+    for stage_dict in stages.values():
+        stage_dict["fraction"] = stage_dict["duration"] / duration if duration > 0 else 0.0
+    return {"n_files": len(list_metrics), "duration": duration, "stages": stages, "counters": counters}
+
+
+def _format_prometheus_labels(labels):
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+
+def format_prometheus_metrics(station_metrics, labels):
+    """Format the station metrics in the Prometheus text exposition format."""
+    labels_str = _format_prometheus_labels(labels)
+    lines = [
+        "# HELP disdrodb_processing_duration_seconds Total processing time of the station files.",
+        "# TYPE disdrodb_processing_duration_seconds gauge",
+        f"disdrodb_processing_duration_seconds{{{labels_str}}} {station_metrics['duration']}",
+        "# HELP disdrodb_processed_files Number of files processed.",
+        "# TYPE disdrodb_processed_files gauge",
+        f"disdrodb_processed_files{{{labels_str}}} {station_metrics['n_files']}",
+        "# HELP disdrodb_stage_duration_seconds Total time spent in each processing stage.",
+        "# TYPE disdrodb_stage_duration_seconds gauge",
+    ]
+    for stage, stage_dict in station_metrics["stages"].items():
+        stage_labels = _format_prometheus_labels({**labels, "stage": stage})
+        lines.append(f"disdrodb_stage_duration_seconds{{{stage_labels}}} {stage_dict['duration']}")
+    lines += [
+        "# HELP disdrodb_stage_calls Number of calls of each processing stage.",
+        "# TYPE disdrodb_stage_calls gauge",
+    ]
+    for stage, stage_dict in station_metrics["stages"].items():
+        stage_labels = _format_prometheus_labels({**labels, "stage": stage})
+        lines.append(f"disdrodb_stage_calls{{{stage_labels}}} {stage_dict['n_calls']}")
+    for name, value in station_metrics["counters"].items():
+        lines += [
+            f"# TYPE disdrodb_{name} gauge",
+            f"disdrodb_{name}{{{labels_str}}} {value}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def define_station_metrics(processed_dir, product, station_name, filenames, prometheus=False):
+    """Aggregate the metrics of the processed files into the station metrics file.
+
+    The station metrics JSON file contains the per-file metrics (``files`` key) and the
+    station aggregated metrics (``station`` key). The per-file metrics files are then removed.
+    If ``prometheus=True``, the station metrics are also exported in the Prometheus text format.
+
+    Returns
+    -------
+    dict
+        Station metrics.
+    """
+    # Read the metrics of the processed files
+    list_metrics = []
+    for filename in filenames:
+        filepath = define_file_metrics_filepath(processed_dir, product, station_name, filename)
+        if os.path.isfile(filepath):
+            with open(filepath) as f:
+                list_metrics.append(json.load(f))
+            os.remove(filepath)
+
+    # Define station labels
+    labels = {
+        "product": product,
+        "data_source": os.path.basename(os.path.dirname(processed_dir)),
+        "campaign_name": os.path.basename(processed_dir),
+        "station_name": station_name,
+    }
+    for key in ["sensor_name", "reader"]:
+        values = {metrics[key] for metrics in list_metrics if metrics.get(key) is not None}
+        if len(values) == 1:
+            labels[key] = values.pop()
+
+    # Write the station metrics
+    station_metrics = {"labels": labels, "station": aggregate_metrics(list_metrics), "files": list_metrics}
+    metrics_filepath = define_station_metrics_filepath(processed_dir, product, station_name)
+    with open(metrics_filepath, "w") as f:
+        json.dump(station_metrics, f, indent=2)
+
+    # Export to Prometheus text format
+    if prometheus:
+        prometheus_filepath = define_station_metrics_filepath(processed_dir, product, station_name, extension="prom")
+        with open(prometheus_filepath, "w") as f:
+            f.write(format_prometheus_metrics(station_metrics["station"], labels=labels))
+    return station_metrics
@@ -18,16 +18,104 @@
 # -----------------------------------------------------------------------------.
 """DISDRODB netCDF utility."""
 
+import contextlib
 import logging
+import threading
 
 import numpy as np
 import pandas as pd
 import xarray as xr
 
 from disdrodb.utils.logger import log_error, log_info, log_warning
+from disdrodb.utils.sparse import densify_dataset, is_sparse_dataset
 
 logger = logging.getLogger(__name__)
 
+L0B_ENGINES = ["netcdf4", "h5netcdf"]
+
+# The netCDF-C library is not thread-safe: netCDF4 files are opened, loaded and written one at a time within a process
+NETCDF4_LOCK = threading.Lock()
+
+
+####---------------------------------------------------------------------------.
+#### netCDF engines
+
+
+def _import_h5netcdf():
+    """Import the optional ``h5netcdf`` package and its ``h5py`` backend (optional since h5netcdf 1.8)."""
+    try:
+        import h5netcdf
+        import h5py  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            "The 'h5netcdf' and 'h5py' packages are required to use the 'h5netcdf' engine. Please install them.",
+        )
+    return h5netcdf
+
+
+def get_l0b_engine(engine=None):
+    """Return the engine used to read and write the DISDRODB L0B netCDF files.
+
+    If ``None``, the ``l0b_engine`` key of the DISDRODB configuration is used (``"netcdf4"`` by default).
+    Valid engines are ``"netcdf4"`` and ``"h5netcdf"``.
+    """
+    import disdrodb
+
+    if engine is None:
+        engine = disdrodb.config.get("l0b_engine", "netcdf4")
+    if engine not in L0B_ENGINES:
+        raise ValueError(f"Invalid L0B engine '{engine}'. Valid engines are {L0B_ENGINES}.")
+    if engine == "h5netcdf":
+        _import_h5netcdf()
+    return engine
+
+
+def set_engine_encodings(ds: xr.Dataset, engine: str) -> xr.Dataset:
+    """Adapt the (netCDF4-python style) variables encodings to the writer engine.
+
+    xarray translates the ``zlib``, ``complevel``, ``shuffle``, ``fletcher32`` and ``_FillValue``
+    encodings for the ``h5netcdf`` engine, but h5py requires the ``chunksizes`` to be a tuple.
+    The ``contiguous`` encoding is ignored by the ``h5netcdf`` engine: HDF5 datasets without
+    ``chunksizes`` and without compression are contiguous.
+    """
+    if engine == "h5netcdf":
+        for var in ds.variables:
+            chunksizes = ds[var].encoding.get("chunksizes", None)
+            if chunksizes is not None:
+                ds[var].encoding["chunksizes"] = tuple(chunksizes)
+    return ds
+
+
+def get_engine_lock(engine: str):
+    """Return the lock serializing the access to netCDF files across the threads of a process.
+
+    With the ``netcdf4`` engine, concurrent threads can crash the netCDF-C library.
+    The lock is held while opening a file, loading it into memory, and writing an in-memory dataset.
+    The chunks of lazy (dask) datasets are read and written under the xarray netCDF-C lock instead,
+    so that threads can compute them concurrently.
+    The ``h5netcdf`` engine relies on the h5py global lock, and files can be accessed concurrently.
+    Processes (i.e. ``dask.distributed`` workers) are not affected.
+
+    If ``engine`` is ``None`` (xarray default engine), the ``netcdf4`` lock is returned.
+    """
+    if engine == "h5netcdf":
+        return contextlib.nullcontext()
+    return NETCDF4_LOCK
+
+
+def xr_open_dataset(filepath: str, engine: str = "netcdf4", load: bool = False, **kwargs) -> xr.Dataset:
+    """Open a netCDF file while holding the engine lock (see ``get_engine_lock``).
+
+    If ``load=True``, the data are loaded into memory and the file is closed.
+    Otherwise, the variables are read lazily. Additional arguments are passed to ``xarray.open_dataset``.
+    """
+    with get_engine_lock(engine):
+        ds = xr.open_dataset(filepath, engine=engine, **kwargs)
+        if load:
+            with ds:
+                ds = ds.load()
+    return ds
+
 
 ####---------------------------------------------------------------------------.
 def _sort_datasets_by_dim(list_ds: list, filepaths: str, dim: str = "time") -> tuple[list, list]:
@@ -328,13 +416,16 @@ def ensure_monotonic_dimension(list_ds: list, filepaths: str, dim: str = "time",
 
 
 ####---------------------------------------------------------------------------
-def get_list_ds(filepaths: str) -> list:
+def get_list_ds(filepaths: str, engine: str = "netcdf4") -> list:
     """Get list of xarray datasets from file paths.
 
     Parameters
     ----------
     filepaths : list
         List of netCDFs file paths.
+    engine : str, optional
+        Engine used to read the netCDFs. Either ``"netcdf4"`` or ``"h5netcdf"``.
+        The default is ``"netcdf4"``.
 
     Returns
     -------
@@ -346,8 +437,10 @@ def get_list_ds(filepaths: str) -> list:
         # This context manager is required to avoid random HDF locking
         # - cache=True: store data in memory to avoid reading back from disk
         # --> but LRU cache might cause the netCDF to not be closed !
-        with xr.open_dataset(filepath, cache=False) as data:
-            ds = data.load()
+        ds = xr_open_dataset(filepath, engine=engine, load=True, cache=False)
+        # Reconstruct the dense spectra of sparse L0B files
+        if is_sparse_dataset(ds):
+            ds = densify_dataset(ds).compute()
         list_ds.append(ds)
     return list_ds
 
@@ -407,7 +500,40 @@ def _concatenate_datasets(list_ds, dim="time", verbose=False):
     return ds
 
 
-def xr_concat_datasets(filepaths: str, verbose=False) -> xr.Dataset:
+def xr_concat_sorted_datasets(filepaths: str, verbose=False, engine: str = "netcdf4") -> xr.Dataset:
+    """Concat xr.Dataset with interleaved or overlapping time periods.
+
+    Unlike ``xr_concat_datasets``, the timesteps causing non-monotonic time values are not dropped.
+    The timesteps of all files are sorted by time and only the duplicated timesteps are dropped
+    (keeping the timestep of the first file).
+
+    Parameters
+    ----------
+    filepaths : list
+        List of netCDFs file paths.
+    engine : str, optional
+        Engine used to read the netCDFs. Either ``"netcdf4"`` or ``"h5netcdf"``.
+        The default is ``"netcdf4"``.
+
+    Returns
+    -------
+    xr.Dataset
+        A single xarray dataset.
+    """
+    list_ds = get_list_ds(filepaths, engine=engine)
+    ds = _concatenate_datasets(list_ds=list_ds, dim="time", verbose=verbose)
+    # Sort by time (the sort is stable, so duplicated timesteps remain in the files order)
+    ds = ds.sortby("time")
+    # Drop duplicated timesteps
+    is_duplicated = ds.indexes["time"].duplicated(keep="first")
+    if np.any(is_duplicated):
+        msg = f"{np.sum(is_duplicated)} duplicated timesteps have been dropped."
+        log_warning(logger=logger, msg=msg, verbose=verbose)
+        ds = ds.isel(time=~is_duplicated)
+    return ds
+
+
+def xr_concat_datasets(filepaths: str, verbose=False, engine: str = "netcdf4") -> xr.Dataset:
     """Concat xr.Dataset in a robust and parallel way.
 
     1. It checks for time dimension monotonicity
@@ -416,6 +542,9 @@ def xr_concat_datasets(filepaths: str, verbose=False) -> xr.Dataset:
     ----------
     filepaths : list
         List of netCDFs file paths.
+    engine : str, optional
+        Engine used to read the netCDFs. Either ``"netcdf4"`` or ``"h5netcdf"``.
+        The default is ``"netcdf4"``.
 
     Returns
     -------
@@ -431,7 +560,7 @@ def xr_concat_datasets(filepaths: str, verbose=False) -> xr.Dataset:
 
     # --------------------------------------.
     # Open xr.Dataset lazily in parallel using dask delayed
-    list_ds = get_list_ds(filepaths)
+    list_ds = get_list_ds(filepaths, engine=engine)
 
     # --------------------------------------.
     # Ensure time dimension contains no duplicated values
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""DISDRODB processing profiling utility.
+
+A sample of the station files is processed under ``cProfile`` (in the process processing the file).
+The profiles are then merged into station files located next to the station logs:
+
+- ``profile_<station_name>.prof``: merged ``pstats`` file (i.e. to be opened with ``snakeviz``).
+- ``profile_<station_name>.txt``: functions sorted by cumulative time.
+- ``profile_<station_name>.collapsed``: collapsed stacks (i.e. for ``flamegraph.pl`` or ``speedscope``).
+"""
+
+import cProfile
+import io
+import os
+import pstats
+
+import numpy as np
+
+
+def get_profile_options(profile=None, profile_n_files=None):
+    """Return the processing profiling options.
+
+    If an option is ``None``, the ``profile`` and ``profile_n_files`` keys of the DISDRODB configuration are used.
+    ``profile_n_files`` is the number of files of each station to profile. If ``None``, all files are profiled.
+    """
+    import disdrodb
+
+    if profile is None:
+        profile = disdrodb.config.get("profile", False)
+    if profile_n_files is None:
+        profile_n_files = disdrodb.config.get("profile_n_files", None)
+    if profile_n_files is not None and int(profile_n_files) < 1:
+        raise ValueError("'profile_n_files' must be a positive integer.")
+    return bool(profile), profile_n_files
+
+
+def select_profiled_filepaths(filepaths, n_files=None):
+    """Select a sample of ``n_files`` evenly spaced in the list of files to process."""
+    if n_files is None or len(filepaths) <= n_files:
+        return list(filepaths)
+    indices = np.unique(np.linspace(0, len(filepaths) - 1, int(n_files)).round().astype(int))
+    return [filepaths[i] for i in indices]
+
+
+def define_file_profile_filepath(processed_dir, product, station_name, filename):
+    """Define the filepath of the profile of a processed file."""
+    return os.path.join(processed_dir, "logs", product, station_name, f"profile_{filename}.prof")
+
+
+def define_station_profile_filepath(processed_dir, product, station_name, extension="prof"):
+    """Define the filepath of the station profile files.
+
+    Valid extensions are ``"prof"``, ``"txt"`` and ``"collapsed"``.
+    """
+    return os.path.join(processed_dir, "logs", product, f"profile_{station_name}.{extension}")
+
+
+def start_profiler():
+    """Create and enable a ``cProfile`` profiler.
+
+    Since Python 3.12, a single ``cProfile`` profiler can be enabled at a time in a process.
+    If another profiler is already enabled (i.e. by another thread processing a file),
+    the profiling is skipped and ``None`` is returned.
+    """
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return None
+    return profiler
+
+
+def stop_profiler(profiler, filepath):
+    """Disable the profiler and save the profile into a ``pstats`` file."""
+    profiler.disable()
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    profiler.dump_stats(filepath)
+
+
+def _format_function(func):
+    filename, lineno, name = func
+    if filename == "~":  # built-in functions
+        return name
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+def get_collapsed_stacks(stats, max_depth=64):
+    """Return the collapsed stacks of a ``pstats.Stats`` object.
+
+    ``cProfile`` only records caller/callee pairs. The stacks are therefore reconstructed
+    from the root functions, splitting the cumulative time of each function between its
+    callers proportionally to the time spent in each call path.
+
+    Returns
+    -------
+    list
+        List of ``(stack, time)`` tuples, with ``stack`` the ``;`` separated functions names
+        and ``time`` the function own time (in microseconds).
+    """
+    # Build the callees dictionary
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, caller_ct) in callers.items():
+            callees.setdefault(caller, {})[func] = caller_ct
+    roots = [func for func, (_, _, _, _, callers) in stats.stats.items() if len(callers) == 0]
+
+    # Walk the call tree
+    list_stacks = []
+
+    def _walk(func, stack, fraction):
+        _, _, tt, _, _ = stats.stats[func]
+        stack = [*stack, func]
+        own_time = int(tt * fraction * 1e6)
+        if own_time > 0:
+            list_stacks.append((";".join(_format_function(f) for f in stack), own_time))
+        if len(stack) >= max_depth:
+            return
+        for callee, edge_ct in callees.get(func, {}).items():
+            callee_ct = stats.stats[callee][3]
+            # Skip recursive calls and negligible call paths
+            if callee in stack or callee_ct <= 0 or fraction * edge_ct < 1e-6:
+                continue
+            _walk(callee, stack, fraction * edge_ct / callee_ct)
+
+    for root in roots:
+        _walk(root, [], 1.0)
+    return list_stacks
+
+
+def define_station_profile(processed_dir, product, station_name, filenames, n_functions=50):
+    """Merge the profiles of the processed files into the station profile files.
+
+    The per-file profiles are removed once merged.
+
+    Returns
+    -------
+    pstats.Stats
+        Merged profiling statistics. ``None`` if no profile is available.
+    """
+    # List the profiles of the processed files
+    filepaths = [define_file_profile_filepath(processed_dir, product, station_name, filename) for filename in filenames]
+    filepaths = [filepath for filepath in filepaths if os.path.isfile(filepath)]
+    if len(filepaths) == 0:
+        return None
+
+    # Merge the profiles
+    stats = pstats.Stats(*filepaths)
+    stats.dump_stats(define_station_profile_filepath(processed_dir, product, station_name))
+
+    # Write the text summary
+    stream = io.StringIO()
+    pstats.Stats(*filepaths, stream=stream).sort_stats("cumulative").print_stats(n_functions)
+    with open(define_station_profile_filepath(processed_dir, product, station_name, extension="txt"), "w") as f:
+        f.write(f"Profile of {len(filepaths)} {product} files of station {station_name}.\n")
+        f.write(stream.getvalue())
+
+    # Write the collapsed stacks
+    list_stacks = get_collapsed_stacks(stats)
+    with open(define_station_profile_filepath(processed_dir, product, station_name, extension="collapsed"), "w") as f:
+        f.writelines(f"{stack} {value}\n" for stack, value in list_stacks)
+
+    # Remove the per-file profiles
+    for filepath in filepaths:
+        os.remove(filepath)
+    return stats
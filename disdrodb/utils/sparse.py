@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+# -----------------------------------------------------------------------------.
+# Copyright (c) 2021-2023 DISDRODB developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# -----------------------------------------------------------------------------.
+"""DISDRODB sparse variables utility.
+
+Mostly-empty spectra variables (i.e. ``raw_drop_number``) can be stored in a compressed sparse row (CSR) layout.
+A sparse ``<variable>`` of dimensions ``(time, <dim_1>, <dim_2>)`` is replaced by:
+
+- ``<variable>_count`` ``(time)``: the number of non-zero values of each timestep.
+- ``<variable>_index`` ``(<variable>_nnz)``: the flat index of the non-zero values within each timestep spectrum.
+- ``<variable>_value`` ``(<variable>_nnz)``: the non-zero values (including ``NaN``), sorted by time.
+
+The ``<variable>_value`` variable carries the original variable attributes and the ``sparse_dims`` attribute.
+"""
+
+import dask.array
+import numpy as np
+import xarray as xr
+
+SPARSE_VARIABLES = ["raw_drop_number"]
+SPARSE_CHUNKSIZE = 5000
+SPARSE_ENCODING_KEYS = [
+    "dtype",
+    "_FillValue",
+    "scale_factor",
+    "add_offset",
+    "zlib",
+    "complevel",
+    "shuffle",
+    "fletcher32",
+]
+
+
+def get_l0b_sparse_option(sparse=None):
+    """Return whether to store the L0B spectra variables in the sparse layout.
+
+    If ``None``, the ``l0b_sparse`` key of the DISDRODB configuration is used (``False`` by default).
+    """
+    import disdrodb
+
+    if sparse is None:
+        sparse = disdrodb.config.get("l0b_sparse", False)
+    return bool(sparse)
+
+
+def _get_sparse_names(var):
+    """Return the names of the count, index and value variables, and of the non-zero values dimension."""
+    return f"{var}_count", f"{var}_index", f"{var}_value", f"{var}_nnz"
+
+
+def get_sparse_variables(ds):
+    """Return the names of the variables stored in the sparse layout."""
+    return [var[: -len("_value")] for var in ds.data_vars if "sparse_dims" in ds[var].attrs]
+
+
+def is_sparse_dataset(ds):
+    """Return ``True`` if the dataset contains variables stored in the sparse layout."""
+    return len(get_sparse_variables(ds)) > 0
+
+
+def _sparsify_block(values, index_dtype):
+    """Return the counts, flat indices and values of the non-zero values of a ``(time, ...)`` block."""
+    values = np.asarray(values)
+    values = values.reshape(values.shape[0], int(np.prod(values.shape[1:])))
+    # Identify the non-zero values (NaN values are retained)
+    is_nonzero = values != 0
+    rows, index = np.nonzero(is_nonzero)
+    return is_nonzero.sum(axis=1).astype("uint32"), index.astype(index_dtype), values[rows, index]
+
+
+def _sparsify_dask_block(values, index_dtype, field):
+    """Return the flat indices (``field="index"``) or the values (``field="value"``) of a block."""
+    _, index, values = _sparsify_block(values, index_dtype=index_dtype)
+    return index if field == "index" else values
+
+
+def _sparsify_dask_array(arr, index_dtype):
+    """Return the counts, and the lazy flat indices and values, of the non-zero values of a dask array.
+
+    The counts are computed block by block along time (and loaded into memory), while the indices
+    and values of each time block are computed only when written.
+    """
+    # Keep the time chunks and do not chunk the other dimensions
+    arr = arr.rechunk({i: -1 for i in range(1, arr.ndim)})
+    counts = (arr != 0).sum(axis=tuple(range(1, arr.ndim))).astype("uint32").compute()
+    nnz_chunks = []
+    start = 0
+    for size in arr.chunks[0]:
+        nnz_chunks.append(int(counts[start : start + size].sum()))
+        start += size
+    kwargs = {
+        "index_dtype": index_dtype,
+        "drop_axis": list(range(1, arr.ndim)),
+        "chunks": (tuple(nnz_chunks),),
+    }
+    index = arr.map_blocks(_sparsify_dask_block, field="index", dtype=index_dtype, **kwargs)
+    values = arr.map_blocks(_sparsify_dask_block, field="value", dtype=arr.dtype, **kwargs)
+    return counts, index, values
+
+
+def sparsify_variable(ds, var):
+    """Replace a ``(time, ...)`` variable with its sparse layout.
+
+    If the variable is a dask array, the variable is sparsified block by block along time:
+    only the counts are loaded into memory, while the indices and values remain lazy.
+    Otherwise, the variable values are loaded into memory.
+    """
+    count_var, index_var, value_var, nnz_dim = _get_sparse_names(var)
+    da = ds[var]
+    if da.dims[0] != "time":
+        raise ValueError(f"The first dimension of '{var}' must be 'time'.")
+    n_cells = int(np.prod(da.shape[1:]))
+    index_dtype = "uint16" if n_cells <= np.iinfo("uint16").max else "uint32"
+    if isinstance(da.data, dask.array.Array):
+        counts, index, values = _sparsify_dask_array(da.data, index_dtype=index_dtype)
+    else:
+        counts, index, values = _sparsify_block(da.values, index_dtype=index_dtype)
+    # Define the sparse variables
+    ds_sparse = xr.Dataset(
+        {
+            count_var: ("time", counts),
+            index_var: (nnz_dim, index),
+            value_var: (nnz_dim, values),
+        },
+    )
+    ds_sparse[count_var].attrs = {"description": f"Number of non-zero {var} values of each timestep"}
+    ds_sparse[index_var].attrs = {"description": f"Flat index of the non-zero {var} values within each timestep"}
+    ds_sparse[value_var].attrs = {**da.attrs, "sparse_dims": " ".join(da.dims)}
+    # Define the encodings
+    encoding = {k: v for k, v in da.encoding.items() if k in SPARSE_ENCODING_KEYS}
+    ds_sparse[count_var].encoding = {"zlib": True, "complevel": 3, "shuffle": True}
+    ds_sparse[index_var].encoding = {"zlib": True, "complevel": 3, "shuffle": True}
+    ds_sparse[value_var].encoding = encoding
+    # Replace the dense variable
+    ds = ds.drop_vars(var)
+    for sparse_var in ds_sparse.data_vars:
+        ds[sparse_var] = ds_sparse[sparse_var]
+    return ds
+
+
+def sparsify_dataset(ds, variables=None):
+    """Replace the (available) spectra variables with their sparse layout."""
+    variables = SPARSE_VARIABLES if variables is None else variables
+    for var in variables:
+        if var in ds:
+            ds = sparsify_variable(ds, var)
+    return ds
+
+
+def _densify_block(counts, index, values, cell_shape):
+    """Reconstruct the dense ``(time, *cell_shape)`` block of a sparse variable."""
+    block = np.zeros((len(counts), int(np.prod(cell_shape))), dtype=values.dtype)
+    rows = np.repeat(np.arange(len(counts)), counts)
+    block[rows, index] = values
+    return block.reshape(len(counts), *cell_shape)
+
+
+def densify_variable(ds, var, chunksize=SPARSE_CHUNKSIZE):
+    """Replace the sparse layout of a variable with a lazy dense dask array.
+
+    The counts are read into memory, while the indices and values of each
+    block of ``chunksize`` timesteps are read only when the block is computed.
+    """
+    count_var, index_var, value_var, nnz_dim = _get_sparse_names(var)
+    attrs = ds[value_var].attrs.copy()
+    dims = attrs.pop("sparse_dims").split(" ")
+    cell_shape = tuple(ds.sizes[dim] for dim in dims[1:])
+
+    # Define the time chunks and the corresponding non-zero values chunks
+    counts = ds[count_var].values.astype(int)
+    time_chunks = tuple(len(counts[i : i + chunksize]) for i in range(0, len(counts), chunksize)) or (0,)
+    nnz_chunks = tuple(int(counts[i : i + chunksize].sum()) for i in range(0, len(counts), chunksize)) or (0,)
+    index = ds[index_var].variable.chunk({nnz_dim: nnz_chunks}).data
+    values = ds[value_var].variable.chunk({nnz_dim: nnz_chunks}).data
+
+    # Reconstruct the dense array
+    arr = dask.array.map_blocks(
+        _densify_block,
+        dask.array.from_array(counts, chunks=(time_chunks,)),
+        index,
+        values,
+        cell_shape=cell_shape,
+        new_axis=list(range(1, len(dims))),
+        chunks=(time_chunks, *[(size,) for size in cell_shape]),
+        dtype=values.dtype,
+        meta=np.array((), dtype=values.dtype),
+    )
+
+    # Replace the sparse variables
+    encoding = {k: v for k, v in ds[value_var].encoding.items() if k in SPARSE_ENCODING_KEYS}
+    ds = ds.drop_vars([count_var, index_var, value_var])
+    ds[var] = xr.Variable(dims, arr, attrs=attrs, encoding=encoding)
+    return ds
+
+
+def densify_dataset(ds, chunksize=SPARSE_CHUNKSIZE):
+    """Replace the sparse layout of the dataset variables with lazy dense dask arrays."""
+    for var in get_sparse_variables(ds):
+        ds = densify_variable(ds, var, chunksize=chunksize)
+    return ds
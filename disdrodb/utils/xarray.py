@@ -18,10 +18,15 @@
 # -----------------------------------------------------------------------------.
 """Xarray utility."""
 
+import numpy as np
 import pandas as pd
 import xarray as xr
+from pandas.tseries.frequencies import to_offset
 from xarray.core import dtypes
 
+GAP_DIM = "gap"
+GAP_TABLE_VARIABLES = ["gap_start_time", "gap_length"]
+
 
 def get_dataset_start_end_time(ds: xr.Dataset):
     """Retrieves dataset starting and ending time.
@@ -42,7 +47,153 @@ def get_dataset_start_end_time(ds: xr.Dataset):
     return (starting_time, ending_time)
 
 
-def regularize_dataset(ds: xr.Dataset, freq: str, time_dim="time", method=None, fill_value=dtypes.NA):
+def infer_sampling_interval(ds: xr.Dataset, time_dim="time") -> pd.Timedelta:
+    """Infer the sampling interval of a dataset.
+
+    The sampling interval is the most frequent time difference between consecutive timesteps,
+    which is robust to data gaps and to a few irregular timesteps.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        xarray Dataset with timesteps sorted by time.
+    time_dim : str, optional
+        The time dimension in the xr.Dataset. The default is ``"time"``.
+
+    Returns
+    -------
+    pd.Timedelta
+        Sampling interval.
+    """
+    time_diff = np.diff(ds[time_dim].values)
+    time_diff = time_diff[time_diff > np.timedelta64(0)]
+    if len(time_diff) == 0:
+        raise ValueError("The sampling interval can not be inferred from less than two distinct timesteps.")
+    values, counts = np.unique(time_diff, return_counts=True)
+    return pd.Timedelta(values[np.argmax(counts)])
+
+
+def _get_freq(ds: xr.Dataset, freq=None, time_dim="time"):
+    """Return the regularization frequency.
+
+    If ``None``, the sampling interval of the gap table (if available) or the inferred sampling interval is used.
+    Fixed frequencies (i.e. ``"10s"``, ``"min"``) are returned as ``pd.Timedelta``, while non-fixed
+    frequencies (i.e. ``"MS"``) are returned as ``pd.DateOffset``.
+    """
+    if freq is not None:
+        offset = to_offset(freq)
+        try:
+            return pd.Timedelta(offset)
+        except ValueError:
+            return offset
+    if "gap_length" in ds:
+        return pd.Timedelta(seconds=ds["gap_length"].attrs["sampling_interval"])
+    return infer_sampling_interval(ds, time_dim=time_dim)
+
+
+def _get_fixed_freq(ds: xr.Dataset, freq=None, time_dim="time") -> pd.Timedelta:
+    """Return the regularization frequency as a ``pd.Timedelta``.
+
+    Raise a ``ValueError`` if the frequency is not fixed (i.e. ``"MS"``).
+    """
+    freq = _get_freq(ds, freq=freq, time_dim=time_dim)
+    if not isinstance(freq, pd.Timedelta):
+        raise ValueError(f"A fixed frequency is required. Got '{freq.freqstr}'.")
+    return freq
+
+
+def _get_regular_positions(time: np.ndarray, freq: pd.Timedelta) -> tuple[np.ndarray, np.ndarray, int]:
+    """Return the positions of the timesteps in the regular time grid starting at the first timestep.
+
+    Returns the positions, a mask of the timesteps lying on the regular time grid,
+    and the number of timesteps of the regular time grid.
+    """
+    time = time.astype("M8[ns]")
+    step = freq.value
+    offsets = (time - time[0]).astype("int64")
+    positions = offsets // step
+    is_on_grid = offsets % step == 0
+    return positions, is_on_grid, int(positions[-1]) + 1
+
+
+def get_gap_table(ds: xr.Dataset, freq=None, time_dim="time") -> pd.DataFrame:
+    """Return the table of the runs of missing timesteps of a dataset.
+
+    The missing timesteps are the timesteps of the regular time grid (from the first to
+    the last timestep with the ``freq`` interval) that are not in the dataset.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        xarray Dataset with timesteps sorted by time.
+    freq : str or pd.Timedelta, optional
+        Fixed interval of the regular time grid (i.e. ``freq="10s"``).
+        If ``None`` (the default), the sampling interval is inferred.
+    time_dim : str, optional
+        The time dimension in the xr.Dataset. The default is ``"time"``.
+
+    Returns
+    -------
+    pd.DataFrame
+        Dataframe with a row for each gap and the columns:
+
+        - ``start_index``: position of the first missing timestep in the regular time grid.
+        - ``start_time``: time of the first missing timestep.
+        - ``length``: number of missing timesteps.
+    """
+    freq = _get_fixed_freq(ds, freq=freq, time_dim=time_dim)
+    time = ds[time_dim].values
+    positions, is_on_grid, n_timesteps = _get_regular_positions(time, freq)
+    positions = np.unique(positions[is_on_grid])
+    # Count the missing timesteps after each available timestep
+    lengths = np.append(positions[1:], n_timesteps) - positions - 1
+    is_gap = lengths > 0
+    start_index = positions[is_gap] + 1
+    return pd.DataFrame(
+        {
+            "start_index": start_index,
+            "start_time": time[0].astype("M8[ns]") + start_index * freq.to_timedelta64(),
+            "length": lengths[is_gap],
+        },
+    )
+
+
+def add_gap_table(ds: xr.Dataset, freq=None, time_dim="time") -> xr.Dataset:
+    """Add the gap table of a dataset instead of materializing the missing timesteps.
+
+    The ``gap_start_time`` and ``gap_length`` variables (along the ``gap`` dimension) contain the time of the
+    first missing timestep and the number of missing timesteps of each gap.
+    The sampling interval (in seconds) is stored in the ``sampling_interval`` attribute of ``gap_length``,
+    and is used by default by ``regularize_dataset``.
+    """
+    freq = _get_fixed_freq(ds, freq=freq, time_dim=time_dim)
+    df_gaps = get_gap_table(ds, freq=freq, time_dim=time_dim)
+    ds = ds.drop_vars(GAP_TABLE_VARIABLES, errors="ignore")
+    ds["gap_start_time"] = xr.DataArray(df_gaps["start_time"].to_numpy(), dims=GAP_DIM)
+    ds["gap_length"] = xr.DataArray(df_gaps["length"].to_numpy().astype("uint32"), dims=GAP_DIM)
+    ds["gap_start_time"].attrs = {"description": "Time of the first missing timestep of each gap"}
+    ds["gap_length"].attrs = {
+        "description": "Number of missing timesteps of each gap",
+        "sampling_interval": freq.total_seconds(),
+    }
+    return ds
+
+
+def is_regular_dataset(ds: xr.Dataset, freq=None, time_dim="time") -> bool:
+    """Return ``True`` if the dataset timesteps are regularly spaced by ``freq``."""
+    freq = _get_fixed_freq(ds, freq=freq, time_dim=time_dim)
+    positions, is_on_grid, n_timesteps = _get_regular_positions(ds[time_dim].values, freq)
+    return bool(np.all(is_on_grid)) and n_timesteps == ds.sizes[time_dim] and bool(np.all(np.diff(positions) == 1))
+
+
+def regularize_dataset(
+    ds: xr.Dataset,
+    freq=None,
+    time_dim="time",
+    method=None,
+    fill_value=dtypes.NA,
+    chunks=None,
+):
     """
     Regularize a dataset across time dimension with uniform resolution.
 
@@ -52,15 +203,22 @@ def regularize_dataset(ds: xr.Dataset, freq: str, time_dim="time", method=None,
         xarray Dataset.
     time_dim : str, optional
         The time dimension in the xr.Dataset. The default is ``"time"``.
-    freq : str
+    freq : str, optional
         The ``freq`` string to pass to ``pd.date_range`` to define the new time coordinates.
-        Examples: ``freq="2min"``.
+        Examples: ``freq="2min"``, ``freq="min"``, ``freq="D"``.
+        If ``None``, the sampling interval of the gap table (see ``add_gap_table``)
+        or the inferred sampling interval is used.
     method : str, optional
         Method to use for filling missing timesteps.
         If ``None``, fill with ``fill_value``. The default is ``None``.
         For other possible methods, see https://docs.xarray.dev/en/stable/generated/xarray.Dataset.reindex.html
     fill_value : float, optional
         Fill value to fill missing timesteps. The default is ``dtypes.NA``.
+    chunks : int, optional
+        Size of the time chunks of the regularized dataset.
+        If specified, the dataset is regularized lazily with dask.
+        If ``None`` (the default), the regularized dataset is built in memory
+        (unless the dataset is already backed by dask arrays).
 
     Returns
     -------
@@ -68,15 +226,86 @@ def regularize_dataset(ds: xr.Dataset, freq: str, time_dim="time", method=None,
         Regularized dataset.
 
     """
+    freq = _get_freq(ds, freq=freq, time_dim=time_dim)
+    ds = ds.drop_vars(GAP_TABLE_VARIABLES, errors="ignore")
+
+    # Return the dataset if already regular
+    # - The check is only performed for fixed frequencies
+    if isinstance(freq, pd.Timedelta) and is_regular_dataset(ds, freq=freq, time_dim=time_dim):
+        return ds if chunks is None else ds.chunk({time_dim: chunks})
+
+    # Define the regular time index
     start = ds[time_dim].values[0]
     end = ds[time_dim].values[-1]
     new_time_index = pd.date_range(start=pd.to_datetime(start), end=pd.to_datetime(end), freq=freq)
 
     # Regularize dataset and fill with NA values
+    # - If chunks is specified, the dataset is reindexed lazily with dask
+    if chunks is not None:
+        ds = ds.chunk({time_dim: chunks})
     ds_reindexed = ds.reindex(
-        {"time": new_time_index},
+        {time_dim: new_time_index},
         method=method,  # do not fill gaps
         # tolerance=tolerance,  # mismatch in seconds
         fill_value=fill_value,
     )
+    if chunks is not None:
+        ds_reindexed = ds_reindexed.chunk({time_dim: chunks})
     return ds_reindexed
+
+
+def iterate_regularized_dataset(
+    ds: xr.Dataset,
+    freq=None,
+    block_size=10_000,
+    time_dim="time",
+    method=None,
+    fill_value=dtypes.NA,
+):
+    """Yield the regularized dataset by blocks of ``block_size`` regular timesteps.
+
+    Only the timesteps of a block are reindexed at once, so that the regularized
+    dataset can be processed or written block by block with a bounded memory usage.
+    The concatenation of the blocks is equal to ``regularize_dataset(ds, freq=freq, method=method)``.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        xarray Dataset with timesteps sorted by time.
+    freq : str, optional
+        Interval of the regular time grid (i.e. ``freq="10s"``).
+        If ``None``, the sampling interval of the gap table (see ``add_gap_table``)
+        or the inferred sampling interval is used.
+    block_size : int, optional
+        Number of regular timesteps of each block. The default is 10000.
+    time_dim : str, optional
+        The time dimension in the xr.Dataset. The default is ``"time"``.
+    method : str, optional
+        Method to use for filling missing timesteps. See ``regularize_dataset``.
+    fill_value : float, optional
+        Fill value to fill missing timesteps. The default is ``dtypes.NA``.
+
+    Yields
+    ------
+    xr.Dataset
+        Regularized dataset of a block of timesteps.
+    """
+    freq = _get_fixed_freq(ds, freq=freq, time_dim=time_dim)
+    ds = ds.drop_vars(GAP_TABLE_VARIABLES, errors="ignore")
+    time = ds[time_dim].values.astype("M8[ns]")
+    _, _, n_timesteps = _get_regular_positions(time, freq)
+    step = freq.to_timedelta64()
+    for i in range(0, n_timesteps, block_size):
+        n_block = min(block_size, n_timesteps - i)
+        block_start = time[0] + i * step
+        # Select the timesteps of the block
+        # - With a fill method, the neighbouring timesteps of the block are also selected
+        idx_start, idx_end = np.searchsorted(time, [block_start, block_start + n_block * step])
+        if method is not None:
+            idx_start, idx_end = max(idx_start - 1, 0), min(idx_end + 1, len(time))
+        new_time_index = pd.date_range(start=pd.to_datetime(block_start), periods=n_block, freq=freq)
+        yield ds.isel({time_dim: slice(idx_start, idx_end)}).reindex(
+            {time_dim: new_time_index},
+            method=method,
+            fill_value=fill_value,
+        )